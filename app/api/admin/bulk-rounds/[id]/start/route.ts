@@ -2,6 +2,7 @@ import { NextRequest, NextResponse } from 'next/server';
 import { neon } from '@neondatabase/serverless';
 import { verifyAuth } from '@/lib/auth-helper';
 import { broadcastRoundUpdate } from '@/lib/realtime/broadcast';
+import { openRoundReserves } from '@/lib/reserve-calculator';
 import { sendNotificationToSeason } from '@/lib/notifications/send-notification';
 
 const sql = neon(process.env.DATABASE_URL || process.env.NEON_DATABASE_URL!);
@@ -85,6 +86,13 @@ export async function POST(
         duration_seconds: round.duration_seconds,
       });
 
+      // Reserve snapshots for every team, so tiebreaker bids validate in memory
+      try {
+        await openRoundReserves(roundId, seasonId);
+      } catch (reserveError) {
+        console.error('Failed to compute reserve snapshots:', reserveError);
+      }
+
       // Send FCM notification
       try {
         const durationMinutes = Math.round(round.duration_seconds / 60);
@@ -2,7 +2,7 @@ import { NextRequest, NextResponse } from 'next/server';
 import { neon } from '@neondatabase/serverless';
 import { verifyAuth } from '@/lib/auth-helper';
 import { finalizeRound, applyFinalizationResults } from '@/lib/finalize-round';
-import { sendNotificationToSeason, sendNotification } from '@/lib/notifications/send-notification';
+import { sendNotificationToSeason, NotificationQueue } from '@/lib/notifications/send-notification';
 import { broadcastRoundUpdate } from '@/lib/realtime/broadcast';
 
 const sql = neon(process.env.DATABASE_URL || process.env.NEON_DATABASE_URL!);
@@ -139,30 +139,28 @@ export async function POST(
 
     // Send notifications to winners
     try {
-      // Notify each winning team
+      // Notify every winning team in one batched flush
+      const winnerNotifications = new NotificationQueue();
       for (const allocation of finalizationResult.allocations) {
-        try {
-          await sendNotification(
-            {
-              title: '🎉 Player Won!',
-              body: `Congratulations! You won ${allocation.player_name} for £${allocation.amount.toLocaleString()}`,
-              url: `/dashboard/team`,
-              icon: '/logo.png',
-              data: {
-                type: 'player_won',
-                roundId: roundId,
-                playerId: allocation.player_id.toString(),
-                playerName: allocation.player_name,
-                amount: allocation.amount.toString(),
-                phase: allocation.phase
-              }
-            },
-            { teamId: allocation.team_id }
-          );
-        } catch (err) {
-          console.error(`Failed to send notification to team ${allocation.team_id}:`, err);
-        }
+        winnerNotifications.enqueue(
+          {
+            title: '🎉 Player Won!',
+            body: `Congratulations! You won ${allocation.player_name} for £${allocation.amount.toLocaleString()}`,
+            url: `/dashboard/team`,
+            icon: '/logo.png',
+            data: {
+              type: 'player_won',
+              roundId: roundId,
+              playerId: allocation.player_id.toString(),
+              playerName: allocation.player_name,
+              amount: allocation.amount.toString(),
+              phase: allocation.phase
+            }
+          },
+          { teamId: allocation.team_id }
+        );
       }
+      await winnerNotifications.flush();
 
       console.log(`✅ Sent ${finalizationResult.allocations.length} winner notifications`);
     } catch (notifError) {
@@ -5,6 +5,7 @@ import { finalizeRound, applyFinalizationResults } from '@/lib/finalize-round';
 import { generateRoundId } from '@/lib/id-generator';
 import { validateAuctionSettings } from '@/lib/auction-settings';
 import { broadcastRoundUpdate } from '@/lib/realtime/broadcast';
+import { openRoundReserves } from '@/lib/reserve-calculator';
 import { sendNotificationToSeason } from '@/lib/notifications/send-notification';
 
 const sql = neon(process.env.DATABASE_URL || process.env.NEON_DATABASE_URL!);
@@ -296,6 +297,13 @@ export async function POST(request: NextRequest) {
       RETURNING *
     `;
 
+    // Reserve snapshots for every team, so bids validate in memory
+    try {
+      await openRoundReserves(roundId!, seasonId);
+    } catch (reserveError) {
+      console.error('Failed to compute reserve snapshots:', reserveError);
+    }
+
     // Send FCM notification to all teams in season (before Firebase to avoid timeout)
     try {
       console.log(`📣 Sending round start notification for season ${seasonId}, round ${roundId}`);
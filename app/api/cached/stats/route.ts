@@ -18,7 +18,7 @@ export async function GET(request: Request) {
     const { searchParams } = new URL(request.url);
     const seasonId = searchParams.get('seasonId') || undefined;
     
-    // Build league stats from Firestore
+    // Served from the versioned season aggregates
     const stats = await buildLeagueStats(seasonId);
     
     return NextResponse.json(
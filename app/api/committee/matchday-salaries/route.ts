@@ -0,0 +1,46 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { verifyAuth } from '@/lib/auth-helper';
+import { runMatchdaySalaries } from '@/lib/salary-engine';
+
+/**
+ * POST /api/committee/matchday-salaries
+ * Charge real player salaries for every completed fixture of a matchday
+ *
+ * Body: { season_id, round_number?, leg?, fixture_ids?, recalculate_categories? }
+ * Fixtures already charged (e.g. by result submission) are skipped.
+ */
+export async function POST(request: NextRequest) {
+  try {
+    const auth = await verifyAuth(['committee_admin'], request);
+    if (!auth.authenticated) {
+      return NextResponse.json({ success: false, error: 'Unauthorized' }, { status: 401 });
+    }
+
+    const { season_id, round_number, leg, fixture_ids, recalculate_categories } = await request.json();
+
+    if (!season_id || (!round_number && !Array.isArray(fixture_ids))) {
+      return NextResponse.json(
+        { success: false, error: 'season_id and round_number or fixture_ids are required' },
+        { status: 400 }
+      );
+    }
+
+    const report = await runMatchdaySalaries(
+      {
+        seasonId: season_id,
+        roundNumber: round_number ? parseInt(round_number) : undefined,
+        leg: leg || undefined,
+        fixtureIds: Array.isArray(fixture_ids) ? fixture_ids : undefined
+      },
+      { recalculateCategories: recalculate_categories === true }
+    );
+
+    return NextResponse.json({ success: true, ...report });
+  } catch (error: any) {
+    console.error('Error running matchday salaries:', error);
+    return NextResponse.json(
+      { success: false, error: error.message || 'Failed to run matchday salaries' },
+      { status: 500 }
+    );
+  }
+}
@@ -3,6 +3,7 @@ import { neon } from '@neondatabase/serverless';
 import { verifyAuth } from '@/lib/auth-helper';
 import { adminDb } from '@/lib/firebase/admin';
 import { FieldValue } from 'firebase-admin/firestore';
+import { recordReserveBudgetChange } from '@/lib/reserve-calculator';
 
 const sql = neon(process.env.DATABASE_URL!);
 
@@ -82,6 +83,11 @@ export async function POST(request: NextRequest) {
 
     console.log('✅ Firebase team_seasons updated');
 
+    // Keep open rounds' reserve snapshots in step with the auction balance
+    if (refundType === 'football' && teamSeasonData.currency_system === 'dual') {
+      recordReserveBudgetChange(teamId, seasonId, newBudget);
+    }
+
     // Update Neon teams (only for football refunds)
     if (refundType === 'football') {
       await sql`
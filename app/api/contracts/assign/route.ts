@@ -1,7 +1,8 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { adminDb } from '@/lib/firebase/admin';
 import { verifyAuth } from '@/lib/auth-helper';
-import { calculateRealPlayerSalary, getInitialPoints } from '@/lib/contracts';
+import { calculateRealPlayerSalary, lookupInitialPoints } from '@/lib/contracts';
+import { getSeasonStarRatingTable } from '@/lib/star-rating-config';
 import { logRealPlayerFee } from '@/lib/transaction-logger';
 
 export async function POST(request: NextRequest) {
@@ -59,7 +60,7 @@ export async function POST(request: NextRequest) {
 
     // Calculate initial points from star rating
     const seasonId = teamData?.season_id || startSeason;
-    const initialPoints = await getInitialPoints(starRating, seasonId);
+    const initialPoints = lookupInitialPoints(await getSeasonStarRatingTable(seasonId), starRating);
 
     // Create player object
     const newPlayer = {
@@ -1,12 +1,30 @@
 import { NextRequest, NextResponse } from 'next/server';
-import { neon } from '@neondatabase/serverless';
-import { finalizeRound, applyFinalizationResults } from '@/lib/finalize-round';
-
-const sql = neon(process.env.DATABASE_URL || process.env.NEON_DATABASE_URL!);
+import { runRoundFinalizationWorker } from '@/lib/round-finalization-worker';
+
+const DEFAULT_CONCURRENCY = 3;
+const MAX_CONCURRENCY = 8;
+const DEFAULT_LIMIT = 10;
+const MAX_LIMIT = 50;
+// Stop claiming new rounds well before the 30s function timeout
+const TIME_BUDGET_MS = 20000;
+
+function clampParam(value: string | null, fallback: number, max: number): number {
+  const parsed = parseInt(value || '', 10);
+  if (!Number.isFinite(parsed) || parsed < 1) return fallback;
+  return Math.min(parsed, max);
+}
 
 /**
  * GET /api/cron/finalize-rounds
  * Automatically finalize rounds that have expired
+ *
+ * Expired rounds are claimed with FOR UPDATE SKIP LOCKED and finalized
+ * concurrently (see lib/round-finalization-worker.ts), so overlapping cron
+ * runs, scripts/finalize_rounds_worker.py and lazy finalization never
+ * process the same round twice. Manual-mode rounds are moved to
+ * expired_pending_finalization for the committee.
+ *
+ * Query params: ?concurrency= (default 3, max 8), ?limit= (default 10, max 50)
  * 
  * This endpoint should be called by a cron job or scheduled task
  * For production, you can use:
@@ -33,20 +51,20 @@ export async function GET(request: NextRequest) {
       );
     }
 
-    // Find all active rounds that have expired
-    const expiredRoundsResult = await sql`
-      SELECT 
-        id,
-        position,
-        end_time,
-        status
-      FROM rounds
-      WHERE status = 'active'
-      AND end_time < NOW()
-      ORDER BY end_time ASC
-    `;
+    // Bounded by the function timeout: claim at most `limit` rounds and
+    // finalize `concurrency` of them at a time (rounds left over are picked
+    // up by the next run)
+    const { searchParams } = new URL(request.url);
+    const concurrency = clampParam(searchParams.get('concurrency'), DEFAULT_CONCURRENCY, MAX_CONCURRENCY);
+    const limit = clampParam(searchParams.get('limit'), DEFAULT_LIMIT, MAX_LIMIT);
+
+    const result = await runRoundFinalizationWorker({
+      concurrency,
+      maxRounds: limit,
+      timeBudgetMs: TIME_BUDGET_MS,
+    });
 
-    if (expiredRoundsResult.length === 0) {
+    if (result.processed === 0) {
       return NextResponse.json({
         success: true,
         message: 'No expired rounds found',
@@ -54,98 +72,43 @@ export async function GET(request: NextRequest) {
       });
     }
 
-    const finalizationResults = [];
-    const errors = [];
-
-    // Process each expired round
-    for (const round of expiredRoundsResult) {
-      try {
-        console.log(`Finalizing round ${round.id} (${round.position})...`);
-
-        // Run finalization algorithm
-        const finalizationResult = await finalizeRound(round.id);
-
-        if (!finalizationResult.success) {
-          if (finalizationResult.tieDetected) {
-            // Tie detected - mark round as requiring tiebreaker
-            await sql`
-              UPDATE rounds
-              SET status = 'tiebreaker',
-                  updated_at = NOW()
-              WHERE id = ${round.id}
-            `;
-
-            errors.push({
-              round_id: round.id,
-              position: round.position,
-              error: 'Tie detected - tiebreaker required',
-              tied_bids: finalizationResult.tiedBids?.length || 0,
-            });
-
-            console.log(`Tie detected in round ${round.id}. Marked for tiebreaker.`);
-            continue;
-          }
-
-          errors.push({
-            round_id: round.id,
-            position: round.position,
-            error: finalizationResult.error,
-          });
-
-          console.error(`Failed to finalize round ${round.id}:`, finalizationResult.error);
-          continue;
-        }
-
-        // Apply finalization results to database
-        const applyResult = await applyFinalizationResults(
-          round.id,
-          finalizationResult.allocations
-        );
-
-        if (!applyResult.success) {
-          errors.push({
-            round_id: round.id,
-            position: round.position,
-            error: applyResult.error,
-          });
-
-          console.error(`Failed to apply finalization for round ${round.id}:`, applyResult.error);
-          continue;
-        }
-
-        // Success
-        finalizationResults.push({
-          round_id: round.id,
-          position: round.position,
-          allocations_count: finalizationResult.allocations.length,
-          allocations: finalizationResult.allocations.map(alloc => ({
-            team_name: alloc.team_name,
-            player_name: alloc.player_name,
-            amount: alloc.amount,
-            phase: alloc.phase,
-          })),
-        });
-
-        console.log(`Successfully finalized round ${round.id}`);
-      } catch (error) {
-        console.error(`Error processing round ${round.id}:`, error);
-        errors.push({
-          round_id: round.id,
-          position: round.position,
-          error: 'Unexpected error during finalization',
-        });
-      }
-    }
+    const finalizationResults = result.rounds
+      .filter(r => r.outcome === 'finalized')
+      .map(r => ({
+        round_id: r.round_id,
+        position: r.position,
+        allocations_count: r.allocations_count,
+        allocations: r.allocations,
+        timings: r.timings,
+      }));
+
+    const errors = result.rounds
+      .filter(r => r.outcome === 'tiebreaker' || r.outcome === 'failed')
+      .map(r => ({
+        round_id: r.round_id,
+        position: r.position,
+        error: r.error,
+        tied_bids: r.tied_bids,
+        timings: r.timings,
+      }));
+
+    const pendingManual = result.rounds
+      .filter(r => r.outcome === 'pending_manual')
+      .map(r => ({ round_id: r.round_id, position: r.position }));
 
     return NextResponse.json({
       success: true,
-      message: `Processed ${expiredRoundsResult.length} expired rounds`,
+      message: `Processed ${result.processed} expired rounds`,
       finalized: finalizationResults,
       errors: errors.length > 0 ? errors : undefined,
+      pending_manual: pendingManual.length > 0 ? pendingManual : undefined,
       summary: {
-        total_expired: expiredRoundsResult.length,
-        successfully_finalized: finalizationResults.length,
-        failed_or_tied: errors.length,
+        total_expired: result.processed,
+        successfully_finalized: result.finalized,
+        failed_or_tied: result.failed + result.tiebreakers,
+        pending_manual_finalization: result.pending_manual,
+        concurrency,
+        duration_ms: result.duration_ms,
       },
     });
   } catch (error) {
@@ -0,0 +1,51 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { processNewsJobs } from '@/lib/news/job-queue';
+
+/**
+ * GET /api/cron/process-news-jobs
+ * Drain the news_jobs queue filled by triggerNews()/triggerNewsGeneration()
+ *
+ * Call every minute from the same cron service as /api/cron/finalize-rounds.
+ * Optional query params: concurrency, max_jobs
+ *
+ * Security: protected by CRON_SECRET (Authorization: Bearer <secret>)
+ */
+export async function GET(request: NextRequest) {
+  try {
+    const authHeader = request.headers.get('authorization');
+    const cronSecret = process.env.CRON_SECRET;
+
+    if (cronSecret && authHeader !== `Bearer ${cronSecret}`) {
+      return NextResponse.json(
+        { success: false, error: 'Unauthorized' },
+        { status: 401 }
+      );
+    }
+
+    const { searchParams } = new URL(request.url);
+    const concurrency = parseInt(searchParams.get('concurrency') || '2');
+    const maxJobs = parseInt(searchParams.get('max_jobs') || '10');
+
+    const summary = await processNewsJobs({ concurrency, maxJobs });
+
+    return NextResponse.json({
+      success: true,
+      message: `Processed ${summary.processed} news jobs`,
+      ...summary,
+    });
+  } catch (error) {
+    console.error('Error in cron process-news-jobs:', error);
+    return NextResponse.json(
+      { success: false, error: 'Internal server error' },
+      { status: 500 }
+    );
+  }
+}
+
+/**
+ * POST /api/cron/process-news-jobs
+ * Alternative endpoint for POST requests (some cron services prefer POST)
+ */
+export async function POST(request: NextRequest) {
+  return GET(request);
+}
@@ -2,6 +2,7 @@ import { NextRequest, NextResponse } from 'next/server';
 import { getFantasyDb } from '@/lib/neon/fantasy-config';
 import { getTournamentDb } from '@/lib/neon/tournament-config';
 import { sendNotificationToSeason } from '@/lib/notifications/send-notification';
+import { DEFAULT_PLAYER_SCORING_RULES, fantasyMultiplier, scoreFantasyPlayer } from '@/lib/fantasy/fixture-points';
 
 /**
  * POST /api/fantasy/calculate-points
@@ -71,15 +72,7 @@ export async function POST(request: NextRequest) {
       });
     } else {
       // Default scoring rules
-      scoringRules.set('goals_scored', 5);
-      scoringRules.set('goals_conceded', -1);
-      scoringRules.set('win', 3);
-      scoringRules.set('draw', 1);
-      scoringRules.set('loss', 0);
-      scoringRules.set('clean_sheet', 4);
-      scoringRules.set('motm', 5);
-      scoringRules.set('fine_goals', -2);
-      scoringRules.set('substitution_penalty', -1);
+      DEFAULT_PLAYER_SCORING_RULES.forEach(([ruleType, points]) => scoringRules.set(ruleType, points));
     }
 
     // Fetch fixture data from Neon (includes MOTM)
@@ -288,40 +281,10 @@ async function processPlayer(params: {
 
   // Calculate points breakdown (same for all teams)
   const is_clean_sheet = goals_conceded === 0;
-
-  const points_breakdown: any = {
-    goals: goals_scored * (scoringRules.get('goals_scored') || 0),
-    conceded: goals_conceded * (scoringRules.get('goals_conceded') || 0),
-    result: scoringRules.get(result) || 0,
-    motm: is_motm ? (scoringRules.get('motm') || 0) : 0,
-    fines: fine_goals * (scoringRules.get('fine_goals') || 0),
-    clean_sheet: is_clean_sheet ? (scoringRules.get('clean_sheet') || 0) : 0,
-    substitution: substitution_penalty > 0 ? (scoringRules.get('substitution_penalty') || 0) : 0,
-  };
-  
-  // Conditional bonuses based on goal milestones
-  if (goals_scored === 2) {
-    points_breakdown.brace = scoringRules.get('brace') || 0;
-  }
-  if (goals_scored >= 3) {
-    points_breakdown.hat_trick = scoringRules.get('hat_trick') || 0;
-  }
-  if (goals_scored >= 6) {
-    points_breakdown.scored_6_plus = scoringRules.get('scored_6_plus_goals') || 0;
-  }
-  
-  // Conditional penalties based on goals conceded
-  if (goals_conceded >= 4) {
-    points_breakdown.concedes_4_plus = scoringRules.get('concedes_4_plus_goals') || 0;
-  }
-  if (goals_conceded >= 15) {
-    points_breakdown.concedes_15_plus = scoringRules.get('concedes_15_plus_goals') || 0;
-  }
-  
-  // Match played bonus (always awarded if player participated)
-  points_breakdown.match_played = scoringRules.get('match_played') || 0;
-
-  const total_points = Object.values(points_breakdown).reduce((sum, val) => sum + val, 0);
+  const { breakdown: points_breakdown, total: total_points } = scoreFantasyPlayer(
+    { goals_scored, goals_conceded, result, is_motm, fine_goals, substitution_penalty },
+    scoringRules
+  );
 
   // Award points to EACH team that owns this player
   for (const squad of squads) {
@@ -340,15 +303,7 @@ async function processPlayer(params: {
     const isViceCaptain = captainCheck.length > 0 && captainCheck[0].is_vice_captain;
 
     // Apply multiplier: Captain = 2x, Vice-Captain = 1.5x
-    let multiplier = 1;
-    let multiplierPercentage = 100; // Store as integer percentage for DB
-    if (isCaptain) {
-      multiplier = 2;
-      multiplierPercentage = 200;
-    } else if (isViceCaptain) {
-      multiplier = 1.5;
-      multiplierPercentage = 150;
-    }
+    const { multiplier, percentage: multiplierPercentage } = fantasyMultiplier(isCaptain, isViceCaptain);
 
     const final_points = Math.round(total_points * multiplier);
 
@@ -1,6 +1,12 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { getFantasyDb } from '@/lib/neon/fantasy-config';
 import { getTournamentDb } from '@/lib/neon/tournament-config';
+import {
+  evaluateTeamBonus,
+  supportedTeamName,
+  supportsRealTeam,
+  SupportedTeamChange
+} from '@/lib/fantasy/fixture-points';
 
 /**
  * POST /api/fantasy/calculate-team-bonuses
@@ -176,10 +182,7 @@ async function awardTeamBonus(params: {
     bonusesAwarded,
   } = params;
 
-  // TEAM CHANGE SUPPORT: Check if any teams changed their supported team after round 13
-  const TEAM_CHANGE_AFTER_ROUND = 13;
-
-  // Get team changes for this league
+  // TEAM CHANGE SUPPORT: Teams that changed their supported team after round 13
   const teamChanges = await fantasySql`
     SELECT 
       team_id,
@@ -191,14 +194,9 @@ async function awardTeamBonus(params: {
     WHERE league_id = ${fantasy_league_id}
   `;
 
-  const teamChangeMap = new Map();
+  const teamChangeMap = new Map<string, SupportedTeamChange>();
   teamChanges.forEach((change: any) => {
-    teamChangeMap.set(change.team_id, {
-      oldTeamId: change.old_supported_team_id,
-      oldTeamName: change.old_supported_team_name,
-      newTeamId: change.new_supported_team_id,
-      newTeamName: change.new_supported_team_name
-    });
+    teamChangeMap.set(change.team_id, change);
   });
 
   // Get ALL fantasy teams first
@@ -210,29 +208,9 @@ async function awardTeamBonus(params: {
   `;
 
   // Filter teams based on round number and team changes
-  // Match: SSPSLT0015 (fixture) against SSPSLT0015_SSPSLS16 (fantasy team)
-  const fantasyTeams = allFantasyTeams.filter((team: any) => {
-    const teamChange = teamChangeMap.get(team.team_id);
-
-    if (!teamChange) {
-      // Team never changed, use current supported team
-      return team.supported_team_id === real_team_id ||
-        team.supported_team_id.startsWith(`${real_team_id}_`);
-    }
-
-    // Team changed after round 13
-    if (round_number <= TEAM_CHANGE_AFTER_ROUND) {
-      // For rounds 1-13, use OLD supported team
-      return teamChange.oldTeamId === real_team_id ||
-        teamChange.oldTeamId.startsWith(`${real_team_id}_`);
-    } else {
-      // For rounds 14+, use NEW supported team
-      return teamChange.newTeamId === real_team_id ||
-        teamChange.newTeamId.startsWith(`${real_team_id}_`) ||
-        team.supported_team_id === real_team_id ||
-        team.supported_team_id.startsWith(`${real_team_id}_`);
-    }
-  });
+  const fantasyTeams = allFantasyTeams.filter((team: any) =>
+    supportsRealTeam(team.supported_team_id, teamChangeMap.get(team.team_id), real_team_id, round_number)
+  );
 
   if (fantasyTeams.length === 0) {
     console.log(`⏭️  No fantasy teams found for real team ${real_team_id}`);
@@ -240,97 +218,11 @@ async function awardTeamBonus(params: {
   }
 
   // Calculate bonuses based on configured rules
-  const won = goals_scored > goals_conceded;
-  const draw = goals_scored === goals_conceded;
-  const lost = goals_scored < goals_conceded;
-  const clean_sheet = goals_conceded === 0;
-  const goal_margin = Math.abs(goals_scored - goals_conceded);
-
-  const bonus_breakdown: any = {};
-  let total_bonus = 0;
-
-  // Apply ALL configured scoring rules dynamically
-  teamScoringRules.forEach((points, ruleType) => {
-    let applies = false;
-
-    // Check each rule type
-    switch (ruleType) {
-      // Result-based rules
-      case 'win':
-        applies = won;
-        break;
-      case 'draw':
-        applies = draw;
-        break;
-      case 'loss':
-        applies = lost;
-        break;
-
-      // Defense-based rules
-      case 'clean_sheet':
-        applies = clean_sheet;
-        break;
-      case 'concedes_4_plus_goals':
-        applies = goals_conceded >= 4;
-        break;
-      case 'concedes_6_plus_goals':
-        applies = goals_conceded >= 6;
-        break;
-      case 'concedes_8_plus_goals':
-        applies = goals_conceded >= 8;
-        break;
-      case 'concedes_10_plus_goals':
-        applies = goals_conceded >= 10;
-        break;
-      case 'concedes_15_plus_goals':
-        applies = goals_conceded >= 15;
-        break;
-
-      // Attack-based rules
-      case 'scored_4_plus_goals':
-      case 'high_scoring':
-        applies = goals_scored >= 4;
-        break;
-      case 'scored_6_plus_goals':
-        applies = goals_scored >= 6;
-        break;
-      case 'scored_8_plus_goals':
-        applies = goals_scored >= 8;
-        break;
-      case 'scored_10_plus_goals':
-        applies = goals_scored >= 10;
-        break;
-      case 'scored_15_plus_goals':
-        applies = goals_scored >= 15;
-        break;
-
-      // Margin-based rules
-      case 'big_win':
-        applies = won && goal_margin >= 3;
-        break;
-      case 'huge_win':
-        applies = won && goal_margin >= 5;
-        break;
-      case 'narrow_win':
-        applies = won && goal_margin === 1;
-        break;
-
-      // Combined rules
-      case 'shutout_win':
-        applies = won && clean_sheet;
-        break;
-
-      default:
-        // Unknown rule type - log warning but don't fail
-        console.log(`⚠️  Unknown team rule type: ${ruleType}`);
-        applies = false;
-    }
-
-    if (applies) {
-      bonus_breakdown[ruleType] = points;
-      total_bonus += points;
-    }
-  });
+  const { breakdown: bonus_breakdown, total: total_bonus } = evaluateTeamBonus(
+    teamScoringRules,
+    goals_scored,
+    goals_conceded
+  );
 
   // Log the result even if no bonus (or negative)
   if (total_bonus === 0) {
@@ -358,13 +250,11 @@ async function awardTeamBonus(params: {
     }
 
     // Determine which team name to use for the record
-    const teamChange = teamChangeMap.get(fantasyTeam.team_id);
-    let realTeamName = fantasyTeam.supported_team_name;
-
-    if (teamChange && round_number <= TEAM_CHANGE_AFTER_ROUND) {
-      // For rounds 1-13, use the OLD team name
-      realTeamName = teamChange.oldTeamName;
-    }
+    const realTeamName = supportedTeamName(
+      fantasyTeam.supported_team_name,
+      teamChangeMap.get(fantasyTeam.team_id),
+      round_number
+    );
 
     // Record bonus in fantasy_team_bonus_points
     await fantasySql`
@@ -1,7 +1,7 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { getTournamentDb } from '@/lib/neon/tournament-config';
 import { verifyAuth } from '@/lib/auth-helper';
-import { generateLineupId } from '@/lib/lineup-validation';
+import { evaluateLineup, generateLineupId, loadLineupRules, NO_LINEUP_RULES } from '@/lib/lineup-validation';
 
 /**
  * Allow committee admin to set lineup for teams that haven't submitted
@@ -92,16 +92,20 @@ export async function POST(
         const seasonId = fixture.season_id;
         const playerIds = players.map(p => p.player_id);
 
-        const teamPlayers = await sql`
-      SELECT player_id 
+        const [squadRows, rules] = await Promise.all([
+            sql`
+      SELECT player_id, category, status
       FROM player_seasons 
       WHERE team_id = ${teamId} 
         AND season_id = ${seasonId}
-        AND player_id = ANY(${playerIds})
-        AND status = 'active'
-    `;
-
-        if (teamPlayers.length !== players.length) {
+    `,
+            fixture.tournament_id
+                ? loadLineupRules([{ tournamentId: fixture.tournament_id, seasonId }])
+                : Promise.resolve(new Map())
+        ]);
+
+        const activePlayers = new Set(squadRows.filter((p: any) => p.status === 'active').map((p: any) => p.player_id));
+        if (new Set(playerIds).size !== playerIds.length || !playerIds.every(id => activePlayers.has(id))) {
             return NextResponse.json(
                 { success: false, error: 'All players must belong to the team' },
                 { status: 400 }
@@ -119,6 +123,13 @@ export async function POST(
             .sort((a, b) => a.position - b.position)
             .map(p => p.player_id);
 
+        // Record rule violations (e.g. category minimums) without blocking the admin
+        const validation = evaluateLineup(
+            { starting_xi: startingXI, substitutes },
+            new Map(squadRows.map((p: any) => [p.player_id, p.category ?? null])),
+            rules.get(fixture.tournament_id) || NO_LINEUP_RULES
+        );
+
         // Generate lineup ID
         const lineupId = generateLineupId(fixtureId, teamId);
 
@@ -149,9 +160,9 @@ export async function POST(
         ${fixture.tournament_id},
         ${JSON.stringify(startingXI)},
         ${JSON.stringify(substitutes)},
-        ${startingXI.length},
-        true,
-        ${JSON.stringify([])},
+        ${validation.classicPlayerCount},
+        ${validation.isValid},
+        ${JSON.stringify(validation.errors)},
         ${userId},
         NOW(),
         NOW(),
@@ -193,6 +204,7 @@ export async function POST(
             success: true,
             message: 'Lineup set successfully',
             lineup_id: lineupId,
+            validation_errors: validation.errors,
         });
     } catch (error: any) {
         console.error('Error setting lineup:', error);
@@ -1,5 +1,5 @@
 import { NextRequest, NextResponse } from 'next/server';
-import { adminDb as db } from '@/lib/firebase/admin';
+import { processLineupDeadlines } from '@/lib/lineup-deadline-processor';
 
 /**
  * Process lineup locks for fixtures past their deadline
@@ -8,24 +8,15 @@ import { adminDb as db } from '@/lib/firebase/admin';
  */
 export async function POST(request: NextRequest) {
   try {
-    const now = new Date();
-    const body = await request.json();
+    const body = await request.json().catch(() => ({}));
     const { season_id, round_number } = body;
 
-    // Get fixtures with passed deadlines
-    let fixturesQuery = db.collection('fixtures')
-      .where('lineup_deadline', '<=', now.toISOString());
-
-    if (season_id) {
-      fixturesQuery = fixturesQuery.where('season_id', '==', season_id);
-    }
-    if (round_number) {
-      fixturesQuery = fixturesQuery.where('round_number', '==', parseInt(round_number));
-    }
-
-    const fixturesSnapshot = await fixturesQuery.get();
+    const report = await processLineupDeadlines({
+      seasonId: season_id || undefined,
+      roundNumber: round_number ? parseInt(round_number) : undefined
+    });
 
-    if (fixturesSnapshot.empty) {
+    if (report.fixtures.length === 0) {
       return NextResponse.json({
         success: true,
         message: 'No fixtures with passed deadlines',
@@ -33,139 +24,17 @@ export async function POST(request: NextRequest) {
       });
     }
 
-    let processedCount = 0;
-    const results: any[] = [];
-
-    for (const fixtureDoc of fixturesSnapshot.docs) {
-      const fixture = fixtureDoc.data();
-      const { id: fixture_id, home_team_id, away_team_id, season_id: fixtureSeason } = { id: fixtureDoc.id, ...fixture };
-
-      try {
-        // Lock home team lineup if exists and not already locked
-        const homeLineupId = `lineup_${fixture_id}_${home_team_id}`;
-        const homeLineupRef = db.collection('lineups').doc(homeLineupId);
-        const homeLineupDoc = await homeLineupRef.get();
-
-        if (homeLineupDoc.exists) {
-          const homeLineup = homeLineupDoc.data();
-          if (!homeLineup?.is_locked) {
-            await homeLineupRef.update({
-              is_locked: true,
-              locked_at: now.toISOString(),
-              locked_by: 'system',
-              locked_by_name: 'Auto-lock (Deadline)',
-              updated_at: now.toISOString()
-            });
-            results.push({ team_id: home_team_id, status: 'locked' });
-            processedCount++;
-          }
-        } else {
-          // Check if team has exactly 5 players - auto-create lineup with all players
-          const rosterResponse = await fetch(`${process.env.NEXT_PUBLIC_BASE_URL || 'http://localhost:3000'}/api/team/${home_team_id}/roster?season_id=${fixtureSeason}`);
-          const rosterData = await rosterResponse.json();
-          
-          let starters: string[] = [];
-          let subs: string[] = [];
-          
-          if (rosterData.success && rosterData.players) {
-            const activePlayers = rosterData.players.filter((p: any) => p.is_active);
-            if (activePlayers.length === 5) {
-              // Team has exactly 5 players - auto-select all as starters
-              starters = activePlayers.map((p: any) => p.player_id);
-              console.log(`✅ Auto-created lineup for home team ${home_team_id} with 5 players`);
-            }
-          }
-          
-          // No lineup submitted - create locked lineup (empty if not 5 players, auto-filled if exactly 5)
-          await homeLineupRef.set({
-            fixture_id,
-            team_id: home_team_id,
-            season_id: fixtureSeason || '',
-            starters,
-            substitutes: subs,
-            is_locked: true,
-            locked_at: now.toISOString(),
-            locked_by: 'system',
-            locked_by_name: starters.length === 5 ? 'Auto-lock (5 Players)' : 'Auto-lock (Deadline - No Submission)',
-            created_at: now.toISOString(),
-            updated_at: now.toISOString(),
-            submitted_by: null,
-            submitted_by_name: null
-          });
-          results.push({ team_id: home_team_id, status: starters.length === 5 ? 'locked_auto_5' : 'locked_empty' });
-          processedCount++;
-        }
-
-        // Lock away team lineup if exists and not already locked
-        const awayLineupId = `lineup_${fixture_id}_${away_team_id}`;
-        const awayLineupRef = db.collection('lineups').doc(awayLineupId);
-        const awayLineupDoc = await awayLineupRef.get();
-
-        if (awayLineupDoc.exists) {
-          const awayLineup = awayLineupDoc.data();
-          if (!awayLineup?.is_locked) {
-            await awayLineupRef.update({
-              is_locked: true,
-              locked_at: now.toISOString(),
-              locked_by: 'system',
-              locked_by_name: 'Auto-lock (Deadline)',
-              updated_at: now.toISOString()
-            });
-            results.push({ team_id: away_team_id, status: 'locked' });
-            processedCount++;
-          }
-        } else {
-          // Check if team has exactly 5 players - auto-create lineup with all players
-          const rosterResponse = await fetch(`${process.env.NEXT_PUBLIC_BASE_URL || 'http://localhost:3000'}/api/team/${away_team_id}/roster?season_id=${fixtureSeason}`);
-          const rosterData = await rosterResponse.json();
-          
-          let starters: string[] = [];
-          let subs: string[] = [];
-          
-          if (rosterData.success && rosterData.players) {
-            const activePlayers = rosterData.players.filter((p: any) => p.is_active);
-            if (activePlayers.length === 5) {
-              // Team has exactly 5 players - auto-select all as starters
-              starters = activePlayers.map((p: any) => p.player_id);
-              console.log(`✅ Auto-created lineup for away team ${away_team_id} with 5 players`);
-            }
-          }
-          
-          // No lineup submitted - create locked lineup (empty if not 5 players, auto-filled if exactly 5)
-          await awayLineupRef.set({
-            fixture_id,
-            team_id: away_team_id,
-            season_id: fixtureSeason || '',
-            starters,
-            substitutes: subs,
-            is_locked: true,
-            locked_at: now.toISOString(),
-            locked_by: 'system',
-            locked_by_name: starters.length === 5 ? 'Auto-lock (5 Players)' : 'Auto-lock (Deadline - No Submission)',
-            created_at: now.toISOString(),
-            updated_at: now.toISOString(),
-            submitted_by: null,
-            submitted_by_name: null
-          });
-          results.push({ team_id: away_team_id, status: starters.length === 5 ? 'locked_auto_5' : 'locked_empty' });
-          processedCount++;
-        }
-
-      } catch (err: any) {
-        console.error(`Error processing lock for fixture ${fixture_id}:`, err);
-        results.push({ 
-          fixture_id, 
-          status: 'error', 
-          error: err.message 
-        });
-      }
-    }
+    // Lineups locked or auto-filled (warnings leave the lineup open)
+    const processedCount = report.fixtures
+      .flatMap(f => [f.home.action, f.away.action])
+      .filter(action => action !== 'none' && action !== 'warn').length;
 
     return NextResponse.json({
       success: true,
       message: `Processed ${processedCount} lineup locks`,
       processed: processedCount,
-      results
+      warnings_issued: report.warningsIssued,
+      results: report.fixtures
     });
   } catch (error: any) {
     console.error('Error processing lineup locks:', error);
@@ -1,19 +1,7 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { getTournamentDb } from '@/lib/neon/tournament-config';
-import { getMinimumAuctionValue, calculateRealPlayerSalary } from '@/lib/contracts';
-import { adminDb } from '@/lib/firebase/admin';
-
-// Base points by star rating (same as update-points API)
-const STAR_RATING_BASE_POINTS: { [key: number]: number } = {
-  3: 100,
-  4: 120,
-  5: 145,
-  6: 175,
-  7: 210,
-  8: 250,
-  9: 300,
-  10: 375,
-};
+import { priceRealPlayers } from '@/lib/contracts';
+import { getSeasonStarRatingTable } from '@/lib/star-rating-config';
 
 export async function POST(request: NextRequest) {
   try {
@@ -34,40 +22,18 @@ export async function POST(request: NextRequest) {
     const sql = getTournamentDb();
     let updatedCount = 0;
     
-    // Fetch star rating configuration from Firebase
-    const seasonDoc = await adminDb.collection('seasons').doc(seasonId).get();
-    const seasonData = seasonDoc.exists ? seasonDoc.data() : null;
-    const starRatingConfigArray = seasonData?.star_rating_config || [];
-    
-    // Create a map for quick lookup
-    const configMap = new Map<number, { auctionValue: number; points: number }>();
-    if (Array.isArray(starRatingConfigArray)) {
-      starRatingConfigArray.forEach((config: any) => {
-        configMap.set(config.star_rating, {
-          auctionValue: config.base_auction_value || getMinimumAuctionValue(config.star_rating),
-          points: config.starting_points || STAR_RATING_BASE_POINTS[config.star_rating] || 100,
-        });
-      });
-    }
-    
-    console.log(`Loaded star rating config from Firebase for ${starRatingConfigArray.length} star ratings`);
-    if (starRatingConfigArray.length === 0) {
-      console.warn('No star rating config found in Firebase, will use fallback values');
-    }
+    // Star rating config for the season (loaded once, cached)
+    const starRatingTable = await getSeasonStarRatingTable(seasonId);
+    const validPlayers = players.filter((player: any) => player.id && player.starRating);
+    const prices = priceRealPlayers(
+      starRatingTable,
+      validPlayers.map((player: any) => ({ starRating: player.starRating }))
+    );
 
     // Update players in Neon
-    for (const player of players) {
-      const { id, starRating, categoryId, categoryName } = player;
-      
-      if (!id || !starRating) continue;
-
-      // Get config from database or use fallback
-      const config = configMap.get(starRating);
-      const points = config?.points || STAR_RATING_BASE_POINTS[starRating] || 100;
-      const auctionValue = config?.auctionValue || getMinimumAuctionValue(starRating);
-      
-      // Calculate salary based on auction value and star rating
-      const salaryPerMatch = calculateRealPlayerSalary(auctionValue, starRating);
+    for (const [index, player] of validPlayers.entries()) {
+      const { id, starRating, categoryName } = player;
+      const { points, auctionValue, salaryPerMatch } = prices[index];
       
       console.log(`Player ${id}: ${starRating}★ → Auction: $${auctionValue}, Points: ${points}, Salary: $${salaryPerMatch.toFixed(2)}/match`);
 
@@ -20,40 +20,33 @@ export async function POST(request: NextRequest) {
     const sql = getTournamentDb();
     let updatedCount = 0;
 
-    // Update only categories in Neon (not star ratings or points)
-    for (const player of players) {
-      const { id, categoryId, categoryName } = player;
-      
-      if (!id) continue;
+    // Update only categories in Neon (not star ratings or points), one statement
+    // Composite ID: player_id_season_id
+    const rows = players.filter((player: any) => player.id);
+    const ids = rows.map((player: any) => `${player.id}_${seasonId}`);
+    const categories = rows.map((player: any) => player.categoryName || null);
 
-      if (isModernSeason(seasonId)) {
+    if (rows.length > 0) {
+      const result = isModernSeason(seasonId)
         // For Season 16+: Update player_seasons table
-        // Use composite ID: player_id_season_id
-        const compositeId = `${id}_${seasonId}`;
-        
-        const result = await sql`
-          UPDATE player_seasons
-          SET category = ${categoryName || null},
-              updated_at = NOW()
-          WHERE id = ${compositeId}
-          RETURNING id
-        `;
-        
-        if (result.length > 0) updatedCount++;
-      } else {
+        ? await sql`
+            UPDATE player_seasons ps
+            SET category = c.category,
+                updated_at = NOW()
+            FROM UNNEST(${ids}::text[], ${categories}::text[]) AS c(id, category)
+            WHERE ps.id = c.id
+            RETURNING ps.id
+          `
         // For historical seasons: Update realplayerstats table
-        const compositeId = `${id}_${seasonId}`;
-        
-        const result = await sql`
-          UPDATE realplayerstats
-          SET category = ${categoryName || null},
-              updated_at = NOW()
-          WHERE id = ${compositeId}
-          RETURNING id
-        `;
-        
-        if (result.length > 0) updatedCount++;
-      }
+        : await sql`
+            UPDATE realplayerstats rs
+            SET category = c.category,
+                updated_at = NOW()
+            FROM UNNEST(${ids}::text[], ${categories}::text[]) AS c(id, category)
+            WHERE rs.id = c.id
+            RETURNING rs.id
+          `;
+      updatedCount = result.length;
     }
 
     return NextResponse.json({
@@ -0,0 +1,39 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { searchPlayersRanked } from '@/lib/neon/player-search';
+
+/**
+ * GET /api/players/database/search?q=term&limit=20&cursor=...
+ * Ranked football player search for as-you-type pickers
+ *
+ * Digit-only terms match player_id prefixes; anything else is a
+ * trigram-ranked name search. Use `nextCursor` to fetch the next page.
+ */
+export async function GET(request: NextRequest) {
+  try {
+    const { searchParams } = new URL(request.url);
+    const q = searchParams.get('q') || '';
+    const limit = parseInt(searchParams.get('limit') || '20');
+    const cursor = searchParams.get('cursor');
+
+    if (q.trim().length < 2) {
+      return NextResponse.json({ success: true, data: [], nextCursor: null });
+    }
+
+    const { players, nextCursor } = await searchPlayersRanked(q, { limit, cursor });
+
+    return NextResponse.json(
+      { success: true, data: players, count: players.length, nextCursor },
+      {
+        headers: {
+          'Cache-Control': 'public, s-maxage=30, stale-while-revalidate=60',
+        },
+      }
+    );
+  } catch (error: any) {
+    console.error('Error searching football players:', error);
+    return NextResponse.json(
+      { success: false, error: error.message || 'Failed to search players' },
+      { status: 500 }
+    );
+  }
+}
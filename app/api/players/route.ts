@@ -1,5 +1,5 @@
 import { NextRequest, NextResponse } from 'next/server';
-import { getAllPlayers, getTotalPlayerCountWithFilters } from '@/lib/neon/players';
+import { getPlayersPage, getTotalPlayerCountWithFilters } from '@/lib/neon/players';
 
 export const maxDuration = 30;
 
@@ -19,6 +19,9 @@ export async function GET(request: NextRequest) {
       search: searchParams.get('search') || undefined,
       limit: searchParams.get('limit') ? parseInt(searchParams.get('limit')!) : 1000, // Default limit
       offset: searchParams.get('offset') ? parseInt(searchParams.get('offset')!) : 0,
+      // Keyset paging: pass pagination.nextCursor back as ?cursor= (preferred over offset)
+      cursor: searchParams.get('cursor') || undefined,
+      view: searchParams.get('view') === 'list' ? 'list' as const : 'full' as const,
     };
 
     console.log('[Players API] Fetching with filters:', filters);
@@ -33,10 +36,10 @@ export async function GET(request: NextRequest) {
       search: filters.search
     };
 
-    // Fetch both players and total count
-    const [players, totalCount] = await Promise.all([
-      getAllPlayers(filters),
-      getTotalPlayerCountWithFilters(countFilters)
+    // Fetch both players and total count (cursor pages reuse the count from the first page)
+    const [{ players, nextCursor }, totalCount] = await Promise.all([
+      getPlayersPage(filters),
+      filters.cursor ? Promise.resolve(null) : getTotalPlayerCountWithFilters(countFilters)
     ]);
 
     return NextResponse.json({
@@ -47,8 +50,9 @@ export async function GET(request: NextRequest) {
       pagination: {
         limit: filters.limit || 1000,
         offset: filters.offset || 0,
-        hasMore: players.length === (filters.limit || 1000), // If we got full page, assume more
-        nextOffset: (filters.offset || 0) + players.length
+        hasMore: nextCursor !== null,
+        nextOffset: (filters.offset || 0) + players.length,
+        nextCursor
       }
     });
   } catch (error: any) {
@@ -0,0 +1,149 @@
+import { NextRequest, NextResponse } from 'next/server';
+import {
+  executeTransferWindowBatch,
+  TransferWindowMove,
+  MAX_BATCH_MOVES
+} from '@/lib/player-transfers-batch';
+
+/**
+ * POST /api/players/transfer-batch
+ * Execute a transfer window's transfers and swaps as one batch
+ *
+ * Moves are ordered by priority, then requested_at, then player IDs, and
+ * validated together against one snapshot of budgets and transfer limits.
+ * Rejected moves are reported per move; accepted moves are applied together.
+ *
+ * Body:
+ * {
+ *   season_id: string,
+ *   processed_by: string,
+ *   processed_by_name: string,
+ *   transfers?: [{ player_id, player_type, new_team_id, priority?, requested_at? }],
+ *   swaps?: [{ player_a_id, player_a_type, player_b_id, player_b_type,
+ *              cash_amount?, cash_direction?, priority?, requested_at? }]
+ * }
+ */
+export async function POST(request: NextRequest) {
+  try {
+    const body = await request.json();
+    const {
+      season_id,
+      processed_by,
+      processed_by_name,
+      transfers = [],
+      swaps = []
+    } = body;
+
+    // Validate required fields
+    if (!season_id || !processed_by || !processed_by_name) {
+      return NextResponse.json(
+        {
+          success: false,
+          error: 'Missing required fields: season_id, processed_by, processed_by_name',
+          errorCode: 'MISSING_FIELDS'
+        },
+        { status: 400 }
+      );
+    }
+
+    if (!Array.isArray(transfers) || !Array.isArray(swaps) || transfers.length + swaps.length === 0) {
+      return NextResponse.json(
+        {
+          success: false,
+          error: 'Provide at least one entry in transfers or swaps',
+          errorCode: 'NO_MOVES'
+        },
+        { status: 400 }
+      );
+    }
+
+    if (transfers.length + swaps.length > MAX_BATCH_MOVES) {
+      return NextResponse.json(
+        {
+          success: false,
+          error: `A batch may contain at most ${MAX_BATCH_MOVES} moves`,
+          errorCode: 'BATCH_TOO_LARGE'
+        },
+        { status: 400 }
+      );
+    }
+
+    const isPlayerType = (type: unknown) => type === 'real' || type === 'football';
+    const moves: TransferWindowMove[] = [];
+
+    for (const t of transfers) {
+      const playerType = t.player_type || 'real';
+      if (!t.player_id || !t.new_team_id || !isPlayerType(playerType)) {
+        return NextResponse.json(
+          {
+            success: false,
+            error: 'Each transfer needs player_id, new_team_id and player_type "real" or "football"',
+            errorCode: 'INVALID_TRANSFER'
+          },
+          { status: 400 }
+        );
+      }
+      moves.push({
+        kind: 'transfer',
+        playerId: t.player_id,
+        playerType,
+        newTeamId: t.new_team_id,
+        priority: t.priority,
+        requestedAt: t.requested_at
+      });
+    }
+
+    for (const s of swaps) {
+      const playerAType = s.player_a_type || 'real';
+      const playerBType = s.player_b_type || 'real';
+      const cashDirection = s.cash_direction || 'none';
+      const cashAmount = Number(s.cash_amount || 0);
+      if (
+        !s.player_a_id || !s.player_b_id || s.player_a_id === s.player_b_id ||
+        !isPlayerType(playerAType) || !isPlayerType(playerBType) ||
+        !['A_to_B', 'B_to_A', 'none'].includes(cashDirection) ||
+        !(cashAmount >= 0)
+      ) {
+        return NextResponse.json(
+          {
+            success: false,
+            error: 'Each swap needs two different players, valid player types, cash_direction and a non-negative cash_amount',
+            errorCode: 'INVALID_SWAP'
+          },
+          { status: 400 }
+        );
+      }
+      moves.push({
+        kind: 'swap',
+        playerAId: s.player_a_id,
+        playerAType,
+        playerBId: s.player_b_id,
+        playerBType,
+        cashAmount,
+        cashDirection,
+        priority: s.priority,
+        requestedAt: s.requested_at
+      });
+    }
+
+    const result = await executeTransferWindowBatch({
+      seasonId: season_id,
+      moves,
+      processedBy: processed_by,
+      processedByName: processed_by_name
+    });
+
+    return NextResponse.json(result, { status: result.success ? 200 : 500 });
+
+  } catch (error: any) {
+    console.error('Error in transfer-batch API:', error);
+    return NextResponse.json(
+      {
+        success: false,
+        error: error.message || 'Failed to process transfer batch',
+        errorCode: 'SYSTEM_ERROR'
+      },
+      { status: 500 }
+    );
+  }
+}
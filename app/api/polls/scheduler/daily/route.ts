@@ -37,13 +37,14 @@ export async function POST(request: NextRequest) {
     });
 
     // Run daily poll triggers
-    await runDailyPollTriggers(season_id, targetDate);
+    const results = await runDailyPollTriggers(season_id, targetDate);
 
     return NextResponse.json({
       success: true,
       message: 'Daily polls created successfully',
       season_id,
       date: targetDate.toISOString().split('T')[0],
+      polls: results,
     });
   } catch (error: any) {
     console.error('Error running daily poll scheduler:', error);
@@ -1,8 +1,5 @@
 import { NextRequest, NextResponse } from 'next/server';
-import { 
-  triggerSeasonChampionPoll, 
-  triggerSeasonMVPPoll 
-} from '@/lib/polls/auto-trigger';
+import { runPollScheduler, type ScheduledPollType } from '@/lib/polls/poll-scheduler';
 
 /**
  * POST /api/polls/scheduler/season
@@ -46,25 +43,17 @@ export async function POST(request: NextRequest) {
       poll_type,
     });
 
-    const results: { type: string; poll_id: string | null }[] = [];
+    // Both rules are evaluated against one season snapshot
+    const pollTypes: ScheduledPollType[] = [];
+    if (poll_type === 'champion' || poll_type === 'both') pollTypes.push('season_champion');
+    if (poll_type === 'mvp' || poll_type === 'both') pollTypes.push('season_mvp');
 
-    // Create champion poll
-    if (poll_type === 'champion' || poll_type === 'both') {
-      const championPollId = await triggerSeasonChampionPoll(season_id);
-      results.push({
-        type: 'champion',
-        poll_id: championPollId,
-      });
-    }
-
-    // Create MVP poll
-    if (poll_type === 'mvp' || poll_type === 'both') {
-      const mvpPollId = await triggerSeasonMVPPoll(season_id);
-      results.push({
-        type: 'mvp',
-        poll_id: mvpPollId,
-      });
-    }
+    const runResults = await runPollScheduler(season_id, { pollTypes });
+    const results = runResults.map(result => ({
+      type: result.poll_type === 'season_champion' ? 'champion' : 'mvp',
+      poll_id: result.poll_id ?? null,
+      status: result.status,
+    }));
 
     return NextResponse.json({
       success: true,
@@ -44,13 +44,14 @@ export async function POST(request: NextRequest) {
     });
 
     // Run weekly poll triggers
-    await runWeeklyPollTriggers(season_id, week_number);
+    const results = await runWeeklyPollTriggers(season_id, week_number);
 
     return NextResponse.json({
       success: true,
       message: 'Weekly polls created successfully',
       season_id,
       week_number,
+      polls: results,
     });
   } catch (error: any) {
     console.error('Error running weekly poll scheduler:', error);
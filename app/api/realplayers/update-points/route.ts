@@ -4,7 +4,7 @@ import { doc, getDoc, updateDoc, collection, query, where, getDocs } from 'fireb
 import { calculateRealPlayerSalary } from '@/lib/contracts';
 import { getTournamentDb } from '@/lib/neon/tournament-config';
 import { adminDb } from '@/lib/firebase/admin';
-import { logSalaryPayment } from '@/lib/transaction-logger';
+import { commitSalaryDeductions } from '@/lib/salary-engine';
 
 // Base points by star rating
 const STAR_RATING_BASE_POINTS: { [key: number]: number } = {
@@ -409,73 +409,38 @@ export async function POST(request: NextRequest) {
     }
 
     if (!shouldSkipSalary && playerSalaries.length > 0) {
-      // Process each player's salary individually
-      for (const playerSalary of playerSalaries) {
-        try {
-          const { player_id, player_name, team_id, salary } = playerSalary;
-
-          console.log(`\n👤 Processing: ${player_name} (${team_id})`);
-          console.log(`   💵 Salary: $${salary.toFixed(2)}`);
-
-          const teamSeasonDocId = `${team_id}_${season_id}`;
-          const teamSeasonRef = adminDb.collection('team_seasons').doc(teamSeasonDocId);
-          const teamSeasonDoc = await teamSeasonRef.get();
-
-          if (!teamSeasonDoc.exists) {
-            console.log(`   ❌ ERROR: Team season document not found!`);
-            salaryErrors.push({
-              player_id,
-              player_name,
-              team_id,
-              error: 'Team season document not found'
-            });
-            continue;
-          }
-
-          const teamSeasonData = teamSeasonDoc.data();
-          const currentBalance = teamSeasonData?.real_player_budget || 0;
-          const currentSpent = teamSeasonData?.real_player_spent || 0;
-          const newBalance = currentBalance - salary;
-          const newSpent = currentSpent + salary;
-
-          // Update balance and spent (allow negative balance)
-          await teamSeasonRef.update({
-            real_player_budget: newBalance,
-            real_player_spent: newSpent,
-            updated_at: new Date()
-          });
-
-          console.log(`   ✓ Balance: $${currentBalance.toFixed(2)} → $${newBalance.toFixed(2)}`);
-          console.log(`   ✓ Spent: $${currentSpent.toFixed(2)} → $${newSpent.toFixed(2)}`);
-
-          // Log individual salary payment transaction
-          await logSalaryPayment(
-            team_id,
-            season_id,
-            salary,
-            currentBalance,
-            'real_player',
-            fixture_id,
-            undefined, // match number
-            1, // one player per transaction
-            player_name, // player name for description
-            player_id // player ID for metadata
-          );
-
-          console.log(`   ✓ Transaction logged`);
+      // One balance read and one budget batch for every team, one log per player
+      try {
+        const plan = await commitSalaryDeductions(season_id, {
+          fixtureIds: playerSalaries.map(() => fixture_id),
+          playerIds: playerSalaries.map(p => p.player_id),
+          playerNames: playerSalaries.map(p => p.player_name),
+          teamIds: playerSalaries.map(p => p.team_id),
+          salaries: playerSalaries.map(p => p.salary)
+        });
 
+        for (const charge of plan.charges) {
           salaryDeductions.push({
-            player_id,
-            player_name,
-            team_id,
-            salary,
-            balanceBefore: currentBalance,
-            balanceAfter: newBalance
+            player_id: charge.player_id,
+            player_name: charge.player_name,
+            team_id: charge.team_id,
+            salary: charge.salary,
+            balanceBefore: charge.balance_before,
+            balanceAfter: charge.balance_after
           });
-
-          console.log(`   ✅ SUCCESS`);
-        } catch (error) {
-          console.error(`   ❌ FAILED:`, error);
+        }
+        for (const skipped of plan.skipped) {
+          const playerSalary = playerSalaries.find(p => p.player_id === skipped.player_id);
+          salaryErrors.push({
+            player_id: skipped.player_id,
+            player_name: skipped.player_name,
+            team_id: playerSalary?.team_id,
+            error: skipped.error
+          });
+        }
+      } catch (error) {
+        console.error(`   ❌ FAILED:`, error);
+        for (const playerSalary of playerSalaries) {
           salaryErrors.push({
             player_id: playerSalary.player_id,
             player_name: playerSalary.player_name,
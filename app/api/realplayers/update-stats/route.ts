@@ -1,5 +1,6 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { getTournamentDb } from '@/lib/neon/tournament-config';
+import { refreshLeagueRecordsAfterChange } from '@/lib/neon/league-records';
 
 interface MatchupResult {
   position: number;
@@ -109,6 +110,10 @@ export async function POST(request: NextRequest) {
       });
     }
 
+    if (updates.length > 0) {
+      await refreshLeagueRecordsAfterChange({ playerIds: updates.map(u => u.player_id) });
+    }
+
     return NextResponse.json({
       success: true,
       message: 'Player stats updated successfully',
@@ -4,6 +4,7 @@ import admin from 'firebase-admin';
 import { v4 as uuidv4 } from 'uuid';
 import { FieldValue } from 'firebase-admin/firestore';
 import { getTournamentDb } from '@/lib/neon/tournament-config';
+import { refreshLeagueRecordsAfterChange } from '@/lib/neon/league-records';
 import * as XLSX from 'xlsx';
 
 interface ImportStats {
@@ -665,6 +666,9 @@ export async function POST(
       console.log(`   ⚠️ ${stats.awards.errors.length} award errors`);
     }
 
+    // Historical rows changed wholesale - rebuild records and hall of fame
+    await refreshLeagueRecordsAfterChange();
+
     return NextResponse.json({
       success: true,
       message: 'Import completed successfully',
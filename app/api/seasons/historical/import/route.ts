@@ -4,6 +4,7 @@ import admin from 'firebase-admin';
 import { v4 as uuidv4 } from 'uuid';
 import { FieldValue } from 'firebase-admin/firestore';
 import { getTournamentDb } from '@/lib/neon/tournament-config';
+import { refreshLeagueRecordsAfterChange } from '@/lib/neon/league-records';
 
 // Types for the import data
 interface ImportTeamData {
@@ -1839,6 +1840,9 @@ async function processImport(importId: string, importData: ImportSeasonData) {
       await importPlayers(seasonId, importData.players, importData.teams, teamMap, importId, batchLookup);
     }
 
+    // Historical rows changed wholesale - rebuild records and hall of fame
+    await refreshLeagueRecordsAfterChange();
+
     // Step 6: Complete
     await updateProgress(importId, {
       status: 'completed',
@@ -1,22 +1,5 @@
 import { NextRequest, NextResponse } from 'next/server';
-import { adminDb } from '@/lib/firebase/admin';
-
-interface StarRatingConfig {
-  star_rating: number;
-  starting_points: number;
-  base_auction_value: number;
-}
-
-const DEFAULT_CONFIG: StarRatingConfig[] = [
-  { star_rating: 3, starting_points: 100, base_auction_value: 100 },
-  { star_rating: 4, starting_points: 120, base_auction_value: 120 },
-  { star_rating: 5, starting_points: 145, base_auction_value: 150 },
-  { star_rating: 6, starting_points: 175, base_auction_value: 180 },
-  { star_rating: 7, starting_points: 210, base_auction_value: 220 },
-  { star_rating: 8, starting_points: 250, base_auction_value: 270 },
-  { star_rating: 9, starting_points: 300, base_auction_value: 330 },
-  { star_rating: 10, starting_points: 350, base_auction_value: 400 },
-];
+import { readStarRatingConfig, saveStarRatingConfig } from '@/lib/star-rating-config';
 
 /**
  * GET /api/star-rating-config?seasonId=SSPSLS16
@@ -34,18 +17,15 @@ export async function GET(request: NextRequest) {
       );
     }
 
-    const seasonDoc = await adminDb.collection('seasons').doc(seasonId).get();
-    
-    if (!seasonDoc.exists) {
+    const config = await readStarRatingConfig(seasonId);
+
+    if (!config) {
       return NextResponse.json(
         { success: false, error: 'Season not found' },
         { status: 404 }
       );
     }
 
-    const seasonData = seasonDoc.data();
-    const config = seasonData?.star_rating_config || DEFAULT_CONFIG;
-
     return NextResponse.json({
       success: true,
       data: config,
@@ -101,11 +81,8 @@ export async function POST(request: NextRequest) {
       }
     }
 
-    // Update season document
-    await adminDb.collection('seasons').doc(seasonId).update({
-      star_rating_config: config,
-      updated_at: new Date(),
-    });
+    // Update season document (drops the cached config for this season)
+    await saveStarRatingConfig(seasonId, config);
 
     return NextResponse.json({
       success: true,
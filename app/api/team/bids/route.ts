@@ -5,7 +5,7 @@ import { encryptBidData } from '@/lib/encryption';
 import { broadcastRoundUpdate } from '@/lib/realtime/broadcast';
 import { generateBidId, generateTeamId } from '@/lib/id-generator';
 import { adminDb } from '@/lib/firebase/admin';
-import { calculateReserve } from '@/lib/reserve-calculator';
+import { getReserveSnapshot, validateBidAmount } from '@/lib/reserve-calculator';
 
 const sql = neon(process.env.DATABASE_URL || process.env.NEON_DATABASE_URL!);
 
@@ -120,37 +120,19 @@ export async function POST(request: NextRequest) {
       );
     }
 
-    // Check reserve requirement
+    // Check reserve requirement against the team's in-memory reserve snapshot
     try {
-      const reserve = await calculateReserve(teamId!, round.id, round.season_id);
-      
-      // Phase 2: Check floor reserve (Phase 3 minimum)
-      if (reserve.phase === 'phase_2' && reserve.minimumReserve > 0) {
-        const availableForBid = teamBalance - reserve.minimumReserve;
-        if (amount > availableForBid) {
-          return NextResponse.json(
-            { 
-              success: false, 
-              error: `Bid exceeds available balance. You must maintain £${reserve.minimumReserve} for Phase 3 slots (${reserve.explanation}). Maximum bid: £${Math.max(0, availableForBid)}` 
-            },
-            { status: 400 }
-          );
-        }
-      }
-      
-      // Phase 1: Strict reserve enforcement
-      if (reserve.requiresReserve) {
-        const availableForBid = teamBalance - reserve.minimumReserve;
-        
-        if (amount > availableForBid) {
-          return NextResponse.json(
-            { 
-              success: false, 
-              error: `Bid exceeds reserve. You must maintain £${reserve.minimumReserve} for future rounds (${reserve.explanation}). Maximum safe bid: £${Math.max(0, availableForBid)}` 
-            },
-            { status: 400 }
-          );
-        }
+      const reserve = await getReserveSnapshot(teamId!, round.id, round.season_id, {
+        balance: teamBalance,
+        squadSize: teamSeasonData?.players_count || 0
+      });
+      const reserveCheck = validateBidAmount(amount, teamBalance, reserve.info);
+
+      if (!reserveCheck.valid) {
+        return NextResponse.json(
+          { success: false, error: reserveCheck.error },
+          { status: 400 }
+        );
       }
     } catch (reserveError) {
       console.error('Reserve calculation error:', reserveError);
@@ -159,15 +159,17 @@ export async function POST(
     const seasonId = tiebreaker.season_id;
 
     const balanceData = await sql`
-      SELECT football_budget
+      SELECT football_budget, football_players_count
       FROM teams
       WHERE id = ${teamId}
       AND season_id = ${seasonId}
     `;
     
     let balance = 1000;
+    let squadSize: number | undefined;
     if (balanceData.length > 0) {
       balance = parseInt(balanceData[0].football_budget) || 1000;
+      squadSize = parseInt(balanceData[0].football_players_count) || 0;
     }
 
     if (bid_amount > balance) {
@@ -182,7 +184,7 @@ export async function POST(
 
     // VALIDATION 7: Check phase-based reserve requirement
     try {
-      const reserveCheck = await calculateReserve(teamId, tiebreaker.bulk_round_id, seasonId);
+      const reserveCheck = await calculateReserve(teamId, tiebreaker.bulk_round_id, seasonId, { balance, squadSize });
       
       if (reserveCheck.requiresReserve) {
         const maxAllowedBid = balance - reserveCheck.minimumReserve;
@@ -4,6 +4,7 @@ import { getTournamentDb } from '@/lib/neon/tournament-config';
 import { adminDb } from '@/lib/firebase/admin';
 import { verifyAuth } from '@/lib/auth-helper';
 import { formatId, ID_PREFIXES, ID_PADDING } from '@/lib/id-utils';
+import { renameTeam } from '@/lib/team-name-resolver';
 
 const sql = neon(process.env.DATABASE_URL || process.env.NEON_DATABASE_URL!);
 
@@ -46,7 +47,7 @@ export async function POST(request: NextRequest) {
 
     // Update team name in Neon teams table (logo is stored in Firebase only)
     if (teamName) {
-      await sql`UPDATE teams SET name = ${teamName}, updated_at = NOW() WHERE id = ${teamId}`;
+      await renameTeam(teamId, teamName, seasonId, sql);
     }
 
     // Update Firebase users collection (for global team info)
@@ -1,5 +1,5 @@
 import { NextRequest, NextResponse } from 'next/server';
-import { getCurrentTeamNames } from '@/lib/team-name-resolver';
+import { getCurrentTeamNames, getCurrentTeamNamesById, getHistoricalTeamNames } from '@/lib/team-name-resolver';
 
 /**
  * POST /api/teams/resolve-names
@@ -8,7 +8,9 @@ import { getCurrentTeamNames } from '@/lib/team-name-resolver';
  * 
  * Request body:
  * {
- *   "firebaseUids": ["uid1", "uid2", ...]
+ *   "firebaseUids": ["uid1", "uid2", ...],
+ *   "teamIds": ["SSPSLT0001", ...],   // optional, by team ID
+ *   "seasonId": "SSPSLS16"            // optional, teamIds resolve to the names used that season
  * }
  * 
  * Response:
@@ -23,17 +25,21 @@ import { getCurrentTeamNames } from '@/lib/team-name-resolver';
 export async function POST(request: NextRequest) {
   try {
     const body = await request.json();
-    const { firebaseUids } = body;
+    const { firebaseUids = [], teamIds = [], seasonId } = body;
 
-    if (!Array.isArray(firebaseUids)) {
+    if (!Array.isArray(firebaseUids) || !Array.isArray(teamIds)) {
       return NextResponse.json({
         success: false,
-        error: 'firebaseUids must be an array'
+        error: 'firebaseUids and teamIds must be arrays'
       }, { status: 400 });
     }
 
-    // Resolve all names at once
-    const nameMap = await getCurrentTeamNames(firebaseUids);
+    // Resolve all names at once (one query per kind for cache misses)
+    const [uidNames, idNames] = await Promise.all([
+      getCurrentTeamNames(firebaseUids),
+      seasonId ? getHistoricalTeamNames(teamIds, seasonId) : getCurrentTeamNamesById(teamIds)
+    ]);
+    const nameMap = new Map([...uidNames, ...idNames]);
 
     // Convert Map to object for JSON response
     const names: Record<string, string> = {};
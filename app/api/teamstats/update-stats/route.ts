@@ -1,6 +1,8 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { getTournamentDb } from '@/lib/neon/tournament-config';
 import { recalculatePositions } from '@/lib/neon/teamstats';
+import { refreshSeasonAggregatesAfterChange } from '@/lib/neon/season-aggregates';
+import { refreshLeagueRecordsAfterChange } from '@/lib/neon/league-records';
 
 interface MatchupResult {
   position: number;
@@ -126,6 +128,9 @@ export async function POST(request: NextRequest) {
       await recalculatePositions(season_id, fixtureData[0].tournament_id);
     }
 
+    await refreshSeasonAggregatesAfterChange(season_id, { teamIds: [home_team_id, away_team_id] });
+    await refreshLeagueRecordsAfterChange({ teamIds: [home_team_id, away_team_id] });
+
     return NextResponse.json({
       success: true,
       message: 'Team stats updated successfully',
@@ -219,7 +219,10 @@ export async function POST(
         
         // Check phase-based reserve requirement
         try {
-          const reserveCheck = await calculateReserve(teamId, tiebreaker.round_id, seasonId);
+          const reserveCheck = await calculateReserve(teamId, tiebreaker.round_id, seasonId, {
+            balance: budgetRemaining,
+            squadSize: teamData?.players_count || 0
+          });
           
           if (reserveCheck.requiresReserve) {
             const maxAllowedBid = budgetRemaining - reserveCheck.minimumReserve;
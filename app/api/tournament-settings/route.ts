@@ -1,5 +1,6 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { getTournamentDb } from '@/lib/neon/tournament-config';
+import { invalidateLineupRules } from '@/lib/lineup-validation';
 
 // GET - Fetch tournament settings by tournament_id
 export async function GET(request: NextRequest) {
@@ -148,6 +149,7 @@ export async function POST(request: NextRequest) {
         lineup_category_requirements = EXCLUDED.lineup_category_requirements,
         updated_at = NOW()
     `;
+    invalidateLineupRules(tournament_id);
 
     return NextResponse.json({
       success: true,
@@ -180,6 +182,7 @@ export async function DELETE(request: NextRequest) {
       DELETE FROM tournament_settings
       WHERE tournament_id = ${tournamentId}
     `;
+    invalidateLineupRules(tournamentId);
 
     return NextResponse.json({
       success: true,
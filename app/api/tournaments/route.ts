@@ -1,5 +1,6 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { getTournamentDb } from '@/lib/neon/tournament-config';
+import { invalidateLineupRules } from '@/lib/lineup-validation';
 import { generateSeasonCreatedNews, generateSeasonActiveNews } from '@/lib/news/season-events';
 
 // GET - List all tournaments or filter by season
@@ -269,6 +270,7 @@ export async function POST(request: NextRequest) {
         lineup_category_requirements = EXCLUDED.lineup_category_requirements,
         updated_at = NOW()
     `;
+    invalidateLineupRules(tournamentId);
 
     // Auto-generate news for season creation
     const tournament = result[0];
@@ -0,0 +1,19 @@
+-- ============================================
+-- POLL TRIGGER LOG
+-- One row per scheduled poll (season, poll type, period), claimed before the
+-- poll is created so repeated or overlapping scheduler runs stay idempotent.
+-- period: 'YYYY-MM-DD' for daily polls, week number for weekly polls,
+-- 'season' for season polls.
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS poll_trigger_log (
+  season_id VARCHAR(100) NOT NULL,
+  poll_type VARCHAR(50) NOT NULL,
+  period VARCHAR(20) NOT NULL,
+  poll_id VARCHAR(100),
+  created_at TIMESTAMP DEFAULT NOW(),
+  PRIMARY KEY (season_id, poll_type, period)
+);
+
+-- Snapshot lookup of existing scheduled polls
+CREATE INDEX IF NOT EXISTS idx_polls_season_type ON polls(season_id, poll_type);
@@ -15,20 +15,156 @@ interface PlayerAwardResult {
   error?: string;
 }
 
+/**
+ * Award types in presentation order (also the order awards are reported in)
+ */
+export const SEASON_AWARD_TYPES = [
+  'Golden Boot',
+  'Most Assists',
+  'Most Clean Sheets',
+  'Best Attacker',
+  'Best Midfielder',
+  'Best Defender',
+  'Best Goalkeeper'
+] as const;
+
+const POSITION_ORDER = ['Winner', 'Runner Up', 'Third Place'];
+
+/**
+ * Rank every player in the season's player_seasons snapshot per award in one
+ * pass (window functions), insert the top N of each award, and return the
+ * rows that were actually inserted.
+ *
+ * Rankings (ties broken by player_id so reruns are stable):
+ * - Golden Boot: goals, then assists
+ * - Most Assists: assists, then goals
+ * - Most Clean Sheets: goalkeepers by clean sheets, then fewest conceded
+ * - Best Attacker / Midfielder: goals, then assists within the category
+ * - Best Defender / Goalkeeper: clean sheets, then goals within the category
+ */
+const INSERT_SEASON_AWARDS = `
+  WITH snapshot AS (
+    SELECT player_id, player_name, category,
+           COALESCE(goals_scored, 0) AS goals_scored,
+           COALESCE(assists, 0) AS assists,
+           COALESCE(clean_sheets, 0) AS clean_sheets,
+           COALESCE(goals_conceded, 0) AS goals_conceded
+    FROM player_seasons
+    WHERE season_id = $1
+  ),
+  ranked AS (
+    SELECT s.*,
+      ROW_NUMBER() OVER (ORDER BY goals_scored DESC, assists DESC, player_id) AS goals_rank,
+      ROW_NUMBER() OVER (ORDER BY assists DESC, goals_scored DESC, player_id) AS assists_rank,
+      ROW_NUMBER() OVER (
+        PARTITION BY category
+        ORDER BY clean_sheets DESC, goals_conceded ASC, player_id
+      ) AS clean_sheets_rank,
+      ROW_NUMBER() OVER (
+        PARTITION BY category
+        ORDER BY
+          CASE WHEN category IN ('Defender', 'Goalkeeper') THEN clean_sheets ELSE goals_scored END DESC,
+          CASE WHEN category IN ('Defender', 'Goalkeeper') THEN goals_scored ELSE assists END DESC,
+          player_id
+      ) AS category_rank
+    FROM snapshot s
+  ),
+  candidates AS (
+    SELECT player_id, player_name, 'individual' AS award_category, 'Golden Boot' AS award_type,
+           goals_rank AS award_rank, NULL::text AS player_category,
+           'Auto-awarded based on goals scored' AS notes,
+           jsonb_build_object('goals', goals_scored) AS performance_stats
+    FROM ranked WHERE goals_rank <= $2
+    UNION ALL
+    SELECT player_id, player_name, 'individual', 'Most Assists',
+           assists_rank, NULL,
+           'Auto-awarded based on assists',
+           jsonb_build_object('assists', assists)
+    FROM ranked WHERE assists_rank <= $2
+    UNION ALL
+    SELECT player_id, player_name, 'individual', 'Most Clean Sheets',
+           clean_sheets_rank, NULL,
+           'Auto-awarded based on clean sheets',
+           jsonb_build_object('clean_sheets', clean_sheets)
+    FROM ranked WHERE category = 'Goalkeeper' AND clean_sheets_rank <= $2
+    UNION ALL
+    SELECT player_id, player_name, 'category', 'Best ' || category,
+           category_rank, category,
+           'Auto-awarded based on category performance',
+           jsonb_build_object('goals', goals_scored, 'assists', assists, 'clean_sheets', clean_sheets)
+    FROM ranked
+    WHERE category IN ('Attacker', 'Midfielder', 'Defender', 'Goalkeeper') AND category_rank <= $2
+  )
+  INSERT INTO player_awards (
+    player_id, player_name, season_id,
+    award_category, award_type, award_position,
+    player_category, awarded_by, notes,
+    performance_stats
+  )
+  SELECT
+    player_id, player_name, $1,
+    award_category, award_type,
+    CASE award_rank WHEN 1 THEN 'Winner' WHEN 2 THEN 'Runner Up' ELSE 'Third Place' END,
+    player_category, 'system', notes,
+    performance_stats
+  FROM candidates
+  ON CONFLICT (player_id, season_id, award_category, award_type, award_position) DO NOTHING
+  RETURNING player_id, player_name, award_category, award_type, award_position, player_category
+`;
+
+/**
+ * Set awards_count to the number of player_awards rows for every player in
+ * the season (not +1 per insert, so earlier drift is corrected too)
+ */
+const REFRESH_AWARDS_COUNT = `
+  UPDATE player_season ps
+  SET awards_count = c.awards_count, updated_at = NOW()
+  FROM (
+    SELECT ps2.player_id, COUNT(pa.id)::int AS awards_count
+    FROM player_season ps2
+    LEFT JOIN player_awards pa ON pa.player_id = ps2.player_id AND pa.season_id = ps2.season_id
+    WHERE ps2.season_id = $1
+    GROUP BY ps2.player_id
+  ) c
+  WHERE ps.season_id = $1
+    AND ps.player_id = c.player_id
+    AND ps.awards_count IS DISTINCT FROM c.awards_count
+`;
+
+/**
+ * Order awards by SEASON_AWARD_TYPES, then Winner / Runner Up / Third Place
+ */
+export function sortSeasonAwards<T extends { award_type: string; award_position: string | null }>(awards: T[]): T[] {
+  const typeIndex = (type: string) => {
+    const i = (SEASON_AWARD_TYPES as readonly string[]).indexOf(type);
+    return i === -1 ? SEASON_AWARD_TYPES.length : i;
+  };
+  const positionIndex = (position: string | null) => {
+    const i = POSITION_ORDER.indexOf(position || '');
+    return i === -1 ? POSITION_ORDER.length : i;
+  };
+  return [...awards].sort((a, b) =>
+    typeIndex(a.award_type) - typeIndex(b.award_type) ||
+    positionIndex(a.award_position) - positionIndex(b.award_position)
+  );
+}
+
 /**
  * Auto-award player awards based on season statistics
- * 
+ *
  * Individual Awards (season-wide):
  * - Golden Boot (Top 3 goal scorers)
  * - Most Assists (Top 3)
  * - Most Clean Sheets (Top 3 goalkeepers)
- * - Most MOTM Awards (Top 3)
- * 
+ *
  * Category Awards (per position):
  * - Best Attacker (Top 3 attackers by goals + assists)
  * - Best Midfielder (Top 3 midfielders by goals + assists)
  * - Best Defender (Top 3 defenders by clean sheets)
- * - Best Goalkeeper (Top 3 goalkeepers by clean sheets + saves)
+ * - Best Goalkeeper (Top 3 goalkeepers by clean sheets)
+ *
+ * All awards are ranked and inserted in one statement, and awards_count is
+ * refreshed in the same transaction.
  */
 export async function autoAwardPlayerAwards(
   seasonId: string,
@@ -36,279 +172,38 @@ export async function autoAwardPlayerAwards(
 ): Promise<PlayerAwardResult> {
   try {
     const sql = getTournamentDb();
-    
+
     console.log(`🏆 Starting player awards auto-award for season ${seasonId}...`);
-    
-    const awards: PlayerAwardResult['awards'] = [];
-    let awardsGiven = 0;
 
-    // ============================================
-    // INDIVIDUAL AWARDS (Season-wide)
-    // ============================================
-    
-    // 1. Golden Boot - Top goal scorers
-    console.log('  📊 Awarding Golden Boot...');
-    const topScorers = await sql`
-      SELECT player_id, player_name, goals_scored, category
-      FROM realplayerstats
-      WHERE season_id = ${seasonId}
-      ORDER BY goals_scored DESC, assists DESC
-      LIMIT ${awardTopN}
-    `;
-    
-    for (let i = 0; i < topScorers.length; i++) {
-      const player = topScorers[i];
-      const position = i === 0 ? 'Winner' : i === 1 ? 'Runner Up' : 'Third Place';
-      
-      const result = await sql`
-        INSERT INTO player_awards (
-          player_id, player_name, season_id,
-          award_category, award_type, award_position,
-          player_category, awarded_by, notes,
-          performance_stats
-        )
-        VALUES (
-          ${player.player_id}, ${player.player_name}, ${seasonId},
-          'individual', 'Golden Boot', ${position},
-          NULL, 'system', 'Auto-awarded based on goals scored',
-          ${JSON.stringify({ goals: player.goals_scored })}
-        )
-        ON CONFLICT (player_id, season_id, award_category, award_type, award_position) DO NOTHING
-        RETURNING *
-      `;
-      
-      if (result.length > 0) {
-        awardsGiven++;
-        awards.push({
-          player_id: player.player_id,
-          player_name: player.player_name,
-          award_category: 'individual',
-          award_type: 'Golden Boot',
-          award_position: position,
-          player_category: null
-        });
-        console.log(`    ✅ ${position}: ${player.player_name} (${player.goals_scored} goals)`);
-        
-        // Update awards_count
-        await sql`
-          UPDATE player_season
-          SET awards_count = COALESCE(awards_count, 0) + 1
-          WHERE player_id = ${player.player_id} AND season_id = ${seasonId}
-        `;
-        
-        // Add fantasy points
-        await addFantasyPointsForAward(
-          player.player_id,
-          player.player_name,
-          seasonId,
-          'Golden Boot'
-        );
-      }
-    }
+    const [inserted] = await sql.transaction([
+      sql.query(INSERT_SEASON_AWARDS, [seasonId, awardTopN]),
+      sql.query(REFRESH_AWARDS_COUNT, [seasonId])
+    ]);
 
-    // 2. Most Assists - Top assist providers
-    console.log('  📊 Awarding Most Assists...');
-    const topAssisters = await sql`
-      SELECT player_id, player_name, assists
-      FROM realplayerstats
-      WHERE season_id = ${seasonId}
-      ORDER BY assists DESC, goals_scored DESC
-      LIMIT ${awardTopN}
-    `;
-    
-    for (let i = 0; i < topAssisters.length; i++) {
-      const player = topAssisters[i];
-      const position = i === 0 ? 'Winner' : i === 1 ? 'Runner Up' : 'Third Place';
-      
-      const result = await sql`
-        INSERT INTO player_awards (
-          player_id, player_name, season_id,
-          award_category, award_type, award_position,
-          player_category, awarded_by, notes,
-          performance_stats
-        )
-        VALUES (
-          ${player.player_id}, ${player.player_name}, ${seasonId},
-          'individual', 'Most Assists', ${position},
-          NULL, 'system', 'Auto-awarded based on assists',
-          ${JSON.stringify({ assists: player.assists })}
-        )
-        ON CONFLICT (player_id, season_id, award_category, award_type, award_position) DO NOTHING
-        RETURNING *
-      `;
-      
-      if (result.length > 0) {
-        awardsGiven++;
-        awards.push({
-          player_id: player.player_id,
-          player_name: player.player_name,
-          award_category: 'individual',
-          award_type: 'Most Assists',
-          award_position: position,
-          player_category: null
-        });
-        console.log(`    ✅ ${position}: ${player.player_name} (${player.assists} assists)`);
-        
-        await sql`
-          UPDATE player_season
-          SET awards_count = COALESCE(awards_count, 0) + 1
-          WHERE player_id = ${player.player_id} AND season_id = ${seasonId}
-        `;
-        
-        // Add fantasy points
-        await addFantasyPointsForAward(
-          player.player_id,
-          player.player_name,
-          seasonId,
-          'Most Assists'
-        );
-      }
-    }
+    const awards: PlayerAwardResult['awards'] = sortSeasonAwards(inserted as PlayerAwardResult['awards']);
 
-    // 3. Most Clean Sheets (Goalkeepers)
-    console.log('  📊 Awarding Most Clean Sheets...');
-    const topKeepers = await sql`
-      SELECT player_id, player_name, clean_sheets
-      FROM realplayerstats
-      WHERE season_id = ${seasonId} AND category = 'Goalkeeper'
-      ORDER BY clean_sheets DESC, saves DESC
-      LIMIT ${awardTopN}
-    `;
-    
-    for (let i = 0; i < topKeepers.length; i++) {
-      const player = topKeepers[i];
-      const position = i === 0 ? 'Winner' : i === 1 ? 'Runner Up' : 'Third Place';
-      
-      const result = await sql`
-        INSERT INTO player_awards (
-          player_id, player_name, season_id,
-          award_category, award_type, award_position,
-          player_category, awarded_by, notes,
-          performance_stats
-        )
-        VALUES (
-          ${player.player_id}, ${player.player_name}, ${seasonId},
-          'individual', 'Most Clean Sheets', ${position},
-          NULL, 'system', 'Auto-awarded based on clean sheets',
-          ${JSON.stringify({ clean_sheets: player.clean_sheets })}
-        )
-        ON CONFLICT (player_id, season_id, award_category, award_type, award_position) DO NOTHING
-        RETURNING *
-      `;
-      
-      if (result.length > 0) {
-        awardsGiven++;
-        awards.push({
-          player_id: player.player_id,
-          player_name: player.player_name,
-          award_category: 'individual',
-          award_type: 'Most Clean Sheets',
-          award_position: position,
-          player_category: null
-        });
-        console.log(`    ✅ ${position}: ${player.player_name} (${player.clean_sheets} clean sheets)`);
-        
-        await sql`
-          UPDATE player_season
-          SET awards_count = COALESCE(awards_count, 0) + 1
-          WHERE player_id = ${player.player_id} AND season_id = ${seasonId}
-        `;
-        
-        // Add fantasy points
-        await addFantasyPointsForAward(
-          player.player_id,
-          player.player_name,
-          seasonId,
-          'Most Clean Sheets'
-        );
-      }
+    for (const award of awards) {
+      console.log(`    ✅ ${award.award_type} ${award.award_position}: ${award.player_name}`);
     }
 
-    // ============================================
-    // CATEGORY AWARDS (Per Position)
-    // ============================================
-    
-    const categories = ['Attacker', 'Midfielder', 'Defender', 'Goalkeeper'];
-    
-    for (const category of categories) {
-      console.log(`  📊 Awarding Best ${category}...`);
-      
-      let orderBy = 'goals_scored DESC, assists DESC';
-      if (category === 'Defender' || category === 'Goalkeeper') {
-        orderBy = 'clean_sheets DESC, goals_scored DESC';
-      }
-      
-      const topPlayers = await sql.unsafe(`
-        SELECT player_id, player_name, category, 
-               goals_scored, assists, clean_sheets
-        FROM realplayerstats
-        WHERE season_id = '${seasonId}' AND category = '${category}'
-        ORDER BY ${orderBy}
-        LIMIT ${awardTopN}
-      `);
-      
-      for (let i = 0; i < topPlayers.length; i++) {
-        const player = topPlayers[i];
-        const position = i === 0 ? 'Winner' : i === 1 ? 'Runner Up' : 'Third Place';
-        
-        const result = await sql`
-          INSERT INTO player_awards (
-            player_id, player_name, season_id,
-            award_category, award_type, award_position,
-            player_category, awarded_by, notes,
-            performance_stats
-          )
-          VALUES (
-            ${player.player_id}, ${player.player_name}, ${seasonId},
-            'category', ${`Best ${category}`}, ${position},
-            ${category}, 'system', 'Auto-awarded based on category performance',
-            ${JSON.stringify({
-              goals: player.goals_scored,
-              assists: player.assists,
-              clean_sheets: player.clean_sheets
-            })}
-          )
-          ON CONFLICT (player_id, season_id, award_category, award_type, award_position) DO NOTHING
-          RETURNING *
-        `;
-        
-        if (result.length > 0) {
-          awardsGiven++;
-          awards.push({
-            player_id: player.player_id,
-            player_name: player.player_name,
-            award_category: 'category',
-            award_type: `Best ${category}`,
-            award_position: position,
-            player_category: category
-          });
-          console.log(`    ✅ ${position}: ${player.player_name}`);
-          
-          await sql`
-            UPDATE player_season
-            SET awards_count = COALESCE(awards_count, 0) + 1
-            WHERE player_id = ${player.player_id} AND season_id = ${seasonId}
-          `;
-          
-          // Add fantasy points
-          await addFantasyPointsForAward(
-            player.player_id,
-            player.player_name,
-            seasonId,
-            `Best ${category}`
-          );
-        }
-      }
+    // Fantasy points live in a separate database, so they are added after commit
+    for (const award of awards) {
+      await addFantasyPointsForAward(
+        award.player_id,
+        award.player_name,
+        seasonId,
+        award.award_type
+      );
     }
 
-    console.log(`\n🏆 Player awards auto-award complete: ${awardsGiven} awards given`);
-    
+    console.log(`\n🏆 Player awards auto-award complete: ${awards.length} awards given`);
+
     return {
       success: true,
-      awardsGiven,
+      awardsGiven: awards.length,
       awards
     };
-    
+
   } catch (error: any) {
     console.error('❌ Error awarding player awards:', error);
     return {
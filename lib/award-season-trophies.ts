@@ -1,4 +1,5 @@
 import { getTournamentDb } from './neon/tournament-config';
+import { refreshLeagueRecordsAfterChange } from './neon/league-records';
 
 interface TrophyAwardResult {
   success: boolean;
@@ -13,451 +14,64 @@ interface TrophyAwardResult {
   error?: string;
 }
 
-/**
- * Auto-award trophies for all tournaments in a season
- * Awards trophies based on tournament standings (league, group stage, knockout)
- * 
- * @param seasonId - Season ID (e.g., "SSPSLS01")
- * @param awardTopN - Number of positions to award for league tournaments (default: 2)
- * @returns Result with awarded trophies
- */
-export async function awardSeasonTrophies(
-  seasonId: string,
-  awardTopN: number = 2
-): Promise<TrophyAwardResult> {
-  try {
-    const sql = getTournamentDb();
-    
-    console.log(`🏆 Starting trophy auto-award for season ${seasonId}...`);
-    
-    // Get all tournaments in the season
-    const tournaments = await sql`
-      SELECT id, tournament_name, tournament_type, has_knockout_stage, is_pure_knockout, has_group_stage
-      FROM tournaments
-      WHERE season_id = ${seasonId}
-      ORDER BY is_primary DESC, display_order ASC
-    `;
-    
-    if (tournaments.length === 0) {
-      return {
-        success: false,
-        trophiesAwarded: 0,
-        awards: [],
-        error: 'No tournaments found for this season'
-      };
-    }
-    
-    const awards = [];
-    let trophiesAwarded = 0;
-    
-    // Process each tournament
-    for (const tournament of tournaments) {
-      console.log(`\n📋 Processing tournament: ${tournament.tournament_name}`);
-      console.log(`   Type: ${tournament.tournament_type}`);
-      console.log(`   is_pure_knockout: ${tournament.is_pure_knockout}`);
-      console.log(`   has_knockout_stage: ${tournament.has_knockout_stage}`);
-      console.log(`   has_group_stage: ${tournament.has_group_stage}`);
-      
-      // Get completed fixtures for this tournament
-      const fixtures = await sql`
-        SELECT 
-          id, home_team_id, home_team_name, away_team_id, away_team_name,
-          home_score, away_score, knockout_round, group_name
-        FROM fixtures
-        WHERE tournament_id = ${tournament.id}
-          AND status = 'completed'
-          AND result IS NOT NULL
-      `;
-      
-      if (fixtures.length === 0) {
-        console.log(`  ⚠️  No completed fixtures found`);
-        continue;
-      }
-      
-      // Award based on tournament format
-      if (tournament.is_pure_knockout) {
-        // Pure knockout - award knockout trophies only
-        console.log(`  🏆 Pure knockout tournament`);
-        const knockoutAwards = await awardKnockoutTrophies(
-          sql, seasonId, tournament, fixtures
-        );
-        awards.push(...knockoutAwards.awards);
-        trophiesAwarded += knockoutAwards.count;
-      } else if (tournament.has_group_stage && tournament.has_knockout_stage) {
-        // Group + Knockout - award knockout trophies only (not group winners)
-        console.log(`  🏆 Group stage + Knockout tournament - awarding knockout trophies only`);
-        const knockoutAwards = await awardKnockoutTrophies(
-          sql, seasonId, tournament, fixtures
-        );
-        awards.push(...knockoutAwards.awards);
-        trophiesAwarded += knockoutAwards.count;
-      } else if (tournament.has_knockout_stage) {
-        // League + Knockout - award shield winner + knockout winner & runner-up
-        console.log(`  🏆 League + Knockout tournament - awarding shield winner + knockout trophies`);
-        
-        // Award shield winner only (no runner-up)
-        const leagueFixtures = fixtures.filter((f: any) => f.id && !f.id.includes('_ko_'));
-        console.log(`  📊 Total fixtures: ${fixtures.length}, League fixtures: ${leagueFixtures.length}`);
-        const leagueAwards = await awardLeagueTrophies(
-          sql, seasonId, tournament, leagueFixtures, 1  // Only award top 1 (winner)
-        );
-        awards.push(...leagueAwards.awards);
-        trophiesAwarded += leagueAwards.count;
-        
-        // Award knockout trophies
-        const knockoutAwards = await awardKnockoutTrophies(
-          sql, seasonId, tournament, fixtures
-        );
-        awards.push(...knockoutAwards.awards);
-        trophiesAwarded += knockoutAwards.count;
-      } else if (tournament.has_group_stage) {
-        // Pure group stage - award group winners
-        console.log(`  🏆 Group stage tournament`);
-        const groupAwards = await awardGroupStageTrophies(
-          sql, seasonId, tournament, fixtures
-        );
-        awards.push(...groupAwards.awards);
-        trophiesAwarded += groupAwards.count;
-      } else {
-        // Pure league - award shield winner only (no runner-up)
-        console.log(`  🏆 League tournament`);
-        const leagueFixtures = fixtures.filter((f: any) => f.id && !f.id.includes('_ko_'));
-        console.log(`  📊 Total fixtures: ${fixtures.length}, League fixtures (excluding knockout): ${leagueFixtures.length}`);
-        const leagueAwards = await awardLeagueTrophies(
-          sql, seasonId, tournament, leagueFixtures, 1  // Only award top 1 (winner)
-        );
-        awards.push(...leagueAwards.awards);
-        trophiesAwarded += leagueAwards.count;
-      }
-    }
-    
-    // Award Fantasy League Winner
-    console.log(`\n📋 Checking for Fantasy League winner...`);
-    try {
-      const { getFantasyDb } = await import('@/lib/neon/fantasy-config');
-      const fantasySql = getFantasyDb();
-      
-      // Get fantasy league for this season
-      const fantasyLeagues = await fantasySql`
-        SELECT league_id, league_name
-        FROM fantasy_leagues
-        WHERE season_id = ${seasonId}
-        LIMIT 1
-      `;
-      
-      if (fantasyLeagues.length > 0) {
-        const fantasyLeague = fantasyLeagues[0];
-        console.log(`  Found fantasy league: ${fantasyLeague.league_name}`);
-        
-        // Get top fantasy team
-        const topTeam = await fantasySql`
-          SELECT team_id, team_name, total_points, rank
-          FROM fantasy_teams
-          WHERE league_id = ${fantasyLeague.league_id}
-          ORDER BY rank ASC NULLS LAST, total_points DESC
-          LIMIT 1
-        `;
-        
-        if (topTeam.length > 0) {
-          console.log(`  🥇 Fantasy Winner: ${topTeam[0].team_name} (${topTeam[0].total_points} pts)`);
-          
-          // Award the trophy
-          const result = await sql`
-            INSERT INTO team_trophies (
-              team_id, team_name, season_id, trophy_type, trophy_name, trophy_position, position, awarded_by
-            )
-            VALUES (
-              ${topTeam[0].team_id}, ${topTeam[0].team_name}, ${seasonId}, 'special', 
-              ${fantasyLeague.league_name}, 'Winner', 1, 'system'
-            )
-            ON CONFLICT (team_id, season_id, trophy_name, trophy_position) DO NOTHING
-            RETURNING *
-          `;
-          
-          if (result.length > 0) {
-            awards.push({
-              team_name: topTeam[0].team_name,
-              trophy_name: `${fantasyLeague.league_name} Winner`,
-              position: 1
-            });
-            trophiesAwarded++;
-            console.log(`  ✅ Awarded fantasy trophy to ${topTeam[0].team_name}`);
-          } else {
-            console.log(`  ℹ️  Fantasy trophy already awarded`);
-          }
-        }
-      }
-    } catch (fantasyError) {
-      console.log(`  ⚠️  Could not award fantasy trophy:`, fantasyError);
-    }
-    
-    console.log(`\n🏆 Trophy auto-award complete: ${trophiesAwarded} new trophies awarded`);
-    
-    return {
-      success: true,
-      trophiesAwarded,
-      awards
-    };
-    
-  } catch (error: any) {
-    console.error('❌ Error awarding season trophies:', error);
-    return {
-      success: false,
-      trophiesAwarded: 0,
-      awards: [],
-      error: error.message || 'Failed to award trophies'
-    };
-  }
+export interface TrophyTournament {
+  id: string;
+  tournament_name: string;
+  tournament_type?: string;
+  has_knockout_stage: boolean;
+  is_pure_knockout: boolean;
+  has_group_stage: boolean;
 }
 
-/**
- * Award trophies for league-format tournaments
- */
-async function awardLeagueTrophies(
-  sql: any,
-  seasonId: string,
-  tournament: any,
-  fixtures: any[],
-  awardTopN: number
-) {
-  const standings = calculateStandings(fixtures);
-  const topTeams = standings.slice(0, awardTopN);
-  
-  const awards = [];
-  let count = 0;
-  
-  for (const team of topTeams) {
-    let trophyType = '';
-    let trophyPosition = '';
-    
-    if (team.position === 1) {
-      trophyType = 'cup';
-      trophyPosition = 'Winner';
-    } else if (team.position === 2) {
-      trophyType = 'runner_up';
-      trophyPosition = 'Runner Up';
-    } else if (team.position === 3) {
-      trophyType = 'third_place';
-      trophyPosition = 'Third Place';
-    } else {
-      trophyType = 'special';
-      trophyPosition = `${team.position}${getOrdinalSuffix(team.position)} Place`;
-    }
-    
-    const result = await sql`
-      INSERT INTO team_trophies (
-        team_id, team_name, season_id, trophy_type, trophy_name, trophy_position,
-        position, awarded_by, notes
-      )
-      VALUES (
-        ${team.team_id}, ${team.team_name}, ${seasonId}, ${trophyType},
-        ${tournament.tournament_name}, ${trophyPosition}, ${team.position},
-        'system', 'Auto-awarded based on tournament standings'
-      )
-      ON CONFLICT (team_id, season_id, trophy_name, trophy_position) DO NOTHING
-      RETURNING id
-    `;
-    
-    if (result.length > 0) {
-      count++;
-      awards.push({
-        team_id: team.team_id,
-        team_name: team.team_name,
-        trophy_type: trophyType,
-        trophy_name: `${tournament.tournament_name} ${trophyPosition}`,
-        position: team.position
-      });
-      console.log(`  ✅ ${team.team_name} - ${tournament.tournament_name} ${trophyPosition}`);
-    }
-  }
-  
-  return { awards, count };
+export interface TrophyFixture {
+  id: string;
+  tournament_id: string;
+  home_team_id: string;
+  home_team_name: string;
+  away_team_id: string;
+  away_team_name: string;
+  home_score: number | null;
+  away_score: number | null;
+  knockout_round: string | null;
+  group_name: string | null;
 }
 
-/**
- * Award trophies for knockout tournaments
- */
-async function awardKnockoutTrophies(
-  sql: any,
-  seasonId: string,
-  tournament: any,
-  fixtures: any[]
-) {
-  const knockoutFixtures = fixtures.filter((f: any) => f.knockout_round);
-  
-  console.log(`  🔍 Found ${knockoutFixtures.length} knockout fixtures`);
-  
-  // Find the final (last round) - Finals should be the last
-  const rounds = [...new Set(knockoutFixtures.map((f: any) => f.knockout_round))];
-  console.log(`  🔍 Knockout rounds found: ${rounds.join(', ')}`);
-  
-  // Find the final - look for "Final" or "final" in the round name
-  let finalRound = rounds.find((r: string) => r.toLowerCase().includes('final') && !r.toLowerCase().includes('semi'));
-  
-  if (!finalRound) {
-    // Fallback: use the last round alphabetically
-    finalRound = rounds.sort().pop();
-  }
-  
-  console.log(`  🏆 Final round identified: ${finalRound}`);
-  
-  if (!finalRound) {
-    console.log(`  ⚠️  No final found`);
-    return { awards: [], count: 0 };
-  }
-  
-  const finalFixture = knockoutFixtures.find((f: any) => f.knockout_round === finalRound);
-  
-  if (!finalFixture) {
-    console.log(`  ⚠️  No fixture found for final round`);
-    return { awards: [], count: 0 };
-  }
-  
-  console.log(`  📊 Final fixture: ${finalFixture.home_team_name} ${finalFixture.home_score} - ${finalFixture.away_score} ${finalFixture.away_team_name}`);
-  
-  const awards = [];
-  let count = 0;
-  
-  // Determine winner and runner-up
-  const winner = finalFixture.home_score > finalFixture.away_score
-    ? { id: finalFixture.home_team_id, name: finalFixture.home_team_name }
-    : { id: finalFixture.away_team_id, name: finalFixture.away_team_name };
-  
-  const runnerUp = finalFixture.home_score > finalFixture.away_score
-    ? { id: finalFixture.away_team_id, name: finalFixture.away_team_name }
-    : { id: finalFixture.home_team_id, name: finalFixture.home_team_name };
-  
-  console.log(`  🥇 Winner: ${winner.name}`);
-  console.log(`  🥈 Runner-up: ${runnerUp.name}`);
-  
-  // Award winner
-  const winnerResult = await sql`
-    INSERT INTO team_trophies (
-      team_id, team_name, season_id, trophy_type, trophy_name, trophy_position,
-      position, awarded_by, notes
-    )
-    VALUES (
-      ${winner.id}, ${winner.name}, ${seasonId}, 'cup',
-      ${tournament.tournament_name}, 'Winner', 1,
-      'system', 'Auto-awarded based on knockout final'
-    )
-    ON CONFLICT (team_id, season_id, trophy_name, trophy_position) DO NOTHING
-    RETURNING id
-  `;
-  
-  if (winnerResult.length > 0) {
-    count++;
-    awards.push({
-      team_id: winner.id,
-      team_name: winner.name,
-      trophy_type: 'cup',
-      trophy_name: `${tournament.tournament_name} Winner`,
-      position: 1
-    });
-    console.log(`  ✅ ${winner.name} - ${tournament.tournament_name} Winner`);
-  }
-  
-  // Award runner-up
-  const runnerUpResult = await sql`
-    INSERT INTO team_trophies (
-      team_id, team_name, season_id, trophy_type, trophy_name, trophy_position,
-      position, awarded_by, notes
-    )
-    VALUES (
-      ${runnerUp.id}, ${runnerUp.name}, ${seasonId}, 'runner_up',
-      ${tournament.tournament_name}, 'Runner Up', 2,
-      'system', 'Auto-awarded based on knockout final'
-    )
-    ON CONFLICT (team_id, season_id, trophy_name, trophy_position) DO NOTHING
-    RETURNING id
-  `;
-  
-  if (runnerUpResult.length > 0) {
-    count++;
-    awards.push({
-      team_id: runnerUp.id,
-      team_name: runnerUp.name,
-      trophy_type: 'runner_up',
-      trophy_name: `${tournament.tournament_name} Runner Up`,
-      position: 2
-    });
-    console.log(`  ✅ ${runnerUp.name} - ${tournament.tournament_name} Runner Up`);
-  }
-  
-  return { awards, count };
+export interface FantasyWinner {
+  league_name: string;
+  team_id: string;
+  team_name: string;
+  total_points: number;
 }
 
 /**
- * Award trophies for group stage tournaments
+ * One trophy the season's results entitle a team to.
+ * trophy_name / trophy_position are the team_trophies columns; label is the
+ * display name shown in the preview.
  */
-async function awardGroupStageTrophies(
-  sql: any,
-  seasonId: string,
-  tournament: any,
-  fixtures: any[]
-) {
-  const groupFixtures = fixtures.filter((f: any) => f.group_name);
-  const groups: Record<string, any[]> = {};
-  
-  // Calculate standings per group
-  groupFixtures.forEach((fixture: any) => {
-    const groupName = fixture.group_name;
-    if (!groups[groupName]) groups[groupName] = [];
-    groups[groupName].push(fixture);
-  });
-  
-  const awards = [];
-  let count = 0;
-  
-  // Award winner of each group
-  for (const [groupName, groupFixtures] of Object.entries(groups)) {
-    const standings = calculateStandings(groupFixtures);
-    if (standings.length === 0) continue;
-    
-    const winner = standings[0];
-    
-    const result = await sql`
-      INSERT INTO team_trophies (
-        team_id, team_name, season_id, trophy_type, trophy_name, trophy_position,
-        position, awarded_by, notes
-      )
-      VALUES (
-        ${winner.team_id}, ${winner.team_name}, ${seasonId}, 'special',
-        ${tournament.tournament_name}, ${groupName + ' Winner'}, 1,
-        'system', 'Auto-awarded as group stage winner'
-      )
-      ON CONFLICT (team_id, season_id, trophy_name, trophy_position) DO NOTHING
-      RETURNING id
-    `;
-    
-    if (result.length > 0) {
-      count++;
-      awards.push({
-        team_id: winner.team_id,
-        team_name: winner.team_name,
-        trophy_type: 'special',
-        trophy_name: `${tournament.tournament_name} ${groupName} Winner`,
-        position: 1
-      });
-      console.log(`  ✅ ${winner.team_name} - ${groupName} Winner`);
-    }
-  }
-  
-  return { awards, count };
+export interface PlannedTrophy {
+  team_id: string;
+  team_name: string;
+  trophy_type: string;
+  trophy_name: string;
+  trophy_position: string;
+  position: number;
+  notes: string | null;
+  tournament_name: string;
+  label: string;
 }
 
 /**
  * Calculate standings from fixtures
  */
-function calculateStandings(fixtures: any[]) {
+function calculateStandings(fixtures: TrophyFixture[]) {
   const teamStats: Record<string, any> = {};
-  
-  fixtures.forEach((fixture: any) => {
+
+  fixtures.forEach((fixture) => {
     const homeId = fixture.home_team_id;
     const awayId = fixture.away_team_id;
     const homeScore = fixture.home_score || 0;
     const awayScore = fixture.away_score || 0;
-    
+
     if (!teamStats[homeId]) {
       teamStats[homeId] = {
         team_id: homeId,
@@ -484,12 +98,12 @@ function calculateStandings(fixtures: any[]) {
         goal_difference: 0
       };
     }
-    
+
     teamStats[homeId].goals_for += homeScore;
     teamStats[homeId].goals_against += awayScore;
     teamStats[awayId].goals_for += awayScore;
     teamStats[awayId].goals_against += homeScore;
-    
+
     if (homeScore > awayScore) {
       teamStats[homeId].wins++;
       teamStats[homeId].points += 3;
@@ -505,7 +119,7 @@ function calculateStandings(fixtures: any[]) {
       teamStats[awayId].points += 1;
     }
   });
-  
+
   const standings = Object.values(teamStats).map((team: any) => ({
     ...team,
     goal_difference: team.goals_for - team.goals_against
@@ -514,19 +128,358 @@ function calculateStandings(fixtures: any[]) {
     if (b.goal_difference !== a.goal_difference) return b.goal_difference - a.goal_difference;
     return b.goals_for - a.goals_for;
   });
-  
+
   // Add positions
   standings.forEach((team, index) => {
     team.position = index + 1;
   });
-  
+
   return standings;
 }
 
+/**
+ * Winner and runner-up of a tournament's final (a drawn final goes to the away team)
+ */
+function findFinalResult(knockoutFixtures: TrophyFixture[]) {
+  const rounds = [...new Set(knockoutFixtures.map(f => f.knockout_round as string))];
+
+  // Find the final - look for "Final" or "final" in the round name
+  let finalRound = rounds.find(r => r.toLowerCase().includes('final') && !r.toLowerCase().includes('semi'));
+  if (!finalRound) {
+    // Fallback: use the last round alphabetically
+    finalRound = rounds.sort().pop();
+  }
+  if (!finalRound) return null;
+
+  const finalFixture = knockoutFixtures.find(f => f.knockout_round === finalRound);
+  if (!finalFixture) return null;
+
+  const homeWon = (finalFixture.home_score ?? 0) > (finalFixture.away_score ?? 0);
+  const home = { id: finalFixture.home_team_id, name: finalFixture.home_team_name };
+  const away = { id: finalFixture.away_team_id, name: finalFixture.away_team_name };
+
+  return {
+    winner: homeWon ? home : away,
+    runnerUp: homeWon ? away : home
+  };
+}
+
+/**
+ * League trophy for a standings position (1 = Winner, 2 = Runner Up, ...)
+ */
+function leagueTrophy(position: number) {
+  if (position === 1) return { trophy_type: 'cup', trophy_position: 'Winner' };
+  if (position === 2) return { trophy_type: 'runner_up', trophy_position: 'Runner Up' };
+  if (position === 3) return { trophy_type: 'third_place', trophy_position: 'Third Place' };
+  return { trophy_type: 'special', trophy_position: `${position}${getOrdinalSuffix(position)} Place` };
+}
+
+/**
+ * Work out every trophy for a season from its completed fixtures.
+ *
+ * Fixtures are bucketed per tournament (league, group and knockout) in one
+ * pass, then each tournament is awarded by format:
+ * - Pure knockout, or group stage + knockout: knockout winner & runner-up
+ * - League + knockout: shield winner, then knockout winner & runner-up
+ * - Pure group stage: each group winner
+ * - Pure league: shield winner
+ * Tournaments without completed fixtures are skipped. The fantasy league
+ * winner, if any, is added last. Pure - no database access.
+ */
+export function evaluateSeasonTrophies(
+  tournaments: TrophyTournament[],
+  fixtures: TrophyFixture[],
+  fantasyWinner: FantasyWinner | null = null
+): PlannedTrophy[] {
+  const buckets = new Map(tournaments.map(t => [t.id, {
+    all: 0,
+    league: [] as TrophyFixture[],
+    knockout: [] as TrophyFixture[],
+    groups: new Map<string, TrophyFixture[]>()
+  }]));
+
+  for (const fixture of fixtures) {
+    const bucket = buckets.get(fixture.tournament_id);
+    if (!bucket) continue;
+    bucket.all++;
+    if (fixture.id && !fixture.id.includes('_ko_')) bucket.league.push(fixture);
+    if (fixture.knockout_round) bucket.knockout.push(fixture);
+    if (fixture.group_name) {
+      if (!bucket.groups.has(fixture.group_name)) bucket.groups.set(fixture.group_name, []);
+      bucket.groups.get(fixture.group_name)!.push(fixture);
+    }
+  }
+
+  const trophies: PlannedTrophy[] = [];
+
+  for (const tournament of tournaments) {
+    const bucket = buckets.get(tournament.id)!;
+    const name = tournament.tournament_name;
+    if (bucket.all === 0) continue;
+
+    const addLeagueWinner = (labelPrefix: string) => {
+      const [top] = calculateStandings(bucket.league);
+      if (!top) return;
+      const { trophy_type, trophy_position } = leagueTrophy(top.position);
+      trophies.push({
+        team_id: top.team_id,
+        team_name: top.team_name,
+        trophy_type,
+        trophy_name: name,
+        trophy_position,
+        position: top.position,
+        notes: 'Auto-awarded based on tournament standings',
+        tournament_name: name,
+        label: `${name} ${labelPrefix}${trophy_position}`
+      });
+    };
+
+    const addKnockout = (labelPrefix: string) => {
+      const result = findFinalResult(bucket.knockout);
+      if (!result) return;
+      trophies.push(
+        {
+          team_id: result.winner.id,
+          team_name: result.winner.name,
+          trophy_type: 'cup',
+          trophy_name: name,
+          trophy_position: 'Winner',
+          position: 1,
+          notes: 'Auto-awarded based on knockout final',
+          tournament_name: name,
+          label: `${name} ${labelPrefix}Winner`
+        },
+        {
+          team_id: result.runnerUp.id,
+          team_name: result.runnerUp.name,
+          trophy_type: 'runner_up',
+          trophy_name: name,
+          trophy_position: 'Runner Up',
+          position: 2,
+          notes: 'Auto-awarded based on knockout final',
+          tournament_name: name,
+          label: `${name} ${labelPrefix}Runner Up`
+        }
+      );
+    };
+
+    if (tournament.is_pure_knockout || (tournament.has_group_stage && tournament.has_knockout_stage)) {
+      // Knockout trophies only (not group winners)
+      addKnockout('');
+    } else if (tournament.has_knockout_stage) {
+      // Shield winner only (no runner-up), then the knockout trophies
+      addLeagueWinner('Shield ');
+      addKnockout('Knockout ');
+    } else if (tournament.has_group_stage) {
+      for (const [groupName, groupFixtures] of bucket.groups) {
+        const [winner] = calculateStandings(groupFixtures);
+        if (!winner) continue;
+        trophies.push({
+          team_id: winner.team_id,
+          team_name: winner.team_name,
+          trophy_type: 'special',
+          trophy_name: name,
+          trophy_position: `${groupName} Winner`,
+          position: 1,
+          notes: 'Auto-awarded as group stage winner',
+          tournament_name: name,
+          label: `${name} ${groupName} Winner`
+        });
+      }
+    } else {
+      addLeagueWinner('');
+    }
+  }
+
+  if (fantasyWinner) {
+    trophies.push({
+      team_id: fantasyWinner.team_id,
+      team_name: fantasyWinner.team_name,
+      trophy_type: 'special',
+      trophy_name: fantasyWinner.league_name,
+      trophy_position: 'Winner',
+      position: 1,
+      notes: null,
+      tournament_name: fantasyWinner.league_name,
+      label: `${fantasyWinner.league_name} Winner`
+    });
+  }
+
+  return trophies;
+}
+
+/**
+ * Key matching the team_trophies unique constraint
+ */
+function trophyKey(t: { team_id: string; trophy_name: string; trophy_position: string }) {
+  return `${t.team_id}|${t.trophy_name}|${t.trophy_position}`;
+}
+
+/**
+ * Top fantasy team for the season's fantasy league, if there is one
+ */
+async function loadFantasyWinner(seasonId: string): Promise<FantasyWinner | null> {
+  try {
+    const { getFantasyDb } = await import('@/lib/neon/fantasy-config');
+    const fantasySql = getFantasyDb();
+
+    const rows = await fantasySql`
+      SELECT fl.league_name, ft.team_id, ft.team_name, ft.total_points
+      FROM fantasy_leagues fl
+      JOIN LATERAL (
+        SELECT team_id, team_name, total_points
+        FROM fantasy_teams
+        WHERE league_id = fl.league_id
+        ORDER BY rank ASC NULLS LAST, total_points DESC
+        LIMIT 1
+      ) ft ON true
+      WHERE fl.season_id = ${seasonId}
+      LIMIT 1
+    `;
+
+    return rows.length > 0 ? (rows[0] as FantasyWinner) : null;
+  } catch (fantasyError) {
+    console.log(`  ⚠️  Could not fetch fantasy winner:`, fantasyError);
+    return null;
+  }
+}
+
+/**
+ * Load the season's tournaments, completed fixtures and fantasy winner, and
+ * evaluate them into a trophy plan. Shared by award and preview.
+ */
+async function buildSeasonTrophyPlan(seasonId: string) {
+  const sql = getTournamentDb();
+
+  const [tournaments, fixtures, fantasyWinner] = await Promise.all([
+    sql`
+      SELECT id, tournament_name, tournament_type, has_knockout_stage, is_pure_knockout, has_group_stage
+      FROM tournaments
+      WHERE season_id = ${seasonId}
+      ORDER BY is_primary DESC, display_order ASC
+    `,
+    sql`
+      SELECT
+        f.id, f.tournament_id, f.home_team_id, f.home_team_name, f.away_team_id, f.away_team_name,
+        f.home_score, f.away_score, f.knockout_round, f.group_name
+      FROM fixtures f
+      JOIN tournaments t ON t.id = f.tournament_id
+      WHERE t.season_id = ${seasonId}
+        AND f.status = 'completed'
+        AND f.result IS NOT NULL
+    `,
+    loadFantasyWinner(seasonId)
+  ]);
+
+  return {
+    tournamentCount: tournaments.length,
+    trophies: evaluateSeasonTrophies(
+      tournaments as TrophyTournament[],
+      fixtures as TrophyFixture[],
+      fantasyWinner
+    )
+  };
+}
+
+/**
+ * Auto-award trophies for all tournaments in a season
+ * Awards trophies based on tournament standings (league, group stage, knockout)
+ *
+ * @param seasonId - Season ID (e.g., "SSPSLS01")
+ * @param awardTopN - Number of positions to award for league tournaments (default: 2)
+ * @returns Result with awarded trophies
+ */
+export async function awardSeasonTrophies(
+  seasonId: string,
+  awardTopN: number = 2
+): Promise<TrophyAwardResult> {
+  try {
+    const sql = getTournamentDb();
+
+    console.log(`🏆 Starting trophy auto-award for season ${seasonId}...`);
+
+    const plan = await buildSeasonTrophyPlan(seasonId);
+
+    if (plan.tournamentCount === 0) {
+      return {
+        success: false,
+        trophiesAwarded: 0,
+        awards: [],
+        error: 'No tournaments found for this season'
+      };
+    }
+
+    // A team can earn the same trophy twice in one plan (e.g. shield and
+    // knockout winner of one tournament); the first entry wins, as before
+    const seen = new Set<string>();
+    const trophies = plan.trophies.filter(t => {
+      const key = trophyKey(t);
+      if (seen.has(key)) return false;
+      seen.add(key);
+      return true;
+    });
+
+    const inserted = trophies.length === 0 ? [] : await sql.query(`
+      INSERT INTO team_trophies (
+        team_id, team_name, season_id, trophy_type, trophy_name, trophy_position,
+        position, awarded_by, notes
+      )
+      SELECT t.team_id, t.team_name, $1, t.trophy_type, t.trophy_name, t.trophy_position,
+             t.position, 'system', t.notes
+      FROM UNNEST(
+        $2::text[], $3::text[], $4::text[], $5::text[], $6::text[], $7::int[], $8::text[]
+      ) AS t(team_id, team_name, trophy_type, trophy_name, trophy_position, position, notes)
+      ON CONFLICT (team_id, season_id, trophy_name, trophy_position) DO NOTHING
+      RETURNING team_id, trophy_name, trophy_position
+    `, [
+      seasonId,
+      trophies.map(t => t.team_id),
+      trophies.map(t => t.team_name),
+      trophies.map(t => t.trophy_type),
+      trophies.map(t => t.trophy_name),
+      trophies.map(t => t.trophy_position),
+      trophies.map(t => t.position),
+      trophies.map(t => t.notes)
+    ]);
+
+    const insertedKeys = new Set((inserted as any[]).map(trophyKey));
+    const awards = trophies
+      .filter(t => insertedKeys.has(trophyKey(t)))
+      .map(t => ({
+        team_id: t.team_id,
+        team_name: t.team_name,
+        trophy_type: t.trophy_type,
+        trophy_name: `${t.trophy_name} ${t.trophy_position}`,
+        position: t.position
+      }));
+
+    awards.forEach(a => console.log(`  ✅ ${a.team_name} - ${a.trophy_name}`));
+    console.log(`\n🏆 Trophy auto-award complete: ${awards.length} new trophies awarded (${trophies.length} planned)`);
+
+    // Season close: rebuild records and hall of fame from the full history
+    await refreshLeagueRecordsAfterChange();
+
+    return {
+      success: true,
+      trophiesAwarded: awards.length,
+      awards
+    };
+
+  } catch (error: any) {
+    console.error('❌ Error awarding season trophies:', error);
+    return {
+      success: false,
+      trophiesAwarded: 0,
+      awards: [],
+      error: error.message || 'Failed to award trophies'
+    };
+  }
+}
+
 /**
  * Get preview of trophies that would be awarded for all tournaments
  * Does NOT insert into database
- * 
+ *
  * @param seasonId - Season ID
  * @param awardTopN - Number of positions to preview for league tournaments
  * @returns Preview of awards that would be created
@@ -549,309 +502,39 @@ export async function previewSeasonTrophies(
 }> {
   try {
     const sql = getTournamentDb();
-    
-    // Get all tournaments in the season
-    const tournaments = await sql`
-      SELECT id, tournament_name, tournament_type, has_knockout_stage, is_pure_knockout, has_group_stage
-      FROM tournaments
-      WHERE season_id = ${seasonId}
-      ORDER BY is_primary DESC, display_order ASC
-    `;
-    
-    if (tournaments.length === 0) {
+
+    const [plan, existingTrophies] = await Promise.all([
+      buildSeasonTrophyPlan(seasonId),
+      sql`
+        SELECT team_id, trophy_name, trophy_position
+        FROM team_trophies
+        WHERE season_id = ${seasonId}
+      `
+    ]);
+
+    if (plan.tournamentCount === 0) {
       return {
         success: false,
         preview: [],
         error: 'No tournaments found for this season'
       };
     }
-    
-    // Get existing trophies
-    const existingTrophies = await sql`
-      SELECT team_id, trophy_name, trophy_position
-      FROM team_trophies
-      WHERE season_id = ${seasonId}
-    `;
-    
-    const existingMap = new Map<string, Set<string>>();
-    for (const trophy of existingTrophies) {
-      const key = `${trophy.trophy_name}|${trophy.trophy_position}`;
-      if (!existingMap.has(trophy.team_id)) {
-        existingMap.set(trophy.team_id, new Set());
-      }
-      existingMap.get(trophy.team_id)!.add(key);
-    }
-    
-    const preview = [];
-    
-    // Process each tournament
-    for (const tournament of tournaments) {
-      console.log(`\n📋 [PREVIEW] Processing tournament: ${tournament.tournament_name}`);
-      console.log(`   Type: ${tournament.tournament_type}`);
-      console.log(`   is_pure_knockout: ${tournament.is_pure_knockout}`);
-      console.log(`   has_knockout_stage: ${tournament.has_knockout_stage}`);
-      console.log(`   has_group_stage: ${tournament.has_group_stage}`);
-      
-      // Get fixtures for this tournament
-      const fixtures = await sql`
-        SELECT 
-          id, home_team_id, home_team_name, away_team_id, away_team_name,
-          home_score, away_score, knockout_round, group_name
-        FROM fixtures
-        WHERE tournament_id = ${tournament.id}
-          AND status = 'completed'
-          AND result IS NOT NULL
-      `;
-      
-      console.log(`   Total fixtures: ${fixtures.length}`);
-      
-      if (fixtures.length === 0) continue;
-      
-      // Generate preview based on tournament format
-      if (tournament.is_pure_knockout) {
-        console.log(`   🏆 Pure knockout tournament`);
-        // Pure knockout - show knockout trophies only
-        const knockoutFixtures = fixtures.filter((f: any) => f.knockout_round);
-        console.log(`   🔍 Found ${knockoutFixtures.length} knockout fixtures`);
-        const rounds = [...new Set(knockoutFixtures.map((f: any) => f.knockout_round))];
-        console.log(`   🔍 Knockout rounds: ${rounds.join(', ')}`);
-        
-        // Find the final
-        let finalRound = rounds.find((r: string) => r.toLowerCase().includes('final') && !r.toLowerCase().includes('semi'));
-        if (!finalRound) finalRound = rounds.sort().pop();
-        console.log(`   🏆 Final round: ${finalRound}`);
-        
-        if (finalRound) {
-          const finalFixture = knockoutFixtures.find((f: any) => f.knockout_round === finalRound);
-          if (finalFixture) {
-            console.log(`   📊 Final: ${finalFixture.home_team_name} ${finalFixture.home_score} - ${finalFixture.away_score} ${finalFixture.away_team_name}`);
-            
-            const winner = finalFixture.home_score > finalFixture.away_score
-              ? { id: finalFixture.home_team_id, name: finalFixture.home_team_name }
-              : { id: finalFixture.away_team_id, name: finalFixture.away_team_name };
-            
-            const runnerUp = finalFixture.home_score > finalFixture.away_score
-              ? { id: finalFixture.away_team_id, name: finalFixture.away_team_name }
-              : { id: finalFixture.home_team_id, name: finalFixture.home_team_name };
-            
-            console.log(`   🥇 Winner: ${winner.name}`);
-            console.log(`   🥈 Runner-up: ${runnerUp.name}`);
-            
-            preview.push({
-              team_id: winner.id,
-              team_name: winner.name,
-              position: 1,
-              trophy_name: `${tournament.tournament_name} Winner`,
-              trophy_type: 'cup',
-              tournament_name: tournament.tournament_name,
-              alreadyAwarded: existingMap.get(winner.id)?.has(`${tournament.tournament_name}|Winner`) || false
-            });
-            
-            preview.push({
-              team_id: runnerUp.id,
-              team_name: runnerUp.name,
-              position: 2,
-              trophy_name: `${tournament.tournament_name} Runner Up`,
-              trophy_type: 'runner_up',
-              tournament_name: tournament.tournament_name,
-              alreadyAwarded: existingMap.get(runnerUp.id)?.has(`${tournament.tournament_name}|Runner Up`) || false
-            });
-          }
-        }
-      } else if (tournament.has_group_stage && tournament.has_knockout_stage) {
-        console.log(`   🏆 Group + Knockout tournament - knockout trophies only`);
-        // Group + Knockout - show knockout trophies only (not group winners)
-        const knockoutFixtures = fixtures.filter((f: any) => f.knockout_round);
-        console.log(`   🔍 Found ${knockoutFixtures.length} knockout fixtures`);
-        const rounds = [...new Set(knockoutFixtures.map((f: any) => f.knockout_round))];
-        console.log(`   🔍 Knockout rounds: ${rounds.join(', ')}`);
-        
-        // Find the final
-        let finalRound = rounds.find((r: string) => r.toLowerCase().includes('final') && !r.toLowerCase().includes('semi'));
-        if (!finalRound) finalRound = rounds.sort().pop();
-        console.log(`   🏆 Final round: ${finalRound}`);
-        
-        if (finalRound) {
-          const finalFixture = knockoutFixtures.find((f: any) => f.knockout_round === finalRound);
-          if (finalFixture) {
-            console.log(`   📊 Final: ${finalFixture.home_team_name} ${finalFixture.home_score} - ${finalFixture.away_score} ${finalFixture.away_team_name}`);
-            
-            const winner = finalFixture.home_score > finalFixture.away_score
-              ? { id: finalFixture.home_team_id, name: finalFixture.home_team_name }
-              : { id: finalFixture.away_team_id, name: finalFixture.away_team_name };
-            
-            const runnerUp = finalFixture.home_score > finalFixture.away_score
-              ? { id: finalFixture.away_team_id, name: finalFixture.away_team_name }
-              : { id: finalFixture.home_team_id, name: finalFixture.home_team_name };
-            
-            console.log(`   🥇 Winner: ${winner.name}`);
-            console.log(`   🥈 Runner-up: ${runnerUp.name}`);
-            
-            preview.push({
-              team_id: winner.id,
-              team_name: winner.name,
-              position: 1,
-              trophy_name: `${tournament.tournament_name} Winner`,
-              trophy_type: 'cup',
-              tournament_name: tournament.tournament_name,
-              alreadyAwarded: existingMap.get(winner.id)?.has(`${tournament.tournament_name}|Winner`) || false
-            });
-            
-            preview.push({
-              team_id: runnerUp.id,
-              team_name: runnerUp.name,
-              position: 2,
-              trophy_name: `${tournament.tournament_name} Runner Up`,
-              trophy_type: 'runner_up',
-              tournament_name: tournament.tournament_name,
-              alreadyAwarded: existingMap.get(runnerUp.id)?.has(`${tournament.tournament_name}|Runner Up`) || false
-            });
-          }
-        }
-      } else if (tournament.has_knockout_stage) {
-        console.log(`   🏆 League + Knockout tournament`);
-        // League + Knockout - show shield winner + knockout winner & runner-up
-        
-        // Shield winner only (no runner-up)
-        const leagueFixtures = fixtures.filter((f: any) => f.id && !f.id.includes('_ko_'));
-        console.log(`   📊 League fixtures: ${leagueFixtures.length}`);
-        const standings = calculateStandings(leagueFixtures);
-        const topTeam = standings[0];  // Only top 1 (winner)
-        
-        if (topTeam) {
-          console.log(`   🥇 Shield Winner: ${topTeam.team_name}`);
-          preview.push({
-            team_id: topTeam.team_id,
-            team_name: topTeam.team_name,
-            position: 1,
-            trophy_name: `${tournament.tournament_name} Shield Winner`,
-            trophy_type: 'cup',
-            tournament_name: tournament.tournament_name,
-            alreadyAwarded: existingMap.get(topTeam.team_id)?.has(`${tournament.tournament_name}|Winner`) || false
-          });
-        }
-        
-        // Knockout trophies
-        const knockoutFixtures = fixtures.filter((f: any) => f.knockout_round);
-        console.log(`   🔍 Found ${knockoutFixtures.length} knockout fixtures`);
-        const rounds = [...new Set(knockoutFixtures.map((f: any) => f.knockout_round))];
-        console.log(`   🔍 Knockout rounds: ${rounds.join(', ')}`);
-        
-        // Find the final
-        let finalRound = rounds.find((r: string) => r.toLowerCase().includes('final') && !r.toLowerCase().includes('semi'));
-        if (!finalRound) finalRound = rounds.sort().pop();
-        console.log(`   🏆 Final round: ${finalRound}`);
-        
-        if (finalRound) {
-          const finalFixture = knockoutFixtures.find((f: any) => f.knockout_round === finalRound);
-          if (finalFixture) {
-            console.log(`   📊 Final: ${finalFixture.home_team_name} ${finalFixture.home_score} - ${finalFixture.away_score} ${finalFixture.away_team_name}`);
-            
-            const winner = finalFixture.home_score > finalFixture.away_score
-              ? { id: finalFixture.home_team_id, name: finalFixture.home_team_name }
-              : { id: finalFixture.away_team_id, name: finalFixture.away_team_name };
-            
-            const runnerUp = finalFixture.home_score > finalFixture.away_score
-              ? { id: finalFixture.away_team_id, name: finalFixture.away_team_name }
-              : { id: finalFixture.home_team_id, name: finalFixture.home_team_name };
-            
-            console.log(`   🥇 Knockout Winner: ${winner.name}`);
-            console.log(`   🥈 Knockout Runner-up: ${runnerUp.name}`);
-            
-            preview.push({
-              team_id: winner.id,
-              team_name: winner.name,
-              position: 1,
-              trophy_name: `${tournament.tournament_name} Knockout Winner`,
-              trophy_type: 'cup',
-              tournament_name: tournament.tournament_name,
-              alreadyAwarded: existingMap.get(winner.id)?.has(`${tournament.tournament_name}|Winner`) || false
-            });
-            
-            preview.push({
-              team_id: runnerUp.id,
-              team_name: runnerUp.name,
-              position: 2,
-              trophy_name: `${tournament.tournament_name} Knockout Runner Up`,
-              trophy_type: 'runner_up',
-              tournament_name: tournament.tournament_name,
-              alreadyAwarded: existingMap.get(runnerUp.id)?.has(`${tournament.tournament_name}|Runner Up`) || false
-            });
-          }
-        }
-      } else {
-        // Pure league - show shield winner only (no runner-up)
-        const leagueFixtures = fixtures.filter((f: any) => f.id && !f.id.includes('_ko_'));
-        const standings = calculateStandings(leagueFixtures);
-        const topTeams = standings.slice(0, 1);  // Only top 1 (winner)
-        
-        for (const team of topTeams) {
-          let trophyType = 'cup';
-          let trophyPosition = 'Winner';
-          
-          preview.push({
-            team_id: team.team_id,
-            team_name: team.team_name,
-            position: team.position,
-            trophy_name: `${tournament.tournament_name} ${trophyPosition}`,
-            trophy_type: trophyType,
-            tournament_name: tournament.tournament_name,
-            alreadyAwarded: existingMap.get(team.team_id)?.has(`${tournament.tournament_name}|${trophyPosition}`) || false
-          });
-        }
-      }
-    }
-    
-    // Add Fantasy League Winner
-    console.log(`\n📋 [PREVIEW] Checking for Fantasy League winner...`);
-    try {
-      const { getFantasyDb } = await import('@/lib/neon/fantasy-config');
-      const fantasySql = getFantasyDb();
-      
-      // Get fantasy league for this season
-      const fantasyLeagues = await fantasySql`
-        SELECT league_id, league_name
-        FROM fantasy_leagues
-        WHERE season_id = ${seasonId}
-        LIMIT 1
-      `;
-      
-      if (fantasyLeagues.length > 0) {
-        const fantasyLeague = fantasyLeagues[0];
-        console.log(`   Found fantasy league: ${fantasyLeague.league_name}`);
-        
-        // Get top fantasy team
-        const topTeam = await fantasySql`
-          SELECT team_id, team_name, total_points, rank
-          FROM fantasy_teams
-          WHERE league_id = ${fantasyLeague.league_id}
-          ORDER BY rank ASC NULLS LAST, total_points DESC
-          LIMIT 1
-        `;
-        
-        if (topTeam.length > 0) {
-          console.log(`   🥇 Fantasy Winner: ${topTeam[0].team_name} (${topTeam[0].total_points} pts)`);
-          
-          preview.push({
-            team_id: topTeam[0].team_id,
-            team_name: topTeam[0].team_name,
-            position: 1,
-            trophy_name: `${fantasyLeague.league_name} Winner`,
-            trophy_type: 'special',
-            tournament_name: fantasyLeague.league_name,
-            alreadyAwarded: existingMap.get(topTeam[0].team_id)?.has(`${fantasyLeague.league_name}|Winner`) || false
-          });
-        }
-      }
-    } catch (fantasyError) {
-      console.log(`   ⚠️  Could not fetch fantasy winner:`, fantasyError);
-    }
-    
+
+    const existing = new Set((existingTrophies as any[]).map(trophyKey));
+
     return {
       success: true,
-      preview
+      preview: plan.trophies.map(t => ({
+        team_id: t.team_id,
+        team_name: t.team_name,
+        position: t.position,
+        trophy_name: t.label,
+        trophy_type: t.trophy_type,
+        tournament_name: t.tournament_name,
+        alreadyAwarded: existing.has(trophyKey(t))
+      }))
     };
-    
+
   } catch (error: any) {
     console.error('Error previewing trophies:', error);
     return {
@@ -0,0 +1,111 @@
+import { describe, it, expect, vi, beforeEach } from 'vitest';
+import {
+  DEFAULT_STAR_RATING_TABLE,
+  buildStarRatingTable,
+  calculatePlayerCategories,
+  calculatePlayerCategory,
+  getBaseAuctionValue,
+  getBaseAuctionValues,
+  getInitialPoints,
+  getStarRatingTable,
+  invalidateStarRatingConfig,
+  loadStarRatingTable,
+  priceRealPlayers,
+} from './contracts';
+
+const seasonConfig = [
+  { star_rating: 3, starting_points: 90, base_auction_value: 110 },
+  { star_rating: 5, starting_points: 150, base_auction_value: 160 },
+];
+
+describe('star rating config', () => {
+  beforeEach(() => {
+    invalidateStarRatingConfig();
+  });
+
+  it('loads a season once for concurrent callers and then serves it synchronously', async () => {
+    const loader = vi.fn().mockResolvedValue(seasonConfig);
+
+    const [a, b] = await Promise.all([
+      loadStarRatingTable('SSPSLS16', loader),
+      loadStarRatingTable('SSPSLS16', loader),
+    ]);
+
+    expect(loader).toHaveBeenCalledTimes(1);
+    expect(a).toBe(b);
+    expect(getStarRatingTable('SSPSLS16')).toBe(a);
+    expect(a.baseAuctionValues[5]).toBe(160);
+  });
+
+  it('reloads after invalidation', async () => {
+    const loader = vi.fn().mockResolvedValue(seasonConfig);
+
+    await loadStarRatingTable('SSPSLS16', loader);
+    invalidateStarRatingConfig('SSPSLS16');
+
+    expect(getStarRatingTable('SSPSLS16')).toBeNull();
+    await loadStarRatingTable('SSPSLS16', loader);
+    expect(loader).toHaveBeenCalledTimes(2);
+  });
+
+  it('falls back to defaults without caching when the loader fails', async () => {
+    vi.spyOn(console, 'error').mockImplementation(() => {});
+    const loader = vi.fn().mockRejectedValue(new Error('offline'));
+
+    const table = await loadStarRatingTable('SSPSLS16', loader);
+
+    expect(table).toBe(DEFAULT_STAR_RATING_TABLE);
+    expect(getStarRatingTable('SSPSLS16')).toBeNull();
+  });
+
+  it('uses defaults when a season has no config', () => {
+    expect(buildStarRatingTable(null)).toEqual(DEFAULT_STAR_RATING_TABLE);
+    expect(DEFAULT_STAR_RATING_TABLE.baseAuctionValues[10]).toBe(400);
+    expect(DEFAULT_STAR_RATING_TABLE.startingPoints[10]).toBe(350);
+  });
+
+  it('fetches the API once for repeated async lookups', async () => {
+    const fetchMock = vi.fn().mockResolvedValue({
+      json: async () => ({ success: true, data: seasonConfig }),
+    });
+    vi.stubGlobal('fetch', fetchMock);
+
+    expect(await getBaseAuctionValue(3, 'SSPSLS16')).toBe(110);
+    expect(await getInitialPoints(5, 'SSPSLS16')).toBe(150);
+    expect(await getInitialPoints(7, 'SSPSLS16')).toBe(100);
+    expect(fetchMock).toHaveBeenCalledTimes(1);
+
+    vi.unstubAllGlobals();
+  });
+});
+
+describe('vectorized pricing', () => {
+  const table = buildStarRatingTable(seasonConfig);
+
+  it('maps star ratings to base auction values in order', () => {
+    expect(getBaseAuctionValues(table, [5, 3, 9])).toEqual([160, 110, 100]);
+  });
+
+  it('prices players at their auction value or the base value', () => {
+    expect(priceRealPlayers(table, [
+      { starRating: 5 },
+      { starRating: 3, auctionValue: 200 },
+    ])).toEqual([
+      { auctionValue: 160, points: 150, salaryPerMatch: (160 / 100) * 5 / 10 },
+      { auctionValue: 200, points: 90, salaryPerMatch: (200 / 100) * 3 / 10 },
+    ]);
+  });
+});
+
+describe('calculatePlayerCategories', () => {
+  it('matches calculatePlayerCategory for every player', () => {
+    const points = [180, 120, 215, 150, 150, 100, 150, 330, 100];
+    expect(calculatePlayerCategories(points)).toEqual(
+      points.map(p => calculatePlayerCategory(p, points))
+    );
+  });
+
+  it('returns no categories for an empty league', () => {
+    expect(calculatePlayerCategories([])).toEqual([]);
+  });
+});
@@ -29,34 +29,158 @@ export function getMinimumAuctionValue(starRating: number): number {
   return mapping[starRating] || 100;
 }
 
+/**
+ * Star rating configuration (per season, stored on the Firestore season doc)
+ */
+export interface StarRatingConfigItem {
+  star_rating: number;
+  starting_points: number;
+  base_auction_value: number;
+}
+
+export const DEFAULT_STAR_RATING_CONFIG: StarRatingConfigItem[] = [
+  { star_rating: 3, starting_points: 100, base_auction_value: 100 },
+  { star_rating: 4, starting_points: 120, base_auction_value: 120 },
+  { star_rating: 5, starting_points: 145, base_auction_value: 150 },
+  { star_rating: 6, starting_points: 175, base_auction_value: 180 },
+  { star_rating: 7, starting_points: 210, base_auction_value: 220 },
+  { star_rating: 8, starting_points: 250, base_auction_value: 270 },
+  { star_rating: 9, starting_points: 300, base_auction_value: 330 },
+  { star_rating: 10, starting_points: 350, base_auction_value: 400 },
+];
+
+/**
+ * Star rating config indexed by rating, for synchronous lookups
+ */
+export interface StarRatingTable {
+  baseAuctionValues: Record<number, number>;
+  startingPoints: Record<number, number>;
+}
+
+export type StarRatingConfigLoader = (seasonId: string) => Promise<StarRatingConfigItem[] | null>;
+
+export function buildStarRatingTable(config: StarRatingConfigItem[] | null | undefined): StarRatingTable {
+  const table: StarRatingTable = { baseAuctionValues: {}, startingPoints: {} };
+  for (const item of Array.isArray(config) && config.length > 0 ? config : DEFAULT_STAR_RATING_CONFIG) {
+    table.baseAuctionValues[item.star_rating] = item.base_auction_value;
+    table.startingPoints[item.star_rating] = item.starting_points;
+  }
+  return table;
+}
+
+export const DEFAULT_STAR_RATING_TABLE = buildStarRatingTable(DEFAULT_STAR_RATING_CONFIG);
+
+const STAR_RATING_CONFIG_TTL = 5 * 60 * 1000; // 5 minutes
+const starRatingTables = new Map<string, { table: StarRatingTable; expiresAt: number }>();
+const pendingStarRatingLoads = new Map<string, Promise<StarRatingTable>>();
+
+/**
+ * Default loader: the star-rating-config API (browser)
+ */
+async function fetchStarRatingConfig(seasonId: string): Promise<StarRatingConfigItem[] | null> {
+  const response = await fetch(`/api/star-rating-config?seasonId=${seasonId}`);
+  const result = await response.json();
+  return result.success ? result.data : null;
+}
+
+/**
+ * Load a season's star rating table once and cache it
+ * Concurrent callers share one load; on failure the defaults are returned (not cached)
+ */
+export async function loadStarRatingTable(
+  seasonId: string,
+  loader: StarRatingConfigLoader = fetchStarRatingConfig
+): Promise<StarRatingTable> {
+  const cached = getStarRatingTable(seasonId);
+  if (cached) return cached;
+
+  let pending = pendingStarRatingLoads.get(seasonId);
+  if (!pending) {
+    pending = loader(seasonId)
+      .then(config => {
+        const table = buildStarRatingTable(config);
+        starRatingTables.set(seasonId, { table, expiresAt: Date.now() + STAR_RATING_CONFIG_TTL });
+        return table;
+      })
+      .catch(error => {
+        console.error('Error fetching star rating config:', error);
+        return DEFAULT_STAR_RATING_TABLE;
+      })
+      .finally(() => pendingStarRatingLoads.delete(seasonId));
+    pendingStarRatingLoads.set(seasonId, pending);
+  }
+  return pending;
+}
+
+/**
+ * Cached star rating table for a season (synchronous), or null if not loaded
+ */
+export function getStarRatingTable(seasonId: string): StarRatingTable | null {
+  const entry = starRatingTables.get(seasonId);
+  if (!entry) return null;
+  if (entry.expiresAt <= Date.now()) {
+    starRatingTables.delete(seasonId);
+    return null;
+  }
+  return entry.table;
+}
+
+/**
+ * Drop cached star rating config (call after the config is edited)
+ * @param seasonId - Optional season to clear, or clear all if not provided
+ */
+export function invalidateStarRatingConfig(seasonId?: string): void {
+  if (seasonId) {
+    starRatingTables.delete(seasonId);
+  } else {
+    starRatingTables.clear();
+  }
+}
+
+/**
+ * Base auction value for a star rating from a loaded table
+ */
+export function lookupBaseAuctionValue(table: StarRatingTable, starRating: number): number {
+  return table.baseAuctionValues[starRating] || 100;
+}
+
+/**
+ * Initial points for a star rating from a loaded table
+ */
+export function lookupInitialPoints(table: StarRatingTable, starRating: number): number {
+  return table.startingPoints[starRating] || 100;
+}
+
 /**
  * Get base auction value for a star rating from season config
  */
 export async function getBaseAuctionValue(starRating: number, seasonId: string): Promise<number> {
-  try {
-    const response = await fetch(`/api/star-rating-config?seasonId=${seasonId}`);
-    const result = await response.json();
-    
-    if (result.success && result.data) {
-      const config = result.data.find((item: any) => item.star_rating === starRating);
-      return config?.base_auction_value || 100;
-    }
-  } catch (error) {
-    console.error('Error fetching star rating config:', error);
-  }
-  
-  // Fallback to hardcoded defaults
-  const mapping: { [key: number]: number } = {
-    3: 100,
-    4: 120,
-    5: 150,
-    6: 180,
-    7: 220,
-    8: 270,
-    9: 330,
-    10: 400,
-  };
-  return mapping[starRating] || 100;
+  return lookupBaseAuctionValue(await loadStarRatingTable(seasonId), starRating);
+}
+
+/**
+ * Base auction values for a list of star ratings (same order)
+ */
+export function getBaseAuctionValues(table: StarRatingTable, starRatings: number[]): number[] {
+  return starRatings.map(starRating => lookupBaseAuctionValue(table, starRating));
+}
+
+/**
+ * Starting price, points and salary for a list of real players (same order)
+ * Players without an auction value are priced at the base value for their rating
+ */
+export function priceRealPlayers(
+  table: StarRatingTable,
+  players: Array<{ starRating: number; auctionValue?: number | null }>
+): Array<{ auctionValue: number; points: number; salaryPerMatch: number }> {
+  return players.map(({ starRating, auctionValue }) => {
+    const value = auctionValue || lookupBaseAuctionValue(table, starRating);
+    return {
+      auctionValue: value,
+      points: lookupInitialPoints(table, starRating),
+      salaryPerMatch: calculateRealPlayerSalary(value, starRating),
+    };
+  });
 }
 
 /**
@@ -123,6 +247,20 @@ export function isContractExpired(
   return current > end;
 }
 
+/**
+ * Points assumed for a player with no recorded points, by star rating
+ */
+export const STAR_RATING_BASE_POINTS: { [key: number]: number } = {
+  3: 100,
+  4: 120,
+  5: 145,
+  6: 175,
+  7: 210,
+  8: 250,
+  9: 300,
+  10: 375, // average of 350-400
+};
+
 /**
  * Star rating thresholds based on points
  */
@@ -152,33 +290,10 @@ export function calculateStarRating(points: number): number {
 
 /**
  * Get initial points based on star rating
- * Fetches from season configuration in Firebase
+ * Uses the season's cached star rating config
  */
 export async function getInitialPoints(starRating: number, seasonId: string): Promise<number> {
-  try {
-    const response = await fetch(`/api/star-rating-config?seasonId=${seasonId}`);
-    const result = await response.json();
-    
-    if (result.success && result.data) {
-      const config = result.data.find((item: any) => item.star_rating === starRating);
-      return config?.starting_points || 100;
-    }
-  } catch (error) {
-    console.error('Error fetching star rating config:', error);
-  }
-  
-  // Fallback to hardcoded defaults
-  const mapping: { [key: number]: number } = {
-    3: 100,
-    4: 120,
-    5: 145,
-    6: 175,
-    7: 210,
-    8: 250,
-    9: 300,
-    10: 350,
-  };
-  return mapping[starRating] || 100;
+  return lookupInitialPoints(await loadStarRatingTable(seasonId), starRating);
 }
 
 /**
@@ -225,21 +340,35 @@ export function calculatePlayerCategory(
   return playerRank < legendThreshold ? 'legend' : 'classic';
 }
 
+/**
+ * Categories for a whole league in one sort (same order as the input)
+ * Same result as calculatePlayerCategory for each player: tied players share
+ * the rank of the first of them
+ */
+export function calculatePlayerCategories(allPlayerPoints: number[]): PlayerCategory[] {
+  const order = allPlayerPoints.map((_, index) => index).sort((a, b) => allPlayerPoints[b] - allPlayerPoints[a]);
+  const legendThreshold = Math.ceil(allPlayerPoints.length * 0.5);
+  const categories = new Array<PlayerCategory>(allPlayerPoints.length);
+
+  let rank = 0;
+  order.forEach((index, position) => {
+    if (position > 0 && allPlayerPoints[index] !== allPlayerPoints[order[position - 1]]) {
+      rank = position;
+    }
+    categories[index] = rank < legendThreshold ? 'legend' : 'classic';
+  });
+
+  return categories;
+}
+
 /**
  * Update all players' categories based on current points
  */
 export function updateAllPlayerCategories(
   players: RealPlayerData[]
 ): Map<string, PlayerCategory> {
-  const allPoints = players.map(p => p.points || 0);
-  const categoryMap = new Map<string, PlayerCategory>();
-  
-  players.forEach(player => {
-    const category = calculatePlayerCategory(player.points || 0, allPoints);
-    categoryMap.set(player.id, category);
-  });
-  
-  return categoryMap;
+  const categories = calculatePlayerCategories(players.map(p => p.points || 0));
+  return new Map(players.map((player, index) => [player.id, categories[index]]));
 }
 
 /**
@@ -282,11 +411,12 @@ export interface AssignRealPlayerContractData {
  * Create contract data for real player
  */
 export function createRealPlayerContract(
-  data: AssignRealPlayerContractData
+  data: AssignRealPlayerContractData,
+  starRatingTable: StarRatingTable = getStarRatingTable(data.startSeasonId) || DEFAULT_STAR_RATING_TABLE
 ): Partial<RealPlayerData> {
   const salaryPerMatch = calculateRealPlayerSalary(data.auctionValue, data.starRating);
   const contractEndSeason = calculateContractEndSeason(data.startSeasonId);
-  const initialPoints = getInitialPoints(data.starRating);
+  const initialPoints = lookupInitialPoints(starRatingTable, data.starRating);
   
   return {
     team_id: data.teamId,
@@ -0,0 +1,79 @@
+/**
+ * Tests for Fantasy Fixture Points
+ * Tests player scoring, captain multipliers and team affiliation bonuses
+ */
+
+import { describe, it, expect } from 'vitest';
+import {
+  DEFAULT_PLAYER_SCORING_RULES,
+  evaluateTeamBonus,
+  fantasyMultiplier,
+  scoreFantasyPlayer,
+  supportedTeamName,
+  supportsRealTeam
+} from './fixture-points';
+
+const defaultRules = new Map(DEFAULT_PLAYER_SCORING_RULES);
+
+describe('Fantasy Fixture Points', () => {
+  describe('scoreFantasyPlayer', () => {
+    it('should score goals, result, clean sheet and MOTM with default rules', () => {
+      const score = scoreFantasyPlayer(
+        { goals_scored: 2, goals_conceded: 0, result: 'win', is_motm: true, fine_goals: 0, substitution_penalty: 0 },
+        defaultRules
+      );
+
+      expect(score.breakdown).toMatchObject({ goals: 10, result: 3, clean_sheet: 4, motm: 5, brace: 0 });
+      expect(score.total).toBe(22);
+    });
+
+    it('should apply milestone rules when configured', () => {
+      const rules = new Map([['hat_trick', 6], ['concedes_4_plus_goals', -3], ['match_played', 1]]);
+      const score = scoreFantasyPlayer(
+        { goals_scored: 3, goals_conceded: 4, result: 'loss', is_motm: false, fine_goals: 0, substitution_penalty: 1 },
+        rules
+      );
+
+      expect(score.total).toBe(4);
+    });
+  });
+
+  describe('fantasyMultiplier', () => {
+    it('should double captains and add half for vice-captains', () => {
+      expect(fantasyMultiplier(true, false)).toEqual({ multiplier: 2, percentage: 200 });
+      expect(fantasyMultiplier(false, true)).toEqual({ multiplier: 1.5, percentage: 150 });
+      expect(fantasyMultiplier(false, false)).toEqual({ multiplier: 1, percentage: 100 });
+    });
+  });
+
+  describe('evaluateTeamBonus', () => {
+    it('should sum every rule that applies to the result', () => {
+      const rules = new Map([['win', 5], ['clean_sheet', 3], ['big_win', 2], ['narrow_win', 1]]);
+      const bonus = evaluateTeamBonus(rules, 4, 0);
+
+      expect(bonus.breakdown).toEqual({ win: 5, clean_sheet: 3, big_win: 2 });
+      expect(bonus.total).toBe(10);
+    });
+  });
+
+  describe('supported team changes', () => {
+    const change = {
+      old_supported_team_id: 'SSPSLT0001_SSPSLS16',
+      old_supported_team_name: 'Old FC',
+      new_supported_team_id: 'SSPSLT0002_SSPSLS16',
+      new_supported_team_name: 'New FC'
+    };
+
+    it('should use the old team up to the change round and the new team after', () => {
+      expect(supportsRealTeam('SSPSLT0002_SSPSLS16', change, 'SSPSLT0001', 13)).toBe(true);
+      expect(supportsRealTeam('SSPSLT0002_SSPSLS16', change, 'SSPSLT0001', 14)).toBe(false);
+      expect(supportsRealTeam('SSPSLT0002_SSPSLS16', change, 'SSPSLT0002', 14)).toBe(true);
+      expect(supportedTeamName('New FC', change, 13)).toBe('Old FC');
+    });
+
+    it('should match the supported team without a change', () => {
+      expect(supportsRealTeam('SSPSLT0003_SSPSLS16', undefined, 'SSPSLT0003', 5)).toBe(true);
+      expect(supportsRealTeam('SSPSLT00031_SSPSLS16', undefined, 'SSPSLT0003', 5)).toBe(false);
+    });
+  });
+});
@@ -0,0 +1,244 @@
+/**
+ * Fantasy Fixture Points
+ *
+ * Pure scoring helpers for a single fixture: per-player fantasy points
+ * (fantasy_player_points) and team affiliation bonuses
+ * (fantasy_team_bonus_points). Shared by the calculate-points and
+ * calculate-team-bonuses routes and the fixture result pipeline.
+ */
+
+export type FantasyResult = 'win' | 'draw' | 'loss';
+
+export interface FantasyPlayerPerformance {
+  goals_scored: number;
+  goals_conceded: number;
+  result: FantasyResult;
+  is_motm: boolean;
+  fine_goals: number;
+  substitution_penalty: number;
+}
+
+export interface FantasyScore {
+  breakdown: Record<string, number>;
+  total: number;
+}
+
+/**
+ * Rules used when a league has no active fantasy_scoring_rules
+ */
+export const DEFAULT_PLAYER_SCORING_RULES: ReadonlyArray<[string, number]> = [
+  ['goals_scored', 5],
+  ['goals_conceded', -1],
+  ['win', 3],
+  ['draw', 1],
+  ['loss', 0],
+  ['clean_sheet', 4],
+  ['motm', 5],
+  ['fine_goals', -2],
+  ['substitution_penalty', -1],
+];
+
+// Supported team changes apply from the round after this one
+export const TEAM_CHANGE_AFTER_ROUND = 13;
+
+/**
+ * Score one player's matchup (base points, before captain multipliers)
+ */
+export function scoreFantasyPlayer(
+  performance: FantasyPlayerPerformance,
+  rules: Map<string, number>
+): FantasyScore {
+  const { goals_scored, goals_conceded, result, is_motm, fine_goals, substitution_penalty } = performance;
+
+  const breakdown: Record<string, number> = {
+    goals: goals_scored * (rules.get('goals_scored') || 0),
+    conceded: goals_conceded * (rules.get('goals_conceded') || 0),
+    result: rules.get(result) || 0,
+    motm: is_motm ? (rules.get('motm') || 0) : 0,
+    fines: fine_goals * (rules.get('fine_goals') || 0),
+    clean_sheet: goals_conceded === 0 ? (rules.get('clean_sheet') || 0) : 0,
+    substitution: substitution_penalty > 0 ? (rules.get('substitution_penalty') || 0) : 0,
+  };
+
+  // Conditional bonuses based on goal milestones
+  if (goals_scored === 2) {
+    breakdown.brace = rules.get('brace') || 0;
+  }
+  if (goals_scored >= 3) {
+    breakdown.hat_trick = rules.get('hat_trick') || 0;
+  }
+  if (goals_scored >= 6) {
+    breakdown.scored_6_plus = rules.get('scored_6_plus_goals') || 0;
+  }
+
+  // Conditional penalties based on goals conceded
+  if (goals_conceded >= 4) {
+    breakdown.concedes_4_plus = rules.get('concedes_4_plus_goals') || 0;
+  }
+  if (goals_conceded >= 15) {
+    breakdown.concedes_15_plus = rules.get('concedes_15_plus_goals') || 0;
+  }
+
+  // Match played bonus (always awarded if player participated)
+  breakdown.match_played = rules.get('match_played') || 0;
+
+  const total = Object.values(breakdown).reduce((sum, val) => sum + val, 0);
+  return { breakdown, total };
+}
+
+/**
+ * Captain = 2x, Vice-Captain = 1.5x (percentage is what fantasy_player_points stores)
+ */
+export function fantasyMultiplier(isCaptain: boolean, isViceCaptain: boolean): { multiplier: number; percentage: number } {
+  if (isCaptain) return { multiplier: 2, percentage: 200 };
+  if (isViceCaptain) return { multiplier: 1.5, percentage: 150 };
+  return { multiplier: 1, percentage: 100 };
+}
+
+/**
+ * Apply every configured team rule to a real team's fixture result
+ */
+export function evaluateTeamBonus(
+  rules: Map<string, number>,
+  goalsScored: number,
+  goalsConceded: number
+): FantasyScore {
+  const won = goalsScored > goalsConceded;
+  const draw = goalsScored === goalsConceded;
+  const lost = goalsScored < goalsConceded;
+  const cleanSheet = goalsConceded === 0;
+  const margin = Math.abs(goalsScored - goalsConceded);
+
+  const breakdown: Record<string, number> = {};
+  let total = 0;
+
+  rules.forEach((points, ruleType) => {
+    let applies = false;
+
+    switch (ruleType) {
+      // Result-based rules
+      case 'win':
+        applies = won;
+        break;
+      case 'draw':
+        applies = draw;
+        break;
+      case 'loss':
+        applies = lost;
+        break;
+
+      // Defense-based rules
+      case 'clean_sheet':
+        applies = cleanSheet;
+        break;
+      case 'concedes_4_plus_goals':
+        applies = goalsConceded >= 4;
+        break;
+      case 'concedes_6_plus_goals':
+        applies = goalsConceded >= 6;
+        break;
+      case 'concedes_8_plus_goals':
+        applies = goalsConceded >= 8;
+        break;
+      case 'concedes_10_plus_goals':
+        applies = goalsConceded >= 10;
+        break;
+      case 'concedes_15_plus_goals':
+        applies = goalsConceded >= 15;
+        break;
+
+      // Attack-based rules
+      case 'scored_4_plus_goals':
+      case 'high_scoring':
+        applies = goalsScored >= 4;
+        break;
+      case 'scored_6_plus_goals':
+        applies = goalsScored >= 6;
+        break;
+      case 'scored_8_plus_goals':
+        applies = goalsScored >= 8;
+        break;
+      case 'scored_10_plus_goals':
+        applies = goalsScored >= 10;
+        break;
+      case 'scored_15_plus_goals':
+        applies = goalsScored >= 15;
+        break;
+
+      // Margin-based rules
+      case 'big_win':
+        applies = won && margin >= 3;
+        break;
+      case 'huge_win':
+        applies = won && margin >= 5;
+        break;
+      case 'narrow_win':
+        applies = won && margin === 1;
+        break;
+
+      // Combined rules
+      case 'shutout_win':
+        applies = won && cleanSheet;
+        break;
+
+      default:
+        // Unknown rule type - log warning but don't fail
+        console.log(`⚠️  Unknown team rule type: ${ruleType}`);
+        applies = false;
+    }
+
+    if (applies) {
+      breakdown[ruleType] = points;
+      total += points;
+    }
+  });
+
+  return { breakdown, total };
+}
+
+export interface SupportedTeamChange {
+  old_supported_team_id: string;
+  old_supported_team_name: string;
+  new_supported_team_id: string;
+  new_supported_team_name: string;
+}
+
+function matchesTeam(supportedTeamId: string | null | undefined, realTeamId: string): boolean {
+  // Match: SSPSLT0015 (fixture) against SSPSLT0015_SSPSLS16 (fantasy team)
+  return !!supportedTeamId && (supportedTeamId === realTeamId || supportedTeamId.startsWith(`${realTeamId}_`));
+}
+
+/**
+ * Whether a fantasy team was affiliated with a real team in the given round,
+ * honouring supported team changes (old team up to TEAM_CHANGE_AFTER_ROUND)
+ */
+export function supportsRealTeam(
+  supportedTeamId: string,
+  change: SupportedTeamChange | undefined,
+  realTeamId: string,
+  roundNumber: number
+): boolean {
+  if (!change) {
+    return matchesTeam(supportedTeamId, realTeamId);
+  }
+
+  if (roundNumber <= TEAM_CHANGE_AFTER_ROUND) {
+    return matchesTeam(change.old_supported_team_id, realTeamId);
+  }
+
+  return matchesTeam(change.new_supported_team_id, realTeamId) || matchesTeam(supportedTeamId, realTeamId);
+}
+
+/**
+ * Team name to record on a bonus (the old team name before the change round)
+ */
+export function supportedTeamName(
+  supportedTeamName: string,
+  change: SupportedTeamChange | undefined,
+  roundNumber: number
+): string {
+  if (change && roundNumber <= TEAM_CHANGE_AFTER_ROUND) {
+    return change.old_supported_team_name;
+  }
+  return supportedTeamName;
+}
@@ -4,6 +4,7 @@
 
 import { neon } from '@neondatabase/serverless';
 import { logAuctionWin } from './transaction-logger';
+import { recordReserveAllocation } from './reserve-calculator';
 import { getFirestore } from 'firebase-admin/firestore';
 import { triggerNews } from './news/trigger';
 import { broadcastSquadUpdate, broadcastWalletUpdate } from './realtime/broadcast';
@@ -385,6 +386,7 @@ export async function finalizeBulkTiebreaker(
         
         // Update Firebase
         await teamSeasonRef.update(updateData);
+        recordReserveAllocation(tiebreaker.current_highest_team_id, seasonId, winningAmount);
         
         // Log auction win transaction using firebase_uid
         if (firebaseUid) {
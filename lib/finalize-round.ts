@@ -5,7 +5,9 @@ import { createTiebreaker } from './tiebreaker';
 import { getTournamentDb } from './neon/tournament-config';
 import { logAuctionWin } from './transaction-logger';
 import { triggerNews } from './news/trigger';
-import { calculateReserveCore, ReserveConfig } from './reserve-calculator';
+import { refreshSeasonAggregatesAfterChange } from './neon/season-aggregates';
+import { calculateReserveCore, clearRoundReserves, recordReserveAllocation, ReserveConfig } from './reserve-calculator';
+import { toIncrementUpdate } from './player-transfers-v2';
 
 const sql = neon(process.env.DATABASE_URL || process.env.NEON_DATABASE_URL!);
 const tournamentSql = getTournamentDb();
@@ -527,7 +529,8 @@ export async function applyFinalizationResults(
     
     const roundStatus = roundDetails[0]?.status;
     if (roundStatus === 'completed') return { success: true };
-    if (roundStatus !== 'active' && roundStatus !== 'expired' && roundStatus !== 'tiebreaker_pending' && roundStatus !== 'pending_finalization') {
+    // 'finalizing' = claimed by the finalization worker / lazy finalization
+    if (roundStatus !== 'active' && roundStatus !== 'expired' && roundStatus !== 'finalizing' && roundStatus !== 'tiebreaker_pending' && roundStatus !== 'pending_finalization') {
       return { success: false, error: `Invalid status: ${roundStatus}` };
     }
     
@@ -586,23 +589,25 @@ export async function applyFinalizationResults(
           const curr = tsd?.currency_system || 'single';
           const budget = curr === 'dual' ? (tsd?.football_budget || 0) : (tsd?.budget || 0);
           const posCounts = tsd?.position_counts || {};
-          if (pos && pos in posCounts) posCounts[pos] = (posCounts[pos] || 0) + 1;
           
-          const upd: any = {
-            total_spent: (tsd?.total_spent || 0) + alloc.amount,
-            players_count: (tsd?.players_count || 0) + 1,
-            position_counts: posCounts,
-            updated_at: new Date()
+          // Increments, not read-modify-write: rounds of the same season are
+          // finalized concurrently and may allocate to the same team
+          const deltas: Record<string, number> = {
+            total_spent: alloc.amount,
+            players_count: 1,
           };
+          if (pos && pos in posCounts) deltas[`position_counts.${pos}`] = 1;
           
           if (curr === 'dual') {
-            upd.football_budget = budget - alloc.amount;
-            upd.football_spent = (tsd?.football_spent || 0) + alloc.amount;
+            deltas.football_budget = -alloc.amount;
+            deltas.football_spent = alloc.amount;
           } else {
-            upd.budget = budget - alloc.amount;
+            deltas.budget = -alloc.amount;
           }
+          const upd = toIncrementUpdate(deltas);
           
           await tsRef.update(upd);
+          recordReserveAllocation(alloc.team_id, seasonId, alloc.amount);
           await logAuctionWin(alloc.team_id, seasonId, alloc.player_name, alloc.player_id, 'football', alloc.amount, budget, roundId);
         }
       } catch {}
@@ -641,6 +646,12 @@ export async function applyFinalizationResults(
     }
 
     await sql`UPDATE rounds SET status = 'completed', updated_at = NOW() WHERE id = ${roundId}`;
+    clearRoundReserves(roundId);
+
+    await refreshSeasonAggregatesAfterChange(seasonId, {
+      teamIds: [...new Set(allocations.map(a => a.team_id))],
+      playerIds: allocations.map(a => a.player_id),
+    });
 
     try {
       const rRes = await sql`SELECT position FROM rounds WHERE id = ${roundId}`;
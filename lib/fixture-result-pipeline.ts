@@ -0,0 +1,1215 @@
+/**
+ * Fixture Result Pipeline
+ *
+ * Applies a fixture result (first submission or edit) in-process. The stored
+ * and submitted matchups are diffed once into per-player and per-team deltas,
+ * which are then written with bulk statements, one transaction per database:
+ *
+ * 1. Tournament DB: matchups, fixture, player_seasons stats / points / salary,
+ *    teamstats and the audit log
+ * 2. Firestore: team salary budgets (one batch) and their transaction logs
+ * 3. Fantasy DB: the fixture's fantasy_player_points and team bonus rows are
+ *    replaced; running totals subtract the rows deleted and add the rows
+ *    inserted, in the same statements
+ *
+ * Deltas are always taken against what is stored, so re-running an edit is a
+ * no-op and a failed step can't leave stats doubled.
+ */
+
+import { getTournamentDb } from './neon/tournament-config';
+import { getFantasyDb } from './neon/fantasy-config';
+import { recalculatePositions } from './neon/teamstats';
+import { refreshSeasonAggregatesAfterChange } from './neon/season-aggregates';
+import { refreshLeagueRecordsAfterChange } from './neon/league-records';
+import { adminDb } from './firebase/admin';
+import { calculateRealPlayerSalary, calculateStarRating, STAR_RATING_BASE_POINTS } from './contracts';
+import { logTransactions, TransactionData } from './transaction-logger';
+import { toIncrementUpdate } from './player-transfers-v2';
+import {
+  DEFAULT_PLAYER_SCORING_RULES,
+  evaluateTeamBonus,
+  fantasyMultiplier,
+  FantasyResult,
+  scoreFantasyPlayer,
+  SupportedTeamChange,
+  supportedTeamName,
+  supportsRealTeam
+} from './fantasy/fixture-points';
+
+export type MatchResult = 'home_win' | 'away_win' | 'draw';
+
+export interface ResultMatchup {
+  position: number;
+  home_player_id: string;
+  home_player_name: string;
+  away_player_id: string;
+  away_player_name: string;
+  home_goals: number | null;
+  away_goals: number | null;
+  home_sub_penalty?: number | string | null;
+  away_sub_penalty?: number | string | null;
+  is_null?: boolean | null;
+}
+
+export interface FixtureScore {
+  home_score: number;
+  away_score: number;
+  result: MatchResult;
+}
+
+/**
+ * Fixture totals: substitution penalties count for the opponent and fine
+ * penalty goals for the side they were awarded to. With win-based scoring
+ * each matchup is worth 3 / 1 / 0.
+ */
+export function computeFixtureScore(
+  matchups: ResultMatchup[],
+  scoringType: string,
+  homePenaltyGoals: number,
+  awayPenaltyGoals: number
+): FixtureScore {
+  let homeScore = 0;
+  let awayScore = 0;
+
+  for (const m of matchups) {
+    const homeGoals = m.home_goals || 0;
+    const awayGoals = m.away_goals || 0;
+    const homeSubPenalty = Number(m.home_sub_penalty) || 0;
+    const awaySubPenalty = Number(m.away_sub_penalty) || 0;
+
+    if (scoringType === 'wins') {
+      const homeMatchupScore = homeGoals + awaySubPenalty;
+      const awayMatchupScore = awayGoals + homeSubPenalty;
+
+      if (homeMatchupScore > awayMatchupScore) {
+        homeScore += 3;
+      } else if (awayMatchupScore > homeMatchupScore) {
+        awayScore += 3;
+      } else {
+        homeScore += 1;
+        awayScore += 1;
+      }
+    } else {
+      homeScore += homeGoals + awaySubPenalty;
+      awayScore += awayGoals + homeSubPenalty;
+    }
+  }
+
+  homeScore += homePenaltyGoals;
+  awayScore += awayPenaltyGoals;
+
+  return {
+    home_score: homeScore,
+    away_score: awayScore,
+    result: homeScore > awayScore ? 'home_win' : awayScore > homeScore ? 'away_win' : 'draw'
+  };
+}
+
+function isPlayed(m: ResultMatchup): boolean {
+  return !!m.home_player_id && !!m.away_player_id && m.home_goals != null && m.away_goals != null;
+}
+
+const CONTRIBUTION_FIELDS = [
+  'matches_played',
+  'goals_scored',
+  'goals_conceded',
+  'wins',
+  'draws',
+  'losses',
+  'clean_sheets',
+  'motm_awards',
+  'points'
+] as const;
+
+type ContributionField = typeof CONTRIBUTION_FIELDS[number];
+
+/**
+ * What one fixture adds to a player's season row. `points` is the star
+ * rating change: goal difference capped at ±5 per matchup.
+ */
+export type PlayerContribution = { player_id: string; player_name: string } & Record<ContributionField, number>;
+
+/**
+ * Per-player contribution of a set of matchups (NULL matchups don't count)
+ */
+export function playerContributions(
+  matchups: ResultMatchup[] | null,
+  motmPlayerId: string | null
+): Map<string, PlayerContribution> {
+  const contributions = new Map<string, PlayerContribution>();
+  if (!matchups) return contributions;
+
+  const add = (playerId: string, playerName: string, scored: number, conceded: number) => {
+    let c = contributions.get(playerId);
+    if (!c) {
+      c = { player_id: playerId, player_name: playerName } as PlayerContribution;
+      CONTRIBUTION_FIELDS.forEach(field => { c![field] = 0; });
+      contributions.set(playerId, c);
+    }
+    c.matches_played += 1;
+    c.goals_scored += scored;
+    c.goals_conceded += conceded;
+    c.wins += scored > conceded ? 1 : 0;
+    c.draws += scored === conceded ? 1 : 0;
+    c.losses += scored < conceded ? 1 : 0;
+    c.clean_sheets += conceded === 0 ? 1 : 0;
+    c.points += Math.max(-5, Math.min(5, scored - conceded));
+  };
+
+  for (const m of matchups) {
+    if (!isPlayed(m) || m.is_null) continue;
+    add(m.home_player_id, m.home_player_name, m.home_goals!, m.away_goals!);
+    add(m.away_player_id, m.away_player_name, m.away_goals!, m.home_goals!);
+  }
+
+  const motm = motmPlayerId ? contributions.get(motmPlayerId) : undefined;
+  if (motm) motm.motm_awards = 1;
+
+  return contributions;
+}
+
+export type PlayerStatDelta = PlayerContribution & {
+  was_counted: boolean; // fixture was in the player's processed_fixtures before
+  is_counted: boolean;  // fixture is in the player's processed_fixtures after
+};
+
+/**
+ * New minus old contribution for every player in either set (unchanged players dropped)
+ */
+export function diffPlayerContributions(
+  before: Map<string, PlayerContribution>,
+  after: Map<string, PlayerContribution>
+): PlayerStatDelta[] {
+  const deltas: PlayerStatDelta[] = [];
+  const playerIds = new Set([...before.keys(), ...after.keys()]);
+
+  for (const playerId of playerIds) {
+    const old = before.get(playerId);
+    const next = after.get(playerId);
+    const delta = {
+      player_id: playerId,
+      player_name: (next || old)!.player_name,
+      was_counted: !!old,
+      is_counted: !!next
+    } as PlayerStatDelta;
+
+    let changed = delta.was_counted !== delta.is_counted;
+    for (const field of CONTRIBUTION_FIELDS) {
+      delta[field] = (next?.[field] || 0) - (old?.[field] || 0);
+      if (delta[field] !== 0) changed = true;
+    }
+
+    if (changed) deltas.push(delta);
+  }
+
+  return deltas;
+}
+
+export type SalaryReason = 'match' | 'result_edit_player_added' | 'result_edit_player_removed';
+
+export interface SalaryCharge {
+  player_id: string;
+  player_name: string;
+  reason: SalaryReason;
+}
+
+function sidePlayer(m: ResultMatchup, side: 'home' | 'away') {
+  return side === 'home'
+    ? { player_id: m.home_player_id, player_name: m.home_player_name }
+    : { player_id: m.away_player_id, player_name: m.away_player_name };
+}
+
+/**
+ * Salary charges for a result. A first submission charges every player who
+ * took part (NULL matchups included); an edit only refunds players swapped
+ * out and charges the players who replaced them.
+ */
+export function salaryCharges(before: ResultMatchup[] | null, after: ResultMatchup[]): SalaryCharge[] {
+  const charges: SalaryCharge[] = [];
+
+  if (!before) {
+    for (const m of after) {
+      if (!isPlayed(m)) continue;
+      charges.push({ ...sidePlayer(m, 'home'), reason: 'match' });
+      charges.push({ ...sidePlayer(m, 'away'), reason: 'match' });
+    }
+    return charges;
+  }
+
+  const beforeByPosition = new Map(before.map(m => [m.position, m]));
+  for (const m of after) {
+    const old = beforeByPosition.get(m.position);
+    if (!old) continue;
+
+    for (const side of ['home', 'away'] as const) {
+      const removed = sidePlayer(old, side);
+      const added = sidePlayer(m, side);
+      if (removed.player_id === added.player_id) continue;
+      if (removed.player_id) charges.push({ ...removed, reason: 'result_edit_player_removed' });
+      if (added.player_id) charges.push({ ...added, reason: 'result_edit_player_added' });
+    }
+  }
+
+  return charges;
+}
+
+export interface TeamFixtureEntry {
+  fixture_id: string;
+  goals_for: number;
+  goals_against: number;
+  won: boolean;
+  draw: boolean;
+  lost: boolean;
+}
+
+/**
+ * The processed_fixtures entries for both teams. Goals exclude substitution
+ * penalties but include fine penalty goals; with win-based scoring the
+ * result follows the fixture score instead of goals.
+ */
+export function teamFixtureEntries(
+  fixtureId: string,
+  matchups: ResultMatchup[],
+  score: FixtureScore,
+  homePenaltyGoals: number,
+  awayPenaltyGoals: number,
+  scoringType: string
+): { home: TeamFixtureEntry; away: TeamFixtureEntry } {
+  let homeGoals = homePenaltyGoals;
+  let awayGoals = awayPenaltyGoals;
+  for (const m of matchups) {
+    if (m.home_goals != null && m.away_goals != null) {
+      homeGoals += m.home_goals;
+      awayGoals += m.away_goals;
+    }
+  }
+
+  const [homeFor, awayFor] = scoringType === 'wins'
+    ? [score.home_score, score.away_score]
+    : [homeGoals, awayGoals];
+
+  const entry = (goalsFor: number, goalsAgainst: number, resultFor: number, resultAgainst: number): TeamFixtureEntry => ({
+    fixture_id: fixtureId,
+    goals_for: goalsFor,
+    goals_against: goalsAgainst,
+    won: resultFor > resultAgainst,
+    draw: resultFor === resultAgainst,
+    lost: resultFor < resultAgainst
+  });
+
+  return {
+    home: entry(homeGoals, awayGoals, homeFor, awayFor),
+    away: entry(awayGoals, homeGoals, awayFor, homeFor)
+  };
+}
+
+export interface TeamStatsRow {
+  id: string;
+  matches_played: number;
+  wins: number;
+  draws: number;
+  losses: number;
+  goals_for: number;
+  goals_against: number;
+  goal_difference: number;
+  points: number;
+  current_form: string;
+  win_streak: number;
+  unbeaten_streak: number;
+  processed_fixtures: TeamFixtureEntry[];
+}
+
+const resultChar = (e: TeamFixtureEntry) => (e.won ? 'W' : e.draw ? 'D' : 'L');
+
+/**
+ * Apply a fixture entry to a teamstats row. An entry already in
+ * processed_fixtures is replaced in place (its old numbers subtracted), and
+ * form / streaks are rebuilt from processed_fixtures if its result changed.
+ */
+export function applyTeamFixtureEntry(current: any, entry: TeamFixtureEntry): TeamStatsRow {
+  let processed: TeamFixtureEntry[] = current.processed_fixtures || [];
+  if (typeof processed === 'string') processed = JSON.parse(processed);
+  processed = [...processed];
+
+  let matches = current.matches_played || 0;
+  let goalsFor = current.goals_for || 0;
+  let goalsAgainst = current.goals_against || 0;
+  let wins = current.wins || 0;
+  let draws = current.draws || 0;
+  let losses = current.losses || 0;
+  let form: string = current.current_form || '';
+  let winStreak = current.win_streak || 0;
+  let unbeatenStreak = current.unbeaten_streak || 0;
+
+  const index = processed.findIndex(f => f.fixture_id === entry.fixture_id);
+
+  if (index >= 0) {
+    const old = processed[index];
+    goalsFor += entry.goals_for - old.goals_for;
+    goalsAgainst += entry.goals_against - old.goals_against;
+    wins += (entry.won ? 1 : 0) - (old.won ? 1 : 0);
+    draws += (entry.draw ? 1 : 0) - (old.draw ? 1 : 0);
+    losses += (entry.lost ? 1 : 0) - (old.lost ? 1 : 0);
+    processed[index] = entry;
+
+    if (resultChar(old) !== resultChar(entry)) {
+      const results = processed.map(resultChar);
+      form = results.join('').slice(-5);
+      winStreak = 0;
+      unbeatenStreak = 0;
+      for (let i = results.length - 1; i >= 0 && results[i] === 'W'; i--) winStreak++;
+      for (let i = results.length - 1; i >= 0 && results[i] !== 'L'; i--) unbeatenStreak++;
+    }
+  } else {
+    matches += 1;
+    goalsFor += entry.goals_for;
+    goalsAgainst += entry.goals_against;
+    wins += entry.won ? 1 : 0;
+    draws += entry.draw ? 1 : 0;
+    losses += entry.lost ? 1 : 0;
+    processed.push(entry);
+
+    form = (form + resultChar(entry)).slice(-5); // Keep last 5
+    winStreak = entry.won ? winStreak + 1 : 0;
+    unbeatenStreak = entry.won || entry.draw ? unbeatenStreak + 1 : 0;
+  }
+
+  return {
+    id: current.id,
+    matches_played: matches,
+    wins,
+    draws,
+    losses,
+    goals_for: goalsFor,
+    goals_against: goalsAgainst,
+    goal_difference: goalsFor - goalsAgainst,
+    points: (wins * 3) + draws,
+    current_form: form,
+    win_streak: winStreak,
+    unbeaten_streak: unbeatenStreak,
+    processed_fixtures: processed
+  };
+}
+
+export interface FixtureResultInput {
+  matchups: { position: number; home_goals: number | null; away_goals: number | null }[];
+  motm_player_id?: string | null;
+  motm_player_name?: string | null;
+  home_penalty_goals?: number | string | null;
+  away_penalty_goals?: number | string | null;
+  edited_by?: string;
+  edited_by_name?: string;
+  edit_reason?: string;
+}
+
+export interface SalaryApplyResult {
+  applied: (SalaryCharge & { team_id: string; amount: number; balance_before: number; balance_after: number })[];
+  skipped: (SalaryCharge & { error: string })[];
+}
+
+export interface FantasyApplyResult {
+  reverted: number;
+  awarded: number;
+  bonuses: number;
+  teams_affected: number;
+}
+
+export interface FixtureResultOutcome {
+  isFirstSubmit: boolean;
+  oldResult: MatchResult | null;
+  score: FixtureScore;
+  motm_player_id: string | null;
+  motm_player_name: string | null;
+  oldMatchups: ResultMatchup[];
+  newMatchups: ResultMatchup[];
+  playersUpdated: number;
+  salary: SalaryApplyResult;
+  fantasy: FantasyApplyResult | null;
+}
+
+/**
+ * Fixture row with the scoring settings the pipeline needs (null if missing)
+ */
+export async function getFixtureForResult(fixtureId: string): Promise<any | null> {
+  const sql = getTournamentDb();
+  const fixtures = await sql`
+    SELECT f.*, ts.scoring_type, f.knockout_format, f.scoring_system, t.include_in_fantasy
+    FROM fixtures f
+    LEFT JOIN tournaments t ON f.tournament_id = t.id
+    LEFT JOIN tournament_settings ts ON t.id = ts.tournament_id
+    WHERE f.id = ${fixtureId}
+    LIMIT 1
+  `;
+  return fixtures[0] || null;
+}
+
+/**
+ * Apply a submitted or edited result to every store that derives from it
+ *
+ * The Tournament DB transaction is the point of no return: if it fails
+ * nothing has changed. Salary and fantasy updates run after it and report
+ * failures without throwing, as the chained endpoints did.
+ */
+export async function applyFixtureResult(fixture: any, input: FixtureResultInput): Promise<FixtureResultOutcome> {
+  const sql = getTournamentDb();
+  const fixtureId: string = fixture.id;
+  const seasonId: string = fixture.season_id;
+  const scoringType: string = fixture.scoring_system || fixture.scoring_type || 'goals';
+  const isFirstSubmit = fixture.status !== 'completed';
+
+  const oldMatchups = await sql`
+    SELECT * FROM matchups WHERE fixture_id = ${fixtureId} ORDER BY position ASC
+  ` as ResultMatchup[];
+
+  // Keep stored player IDs, substitutions and is_null; take scores from the request
+  const newMatchups: ResultMatchup[] = input.matchups.map(m => {
+    const oldM = oldMatchups.find(om => om.position === m.position);
+    if (!oldM) {
+      throw new Error(`Matchup at position ${m.position} not found in database`);
+    }
+    return { ...oldM, home_goals: m.home_goals, away_goals: m.away_goals };
+  });
+
+  const homePenaltyGoals = input.home_penalty_goals !== undefined
+    ? (Number(input.home_penalty_goals) || 0)
+    : (Number(fixture.home_penalty_goals) || 0);
+  const awayPenaltyGoals = input.away_penalty_goals !== undefined
+    ? (Number(input.away_penalty_goals) || 0)
+    : (Number(fixture.away_penalty_goals) || 0);
+  let motmPlayerId: string | null = input.motm_player_id !== undefined ? input.motm_player_id : (fixture.motm_player_id || null);
+  let motmPlayerName: string | null = input.motm_player_name !== undefined ? input.motm_player_name : (fixture.motm_player_name || null);
+
+  // Clear MOTM if the player is no longer in the match
+  if (motmPlayerId && !newMatchups.some(m => m.home_player_id === motmPlayerId || m.away_player_id === motmPlayerId)) {
+    console.log(`⚠️ MOTM player ${motmPlayerName} was removed from match - clearing MOTM`);
+    motmPlayerId = null;
+    motmPlayerName = null;
+  }
+
+  const score = computeFixtureScore(newMatchups, scoringType, homePenaltyGoals, awayPenaltyGoals);
+  const before = isFirstSubmit ? null : oldMatchups;
+
+  const playerDeltas = diffPlayerContributions(
+    playerContributions(before, fixture.motm_player_id || null),
+    playerContributions(newMatchups, motmPlayerId)
+  );
+  const charges = salaryCharges(before, newMatchups);
+
+  // One snapshot read per table
+  const playerIds = [...new Set([...playerDeltas.map(d => d.player_id), ...charges.map(c => c.player_id)])];
+  const teamEntries = teamFixtureEntries(fixtureId, newMatchups, score, homePenaltyGoals, awayPenaltyGoals, scoringType);
+  const teamStatsIds = [fixture.home_team_id, fixture.away_team_id].map(teamId => `${teamId}_${seasonId}_${fixture.tournament_id}`);
+
+  const [seasonRows, teamRows] = await Promise.all([
+    playerIds.length > 0
+      ? sql`
+          SELECT id, player_id, player_name, team_id, points, star_rating, salary_per_match, auction_value
+          FROM player_seasons
+          WHERE id = ANY(${playerIds.map(id => `${id}_${seasonId}`)})
+        `
+      : Promise.resolve([] as any[]),
+    sql`SELECT * FROM teamstats WHERE id = ANY(${teamStatsIds})`
+  ]);
+  const playerSeasons = new Map<string, any>(seasonRows.map((row: any) => [row.player_id, row]));
+
+  // Star rating points, rating and salary per player (stats are added in SQL)
+  const playerUpdates = playerDeltas.flatMap(delta => {
+    const row = playerSeasons.get(delta.player_id);
+    if (!row) {
+      console.warn(`⚠️  ${delta.player_name} (${delta.player_id}) not found in player_seasons for season ${seasonId}`);
+      return [];
+    }
+    const currentPoints = row.points || STAR_RATING_BASE_POINTS[row.star_rating || 3];
+    const newPoints = Math.max(100, currentPoints + delta.points); // 3-star baseline
+    const newStarRating = calculateStarRating(newPoints);
+    const currentSalary = parseFloat(row.salary_per_match) || 0;
+    const newSalary = newStarRating !== (row.star_rating || 3)
+      ? calculateRealPlayerSalary(row.auction_value || 0, newStarRating)
+      : currentSalary;
+    return [{ ...delta, id: row.id, new_points: newPoints, star_rating: newStarRating, salary_per_match: newSalary }];
+  });
+
+  const teamUpdates = teamRows.map((row: any) =>
+    applyTeamFixtureEntry(row, row.id === teamStatsIds[0] ? teamEntries.home : teamEntries.away)
+  );
+  if (teamRows.length < 2) {
+    console.warn(`⚠ Team stats not found for ${teamStatsIds.join(' / ')}; stats must be created before processing fixtures.`);
+  }
+
+  const statements = [
+    sql`
+      UPDATE matchups m
+      SET home_goals = u.home_goals, away_goals = u.away_goals, updated_at = NOW()
+      FROM UNNEST(
+        ${newMatchups.map(m => m.position)}::int[],
+        ${newMatchups.map(m => m.home_goals)}::int[],
+        ${newMatchups.map(m => m.away_goals)}::int[]
+      ) AS u(position, home_goals, away_goals)
+      WHERE m.fixture_id = ${fixtureId} AND m.position = u.position
+    `,
+    sql`
+      UPDATE fixtures
+      SET
+        home_score = ${score.home_score},
+        away_score = ${score.away_score},
+        result = ${score.result},
+        status = 'completed',
+        motm_player_id = ${motmPlayerId},
+        motm_player_name = ${motmPlayerName},
+        home_penalty_goals = ${homePenaltyGoals},
+        away_penalty_goals = ${awayPenaltyGoals},
+        played_date = NOW(),
+        updated_at = NOW()
+      WHERE id = ${fixtureId}
+    `
+  ];
+
+  if (playerUpdates.length > 0) {
+    // Rows whose processed_fixtures disagree with the delta's assumption were
+    // already updated by another submission and are left alone
+    statements.push(sql`
+      UPDATE player_seasons ps
+      SET
+        matches_played = GREATEST(0, COALESCE(ps.matches_played, 0) + d.matches_played),
+        goals_scored = GREATEST(0, COALESCE(ps.goals_scored, 0) + d.goals_scored),
+        goals_conceded = GREATEST(0, COALESCE(ps.goals_conceded, 0) + d.goals_conceded),
+        wins = GREATEST(0, COALESCE(ps.wins, 0) + d.wins),
+        draws = GREATEST(0, COALESCE(ps.draws, 0) + d.draws),
+        losses = GREATEST(0, COALESCE(ps.losses, 0) + d.losses),
+        clean_sheets = GREATEST(0, COALESCE(ps.clean_sheets, 0) + d.clean_sheets),
+        motm_awards = GREATEST(0, COALESCE(ps.motm_awards, 0) + d.motm_awards),
+        points = d.points,
+        star_rating = d.star_rating,
+        salary_per_match = d.salary_per_match,
+        processed_fixtures = CASE
+          WHEN d.is_counted THEN (COALESCE(ps.processed_fixtures, '[]'::jsonb) - ${fixtureId}::text) || to_jsonb(${fixtureId}::text)
+          ELSE COALESCE(ps.processed_fixtures, '[]'::jsonb) - ${fixtureId}::text
+        END,
+        updated_at = NOW()
+      FROM UNNEST(
+        ${playerUpdates.map(u => u.id)}::text[],
+        ${playerUpdates.map(u => u.matches_played)}::int[],
+        ${playerUpdates.map(u => u.goals_scored)}::int[],
+        ${playerUpdates.map(u => u.goals_conceded)}::int[],
+        ${playerUpdates.map(u => u.wins)}::int[],
+        ${playerUpdates.map(u => u.draws)}::int[],
+        ${playerUpdates.map(u => u.losses)}::int[],
+        ${playerUpdates.map(u => u.clean_sheets)}::int[],
+        ${playerUpdates.map(u => u.motm_awards)}::int[],
+        ${playerUpdates.map(u => u.new_points)}::int[],
+        ${playerUpdates.map(u => u.star_rating)}::int[],
+        ${playerUpdates.map(u => u.salary_per_match)}::numeric[],
+        ${playerUpdates.map(u => u.was_counted)}::boolean[],
+        ${playerUpdates.map(u => u.is_counted)}::boolean[]
+      ) AS d(
+        id, matches_played, goals_scored, goals_conceded, wins, draws, losses,
+        clean_sheets, motm_awards, points, star_rating, salary_per_match, was_counted, is_counted
+      )
+      WHERE ps.id = d.id
+        AND (COALESCE(ps.processed_fixtures, '[]'::jsonb) ? ${fixtureId}) = d.was_counted
+    `);
+  }
+
+  if (teamUpdates.length > 0) {
+    statements.push(sql`
+      UPDATE teamstats t
+      SET
+        matches_played = u.matches_played,
+        wins = u.wins,
+        draws = u.draws,
+        losses = u.losses,
+        goals_for = u.goals_for,
+        goals_against = u.goals_against,
+        goal_difference = u.goal_difference,
+        points = u.points,
+        current_form = u.current_form,
+        win_streak = u.win_streak,
+        unbeaten_streak = u.unbeaten_streak,
+        processed_fixtures = u.processed_fixtures::jsonb,
+        updated_at = NOW()
+      FROM UNNEST(
+        ${teamUpdates.map(u => u.id)}::text[],
+        ${teamUpdates.map(u => u.matches_played)}::int[],
+        ${teamUpdates.map(u => u.wins)}::int[],
+        ${teamUpdates.map(u => u.draws)}::int[],
+        ${teamUpdates.map(u => u.losses)}::int[],
+        ${teamUpdates.map(u => u.goals_for)}::int[],
+        ${teamUpdates.map(u => u.goals_against)}::int[],
+        ${teamUpdates.map(u => u.goal_difference)}::int[],
+        ${teamUpdates.map(u => u.points)}::int[],
+        ${teamUpdates.map(u => u.current_form)}::text[],
+        ${teamUpdates.map(u => u.win_streak)}::int[],
+        ${teamUpdates.map(u => u.unbeaten_streak)}::int[],
+        ${teamUpdates.map(u => JSON.stringify(u.processed_fixtures))}::text[]
+      ) AS u(
+        id, matches_played, wins, draws, losses, goals_for, goals_against, goal_difference,
+        points, current_form, win_streak, unbeaten_streak, processed_fixtures
+      )
+      WHERE t.id = u.id
+    `);
+  }
+
+  statements.push(sql`
+    INSERT INTO fixture_audit_log (
+      fixture_id,
+      change_type,
+      changed_by,
+      changes,
+      tournament_id
+    ) VALUES (
+      ${fixtureId},
+      'result_edited',
+      ${input.edited_by_name || 'Committee Admin'},
+      ${JSON.stringify({
+        edited_by: input.edited_by || 'system',
+        edit_reason: input.edit_reason || 'Result edited by committee admin',
+        season_id: seasonId,
+        round_number: fixture.round_number,
+        match_number: fixture.match_number,
+        old: {
+          home_score: fixture.home_score,
+          away_score: fixture.away_score,
+          result: fixture.result,
+          matchups: oldMatchups
+        },
+        new: {
+          home_score: score.home_score,
+          away_score: score.away_score,
+          result: score.result,
+          matchups: newMatchups
+        },
+        rewards_adjusted: fixture.result !== score.result
+      })},
+      ${seasonId}
+    )
+  `);
+
+  await sql.transaction(statements);
+  console.log(`✅ Result applied for ${fixtureId}: ${playerUpdates.length} player(s), ${teamUpdates.length} team(s) updated`);
+
+  // Derived data - the result itself is committed, so these only log on failure
+  if (fixture.tournament_id) {
+    try {
+      await recalculatePositions(seasonId, fixture.tournament_id);
+    } catch (error) {
+      console.error('⚠️ Failed to recalculate positions:', error);
+    }
+  }
+  await refreshSeasonAggregatesAfterChange(seasonId, { teamIds: [fixture.home_team_id, fixture.away_team_id] });
+  await mirrorRealPlayerPoints(playerUpdates);
+  await refreshLeagueRecordsAfterChange({
+    teamIds: [fixture.home_team_id, fixture.away_team_id],
+    playerIds: playerDeltas.map(d => d.player_id)
+  });
+
+  const salary = await applySalaryCharges(fixtureId, seasonId, charges, playerSeasons, isFirstSubmit);
+
+  let fantasy: FantasyApplyResult | null = null;
+  try {
+    fantasy = await applyFantasyResult(fixture, newMatchups, motmPlayerId, homePenaltyGoals, awayPenaltyGoals);
+  } catch (error) {
+    console.error('⚠️ Fantasy points update failed:', error);
+  }
+
+  return {
+    isFirstSubmit,
+    oldResult: fixture.result || null,
+    score,
+    motm_player_id: motmPlayerId,
+    motm_player_name: motmPlayerName,
+    oldMatchups,
+    newMatchups,
+    playersUpdated: playerUpdates.length,
+    salary,
+    fantasy
+  };
+}
+
+/**
+ * Keep Firebase realplayer points / star rating in step (backward compatibility)
+ */
+async function mirrorRealPlayerPoints(updates: { player_id: string; new_points: number; star_rating: number }[]) {
+  if (updates.length === 0) return;
+
+  try {
+    const byPlayerId = new Map(updates.map(u => [u.player_id, u]));
+    const playerIds = [...byPlayerId.keys()];
+    const batch = adminDb.batch();
+    let writes = 0;
+
+    // Firestore 'in' queries take at most 30 values
+    for (let i = 0; i < playerIds.length; i += 30) {
+      const snapshot = await adminDb.collection('realplayer')
+        .where('player_id', 'in', playerIds.slice(i, i + 30))
+        .get();
+      snapshot.docs.forEach(doc => {
+        const update = byPlayerId.get(doc.data().player_id)!;
+        batch.update(doc.ref, { points: update.new_points, star_rating: update.star_rating });
+        writes++;
+      });
+    }
+
+    if (writes > 0) await batch.commit();
+  } catch (error) {
+    console.warn('Firebase realplayer update failed (non-critical):', error);
+  }
+}
+
+/**
+ * Apply salary charges to team_seasons budgets in one batch and log each one
+ *
+ * A first submission is skipped entirely if salary transactions already
+ * exist for the fixture, so resubmitting never charges twice.
+ */
+async function applySalaryCharges(
+  fixtureId: string,
+  seasonId: string,
+  charges: SalaryCharge[],
+  playerSeasons: Map<string, any>,
+  isFirstSubmit: boolean
+): Promise<SalaryApplyResult> {
+  const result: SalaryApplyResult = { applied: [], skipped: [] };
+  if (charges.length === 0) return result;
+
+  try {
+    if (isFirstSubmit) {
+      const existing = await adminDb.collection('transactions')
+        .where('metadata.fixture_id', '==', fixtureId)
+        .where('currency_type', '==', 'real_player')
+        .get();
+      const alreadyCharged = existing.docs.some(doc =>
+        ['salary', 'salary_payment'].includes(doc.data().transaction_type)
+      );
+      if (alreadyCharged) {
+        console.log(`⏭️  Salary transactions already exist for fixture ${fixtureId}, skipping deduction`);
+        return result;
+      }
+    }
+
+    const resolved = charges.flatMap(charge => {
+      const row = playerSeasons.get(charge.player_id);
+      const salary = parseFloat(row?.salary_per_match) || 0;
+      if (!row || !row.team_id || salary <= 0) {
+        result.skipped.push({ ...charge, error: !row ? 'Not found in player_seasons' : 'No team or salary' });
+        return [];
+      }
+      return [{ ...charge, team_id: row.team_id as string, salary }];
+    });
+    if (resolved.length === 0) return result;
+
+    const teamIds = [...new Set(resolved.map(c => c.team_id))];
+    const refs = teamIds.map(teamId => adminDb.collection('team_seasons').doc(`${teamId}_${seasonId}`));
+    const docs = await adminDb.getAll(...refs);
+    const balances = new Map<string, number>();
+    docs.forEach((doc, i) => {
+      if (doc.exists) balances.set(teamIds[i], doc.data()?.real_player_budget || 0);
+    });
+
+    const fields = new Map<string, Record<string, number>>();
+    const logs: TransactionData[] = [];
+
+    for (const charge of resolved) {
+      const balanceBefore = balances.get(charge.team_id);
+      if (balanceBefore === undefined) {
+        result.skipped.push({ ...charge, error: 'Team season document not found' });
+        continue;
+      }
+
+      const amount = charge.reason === 'result_edit_player_removed' ? charge.salary : -charge.salary;
+      const balanceAfter = balanceBefore + amount;
+      balances.set(charge.team_id, balanceAfter);
+
+      const teamFields = fields.get(charge.team_id) || {};
+      teamFields.real_player_budget = (teamFields.real_player_budget || 0) + amount;
+      if (charge.reason === 'match') {
+        teamFields.real_player_spent = (teamFields.real_player_spent || 0) + charge.salary;
+      }
+      fields.set(charge.team_id, teamFields);
+
+      logs.push({
+        team_id: charge.team_id,
+        season_id: seasonId,
+        transaction_type: charge.reason === 'result_edit_player_removed' ? 'adjustment' : 'salary_payment',
+        currency_type: 'real_player',
+        amount,
+        balance_before: balanceBefore,
+        balance_after: balanceAfter,
+        description: charge.reason === 'match'
+          ? `Salary: ${charge.player_name}`
+          : charge.reason === 'result_edit_player_added'
+            ? `Salary: ${charge.player_name} (result edited, player added)`
+            : `Salary refund: ${charge.player_name} (result edited, player removed)`,
+        metadata: {
+          fixture_id: fixtureId,
+          player_id: charge.player_id,
+          player_name: charge.player_name,
+          salary_amount: charge.salary,
+          player_count: charge.reason === 'result_edit_player_removed' ? undefined : 1,
+          reason: charge.reason === 'match' ? undefined : charge.reason
+        }
+      });
+
+      result.applied.push({
+        player_id: charge.player_id,
+        player_name: charge.player_name,
+        reason: charge.reason,
+        team_id: charge.team_id,
+        amount,
+        balance_before: balanceBefore,
+        balance_after: balanceAfter
+      });
+    }
+
+    if (fields.size > 0) {
+      const batch = adminDb.batch();
+      fields.forEach((teamFields, teamId) => {
+        batch.update(refs[teamIds.indexOf(teamId)], toIncrementUpdate(teamFields));
+      });
+      await batch.commit();
+      await logTransactions(logs);
+    }
+
+    console.log(`💰 Salaries: ${result.applied.length} applied, ${result.skipped.length} skipped`);
+  } catch (error) {
+    console.error('⚠️ Salary update failed:', error);
+    result.skipped.push(...charges.map(c => ({ ...c, error: error instanceof Error ? error.message : 'Unknown error' })));
+    result.applied = [];
+  }
+
+  return result;
+}
+
+/**
+ * Replace the fixture's fantasy points and team bonuses, and move every
+ * running total (teams, squads, players, ranks) by the difference - one
+ * Fantasy DB transaction. Deltas come from the rows actually deleted and
+ * inserted (RETURNING), under a per-fixture advisory lock, so concurrent
+ * submissions of the same fixture can't both revert the same rows.
+ */
+async function applyFantasyResult(
+  fixture: any,
+  matchups: ResultMatchup[],
+  motmPlayerId: string | null,
+  homePenaltyGoals: number,
+  awayPenaltyGoals: number
+): Promise<FantasyApplyResult | null> {
+  const fantasySql = getFantasyDb();
+  const fixtureId: string = fixture.id;
+  const roundNumber: number = fixture.round_number;
+
+  const leagues = await fantasySql`
+    SELECT league_id, is_active
+    FROM fantasy_leagues
+    WHERE season_id = ${fixture.season_id}
+    ORDER BY is_active DESC
+    LIMIT 1
+  `;
+
+  if (leagues.length === 0) {
+    console.log('ℹ️ No fantasy league for season:', fixture.season_id);
+    return null;
+  }
+
+  const leagueId: string = leagues[0].league_id;
+  // Inactive leagues and excluded tournaments only have old points reverted
+  const scoreFixture = leagues[0].is_active && fixture.include_in_fantasy !== false;
+  const playerIds = [...new Set(matchups.flatMap(m => [m.home_player_id, m.away_player_id]).filter(Boolean))];
+
+  const [rules, squads, fantasyTeams, teamChanges] = await Promise.all([
+    scoreFixture
+      ? fantasySql`
+          SELECT rule_type, points_value, applies_to
+          FROM fantasy_scoring_rules
+          WHERE league_id = ${leagueId} AND is_active = true
+        `
+      : Promise.resolve([] as any[]),
+    scoreFixture && playerIds.length > 0
+      ? fantasySql`
+          SELECT team_id, real_player_id, is_captain, is_vice_captain
+          FROM fantasy_squad
+          WHERE league_id = ${leagueId} AND real_player_id = ANY(${playerIds})
+        `
+      : Promise.resolve([] as any[]),
+    scoreFixture
+      ? fantasySql`
+          SELECT team_id, team_name, supported_team_id, supported_team_name
+          FROM fantasy_teams
+          WHERE league_id = ${leagueId} AND supported_team_id IS NOT NULL
+        `
+      : Promise.resolve([] as any[]),
+    scoreFixture
+      ? fantasySql`
+          SELECT team_id, old_supported_team_id, old_supported_team_name,
+                 new_supported_team_id, new_supported_team_name
+          FROM supported_team_changes
+          WHERE league_id = ${leagueId}
+        `
+      : Promise.resolve([] as any[])
+  ]);
+
+  const playerRules = new Map<string, number>(rules.map((r: any) => [r.rule_type, r.points_value]));
+  if (playerRules.size === 0) {
+    DEFAULT_PLAYER_SCORING_RULES.forEach(([ruleType, points]) => playerRules.set(ruleType, points));
+  }
+  const teamRules = new Map<string, number>(
+    rules.filter((r: any) => r.applies_to === 'team').map((r: any) => [r.rule_type, r.points_value])
+  );
+
+  const squadsByPlayer = new Map<string, any[]>();
+  squads.forEach((s: any) => {
+    squadsByPlayer.set(s.real_player_id, [...(squadsByPlayer.get(s.real_player_id) || []), s]);
+  });
+
+  // New fantasy_player_points rows
+  const newPoints: any[] = [];
+  const scoredPlayers = new Set<string>();
+  const scorePlayer = (m: ResultMatchup, side: 'home' | 'away') => {
+    const { player_id, player_name } = sidePlayer(m, side);
+    if (!player_id || scoredPlayers.has(player_id) || !squadsByPlayer.has(player_id)) return;
+    scoredPlayers.add(player_id);
+
+    const scored = (side === 'home' ? m.home_goals : m.away_goals) || 0;
+    const conceded = (side === 'home' ? m.away_goals : m.home_goals) || 0;
+    const result: FantasyResult = scored > conceded ? 'win' : scored === conceded ? 'draw' : 'loss';
+    const performance = {
+      goals_scored: scored,
+      goals_conceded: conceded,
+      result,
+      is_motm: motmPlayerId === player_id,
+      fine_goals: side === 'home' ? homePenaltyGoals : awayPenaltyGoals,
+      substitution_penalty: Number(side === 'home' ? m.home_sub_penalty : m.away_sub_penalty) || 0
+    };
+    const { breakdown, total } = scoreFantasyPlayer(performance, playerRules);
+
+    for (const squad of squadsByPlayer.get(player_id)!) {
+      const { multiplier, percentage } = fantasyMultiplier(!!squad.is_captain, !!squad.is_vice_captain);
+      newPoints.push({
+        team_id: squad.team_id,
+        real_player_id: player_id,
+        player_name,
+        ...performance,
+        is_clean_sheet: conceded === 0,
+        is_captain: !!squad.is_captain || !!squad.is_vice_captain,
+        points_multiplier: percentage,
+        base_points: total,
+        points_breakdown: JSON.stringify(breakdown),
+        total_points: Math.round(total * multiplier)
+      });
+    }
+  };
+  if (scoreFixture) {
+    for (const m of matchups) {
+      scorePlayer(m, 'home');
+      scorePlayer(m, 'away');
+    }
+  }
+
+  // New team affiliation bonuses (goals without penalties)
+  const newBonuses: any[] = [];
+  if (scoreFixture && teamRules.size > 0) {
+    const changes = new Map<string, SupportedTeamChange>(teamChanges.map((c: any) => [c.team_id, c]));
+    const homeGoals = matchups.reduce((sum, m) => sum + (m.home_goals || 0), 0);
+    const awayGoals = matchups.reduce((sum, m) => sum + (m.away_goals || 0), 0);
+    const bonusTeams = new Set<string>();
+
+    for (const [realTeamId, scored, conceded] of [
+      [fixture.home_team_id, homeGoals, awayGoals],
+      [fixture.away_team_id, awayGoals, homeGoals]
+    ] as [string, number, number][]) {
+      const { breakdown, total } = evaluateTeamBonus(teamRules, scored, conceded);
+      if (total === 0) continue;
+
+      for (const team of fantasyTeams) {
+        const change = changes.get(team.team_id);
+        if (bonusTeams.has(team.team_id) || !supportsRealTeam(team.supported_team_id, change, realTeamId, roundNumber)) continue;
+        bonusTeams.add(team.team_id);
+        newBonuses.push({
+          team_id: team.team_id,
+          real_team_id: realTeamId,
+          real_team_name: supportedTeamName(team.supported_team_name, change, roundNumber),
+          bonus_breakdown: JSON.stringify(breakdown),
+          total_bonus: total
+        });
+      }
+    }
+  }
+
+  const statements = [
+    // Serialize submissions of the same fixture: each one must revert exactly
+    // the rows the previous one wrote
+    fantasySql`SELECT pg_advisory_xact_lock(hashtext(${`fantasy-fixture:${leagueId}:${fixtureId}`}))`,
+
+    // Revert: delete the fixture's rows and subtract exactly what was deleted
+    fantasySql`
+      WITH old_points AS (
+        DELETE FROM fantasy_player_points
+        WHERE league_id = ${leagueId} AND fixture_id = ${fixtureId}
+        RETURNING team_id, real_player_id, base_points, total_points
+      ), old_bonuses AS (
+        DELETE FROM fantasy_team_bonus_points
+        WHERE league_id = ${leagueId} AND fixture_id = ${fixtureId}
+        RETURNING team_id, total_bonus
+      ), team_deltas AS (
+        SELECT team_id, SUM(player_points) AS player_points, SUM(passive_points) AS passive_points
+        FROM (
+          SELECT team_id, COALESCE(total_points, 0) AS player_points, 0 AS passive_points FROM old_points
+          UNION ALL
+          SELECT team_id, 0, COALESCE(total_bonus, 0) FROM old_bonuses
+        ) d
+        GROUP BY team_id
+      ), teams_reverted AS (
+        UPDATE fantasy_teams ft
+        SET
+          player_points = COALESCE(ft.player_points, 0) - d.player_points,
+          passive_points = COALESCE(ft.passive_points, 0) - d.passive_points,
+          total_points = COALESCE(ft.total_points, 0) - d.player_points - d.passive_points,
+          updated_at = NOW()
+        FROM team_deltas d
+        WHERE ft.team_id = d.team_id
+        RETURNING ft.team_id
+      ), squads_reverted AS (
+        UPDATE fantasy_squad fs
+        SET total_points = COALESCE(fs.total_points, 0) - d.points
+        FROM (
+          SELECT team_id, real_player_id, SUM(COALESCE(total_points, 0)) AS points
+          FROM old_points GROUP BY team_id, real_player_id
+        ) d
+        WHERE fs.team_id = d.team_id AND fs.real_player_id = d.real_player_id
+        RETURNING 1
+      ), players_reverted AS (
+        -- base_points is per real player, repeated on each owning team's row
+        UPDATE fantasy_players fp
+        SET total_points = COALESCE(fp.total_points, 0) - d.points, updated_at = NOW()
+        FROM (
+          SELECT real_player_id, MAX(COALESCE(base_points, 0)) AS points
+          FROM old_points GROUP BY real_player_id
+        ) d
+        WHERE fp.league_id = ${leagueId} AND fp.real_player_id = d.real_player_id
+        RETURNING 1
+      )
+      SELECT
+        (SELECT COUNT(*) FROM old_points)::int AS reverted,
+        ARRAY(SELECT team_id FROM teams_reverted) AS team_ids
+    `
+  ];
+
+  if (newPoints.length > 0 || newBonuses.length > 0) {
+    // Award: insert the new rows and add exactly what was inserted
+    statements.push(fantasySql`
+      WITH new_points AS (
+        INSERT INTO fantasy_player_points (
+          league_id, team_id, real_player_id, player_name, fixture_id, round_number,
+          goals_scored, goals_conceded, result, is_motm, fine_goals, substitution_penalty,
+          is_clean_sheet, is_captain, points_multiplier, base_points, points_breakdown,
+          total_points, calculated_at
+        )
+        SELECT
+          ${leagueId}, p.team_id, p.real_player_id, p.player_name, ${fixtureId}, ${roundNumber},
+          p.goals_scored, p.goals_conceded, p.result, p.is_motm, p.fine_goals, p.substitution_penalty,
+          p.is_clean_sheet, p.is_captain, p.points_multiplier, p.base_points, p.points_breakdown::jsonb,
+          p.total_points, NOW()
+        FROM UNNEST(
+          ${newPoints.map(p => p.team_id)}::text[],
+          ${newPoints.map(p => p.real_player_id)}::text[],
+          ${newPoints.map(p => p.player_name)}::text[],
+          ${newPoints.map(p => p.goals_scored)}::int[],
+          ${newPoints.map(p => p.goals_conceded)}::int[],
+          ${newPoints.map(p => p.result)}::text[],
+          ${newPoints.map(p => p.is_motm)}::boolean[],
+          ${newPoints.map(p => p.fine_goals)}::int[],
+          ${newPoints.map(p => p.substitution_penalty)}::int[],
+          ${newPoints.map(p => p.is_clean_sheet)}::boolean[],
+          ${newPoints.map(p => p.is_captain)}::boolean[],
+          ${newPoints.map(p => p.points_multiplier)}::int[],
+          ${newPoints.map(p => p.base_points)}::numeric[],
+          ${newPoints.map(p => p.points_breakdown)}::text[],
+          ${newPoints.map(p => p.total_points)}::int[]
+        ) AS p(
+          team_id, real_player_id, player_name, goals_scored, goals_conceded, result,
+          is_motm, fine_goals, substitution_penalty, is_clean_sheet, is_captain,
+          points_multiplier, base_points, points_breakdown, total_points
+        )
+        RETURNING team_id, real_player_id, base_points, total_points
+      ), new_bonuses AS (
+        INSERT INTO fantasy_team_bonus_points (
+          league_id, team_id, real_team_id, real_team_name, fixture_id,
+          round_number, bonus_breakdown, total_bonus, calculated_at
+        )
+        SELECT
+          ${leagueId}, b.team_id, b.real_team_id, b.real_team_name, ${fixtureId},
+          ${roundNumber}, b.bonus_breakdown::jsonb, b.total_bonus, NOW()
+        FROM UNNEST(
+          ${newBonuses.map(b => b.team_id)}::text[],
+          ${newBonuses.map(b => b.real_team_id)}::text[],
+          ${newBonuses.map(b => b.real_team_name)}::text[],
+          ${newBonuses.map(b => b.bonus_breakdown)}::text[],
+          ${newBonuses.map(b => b.total_bonus)}::numeric[]
+        ) AS b(team_id, real_team_id, real_team_name, bonus_breakdown, total_bonus)
+        RETURNING team_id, total_bonus
+      ), team_deltas AS (
+        SELECT team_id, SUM(player_points) AS player_points, SUM(passive_points) AS passive_points
+        FROM (
+          SELECT team_id, COALESCE(total_points, 0) AS player_points, 0 AS passive_points FROM new_points
+          UNION ALL
+          SELECT team_id, 0, COALESCE(total_bonus, 0) FROM new_bonuses
+        ) d
+        GROUP BY team_id
+      ), teams_awarded AS (
+        UPDATE fantasy_teams ft
+        SET
+          player_points = COALESCE(ft.player_points, 0) + d.player_points,
+          passive_points = COALESCE(ft.passive_points, 0) + d.passive_points,
+          total_points = COALESCE(ft.total_points, 0) + d.player_points + d.passive_points,
+          updated_at = NOW()
+        FROM team_deltas d
+        WHERE ft.team_id = d.team_id
+        RETURNING ft.team_id
+      ), squads_awarded AS (
+        UPDATE fantasy_squad fs
+        SET total_points = COALESCE(fs.total_points, 0) + d.points
+        FROM (
+          SELECT team_id, real_player_id, SUM(COALESCE(total_points, 0)) AS points
+          FROM new_points GROUP BY team_id, real_player_id
+        ) d
+        WHERE fs.team_id = d.team_id AND fs.real_player_id = d.real_player_id
+        RETURNING 1
+      ), players_awarded AS (
+        UPDATE fantasy_players fp
+        SET total_points = COALESCE(fp.total_points, 0) + d.points, updated_at = NOW()
+        FROM (
+          SELECT real_player_id, MAX(COALESCE(base_points, 0)) AS points
+          FROM new_points GROUP BY real_player_id
+        ) d
+        WHERE fp.league_id = ${leagueId} AND fp.real_player_id = d.real_player_id
+        RETURNING 1
+      )
+      SELECT ARRAY(SELECT team_id FROM teams_awarded) AS team_ids
+    `);
+  }
+
+  statements.push(fantasySql`
+    UPDATE fantasy_teams ft
+    SET rank = r.rank, updated_at = NOW()
+    FROM (
+      SELECT id, ROW_NUMBER() OVER (ORDER BY total_points DESC, id ASC) AS rank
+      FROM fantasy_teams
+      WHERE league_id = ${leagueId}
+    ) r
+    WHERE ft.id = r.id AND ft.rank IS DISTINCT FROM r.rank
+  `);
+
+  const results = await fantasySql.transaction(statements);
+  const reverted = Number((results[1] as any[])[0].reverted) || 0;
+  const teamsAffected = new Set<string>(
+    results.slice(1, -1).flatMap((rows: any) => rows[0].team_ids || [])
+  );
+
+  console.log(`✅ Fantasy points: ${reverted} reverted, ${newPoints.length} awarded, ${newBonuses.length} bonuses`);
+
+  return {
+    reverted,
+    awarded: newPoints.length,
+    bonuses: newBonuses.length,
+    teams_affected: teamsAffected.size
+  };
+}
@@ -1,8 +1,15 @@
 import { HfInference } from '@huggingface/inference';
 import sharp from 'sharp';
+import { withGenerationCache } from '../news/generation-cache';
 
 const hf = new HfInference(process.env.HUGGING_FACE_TOKEN);
 
+/**
+ * Version of the image prompt builders below. Bump it whenever a prompt
+ * changes so cached image URLs (news_generation_cache) are not reused.
+ */
+export const IMAGE_PROMPT_VERSION = 1;
+
 export interface ImageGenerationOptions {
   width?: number;
   height?: number;
@@ -389,18 +396,33 @@ export function generateImageWithPollinations(
 
 /**
  * Generate and upload news image in one go
+ * Hosted image URLs are cached by (event type, metadata, prompt version)
  */
 export async function generateNewsImage(
   eventType: string,
   metadata: Record<string, any>,
   newsId: string
 ): Promise<string | null> {
+  const cached = await withGenerationCache<{ image_url: string | null }>(
+    { kind: 'image', eventType, payload: metadata, promptVersion: IMAGE_PROMPT_VERSION },
+    async () => ({ image_url: await renderNewsImage(eventType, metadata, newsId) }),
+    // Data URLs from the upload fallback are too large to be worth caching
+    value => !!value.image_url && value.image_url.startsWith('http')
+  );
+  return cached.image_url;
+}
+
+async function renderNewsImage(
+  eventType: string,
+  metadata: Record<string, any>,
+  newsId: string
+): Promise<string | null> {
+  // Generate prompt with text instructions
+  const prompt = generateSDXLPrompt(eventType, metadata);
+
   try {
     console.log('🎨 Generating image with Pollinations.ai (free alternative)...');
 
-    // Generate prompt with text instructions
-    const prompt = generateSDXLPrompt(eventType, metadata);
-    
     // Use Pollinations.ai instead of Hugging Face
     const imageUrl = generateImageWithPollinations(prompt);
 
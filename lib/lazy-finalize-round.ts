@@ -1,5 +1,5 @@
 import { neon } from '@neondatabase/serverless';
-import { finalizeRound, applyFinalizationResults } from '@/lib/finalize-round';
+import { finalizeClaimedRound } from '@/lib/round-finalization-worker';
 
 const sql = neon(process.env.DATABASE_URL || process.env.NEON_DATABASE_URL!);
 
@@ -11,6 +11,7 @@ const sql = neon(process.env.DATABASE_URL || process.env.NEON_DATABASE_URL!);
  * 
  * AUTO-FINALIZE MODE (finalization_mode = 'auto'):
  *   active -> finalizing -> completed (or tiebreaker_pending if tie detected)
+ *   The finalize-rounds cron claims rounds the same way (lib/round-finalization-worker.ts)
  * 
  * MANUAL FINALIZATION MODE (finalization_mode = 'manual'):
  *   active -> expired_pending_finalization (when timer expires)
@@ -121,58 +122,26 @@ export async function checkAndFinalizeExpiredRound(roundId: string): Promise<{
     
     console.log(`🔒 Acquired finalization lock for round ${roundId}`);
 
-    // Calculate winners using the finalization algorithm
-    // This analyzes all bids and determines allocations
-    const finalizationResult = await finalizeRound(roundId);
+    // Same per-round processing as the cron worker
+    // (tie -> tiebreaker_pending, finalizeRound failure releases the claim)
+    const outcome = await finalizeClaimedRound({ id: roundId, position: round.position });
 
-    if (!finalizationResult.success) {
-      if (finalizationResult.tieDetected) {
-        // Tie detected - mark round as 'finalizing' (tiebreaker needed)
-        // Status remains 'finalizing' until tiebreaker is resolved
-        // The tiebreaker system will handle creating the tiebreaker round
-        await sql`
-          UPDATE rounds
-          SET status = 'finalizing',
-              updated_at = NOW()
-          WHERE id = ${roundId}
-        `;
-
-        console.log(`⚠️ Tie detected in round ${roundId}, created tiebreaker`);
-        return { 
-          finalized: true, 
-          alreadyFinalized: false,
-          pendingManualFinalization: false,
-          error: 'Tiebreaker required'
-        };
-      }
-
-      console.error(`❌ Failed to finalize round ${roundId}:`, finalizationResult.error);
+    if (outcome.outcome === 'tiebreaker') {
+      console.log(`⚠️ Tie detected in round ${roundId}, created tiebreaker`);
       return { 
-        finalized: false, 
+        finalized: true, 
         alreadyFinalized: false,
         pendingManualFinalization: false,
-        error: finalizationResult.error 
+        error: 'Tiebreaker required'
       };
     }
 
-    // Apply finalization results immediately (no preview step for auto mode)
-    // This function handles:
-    // 1. Deducting budgets from teams
-    // 2. Allocating players to teams (creating contracts)
-    // 3. Logging transactions
-    // 4. Updating round status to 'completed'
-    const applyResult = await applyFinalizationResults(
-      roundId,
-      finalizationResult.allocations
-    );
-
-    if (!applyResult.success) {
-      console.error(`❌ Failed to apply finalization for round ${roundId}:`, applyResult.error);
+    if (outcome.outcome !== 'finalized') {
       return { 
         finalized: false, 
         alreadyFinalized: false,
         pendingManualFinalization: false,
-        error: applyResult.error 
+        error: outcome.error 
       };
     }
 
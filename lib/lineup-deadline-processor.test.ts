@@ -0,0 +1,95 @@
+import { describe, it, expect, vi } from 'vitest';
+
+vi.mock('./neon/tournament-config', () => ({
+  getTournamentDb: vi.fn(),
+}));
+
+vi.mock('./firebase/admin', () => ({
+  adminDb: {},
+}));
+
+const {
+  planLineupDeadlines,
+  roundStartDeadline
+} = await import('./lineup-deadline-processor');
+
+const fixture = (id: string, overrides: Record<string, any> = {}) => ({
+  id,
+  season_id: 'SSPSLS16',
+  tournament_id: 'SSPSLS16-LEAGUE',
+  round_number: 3,
+  leg: 'first',
+  home_team_id: 'HOME',
+  away_team_id: 'AWAY',
+  round_start: new Date('2025-01-10T08:30:00Z'),
+  matchups_exist: false,
+  ...overrides
+});
+
+const squad = (team: string, size: number) => Array.from({ length: size }, (_, i) => `${team}_P${i + 1}`);
+
+const lineup = (fixtureId: string, teamId: string, players: string[], isLocked = false) => ({
+  fixture_id: fixtureId,
+  team_id: teamId,
+  starting_xi: players.slice(0, 5),
+  substitutes: players.slice(5),
+  is_locked: isLocked
+});
+
+describe('roundStartDeadline', () => {
+  it('converts an IST date and time to UTC', () => {
+    expect(roundStartDeadline('2025-01-10', '14:00').toISOString()).toBe('2025-01-10T08:30:00.000Z');
+  });
+});
+
+describe('planLineupDeadlines', () => {
+  const squads = new Map([
+    ['HOME_SSPSLS16', squad('HOME', 7)],
+    ['AWAY_SSPSLS16', squad('AWAY', 6)]
+  ]);
+
+  it('locks a submitted away lineup at round start and leaves the home lineup until matchups exist', () => {
+    const lineups = new Map([
+      ['F1:HOME', lineup('F1', 'HOME', squad('HOME', 7))],
+      ['F1:AWAY', lineup('F1', 'AWAY', squad('AWAY', 6))]
+    ]);
+    const [plan] = planLineupDeadlines([fixture('F1')], lineups, squads, new Map());
+    expect(plan.home).toEqual({ type: 'none' });
+    expect(plan.away).toEqual({ type: 'lock', reason: 'Round started' });
+
+    const [withMatchups] = planLineupDeadlines([fixture('F1', { matchups_exist: true })], lineups, squads, new Map());
+    expect(withMatchups.home).toEqual({ type: 'lock', reason: 'Matchups created' });
+  });
+
+  it('auto-submits 5-player squads, locked for the away side only', () => {
+    const minimal = new Map([['HOME_SSPSLS16', squad('HOME', 5)], ['AWAY_SSPSLS16', squad('AWAY', 5)]]);
+    const [plan] = planLineupDeadlines([fixture('F1')], new Map(), minimal, new Map());
+    expect(plan.home).toEqual({ type: 'auto_submit', playerIds: squad('HOME', 5), lock: false });
+    expect(plan.away).toEqual({ type: 'auto_submit', playerIds: squad('AWAY', 5), lock: true });
+  });
+
+  it('warns once, then locks the next missed deadline in the same run', () => {
+    const plans = planLineupDeadlines(
+      [
+        fixture('F2', { round_start: new Date('2025-01-17T08:30:00Z') }),
+        fixture('F1')
+      ],
+      new Map(),
+      squads,
+      new Map()
+    );
+    expect(plans.map(p => [p.fixture.id, p.away.type])).toEqual([['F1', 'warn'], ['F2', 'lock_missing']]);
+  });
+
+  it('does not escalate a team already warned for the same fixture', () => {
+    const warnings = new Map([['AWAY_SSPSLS16', { count: 1, lastFixtureId: 'F1' }]]);
+    const [plan] = planLineupDeadlines([fixture('F1')], new Map(), squads, warnings);
+    expect(plan.away).toEqual({ type: 'none' });
+  });
+
+  it('leaves locked lineups alone', () => {
+    const lineups = new Map([['F1:AWAY', lineup('F1', 'AWAY', [], true)]]);
+    const [plan] = planLineupDeadlines([fixture('F1')], lineups, squads, new Map([['AWAY_SSPSLS16', { count: 1 }]]));
+    expect(plan.away).toEqual({ type: 'none' });
+  });
+});
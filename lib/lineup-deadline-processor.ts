@@ -0,0 +1,518 @@
+/**
+ * Lineup Deadline Processor
+ *
+ * Handles every fixture whose round has started in one pass:
+ * 1. Load due fixtures (with round deadlines and matchup flags), their
+ *    lineups, the teams' squads and the away teams' warning state -
+ *    one query per table, one Firestore getAll
+ * 2. Decide what happens to each lineup in memory (planLineupDeadlines) and
+ *    validate the lineups being locked with validateMany
+ * 3. Apply the plan with bulk writes - one Firestore batch for warnings and
+ *    one Neon transaction for locks, auto-submissions and violations
+ *
+ * LOCKING RULES:
+ * - Away team lineup: Locks at round start time (round_start_time or home_fixture_deadline_time)
+ * - Home team lineup: Locks when matchups are created (no time deadline)
+ *
+ * WARNING SYSTEM:
+ * - If away team doesn't submit by deadline: Gets 1 warning, can still submit with penalty
+ * - After 1 warning in any fixture: Home team can submit lineup for away team
+ * - Teams with exactly 5 players (min squad): Auto-submit all players, no warning
+ *
+ * Locked lineups are final, so running the processor again is a no-op.
+ */
+
+import { getTournamentDb } from './neon/tournament-config';
+import { adminDb } from './firebase/admin';
+import {
+  generateLineupId,
+  loadLineupRules,
+  validateMany,
+  LineupValidationEntry
+} from './lineup-validation';
+
+export interface DeadlineFixture {
+  id: string;
+  season_id: string;
+  tournament_id: string;
+  round_number: number;
+  leg: string;
+  home_team_id: string;
+  away_team_id: string;
+  round_start: Date;
+  matchups_exist: boolean;
+}
+
+export interface DeadlineLineup {
+  fixture_id: string;
+  team_id: string;
+  starting_xi: string[];
+  substitutes: string[];
+  is_locked: boolean;
+}
+
+export interface WarningState {
+  count: number;
+  lastFixtureId?: string | null;
+}
+
+export type LineupDeadlineAction =
+  | { type: 'none' }
+  | { type: 'lock'; reason: string }
+  | { type: 'auto_submit'; playerIds: string[]; lock: boolean }
+  | { type: 'warn' }
+  | { type: 'lock_missing' };
+
+export interface FixtureDeadlinePlan {
+  fixture: DeadlineFixture;
+  home: LineupDeadlineAction;
+  away: LineupDeadlineAction;
+}
+
+export interface LineupDeadlineFilter {
+  fixtureIds?: string[];
+  seasonId?: string;
+  roundNumber?: number;
+  leg?: string;
+}
+
+export interface FixtureDeadlineOutcome {
+  fixture_id: string;
+  round_start: string;
+  matchups_exist: boolean;
+  home: { team_id: string; action: LineupDeadlineAction['type']; errors?: string[] };
+  away: { team_id: string; action: LineupDeadlineAction['type']; errors?: string[] };
+}
+
+export interface LineupDeadlineReport {
+  fixtures: FixtureDeadlineOutcome[];
+  locked: number;
+  autoSubmitted: number;
+  warningsIssued: number;
+  lockedMissing: number;
+}
+
+const teamSeasonKey = (teamId: string, seasonId: string) => `${teamId}_${seasonId}`;
+const lineupKey = (fixtureId: string, teamId: string) => `${fixtureId}:${teamId}`;
+
+/**
+ * Round start (away lineup deadline) in UTC from an IST date and HH:MM time
+ */
+export function roundStartDeadline(scheduledDate: string | Date, startTime: string): Date {
+  const baseDateStr = new Date(scheduledDate).toISOString().split('T')[0];
+  const [startHour, startMin] = startTime.split(':').map(Number);
+  const deadline = new Date(baseDateStr);
+  deadline.setUTCHours(startHour - 5, startMin - 30, 0, 0); // Convert IST to UTC
+  return deadline;
+}
+
+/**
+ * Decide the action for both lineups of every fixture.
+ *
+ * Pure: `warnings` is copied, and fixtures are planned in deadline order so
+ * a team missing two deadlines in one run is warned once, then locked.
+ */
+export function planLineupDeadlines(
+  fixtures: DeadlineFixture[],
+  lineups: Map<string, DeadlineLineup>,
+  squads: Map<string, string[]>,
+  warnings: Map<string, WarningState>
+): FixtureDeadlinePlan[] {
+  const warningState = new Map(warnings);
+  const ordered = [...fixtures].sort((a, b) =>
+    a.round_start.getTime() - b.round_start.getTime() || a.id.localeCompare(b.id)
+  );
+
+  return ordered.map(fixture => {
+    const homeLineup = lineups.get(lineupKey(fixture.id, fixture.home_team_id)) || null;
+    const awayLineup = lineups.get(lineupKey(fixture.id, fixture.away_team_id)) || null;
+    const homeSquad = squads.get(teamSeasonKey(fixture.home_team_id, fixture.season_id)) || [];
+    const awaySquad = squads.get(teamSeasonKey(fixture.away_team_id, fixture.season_id)) || [];
+
+    // Home team: auto-submit a 5-player squad until matchups exist, then lock
+    let home: LineupDeadlineAction = { type: 'none' };
+    const homeSubmitted = !!homeLineup && homeLineup.starting_xi.length > 0;
+    if (!homeSubmitted && !fixture.matchups_exist) {
+      if (homeSquad.length === 5) {
+        home = { type: 'auto_submit', playerIds: homeSquad, lock: false };
+      }
+    } else if (fixture.matchups_exist && homeLineup && !homeLineup.is_locked) {
+      home = { type: 'lock', reason: 'Matchups created' };
+    }
+
+    // Away team: lock at round start, warning system for missing lineups
+    let away: LineupDeadlineAction = { type: 'none' };
+    const awaySubmitted = !!awayLineup && awayLineup.starting_xi.length > 0;
+    if (awayLineup?.is_locked) {
+      // Already processed (or submitted by the home team)
+    } else if (!awaySubmitted) {
+      const key = teamSeasonKey(fixture.away_team_id, fixture.season_id);
+      const state = warningState.get(key) || { count: 0 };
+
+      if (awaySquad.length === 5) {
+        away = { type: 'auto_submit', playerIds: awaySquad, lock: true };
+      } else if (state.lastFixtureId === fixture.id) {
+        // Warned for this fixture already - the late submission window stays open
+      } else if (state.count === 0) {
+        away = { type: 'warn' };
+        warningState.set(key, { count: 1, lastFixtureId: fixture.id });
+      } else {
+        away = { type: 'lock_missing' };
+      }
+    } else {
+      away = { type: 'lock', reason: 'Round started' };
+    }
+
+    return { fixture, home, away };
+  });
+}
+
+/**
+ * Fixtures whose round has started and that still have an unlocked lineup
+ */
+async function loadDueFixtures(filter: LineupDeadlineFilter, now: Date): Promise<DeadlineFixture[]> {
+  const sql = getTournamentDb();
+  const rows = await sql`
+    SELECT
+      f.id, f.season_id, f.tournament_id, f.round_number, COALESCE(f.leg, 'first') AS leg,
+      f.home_team_id, f.away_team_id,
+      rd.scheduled_date, rd.round_start_time, rd.home_fixture_deadline_time,
+      EXISTS (SELECT 1 FROM matchups m WHERE m.fixture_id = f.id) AS matchups_exist
+    FROM fixtures f
+    INNER JOIN round_deadlines rd ON
+      rd.season_id = f.season_id
+      AND rd.tournament_id = f.tournament_id
+      AND rd.round_number = f.round_number
+      AND rd.leg = COALESCE(f.leg, 'first')
+    WHERE rd.scheduled_date IS NOT NULL
+      AND rd.scheduled_date::date <= ${now.toISOString()}::date + 1
+      AND COALESCE(f.status, '') NOT IN ('completed', 'finalized')
+      AND (SELECT COUNT(*) FROM lineups l WHERE l.fixture_id = f.id AND l.is_locked) < 2
+      ${filter.fixtureIds ? sql`AND f.id = ANY(${filter.fixtureIds}::text[])` : sql``}
+      ${filter.seasonId ? sql`AND f.season_id = ${filter.seasonId}` : sql``}
+      ${filter.roundNumber ? sql`AND f.round_number = ${filter.roundNumber}` : sql``}
+      ${filter.leg ? sql`AND COALESCE(f.leg, 'first') = ${filter.leg}` : sql``}
+  `;
+
+  return (rows as any[])
+    .map(row => ({
+      id: row.id,
+      season_id: row.season_id,
+      tournament_id: row.tournament_id,
+      round_number: row.round_number,
+      leg: row.leg,
+      home_team_id: row.home_team_id,
+      away_team_id: row.away_team_id,
+      matchups_exist: row.matchups_exist,
+      round_start: roundStartDeadline(
+        row.scheduled_date,
+        row.round_start_time || row.home_fixture_deadline_time || '14:00'
+      ),
+    }))
+    .filter(fixture => now > fixture.round_start);
+}
+
+/**
+ * Lock, auto-submit and warn for every fixture past its round start
+ */
+export async function processLineupDeadlines(
+  filter: LineupDeadlineFilter = {},
+  now: Date = new Date()
+): Promise<LineupDeadlineReport> {
+  const sql = getTournamentDb();
+  const report: LineupDeadlineReport = { fixtures: [], locked: 0, autoSubmitted: 0, warningsIssued: 0, lockedMissing: 0 };
+
+  const fixtures = await loadDueFixtures(filter, now);
+  if (fixtures.length === 0) return report;
+
+  const fixtureIds = fixtures.map(f => f.id);
+  const teamIds = [...new Set(fixtures.flatMap(f => [f.home_team_id, f.away_team_id]))];
+  const seasonIds = [...new Set(fixtures.map(f => f.season_id))];
+
+  const [lineupRows, squadRows] = await Promise.all([
+    sql`
+      SELECT fixture_id, team_id, starting_xi, substitutes, is_locked
+      FROM lineups
+      WHERE fixture_id = ANY(${fixtureIds}::text[])
+    `,
+    sql`
+      SELECT team_id, season_id, player_id, category, status
+      FROM player_seasons
+      WHERE team_id = ANY(${teamIds}::text[])
+        AND season_id = ANY(${seasonIds}::text[])
+      ORDER BY player_id
+    `,
+  ]);
+
+  const lineups = new Map<string, DeadlineLineup>();
+  for (const row of lineupRows as any[]) {
+    lineups.set(lineupKey(row.fixture_id, row.team_id), {
+      fixture_id: row.fixture_id,
+      team_id: row.team_id,
+      starting_xi: row.starting_xi || [],
+      substitutes: row.substitutes || [],
+      is_locked: !!row.is_locked,
+    });
+  }
+
+  // Active players (auto-submission) and every registered player with
+  // their category (validation)
+  const squads = new Map<string, string[]>();
+  const registered = new Map<string, Map<string, string | null>>();
+  for (const row of squadRows as any[]) {
+    const key = teamSeasonKey(row.team_id, row.season_id);
+    if (!registered.has(key)) registered.set(key, new Map());
+    registered.get(key)!.set(row.player_id, row.category ?? null);
+    if (row.status === 'active') {
+      if (!squads.has(key)) squads.set(key, []);
+      squads.get(key)!.push(row.player_id);
+    }
+  }
+
+  // Warning state only matters for away teams without a lineup
+  const warningKeys = [...new Set(fixtures
+    .filter(f => {
+      const lineup = lineups.get(lineupKey(f.id, f.away_team_id));
+      return !lineup || (!lineup.is_locked && lineup.starting_xi.length === 0);
+    })
+    .map(f => teamSeasonKey(f.away_team_id, f.season_id)))];
+  const warnings = new Map<string, WarningState>();
+  if (warningKeys.length > 0) {
+    const docs = await adminDb.getAll(...warningKeys.map(key => adminDb.collection('team_seasons').doc(key)));
+    docs.forEach(doc => {
+      const data = doc.data();
+      warnings.set(doc.id, {
+        count: data?.lineup_warnings || 0,
+        lastFixtureId: data?.last_lineup_warning_fixture || null,
+      });
+    });
+  }
+
+  const plans = planLineupDeadlines(fixtures, lineups, squads, warnings);
+
+  // Validate every lineup being locked in one in-memory pass
+  const toValidate: (LineupValidationEntry & { key: string })[] = [];
+  for (const { fixture, home, away } of plans) {
+    for (const [teamId, action] of [[fixture.home_team_id, home], [fixture.away_team_id, away]] as const) {
+      if (action.type !== 'lock') continue;
+      const lineup = lineups.get(lineupKey(fixture.id, teamId))!;
+      toValidate.push({
+        key: lineupKey(fixture.id, teamId),
+        lineup: { starting_xi: lineup.starting_xi, substitutes: lineup.substitutes },
+        seasonId: fixture.season_id,
+        teamId,
+        tournamentId: fixture.tournament_id
+      });
+    }
+  }
+  const rules = toValidate.length > 0
+    ? await loadLineupRules(fixtures.map(f => ({ tournamentId: f.tournament_id, seasonId: f.season_id })))
+    : new Map();
+  const validations = new Map(validateMany(toValidate, { squads: registered, rules })
+    .map((result, i) => [toValidate[i].key, result]));
+
+  // Collect bulk writes
+  const locks: { fixture_id: string; team_id: string; reason: string; is_valid: boolean; errors: string }[] = [];
+  const submissions: { fixture: DeadlineFixture; team_id: string; player_ids: string; lock: boolean }[] = [];
+  const missing: { fixture: DeadlineFixture; team_id: string }[] = [];
+  const violations: { fixture: DeadlineFixture; team_id: string; type: string; penalty: string; notes: string }[] = [];
+  const warned: { fixture: DeadlineFixture; team_id: string }[] = [];
+
+  for (const { fixture, home, away } of plans) {
+    for (const [teamId, action] of [[fixture.home_team_id, home], [fixture.away_team_id, away]] as const) {
+      switch (action.type) {
+        case 'lock': {
+          const validation = validations.get(lineupKey(fixture.id, teamId))!;
+          locks.push({
+            fixture_id: fixture.id,
+            team_id: teamId,
+            reason: action.reason,
+            is_valid: validation.isValid,
+            errors: JSON.stringify(validation.errors),
+          });
+          break;
+        }
+        case 'auto_submit':
+          submissions.push({ fixture, team_id: teamId, player_ids: JSON.stringify(action.playerIds), lock: action.lock });
+          break;
+        case 'warn':
+          warned.push({ fixture, team_id: teamId });
+          violations.push({
+            fixture, team_id: teamId,
+            type: 'late_lineup_warning',
+            penalty: 'warning_issued',
+            notes: 'First lineup warning - team can still submit with penalty',
+          });
+          break;
+        case 'lock_missing':
+          missing.push({ fixture, team_id: teamId });
+          violations.push({
+            fixture, team_id: teamId,
+            type: 'late_lineup_locked',
+            penalty: 'lineup_locked',
+            notes: 'Missed deadline after previous warning - home team can submit lineup',
+          });
+          break;
+      }
+    }
+
+    const invalid = (teamId: string) => {
+      const validation = validations.get(lineupKey(fixture.id, teamId));
+      return validation && !validation.isValid ? { errors: validation.errors } : {};
+    };
+    report.fixtures.push({
+      fixture_id: fixture.id,
+      round_start: fixture.round_start.toISOString(),
+      matchups_exist: fixture.matchups_exist,
+      home: { team_id: fixture.home_team_id, action: home.type, ...invalid(fixture.home_team_id) },
+      away: { team_id: fixture.away_team_id, action: away.type, ...invalid(fixture.away_team_id) },
+    });
+  }
+
+  report.locked = locks.length + submissions.filter(s => s.lock).length;
+  report.autoSubmitted = submissions.length;
+  report.warningsIssued = warned.length;
+  report.lockedMissing = missing.length;
+
+  // First offences - one Firestore batch
+  if (warned.length > 0) {
+    const batch = adminDb.batch();
+    for (const { fixture, team_id } of warned) {
+      batch.set(adminDb.collection('team_seasons').doc(teamSeasonKey(team_id, fixture.season_id)), {
+        lineup_warnings: 1,
+        last_lineup_warning_fixture: fixture.id,
+        last_lineup_warning_date: now,
+        updated_at: now
+      }, { merge: true });
+    }
+    await batch.commit();
+  }
+
+  const statements: any[] = [];
+
+  if (locks.length > 0) {
+    statements.push(sql`
+      UPDATE lineups l
+      SET
+        is_locked = true,
+        locked_at = NOW(),
+        locked_by = 'system',
+        locked_reason = t.reason,
+        is_valid = COALESCE(l.is_valid, true) AND t.is_valid,
+        validation_errors = CASE WHEN t.is_valid THEN l.validation_errors ELSE t.errors END,
+        updated_at = NOW()
+      FROM UNNEST(
+        ${locks.map(l => l.fixture_id)}::text[],
+        ${locks.map(l => l.team_id)}::text[],
+        ${locks.map(l => l.reason)}::text[],
+        ${locks.map(l => l.is_valid)}::boolean[],
+        ${locks.map(l => l.errors)}::jsonb[]
+      ) AS t(fixture_id, team_id, reason, is_valid, errors)
+      WHERE l.fixture_id = t.fixture_id
+        AND l.team_id = t.team_id
+        AND l.is_locked IS NOT TRUE
+    `);
+  }
+
+  if (submissions.length > 0) {
+    // 5-player squads: all players start, no substitute, no warning
+    statements.push(sql`
+      INSERT INTO lineups (
+        id, fixture_id, team_id, round_number, season_id, tournament_id,
+        starting_xi, substitutes, is_valid, is_locked, locked_at, locked_by, locked_reason,
+        submitted_by, submitted_at, created_at, updated_at
+      )
+      SELECT
+        t.id, t.fixture_id, t.team_id, t.round_number, t.season_id, t.tournament_id,
+        t.starting_xi, '[]'::jsonb, true, t.lock,
+        CASE WHEN t.lock THEN NOW() END,
+        CASE WHEN t.lock THEN 'system' END,
+        CASE WHEN t.lock THEN 'Auto-submitted (5 players)' END,
+        'system', NOW(), NOW(), NOW()
+      FROM UNNEST(
+        ${submissions.map(s => generateLineupId(s.fixture.id, s.team_id))}::text[],
+        ${submissions.map(s => s.fixture.id)}::text[],
+        ${submissions.map(s => s.team_id)}::text[],
+        ${submissions.map(s => s.fixture.round_number)}::int[],
+        ${submissions.map(s => s.fixture.season_id)}::text[],
+        ${submissions.map(s => s.fixture.tournament_id)}::text[],
+        ${submissions.map(s => s.player_ids)}::jsonb[],
+        ${submissions.map(s => s.lock)}::boolean[]
+      ) AS t(id, fixture_id, team_id, round_number, season_id, tournament_id, starting_xi, lock)
+      ON CONFLICT (fixture_id, team_id) DO UPDATE SET
+        starting_xi = EXCLUDED.starting_xi,
+        substitutes = '[]'::jsonb,
+        is_valid = true,
+        is_locked = EXCLUDED.is_locked,
+        locked_at = EXCLUDED.locked_at,
+        locked_by = EXCLUDED.locked_by,
+        locked_reason = EXCLUDED.locked_reason,
+        submitted_at = NOW(),
+        submitted_by = 'system',
+        updated_at = NOW()
+      WHERE lineups.is_locked IS NOT TRUE
+    `);
+  }
+
+  if (missing.length > 0) {
+    // Second+ offence: empty locked lineup, home team can submit for them
+    statements.push(sql`
+      INSERT INTO lineups (
+        id, fixture_id, team_id, round_number, season_id, tournament_id,
+        starting_xi, substitutes, is_valid, is_locked, locked_at, locked_by, locked_reason,
+        selected_by_opponent, submitted_by, submitted_at, created_at, updated_at
+      )
+      SELECT
+        t.id, t.fixture_id, t.team_id, t.round_number, t.season_id, t.tournament_id,
+        '[]'::jsonb, '[]'::jsonb, false, true, NOW(), 'system', 'Missed deadline after warning',
+        false, 'system', NOW(), NOW(), NOW()
+      FROM UNNEST(
+        ${missing.map(m => generateLineupId(m.fixture.id, m.team_id))}::text[],
+        ${missing.map(m => m.fixture.id)}::text[],
+        ${missing.map(m => m.team_id)}::text[],
+        ${missing.map(m => m.fixture.round_number)}::int[],
+        ${missing.map(m => m.fixture.season_id)}::text[],
+        ${missing.map(m => m.fixture.tournament_id)}::text[]
+      ) AS t(id, fixture_id, team_id, round_number, season_id, tournament_id)
+      ON CONFLICT (fixture_id, team_id) DO UPDATE SET
+        is_locked = true,
+        locked_at = NOW(),
+        locked_by = 'system',
+        locked_reason = 'Missed deadline after warning',
+        updated_at = NOW()
+      WHERE lineups.is_locked IS NOT TRUE
+    `);
+  }
+
+  if (violations.length > 0) {
+    statements.push(sql`
+      INSERT INTO team_violations (
+        team_id, season_id, violation_type, fixture_id, round_number,
+        violation_date, deadline, penalty_applied, notes
+      )
+      SELECT t.team_id, t.season_id, t.violation_type, t.fixture_id, t.round_number,
+             NOW(), t.deadline, t.penalty_applied, t.notes
+      FROM UNNEST(
+        ${violations.map(v => v.team_id)}::text[],
+        ${violations.map(v => v.fixture.season_id)}::text[],
+        ${violations.map(v => v.type)}::text[],
+        ${violations.map(v => v.fixture.id)}::text[],
+        ${violations.map(v => v.fixture.round_number)}::int[],
+        ${violations.map(v => v.fixture.round_start.toISOString())}::timestamp[],
+        ${violations.map(v => v.penalty)}::text[],
+        ${violations.map(v => v.notes)}::text[]
+      ) AS t(team_id, season_id, violation_type, fixture_id, round_number, deadline, penalty_applied, notes)
+    `);
+  }
+
+  if (statements.length > 0) {
+    await sql.transaction(statements);
+  }
+
+  console.log(
+    `🔒 Lineup deadlines processed for ${plans.length} fixture(s): ${report.locked} locked, ` +
+    `${report.autoSubmitted} auto-submitted, ${report.warningsIssued} warned, ${report.lockedMissing} locked empty`
+  );
+
+  return report;
+}
@@ -0,0 +1,82 @@
+import { describe, it, expect, vi } from 'vitest';
+
+vi.mock('@/lib/neon/tournament-config', () => ({
+  getTournamentDb: vi.fn(),
+}));
+
+const {
+  compileLineupRules,
+  evaluateLineup,
+  validateMany,
+  NO_LINEUP_RULES
+} = await import('./lineup-validation');
+
+const squad = new Map<string, string | null>([
+  ['P1', 'Legend'], ['P2', 'Legend'], ['P3', 'Classic'],
+  ['P4', 'Classic'], ['P5', 'Classic'], ['P6', 'Rising Star'], ['P7', null]
+]);
+
+const settings = {
+  enable_category_requirements: true,
+  lineup_category_requirements: { cat_legend: 3 },
+  updated_at: '2025-01-01T00:00:00Z'
+};
+
+describe('compileLineupRules', () => {
+  it('memoizes per tournament, season and settings version', () => {
+    const rules = compileLineupRules('T1', 'S16', settings);
+    expect(rules.categoryMinimums).toEqual([['cat_legend', 3]]);
+    expect(compileLineupRules('T1', 'S16', { ...settings })).toBe(rules);
+    expect(compileLineupRules('T1', 'S16', { ...settings, updated_at: '2025-02-01T00:00:00Z' })).not.toBe(rules);
+  });
+
+  it('has no category minimums when requirements are disabled or missing', () => {
+    expect(compileLineupRules('T2', 'S16', { ...settings, enable_category_requirements: false }).categoryMinimums).toEqual([]);
+    expect(compileLineupRules('T3', 'S16', null)).toBe(NO_LINEUP_RULES);
+  });
+});
+
+describe('evaluateLineup', () => {
+  it('accepts 5 starters and up to 2 substitutes from the squad', () => {
+    expect(evaluateLineup({ starting_xi: ['P1', 'P2', 'P3', 'P4', 'P5'], substitutes: ['P6', 'P7'] }, squad, NO_LINEUP_RULES))
+      .toEqual({ isValid: true, errors: [], classicPlayerCount: 0 });
+  });
+
+  it('rejects wrong sizes before checking players', () => {
+    expect(evaluateLineup({ starting_xi: ['P1'], substitutes: ['P2', 'P3', 'P4'] }, squad, NO_LINEUP_RULES).errors).toEqual([
+      'Starting XI must have exactly 5 players',
+      'Cannot have more than 2 substitute players'
+    ]);
+  });
+
+  it('reports duplicates, ineligible players and category shortfalls', () => {
+    const rules = compileLineupRules('T1', 'S16', settings);
+    const result = evaluateLineup({ starting_xi: ['P1', 'P2', 'P3', 'P4', 'X9'], substitutes: ['P1'] }, squad, rules);
+    expect(result.isValid).toBe(false);
+    expect(result.errors).toEqual([
+      'Duplicate players found in lineup',
+      'Some players are not eligible for this team/season',
+      'Starting XI must have at least 3 player(s) from cat_legend category (currently has 2)'
+    ]);
+  });
+});
+
+describe('validateMany', () => {
+  it('validates each lineup against its own team squad and tournament rules', () => {
+    const context = {
+      squads: new Map([['HOME_S16', squad]]),
+      rules: new Map([['T1', compileLineupRules('T1', 'S16', settings)]])
+    };
+    const lineup = { starting_xi: ['P1', 'P2', 'P3', 'P4', 'P5'], substitutes: [] };
+
+    const [home, homeWithRules, away] = validateMany([
+      { lineup, seasonId: 'S16', teamId: 'HOME' },
+      { lineup, seasonId: 'S16', teamId: 'HOME', tournamentId: 'T1' },
+      { lineup, seasonId: 'S16', teamId: 'AWAY', tournamentId: 'T1' }
+    ], context);
+
+    expect(home.isValid).toBe(true);
+    expect(homeWithRules.errors).toEqual(['Starting XI must have at least 3 player(s) from cat_legend category (currently has 2)']);
+    expect(away.errors).toContain('Some players are not eligible for this team/season');
+  });
+});
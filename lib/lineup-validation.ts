@@ -1,4 +1,5 @@
 import { getTournamentDb } from '@/lib/neon/tournament-config';
+import { memoryCache } from '@/lib/cache/memory-cache';
 
 export interface LineupValidationResult {
   isValid: boolean;
@@ -11,157 +12,268 @@ export interface LineupData {
   substitutes: string[];
 }
 
+export interface LineupValidationEntry {
+  lineup: LineupData;
+  seasonId: string;
+  teamId: string;
+  tournamentId?: string | null;
+}
+
+export interface LineupRuleSettings {
+  enable_category_requirements?: boolean | null;
+  lineup_category_requirements?: Record<string, number> | null;
+  updated_at?: string | Date | null;
+}
+
 /**
- * Validate lineup meets all requirements
+ * Category minimums for a starting XI, compiled from tournament settings
  */
-export async function validateLineup(
-  lineup: LineupData,
+export interface CompiledLineupRules {
+  version: string;
+  categoryMinimums: [string, number][];
+}
+
+/**
+ * Preloaded data validateMany evaluates against:
+ * squads by `${teamId}_${seasonId}` (player_id -> category) and
+ * compiled rules by tournament_id
+ */
+export interface LineupValidationContext {
+  squads: Map<string, Map<string, string | null>>;
+  rules: Map<string, CompiledLineupRules>;
+}
+
+// Map category names to category IDs for validation
+const CATEGORY_NAME_TO_ID: Record<string, string> = {
+  'Classic': 'cat_classic',
+  'Legend': 'cat_legend',
+  'Rising Star': 'cat_rising_star',
+  'Veteran': 'cat_veteran'
+};
+
+export const NO_LINEUP_RULES: CompiledLineupRules = { version: 'none', categoryMinimums: [] };
+const RULES_CACHE_LIMIT = 500;
+const SETTINGS_TTL = 60; // seconds - edits on this instance invalidate immediately
+
+const compiledRules = new Map<string, CompiledLineupRules>();
+const settingsKey = (tournamentId: string) => `lineup_rules:${tournamentId}`;
+export const squadKey = (teamId: string, seasonId: string) => `${teamId}_${seasonId}`;
+
+/**
+ * Compile tournament settings into a rule set, memoized per
+ * (tournament, season, settings version)
+ */
+export function compileLineupRules(
+  tournamentId: string,
   seasonId: string,
-  teamId: string,
-  tournamentId?: string
-): Promise<LineupValidationResult> {
-  const errors: string[] = [];
-  const sql = getTournamentDb();
+  settings: LineupRuleSettings | null
+): CompiledLineupRules {
+  if (!settings) return NO_LINEUP_RULES;
+
+  const requirements = settings.lineup_category_requirements || {};
+  const version = settings.updated_at
+    ? new Date(settings.updated_at).getTime().toString()
+    : JSON.stringify([settings.enable_category_requirements, requirements]);
+  const key = `${tournamentId}:${seasonId}:${version}`;
+
+  const cached = compiledRules.get(key);
+  if (cached) return cached;
+
+  // Only validate if category requirements are enabled
+  const rules: CompiledLineupRules = {
+    version,
+    categoryMinimums: settings.enable_category_requirements
+      ? Object.entries(requirements).map(([categoryId, minCount]) => [categoryId, Number(minCount)])
+      : []
+  };
 
-  console.log('🔍 validateLineup - Input:', {
-    starting_xi_count: lineup.starting_xi?.length,
-    substitutes_count: lineup.substitutes?.length,
-    starting_xi: lineup.starting_xi,
-    substitutes: lineup.substitutes,
-    seasonId,
-    teamId
-  });
+  if (compiledRules.size >= RULES_CACHE_LIMIT) compiledRules.clear();
+  compiledRules.set(key, rules);
+  return rules;
+}
+
+/**
+ * Drop cached settings after tournament_settings is edited
+ */
+export function invalidateLineupRules(tournamentId: string): void {
+  memoryCache.delete(settingsKey(tournamentId));
+}
+
+/**
+ * Validate one lineup against a preloaded squad and rule set (no I/O)
+ */
+export function evaluateLineup(
+  lineup: LineupData,
+  squad: Map<string, string | null>,
+  rules: CompiledLineupRules
+): LineupValidationResult {
+  const errors: string[] = [];
 
   // 1. Check starting XI count
   if (!lineup.starting_xi || lineup.starting_xi.length !== 5) {
-    const error = 'Starting XI must have exactly 5 players';
-    console.error('❌', error, '- Got:', lineup.starting_xi?.length);
-    errors.push(error);
+    errors.push('Starting XI must have exactly 5 players');
   }
 
   // 2. Check substitutes count (0 to 2 allowed)
   if (lineup.substitutes && lineup.substitutes.length > 2) {
-    const error = 'Cannot have more than 2 substitute players';
-    console.error('❌', error, '- Got:', lineup.substitutes?.length);
-    errors.push(error);
+    errors.push('Cannot have more than 2 substitute players');
   }
 
   if (errors.length > 0) {
-    return {
-      isValid: false,
-      errors,
-      classicPlayerCount: 0,
-    };
+    return { isValid: false, errors, classicPlayerCount: 0 };
   }
 
   // 3. Check for duplicate players
-  const allPlayers = [...lineup.starting_xi, ...lineup.substitutes];
+  const substitutes = lineup.substitutes || [];
+  const allPlayers = [...lineup.starting_xi, ...substitutes];
   const uniquePlayers = new Set(allPlayers);
-  
+
   if (uniquePlayers.size !== allPlayers.length) {
     errors.push('Duplicate players found in lineup');
   }
 
   // 4. Check if all players belong to the team and are registered for season
-  console.log('🔍 Checking player eligibility:', { allPlayers, seasonId, teamId });
-  const playerChecks = await sql`
-    SELECT player_id, category
-    FROM player_seasons
-    WHERE player_id = ANY(${allPlayers})
-    AND season_id = ${seasonId}
-    AND team_id = ${teamId}
-  `;
-  console.log('🔍 Player checks result:', playerChecks);
-  console.log('🔍 Unique category values found:', [...new Set(playerChecks.map((p: any) => p.category))]);
-
-  if (playerChecks.length !== allPlayers.length) {
-    const error = 'Some players are not eligible for this team/season';
-    console.error('❌', error, '- Expected:', allPlayers.length, 'Found:', playerChecks.length);
-    console.error('Missing players:', allPlayers.filter(p => !playerChecks.find((pc: any) => pc.player_id === p)));
-    errors.push(error);
+  const eligibleCount = allPlayers.filter(playerId => squad.has(playerId)).length;
+  if (eligibleCount !== allPlayers.length) {
+    errors.push('Some players are not eligible for this team/season');
   }
 
-  // 5. Validate category requirements from tournament settings
-  const startingXIChecks = playerChecks.filter(
-    (p: any) => lineup.starting_xi.includes(p.player_id)
-  );
-  
-  console.log('🔍 Starting XI player categories:', {
-    total_players_checked: playerChecks.length,
-    starting_xi_players: startingXIChecks.length,
-    starting_xi_categories: startingXIChecks.map((p: any) => ({ id: p.player_id, category: p.category }))
-  });
-
-  // Get category counts
-  // Map category names to category IDs for validation
-  const categoryNameToId: Record<string, string> = {
-    'Classic': 'cat_classic',
-    'Legend': 'cat_legend',
-    'Rising Star': 'cat_rising_star',
-    'Veteran': 'cat_veteran'
-  };
-  
+  // 5. Count starting XI categories (by category ID where the name is known)
   const categoryCounts: Record<string, number> = {};
-  startingXIChecks.forEach((p: any) => {
-    const categoryName = p.category || 'Unknown';
-    // Try to get the category ID from the mapping, otherwise use the value as-is
-    const categoryId = categoryNameToId[categoryName] || categoryName;
+  for (const playerId of uniquePlayers) {
+    if (!lineup.starting_xi.includes(playerId) || !squad.has(playerId)) continue;
+    const categoryName = squad.get(playerId) || 'Unknown';
+    const categoryId = CATEGORY_NAME_TO_ID[categoryName] || categoryName;
     categoryCounts[categoryId] = (categoryCounts[categoryId] || 0) + 1;
-  });
+  }
 
-  console.log('🔍 Category counts in starting XI:', categoryCounts);
+  // 6. Tournament category requirements
+  for (const [categoryId, minCount] of rules.categoryMinimums) {
+    const actualCount = categoryCounts[categoryId] || 0;
+    if (actualCount < minCount) {
+      errors.push(`Starting XI must have at least ${minCount} player(s) from ${categoryId} category (currently has ${actualCount})`);
+    }
+  }
 
-  // 6. Check tournament settings for category requirements
-  if (tournamentId) {
+  return {
+    isValid: errors.length === 0,
+    errors,
+    classicPlayerCount: categoryCounts['Classic'] || categoryCounts['classic'] || 0,
+  };
+}
+
+/**
+ * Validate many lineups (e.g. every lineup of a round) against one
+ * preloaded context
+ */
+export function validateMany(
+  entries: LineupValidationEntry[],
+  context: LineupValidationContext
+): LineupValidationResult[] {
+  return entries.map(entry => evaluateLineup(
+    entry.lineup,
+    context.squads.get(squadKey(entry.teamId, entry.seasonId)) || new Map(),
+    (entry.tournamentId && context.rules.get(entry.tournamentId)) || NO_LINEUP_RULES
+  ));
+}
+
+/**
+ * Compiled rules for each tournament; settings are cached per tournament
+ * and only the misses are read, in one query
+ */
+export async function loadLineupRules(
+  tournaments: { tournamentId: string; seasonId: string }[]
+): Promise<Map<string, CompiledLineupRules>> {
+  const settingsById = new Map<string, LineupRuleSettings | null>();
+  const misses: string[] = [];
+
+  for (const tournamentId of new Set(tournaments.map(t => t.tournamentId))) {
+    const cached = memoryCache.get<{ settings: LineupRuleSettings | null }>(settingsKey(tournamentId));
+    if (cached) settingsById.set(tournamentId, cached.settings);
+    else misses.push(tournamentId);
+  }
+
+  if (misses.length > 0) {
     try {
-      const settingsResult = await sql`
-        SELECT enable_category_requirements, lineup_category_requirements
+      const sql = getTournamentDb();
+      const rows = await sql`
+        SELECT tournament_id, enable_category_requirements, lineup_category_requirements, updated_at
         FROM tournament_settings
-        WHERE tournament_id = ${tournamentId}
-        LIMIT 1
+        WHERE tournament_id = ANY(${misses}::text[])
       `;
-
-      if (settingsResult.length > 0) {
-        const enableRequirements = settingsResult[0].enable_category_requirements;
-        const categoryRequirements = settingsResult[0].lineup_category_requirements;
-        
-        console.log('🔍 Tournament category settings:', {
-          enable_category_requirements: enableRequirements,
-          categoryRequirements
-        });
-
-        // Only validate if category requirements are enabled
-        if (enableRequirements && categoryRequirements && Object.keys(categoryRequirements).length > 0) {
-          console.log('🔍 Category requirements ENABLED - validating...');
-          
-          // Validate each category requirement
-          for (const [categoryId, minCount] of Object.entries(categoryRequirements)) {
-            const actualCount = categoryCounts[categoryId] || 0;
-            console.log(`🔍 Checking category requirement:`, {
-              categoryId,
-              minCount,
-              actualCount,
-              categoryCounts,
-              hasCategory: categoryId in categoryCounts
-            });
-            if (actualCount < minCount) {
-              errors.push(`Starting XI must have at least ${minCount} player(s) from ${categoryId} category (currently has ${actualCount})`);
-            }
-          }
-        } else {
-          console.log('✅ Category requirements DISABLED - skipping validation');
-        }
+      const found = new Map((rows as any[]).map(row => [row.tournament_id, row as LineupRuleSettings]));
+      for (const tournamentId of misses) {
+        const settings = found.get(tournamentId) || null;
+        memoryCache.set(settingsKey(tournamentId), { settings }, SETTINGS_TTL);
+        settingsById.set(tournamentId, settings);
       }
     } catch (error) {
+      // Validate without category requirements rather than reject the lineup
       console.error('Error checking tournament category requirements:', error);
     }
   }
-  
-  return {
-    isValid: errors.length === 0,
-    errors,
-    classicPlayerCount: categoryCounts['Classic'] || categoryCounts['classic'] || 0,
-  };
+
+  const rules = new Map<string, CompiledLineupRules>();
+  for (const { tournamentId, seasonId } of tournaments) {
+    rules.set(tournamentId, compileLineupRules(tournamentId, seasonId, settingsById.get(tournamentId) || null));
+  }
+  return rules;
+}
+
+/**
+ * Squads and rules for a set of lineups: one player_seasons query plus
+ * (on a cache miss) one tournament_settings query
+ */
+export async function loadLineupValidationContext(
+  entries: LineupValidationEntry[]
+): Promise<LineupValidationContext> {
+  const sql = getTournamentDb();
+  const teamIds = [...new Set(entries.map(e => e.teamId))];
+  const seasonIds = [...new Set(entries.map(e => e.seasonId))];
+  const wanted = new Set(entries.map(e => squadKey(e.teamId, e.seasonId)));
+
+  const [squadRows, rules] = await Promise.all([
+    teamIds.length > 0
+      ? sql`
+          SELECT team_id, season_id, player_id, category
+          FROM player_seasons
+          WHERE team_id = ANY(${teamIds}::text[])
+            AND season_id = ANY(${seasonIds}::text[])
+        `
+      : Promise.resolve([]),
+    loadLineupRules(entries
+      .filter(e => e.tournamentId)
+      .map(e => ({ tournamentId: e.tournamentId!, seasonId: e.seasonId }))),
+  ]);
+
+  const squads = new Map<string, Map<string, string | null>>();
+  for (const row of squadRows as any[]) {
+    const key = squadKey(row.team_id, row.season_id);
+    if (!wanted.has(key)) continue;
+    if (!squads.has(key)) squads.set(key, new Map());
+    squads.get(key)!.set(row.player_id, row.category ?? null);
+  }
+
+  return { squads, rules };
+}
+
+/**
+ * Validate lineup meets all requirements
+ */
+export async function validateLineup(
+  lineup: LineupData,
+  seasonId: string,
+  teamId: string,
+  tournamentId?: string
+): Promise<LineupValidationResult> {
+  const entry = { lineup, seasonId, teamId, tournamentId };
+  const context = await loadLineupValidationContext([entry]);
+  const [result] = validateMany([entry], context);
+
+  if (!result.isValid) {
+    console.error('❌ Lineup validation failed:', { teamId, seasonId, tournamentId, errors: result.errors });
+  }
+  return result;
 }
 
 /**
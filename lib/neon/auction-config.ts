@@ -8,7 +8,7 @@
  * - Tiebreakers
  */
 
-import { neon } from '@neondatabase/serverless';
+import { neon, Pool } from '@neondatabase/serverless';
 
 const connectionString = process.env.NEON_AUCTION_DB_URL || process.env.NEON_DATABASE_URL;
 
@@ -34,3 +34,17 @@ export function getAuctionDb() {
   }
   return auctionSql;
 }
+
+// Shared connection pool for multi-statement work (transactions, temp tables).
+// Created on first use and reused across requests in the same instance.
+let auctionPool: Pool | null = null;
+
+export function getAuctionPool(): Pool {
+  if (!connectionString) {
+    throw new Error('Auction database not configured. Check NEON_AUCTION_DB_URL.');
+  }
+  if (!auctionPool) {
+    auctionPool = new Pool({ connectionString });
+  }
+  return auctionPool;
+}
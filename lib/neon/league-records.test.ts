@@ -0,0 +1,112 @@
+import { describe, it, expect, vi } from 'vitest';
+
+vi.mock('./tournament-config', () => ({
+  getTournamentDb: vi.fn(),
+}));
+
+const {
+  RECORD_DEFINITIONS,
+  mergeRecord,
+  refreshLeagueRecords,
+  snapshotETag
+} = await import('./league-records');
+const { getTournamentDb } = await import('./tournament-config');
+
+const mostGoals = RECORD_DEFINITIONS.find(d => d.key === 'player.mostGoals')!;
+const winStreak = RECORD_DEFINITIONS.find(d => d.key === 'team.longestWinStreak')!;
+
+const row = (id: string, holder: string, goals: number) => ({
+  id, holder_id: holder, player_name: holder.toUpperCase(), goals_scored: goals,
+  season_id: 'SSPSLS16', matches_played: 10, team: 'Team A'
+});
+
+const record = {
+  record_key: 'player.mostGoals',
+  holder_id: 'p1',
+  source_id: 'p1_SSPSLS12',
+  value: 30,
+  details: { player_name: 'P1', goals_scored: 30, season_id: 'SSPSLS12', matches_played: 14, team: 'Team B' }
+};
+
+describe('mergeRecord', () => {
+  it('hands the record to an affected row that beats it', () => {
+    const merged = mergeRecord(mostGoals, record, [row('p2_SSPSLS16', 'p2', 31)], new Set(['p2']));
+    expect(merged).toMatchObject({ holder_id: 'p2', source_id: 'p2_SSPSLS16', value: 31 });
+    expect((merged as any).details).toEqual({
+      player_name: 'P2', goals_scored: 31, season_id: 'SSPSLS16', matches_played: 10, team: 'Team A'
+    });
+  });
+
+  it('keeps the current holder on ties and lower values', () => {
+    const rows = [row('p2_SSPSLS16', 'p2', 30), row('p3_SSPSLS16', 'p3', 12)];
+    expect(mergeRecord(mostGoals, record, rows, new Set(['p2', 'p3']))).toBe(record);
+  });
+
+  it('recomputes when the holder row went down or disappeared', () => {
+    expect(mergeRecord(mostGoals, record, [row('p1_SSPSLS12', 'p1', 28)], new Set(['p1']))).toBe('recompute');
+    expect(mergeRecord(mostGoals, record, [], new Set(['p1']))).toBe('recompute');
+  });
+
+  it('refreshes details when the holder row improves', () => {
+    expect(mergeRecord(mostGoals, record, [row('p1_SSPSLS12', 'p1', 32)], new Set(['p1']))).toMatchObject({
+      holder_id: 'p1', value: 32
+    });
+  });
+
+  it('takes the best qualifying row when there is no record yet', () => {
+    const rows = [
+      { id: '1', holder_id: 't1', team_name: 'T1', win_streak: 0, season_id: 'S1' },
+      { id: '2', holder_id: 't2', team_name: 'T2', win_streak: 3, season_id: 'S1' }
+    ];
+    expect(mergeRecord(winStreak, null, rows, new Set(['t1', 't2']))).toMatchObject({ holder_id: 't2', value: 3 });
+    expect(mergeRecord(winStreak, null, rows.slice(0, 1), new Set(['t1']))).toBeNull();
+  });
+});
+
+describe('refreshLeagueRecords', () => {
+  // Stored record p1 (30), affected player p2 now on 31; `written` is what
+  // the conditional upsert reports back
+  function mockRecordsDb(written: string[]) {
+    const sql: any = vi.fn()
+      .mockResolvedValueOnce([record])
+      .mockResolvedValueOnce([{ snapshot_key: 'league-records' }, { snapshot_key: 'hall-of-fame' }]);
+    sql.query = vi.fn(async (text: string, params: any[]) => {
+      if (text.includes('to_jsonb(t)')) return [{ record_key: 'player.mostGoals', row: row('p3_SSPSLS15', 'p3', 33) }];
+      if (text.includes('AS holder_id')) return [row('p2_SSPSLS16', 'p2', 31)];
+      return { text, params };
+    });
+    sql.transaction = vi.fn()
+      .mockResolvedValueOnce([written.map(record_key => ({ record_key }))])
+      .mockResolvedValueOnce([]);
+    vi.mocked(getTournamentDb).mockReturnValue(sql);
+    return sql;
+  }
+
+  it('writes incremental records conditionally', async () => {
+    const sql = mockRecordsDb(['player.mostGoals']);
+
+    await refreshLeagueRecords({ playerIds: ['p2'] });
+
+    const [upsert] = await Promise.all(sql.transaction.mock.calls[0][0]);
+    expect(upsert.text).toContain('WHERE EXCLUDED.value >= league_season_records.value');
+    expect(upsert.params[2]).toEqual(['p2_SSPSLS16']);
+    expect(sql.transaction).toHaveBeenCalledTimes(1);
+  });
+
+  it('recomputes a record over the full history when its write loses', async () => {
+    const sql = mockRecordsDb([]);
+
+    await refreshLeagueRecords({ playerIds: ['p2'] });
+
+    expect(sql.transaction).toHaveBeenCalledTimes(2);
+    const [upsert] = await Promise.all(sql.transaction.mock.calls[1][0]);
+    expect(upsert.text).not.toContain('WHERE EXCLUDED.value');
+    expect(upsert.params[2]).toEqual(['p3_SSPSLS15']);
+  });
+});
+
+describe('snapshotETag', () => {
+  it('is a quoted key/version pair', () => {
+    expect(snapshotETag('hall-of-fame', 7)).toBe('"hall-of-fame-v7"');
+  });
+});
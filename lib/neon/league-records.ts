@@ -0,0 +1,452 @@
+/**
+ * League Records - materialized league records and hall of fame
+ *
+ * Single-season records live in league_season_records, all-time player
+ * totals in player_career_totals, and the public API payloads in
+ * league_record_snapshots (Tournament DB, see
+ * migrations/create_league_records_tables.sql).
+ *
+ * After a fixture only the affected teams/players are re-read: a record
+ * changes hands when one of their rows beats it, and is recomputed over the
+ * full history only when its current holder's row went down (result edit).
+ * Incremental writes are conditional, so a refresh working from a stale read
+ * can't replace a higher record; keys it loses are recomputed in full.
+ * Snapshot versions only move when a payload actually changes, so they make
+ * stable ETags for CDN caching.
+ */
+
+import { getTournamentDb } from './tournament-config';
+
+export type RecordGroup = 'team' | 'player';
+export type SnapshotKey = 'league-records' | 'hall-of-fame';
+
+export interface RecordDefinition {
+  key: string;             // league_season_records.record_key
+  group: RecordGroup;
+  name: string;            // Field name in the API payload
+  column: string;          // Value compared (source column)
+  positiveOnly?: boolean;  // Ignore rows where the value is 0
+  fields: string[];        // Columns returned in the API payload
+}
+
+export interface SeasonRecord {
+  record_key: string;
+  holder_id: string;
+  source_id: string;
+  value: number;
+  details: Record<string, any>;
+}
+
+export interface RecordsRefreshScope {
+  teamIds?: string[];
+  playerIds?: string[];
+}
+
+export interface LeagueRecordSnapshot {
+  version: number;
+  payload: Record<string, any>;
+  updated_at: string;
+}
+
+export const RECORD_DEFINITIONS: RecordDefinition[] = [
+  { key: 'team.highestPoints', group: 'team', name: 'highestPoints', column: 'points', fields: ['team_name', 'points', 'season_id', 'wins', 'matches_played'] },
+  { key: 'team.mostGoals', group: 'team', name: 'mostGoals', column: 'goals_for', fields: ['team_name', 'goals', 'season_id', 'matches_played'] },
+  { key: 'team.bestGoalDifference', group: 'team', name: 'bestGoalDifference', column: 'goal_difference', fields: ['team_name', 'goal_difference', 'goals_for', 'goals_against', 'season_id'] },
+  { key: 'team.longestWinStreak', group: 'team', name: 'longestWinStreak', column: 'win_streak', positiveOnly: true, fields: ['team_name', 'win_streak', 'season_id'] },
+  { key: 'team.unbeatenStreak', group: 'team', name: 'unbeatenStreak', column: 'unbeaten_streak', positiveOnly: true, fields: ['team_name', 'unbeaten_streak', 'season_id'] },
+  { key: 'player.mostGoals', group: 'player', name: 'mostGoals', column: 'goals_scored', fields: ['player_name', 'goals_scored', 'season_id', 'matches_played', 'team'] },
+  { key: 'player.mostAssists', group: 'player', name: 'mostAssists', column: 'assists', fields: ['player_name', 'assists', 'season_id', 'matches_played', 'team'] },
+  { key: 'player.mostCleanSheets', group: 'player', name: 'mostCleanSheets', column: 'clean_sheets', fields: ['player_name', 'clean_sheets', 'season_id', 'matches_played', 'team'] },
+  { key: 'player.mostPoints', group: 'player', name: 'mostPoints', column: 'points', fields: ['player_name', 'points', 'season_id', 'matches_played', 'team'] },
+];
+
+// Per-season rows each group's records are taken from. Player rows are
+// modern seasons plus historical (1-15) realplayerstats rows.
+const SOURCES: Record<RecordGroup, { table: string; holder: string; columns: string; where: string }> = {
+  team: {
+    table: 'teamstats',
+    holder: 'team_id',
+    columns: `id::text AS id, team_id AS holder_id, team_name, season_id, points, wins, matches_played,
+              goals_for, goals_for AS goals, goals_against, goal_difference, win_streak, unbeaten_streak`,
+    where: 'TRUE',
+  },
+  player: {
+    table: 'player_stats_v',
+    holder: 'player_id',
+    columns: `id, player_id AS holder_id, player_name, season_id, team, matches_played,
+              goals_scored, assists, clean_sheets, points`,
+    where: `(data_source = 'modern' OR season_number < 16)`,
+  },
+};
+
+function toRecord(def: RecordDefinition, row: Record<string, any>): SeasonRecord {
+  return {
+    record_key: def.key,
+    holder_id: row.holder_id,
+    source_id: String(row.id),
+    value: Number(row[def.column]) || 0,
+    details: Object.fromEntries(def.fields.map(field => [field, row[field] ?? null])),
+  };
+}
+
+function qualifies(def: RecordDefinition, row: Record<string, any>): boolean {
+  return !def.positiveOnly || Number(row[def.column]) > 0;
+}
+
+/**
+ * Incremental update of one record from the affected holders' rows.
+ *
+ * Returns the new record (null = no qualifying row), or 'recompute' when
+ * the current holder's row dropped below the record and the true holder
+ * could be anyone.
+ */
+export function mergeRecord(
+  def: RecordDefinition,
+  current: SeasonRecord | null,
+  affectedRows: Record<string, any>[],
+  affectedHolderIds: Set<string>
+): SeasonRecord | null | 'recompute' {
+  if (current && affectedHolderIds.has(current.holder_id)) {
+    const holderRow = affectedRows.find(row => String(row.id) === current.source_id);
+    if (!holderRow || !qualifies(def, holderRow) || Number(holderRow[def.column]) < current.value) {
+      return 'recompute';
+    }
+  }
+
+  let best = current;
+  for (const row of affectedRows) {
+    if (!qualifies(def, row)) continue;
+    const value = Number(row[def.column]) || 0;
+    const isHolderRow = current && String(row.id) === current.source_id;
+    // Ties keep the existing holder; the holder's own row refreshes its details
+    if (!best || value > best.value || isHolderRow && best === current) {
+      best = toRecord(def, row);
+    }
+  }
+  return best;
+}
+
+/**
+ * Top row for each definition over the full history, in one round trip
+ */
+async function loadTopRows(defs: RecordDefinition[]): Promise<Map<string, SeasonRecord | null>> {
+  const sql = getTournamentDb();
+  const top = new Map<string, SeasonRecord | null>(defs.map(def => [def.key, null]));
+  if (defs.length === 0) return top;
+
+  const text = defs.map((def, i) => {
+    const source = SOURCES[def.group];
+    return `(SELECT $${i + 1}::text AS record_key, to_jsonb(t) AS row FROM (
+      SELECT ${source.columns} FROM ${source.table}
+      WHERE ${source.where}${def.positiveOnly ? ` AND ${def.column} > 0` : ''}
+      ORDER BY ${def.column} DESC NULLS LAST, id
+      LIMIT 1
+    ) t)`;
+  }).join('\nUNION ALL\n');
+
+  const rows = await sql.query(text, defs.map(def => def.key));
+  for (const { record_key, row } of rows as any[]) {
+    const def = defs.find(d => d.key === record_key)!;
+    top.set(record_key, toRecord(def, row));
+  }
+  return top;
+}
+
+async function loadAffectedRows(group: RecordGroup, holderIds: string[]): Promise<Record<string, any>[]> {
+  if (holderIds.length === 0) return [];
+  const sql = getTournamentDb();
+  const source = SOURCES[group];
+  return await sql.query(`
+    SELECT ${source.columns} FROM ${source.table}
+    WHERE ${source.where} AND ${source.holder} = ANY($1::text[])
+  `, [holderIds]) as Record<string, any>[];
+}
+
+// Hall-of-fame payload, built from player_career_totals inside the refresh transaction
+const HALL_OF_FAME_PAYLOAD_SQL = `
+  jsonb_build_object(
+    'topScorers', COALESCE((
+      SELECT jsonb_agg(t ORDER BY t.total_goals DESC, t.player_id) FROM (
+        SELECT player_id, player_name, total_goals, total_matches, seasons_played,
+               ROUND(total_goals::numeric / NULLIF(total_matches, 0), 2) AS goals_per_game
+        FROM player_career_totals WHERE total_goals > 0
+        ORDER BY total_goals DESC, player_id LIMIT 10
+      ) t), '[]'::jsonb),
+    'topAssisters', COALESCE((
+      SELECT jsonb_agg(t ORDER BY t.total_assists DESC, t.player_id) FROM (
+        SELECT player_id, player_name, total_assists, total_matches, seasons_played
+        FROM player_career_totals WHERE total_assists > 0
+        ORDER BY total_assists DESC, player_id LIMIT 10
+      ) t), '[]'::jsonb),
+    'cleanSheetKings', COALESCE((
+      SELECT jsonb_agg(t ORDER BY t.total_clean_sheets DESC, t.player_id) FROM (
+        SELECT player_id, player_name, total_clean_sheets, total_matches, seasons_played
+        FROM player_career_totals WHERE total_clean_sheets > 0
+        ORDER BY total_clean_sheets DESC, player_id LIMIT 10
+      ) t), '[]'::jsonb),
+    'mostAppearances', COALESCE((
+      SELECT jsonb_agg(t ORDER BY t.total_matches DESC, t.player_id) FROM (
+        SELECT player_id, player_name, total_matches, total_wins, seasons_played, total_goals
+        FROM player_career_totals
+        ORDER BY total_matches DESC, player_id LIMIT 10
+      ) t), '[]'::jsonb),
+    'mostPoints', COALESCE((
+      SELECT jsonb_agg(t ORDER BY t.total_points DESC, t.player_id) FROM (
+        SELECT player_id, player_name, total_points, total_matches, seasons_played
+        FROM player_career_totals WHERE total_points > 0
+        ORDER BY total_points DESC, player_id LIMIT 10
+      ) t), '[]'::jsonb),
+    'bestWinRate', COALESCE((
+      SELECT jsonb_agg(t ORDER BY t.win_rate DESC, t.player_id) FROM (
+        SELECT player_id, player_name, total_wins, total_matches,
+               ROUND((total_wins::numeric / NULLIF(total_matches, 0)) * 100, 1) AS win_rate,
+               seasons_played
+        FROM player_career_totals WHERE total_matches >= 20
+        ORDER BY win_rate DESC, player_id LIMIT 10
+      ) t), '[]'::jsonb)
+  )
+`;
+
+// League-records payload built from league_season_records inside the
+// transaction, so it always matches the stored records ($2-$4: definition
+// keys, groups and names)
+const LEAGUE_RECORDS_PAYLOAD_SQL = `
+  (SELECT jsonb_build_object(
+    'team', COALESCE(jsonb_object_agg(d.name, r.details) FILTER (WHERE d.grp = 'team'), '{}'::jsonb),
+    'player', COALESCE(jsonb_object_agg(d.name, r.details) FILTER (WHERE d.grp = 'player'), '{}'::jsonb)
+  )
+  FROM league_season_records r
+  JOIN UNNEST($2::text[], $3::text[], $4::text[]) AS d(record_key, grp, name) USING (record_key))
+`;
+
+// Version only moves when the payload changes
+const UPSERT_SNAPSHOT_SQL = (payloadExpr: string) => `
+  INSERT INTO league_record_snapshots (snapshot_key, version, payload, updated_at)
+  SELECT $1, 1, ${payloadExpr}, NOW()
+  ON CONFLICT (snapshot_key) DO UPDATE SET
+    version = league_record_snapshots.version + 1,
+    payload = EXCLUDED.payload,
+    updated_at = NOW()
+  WHERE league_record_snapshots.payload IS DISTINCT FROM EXCLUDED.payload
+`;
+
+/**
+ * Refresh records, career totals and both snapshots.
+ *
+ * With no scope (or before the first build) everything is rebuilt from the
+ * full history; otherwise only the given teams/players are re-read. All
+ * writes run in one transaction; records whose conditional write loses are
+ * recomputed and stored in a second one.
+ */
+export async function refreshLeagueRecords(scope: RecordsRefreshScope = {}): Promise<void> {
+  const sql = getTournamentDb();
+  const [currentRows, snapshots] = await Promise.all([
+    sql`SELECT record_key, holder_id, source_id, value, details FROM league_season_records`,
+    sql`SELECT snapshot_key FROM league_record_snapshots`,
+  ]);
+  const full = (!scope.teamIds && !scope.playerIds) || snapshots.length < 2;
+
+  const current = new Map<string, SeasonRecord>(
+    (currentRows as any[]).map(row => [row.record_key, { ...row, value: Number(row.value) }])
+  );
+  const next = new Map(current);
+  const affected: Record<RecordGroup, string[]> = {
+    team: full ? [] : [...new Set(scope.teamIds || [])],
+    player: full ? [] : [...new Set(scope.playerIds || [])],
+  };
+
+  const recompute: RecordDefinition[] = [];
+  if (full) {
+    recompute.push(...RECORD_DEFINITIONS);
+  } else {
+    const [teamRows, playerRows] = await Promise.all([
+      loadAffectedRows('team', affected.team),
+      loadAffectedRows('player', affected.player),
+    ]);
+    const rowsByGroup = { team: teamRows, player: playerRows };
+
+    for (const def of RECORD_DEFINITIONS) {
+      if (affected[def.group].length === 0) continue;
+      const merged = mergeRecord(def, current.get(def.key) || null, rowsByGroup[def.group], new Set(affected[def.group]));
+      if (merged === 'recompute') {
+        recompute.push(def);
+      } else if (merged) {
+        next.set(def.key, merged);
+      } else {
+        next.delete(def.key);
+      }
+    }
+  }
+
+  for (const [key, record] of await loadTopRows(recompute)) {
+    if (record) next.set(key, record);
+    else next.delete(key);
+  }
+
+  const changed = [...next.values()].filter(record => {
+    const before = current.get(record.record_key);
+    return !before || before.source_id !== record.source_id || before.value !== record.value
+      || JSON.stringify(before.details) !== JSON.stringify(record.details);
+  });
+  const removed = [...current.values()].filter(record => !next.has(record.record_key));
+  const playerScope = full ? null : affected.player;
+
+  const statements = [
+    ...(changed.length > 0 ? [upsertRecordsQuery(changed, !full)] : []),
+    ...(removed.length > 0 ? [deleteRecordsQuery(removed)] : []),
+    ...(full || affected.player.length > 0 ? [
+      sql.query(`
+        INSERT INTO player_career_totals (
+          player_id, player_name, total_goals, total_assists, total_clean_sheets,
+          total_matches, total_wins, total_points, seasons_played, updated_at
+        )
+        SELECT player_id, MAX(player_name),
+               SUM(goals_scored)::int, SUM(assists)::int, SUM(clean_sheets)::int,
+               SUM(matches_played)::int, SUM(wins)::int, SUM(points)::int,
+               COUNT(DISTINCT season_id)::int, NOW()
+        FROM player_stats_v
+        WHERE ${SOURCES.player.where}
+          AND ($1::text[] IS NULL OR player_id = ANY($1::text[]))
+        GROUP BY player_id
+        ON CONFLICT (player_id) DO UPDATE SET
+          player_name = EXCLUDED.player_name,
+          total_goals = EXCLUDED.total_goals,
+          total_assists = EXCLUDED.total_assists,
+          total_clean_sheets = EXCLUDED.total_clean_sheets,
+          total_matches = EXCLUDED.total_matches,
+          total_wins = EXCLUDED.total_wins,
+          total_points = EXCLUDED.total_points,
+          seasons_played = EXCLUDED.seasons_played,
+          updated_at = NOW()
+      `, [playerScope]),
+      // Drop players (within the refreshed scope) with no stats rows left
+      sql.query(`
+        DELETE FROM player_career_totals c
+        WHERE ($1::text[] IS NULL OR c.player_id = ANY($1::text[]))
+          AND NOT EXISTS (
+            SELECT 1 FROM player_stats_v v
+            WHERE ${SOURCES.player.where} AND v.player_id = c.player_id
+          )
+      `, [playerScope]),
+    ] : []),
+    upsertLeagueRecordsSnapshotQuery(),
+    sql.query(UPSERT_SNAPSHOT_SQL(HALL_OF_FAME_PAYLOAD_SQL), ['hall-of-fame']),
+  ];
+
+  const results = await sql.transaction(statements);
+
+  // Keys whose conditional write was skipped: another refresh stored a
+  // higher record, or ours legitimately went down (result edit). Either way
+  // the full history decides.
+  const written = new Set(changed.length > 0 ? (results[0] as any[]).map(row => row.record_key) : []);
+  const lost = RECORD_DEFINITIONS.filter(def => changed.some(r => r.record_key === def.key) && !written.has(def.key));
+  if (lost.length > 0) {
+    await rebuildRecords(lost);
+  }
+
+  console.log(
+    `✅ League records refreshed${full ? ' (full)' : ''}: ${changed.length} changed, ${removed.length} removed, ${recompute.length + lost.length} recomputed`
+  );
+}
+
+/**
+ * Upsert records. Conditional writes only replace a stored record with a
+ * value at least as high, or refresh the same source row.
+ */
+function upsertRecordsQuery(records: SeasonRecord[], conditional: boolean) {
+  const sql = getTournamentDb();
+  return sql.query(`
+    INSERT INTO league_season_records (record_key, holder_id, source_id, value, details, updated_at)
+    SELECT t.record_key, t.holder_id, t.source_id, t.value, t.details, NOW()
+    FROM UNNEST($1::text[], $2::text[], $3::text[], $4::numeric[], $5::jsonb[])
+      AS t(record_key, holder_id, source_id, value, details)
+    ON CONFLICT (record_key) DO UPDATE SET
+      holder_id = EXCLUDED.holder_id,
+      source_id = EXCLUDED.source_id,
+      value = EXCLUDED.value,
+      details = EXCLUDED.details,
+      updated_at = NOW()
+    ${conditional ? `WHERE EXCLUDED.value >= league_season_records.value
+      OR league_season_records.source_id = EXCLUDED.source_id` : ''}
+    RETURNING record_key
+  `, [
+    records.map(r => r.record_key),
+    records.map(r => r.holder_id),
+    records.map(r => r.source_id),
+    records.map(r => r.value),
+    records.map(r => JSON.stringify(r.details)),
+  ]);
+}
+
+/**
+ * Delete records, only while they are still held by the source row that was read
+ */
+function deleteRecordsQuery(records: SeasonRecord[]) {
+  const sql = getTournamentDb();
+  return sql.query(`
+    DELETE FROM league_season_records r
+    USING UNNEST($1::text[], $2::text[]) AS t(record_key, source_id)
+    WHERE r.record_key = t.record_key AND r.source_id = t.source_id
+  `, [records.map(r => r.record_key), records.map(r => r.source_id)]);
+}
+
+function upsertLeagueRecordsSnapshotQuery() {
+  const sql = getTournamentDb();
+  return sql.query(UPSERT_SNAPSHOT_SQL(LEAGUE_RECORDS_PAYLOAD_SQL), [
+    'league-records',
+    RECORD_DEFINITIONS.map(def => def.key),
+    RECORD_DEFINITIONS.map(def => def.group),
+    RECORD_DEFINITIONS.map(def => def.name),
+  ]);
+}
+
+/**
+ * Recompute records over the full history and store them unconditionally
+ */
+async function rebuildRecords(defs: RecordDefinition[]): Promise<void> {
+  const sql = getTournamentDb();
+  const top = await loadTopRows(defs);
+  const records = [...top.values()].filter((record): record is SeasonRecord => record !== null);
+  const missing = [...top.keys()].filter(key => !top.get(key));
+
+  await sql.transaction([
+    ...(records.length > 0 ? [upsertRecordsQuery(records, false)] : []),
+    ...(missing.length > 0 ? [sql.query(
+      `DELETE FROM league_season_records WHERE record_key = ANY($1::text[])`, [missing]
+    )] : []),
+    upsertLeagueRecordsSnapshotQuery(),
+  ]);
+}
+
+/**
+ * Refresh after a write elsewhere has already succeeded.
+ * Failures are logged, not thrown - the next refresh or a full rebuild catches up.
+ */
+export async function refreshLeagueRecordsAfterChange(scope: RecordsRefreshScope = {}): Promise<void> {
+  try {
+    await refreshLeagueRecords(scope);
+  } catch (error) {
+    console.error('Failed to refresh league records:', error);
+  }
+}
+
+/**
+ * Current snapshot (built on first use)
+ */
+export async function getLeagueRecordSnapshot(key: SnapshotKey): Promise<LeagueRecordSnapshot> {
+  const sql = getTournamentDb();
+  const load = () => sql`
+    SELECT version, payload, updated_at FROM league_record_snapshots WHERE snapshot_key = ${key}
+  `;
+
+  let rows = await load();
+  if (rows.length === 0) {
+    await refreshLeagueRecords();
+    rows = await load();
+  }
+  return { version: Number(rows[0].version), payload: rows[0].payload, updated_at: rows[0].updated_at };
+}
+
+export function snapshotETag(key: SnapshotKey, version: number): string {
+  return `"${key}-v${version}"`;
+}
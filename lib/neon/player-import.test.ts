@@ -0,0 +1,50 @@
+import { describe, it, expect, vi } from 'vitest';
+
+vi.mock('./auction-config', () => ({
+  getAuctionPool: vi.fn(),
+}));
+
+const { toStagingRow, buildPlayerUpsertSql } = await import('./player-import');
+
+describe('toStagingRow', () => {
+  it('nulls empty values, defaults flags and assigns an id to new players', () => {
+    const row = toStagingRow({ id: '', player_id: 1105 as any, name: 'Messi', overall_rating: 0, speed: 88 }, 3);
+
+    expect(row.ordinal).toBe(3);
+    expect(row.player_id).toBe('1105');
+    expect(row.id).toMatch(/^[0-9a-f-]{36}$/);
+    expect(row.overall_rating).toBeNull();
+    expect(row.speed).toBe(88);
+    expect(row.is_sold).toBe(false);
+    expect(row.is_auction_eligible).toBe(false);
+  });
+});
+
+describe('buildPlayerUpsertSql', () => {
+  const setClause = (sql: string) => sql.slice(sql.indexOf('DO UPDATE SET'), sql.indexOf('RETURNING'));
+
+  it('never overwrites ownership columns in stats mode', () => {
+    const set = setClause(buildPlayerUpsertSql('stats'));
+
+    for (const column of ['team_id', 'is_sold', 'acquisition_value', 'season_id', 'round_id', 'club']) {
+      expect(set).not.toMatch(new RegExp(`\\b${column} =`));
+    }
+    expect(set).toContain('overall_rating = EXCLUDED.overall_rating');
+    expect(set).toContain('updated_at = NOW()');
+  });
+
+  it('overwrites club but keeps ownership in import mode', () => {
+    const set = setClause(buildPlayerUpsertSql('import'));
+
+    expect(set).toContain('club = EXCLUDED.club');
+    expect(set).not.toMatch(/\bteam_id =/);
+    expect(set).not.toMatch(/\bis_sold =/);
+  });
+
+  it('collapses duplicate player_ids and reports inserts via xmax', () => {
+    const sql = buildPlayerUpsertSql('stats');
+
+    expect(sql).toContain('DISTINCT ON (player_id)');
+    expect(sql).toContain('RETURNING (xmax = 0) AS inserted');
+  });
+});
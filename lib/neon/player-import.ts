@@ -0,0 +1,158 @@
+/**
+ * Football Player Import Pipeline
+ *
+ * Set-based upsert of eFootball player data into footballplayers:
+ * 1. Stage the whole batch into a temp table (one round trip)
+ * 2. Upsert staged rows with a single INSERT ... ON CONFLICT DO UPDATE
+ * 3. Count inserted vs updated rows from RETURNING (xmax = 0)
+ *
+ * scripts/import_players.py runs the same statements from a CSV/Excel export.
+ */
+
+import { randomUUID } from 'crypto';
+import { getAuctionPool } from './auction-config';
+import type { FootballPlayer } from './players';
+
+export type PlayerImportRow = Omit<FootballPlayer, 'created_at' | 'updated_at'>;
+
+/**
+ * 'stats'  - season rating update; ownership (team_id, is_sold, acquisition_value,
+ *            season_id, round_id) and club are never overwritten
+ * 'import' - full import; overwrites club but still keeps ownership on existing rows
+ */
+export type PlayerImportMode = 'stats' | 'import';
+
+export interface PlayerImportResult {
+  inserted: number;
+  updated: number;
+  errors: number;      // Rows rejected before staging (missing player_id or name)
+  duplicates: number;  // Repeated player_ids in the batch (last occurrence wins)
+}
+
+export const PLAYER_IMPORT_COLUMNS = [
+  'id', 'player_id', 'name', 'position', 'position_group', 'overall_rating',
+  'nationality', 'age', 'club', 'team_id', 'team_name', 'season_id', 'round_id',
+  'is_auction_eligible', 'is_sold', 'acquisition_value', 'playing_style',
+  // Offensive attributes
+  'offensive_awareness', 'ball_control', 'dribbling', 'tight_possession',
+  'low_pass', 'lofted_pass', 'finishing', 'heading', 'set_piece_taking', 'curl',
+  // Physical attributes
+  'speed', 'acceleration', 'kicking_power', 'jumping', 'physical_contact', 'balance', 'stamina',
+  // Defensive attributes
+  'defensive_awareness', 'tackling', 'aggression', 'defensive_engagement',
+  // Goalkeeper attributes
+  'gk_awareness', 'gk_catching', 'gk_parrying', 'gk_reflexes', 'gk_reach',
+] as const;
+
+type PlayerImportColumn = typeof PLAYER_IMPORT_COLUMNS[number];
+
+const BOOLEAN_COLUMNS = new Set<PlayerImportColumn>(['is_auction_eligible', 'is_sold']);
+
+const ATTRIBUTE_COLUMNS = PLAYER_IMPORT_COLUMNS.slice(PLAYER_IMPORT_COLUMNS.indexOf('offensive_awareness'));
+
+// Columns refreshed on conflict. Anything not listed keeps its stored value.
+const UPDATE_COLUMNS: Record<PlayerImportMode, readonly string[]> = {
+  stats: [
+    'name', 'position', 'position_group', 'overall_rating', 'nationality', 'age',
+    'team_name', 'playing_style', ...ATTRIBUTE_COLUMNS,
+  ],
+  import: [
+    'name', 'position', 'position_group', 'overall_rating', 'nationality', 'age',
+    'club', 'playing_style', ...ATTRIBUTE_COLUMNS,
+  ],
+};
+
+export const STAGING_TABLE = 'footballplayers_staging';
+
+/**
+ * Normalise one incoming player to staging column values.
+ * Empty/zero values become NULL, flags default to false. New players get a
+ * fresh id; existing players keep theirs because id is never updated.
+ */
+export function toStagingRow(p: PlayerImportRow, ordinal: number): Record<string, unknown> {
+  const row: Record<string, unknown> = { ordinal };
+  for (const column of PLAYER_IMPORT_COLUMNS) {
+    const value = (p as Record<string, unknown>)[column];
+    row[column] = BOOLEAN_COLUMNS.has(column)
+      ? value !== undefined ? Boolean(value) : false
+      : value || null;
+  }
+  row.id = p.id || randomUUID();
+  row.player_id = String(p.player_id);
+  return row;
+}
+
+/**
+ * Build the upsert statement that moves staged rows into footballplayers.
+ * Duplicate player_ids in the batch collapse to their last occurrence so
+ * ON CONFLICT never touches the same row twice.
+ */
+export function buildPlayerUpsertSql(mode: PlayerImportMode): string {
+  const columns = PLAYER_IMPORT_COLUMNS.join(', ');
+  const updates = UPDATE_COLUMNS[mode].map(column => `${column} = EXCLUDED.${column}`);
+  if (mode === 'stats') updates.push('updated_at = NOW()');
+
+  return `
+    INSERT INTO footballplayers (${columns})
+    SELECT ${columns}
+    FROM (
+      SELECT DISTINCT ON (player_id) *
+      FROM ${STAGING_TABLE}
+      ORDER BY player_id, ordinal DESC
+    ) staged
+    ON CONFLICT (player_id) DO UPDATE SET
+      ${updates.join(',\n      ')}
+    RETURNING (xmax = 0) AS inserted
+  `;
+}
+
+/**
+ * Upsert a batch of players in one transaction
+ */
+export async function upsertPlayers(
+  players: PlayerImportRow[],
+  mode: PlayerImportMode
+): Promise<PlayerImportResult> {
+  const valid = players.filter(p => p.player_id && p.name);
+  const errors = players.length - valid.length;
+  if (errors > 0) {
+    console.warn(`⚠️ Skipping ${errors} player(s) without player_id or name`);
+  }
+  if (valid.length === 0) {
+    return { inserted: 0, updated: 0, errors, duplicates: 0 };
+  }
+
+  const client = await getAuctionPool().connect();
+  try {
+    await client.query('BEGIN');
+
+    // Temp tables are session-local and never WAL-logged
+    await client.query(`
+      CREATE TEMP TABLE ${STAGING_TABLE} (LIKE footballplayers, ordinal INTEGER)
+      ON COMMIT DROP
+    `);
+
+    // Whole batch travels as one JSON parameter and is expanded server-side
+    const staged = await client.query(
+      `INSERT INTO ${STAGING_TABLE} (ordinal, ${PLAYER_IMPORT_COLUMNS.join(', ')})
+       SELECT ordinal, ${PLAYER_IMPORT_COLUMNS.join(', ')}
+       FROM jsonb_populate_recordset(NULL::${STAGING_TABLE}, $1::jsonb)`,
+      [JSON.stringify(valid.map(toStagingRow))]
+    );
+
+    const result = await client.query(buildPlayerUpsertSql(mode));
+    await client.query('COMMIT');
+
+    const inserted = result.rows.filter(row => row.inserted).length;
+    const updated = result.rows.length - inserted;
+    const duplicates = (staged.rowCount ?? valid.length) - result.rows.length;
+
+    console.log(`🎉 Player ${mode} complete: ${updated} updated, ${inserted} inserted, ${errors} errors, ${duplicates} duplicates`);
+    return { inserted, updated, errors, duplicates };
+  } catch (error) {
+    await client.query('ROLLBACK').catch(() => {});
+    throw error;
+  } finally {
+    client.release();
+  }
+}
@@ -0,0 +1,30 @@
+import { describe, it, expect, vi } from 'vitest';
+
+vi.mock('./auction-config', () => ({
+  auctionSql: vi.fn(),
+}));
+
+const { escapeLikePattern, encodeSearchCursor, decodeSearchCursor } = await import('./player-search');
+
+describe('escapeLikePattern', () => {
+  it('escapes LIKE wildcards and backslashes', () => {
+    expect(escapeLikePattern('50%_off\\')).toBe('50\\%\\_off\\\\');
+  });
+
+  it('leaves ordinary names untouched', () => {
+    expect(escapeLikePattern("N'Golo Kanté")).toBe("N'Golo Kanté");
+  });
+});
+
+describe('search cursors', () => {
+  it('round-trips through encode/decode', () => {
+    const cursor = { s: 1.254321, n: 'Lionel Messi', i: '42' };
+    expect(decodeSearchCursor(encodeSearchCursor(cursor))).toEqual(cursor);
+  });
+
+  it('treats missing or malformed cursors as the first page', () => {
+    expect(decodeSearchCursor(undefined)).toBeNull();
+    expect(decodeSearchCursor('not-a-cursor')).toBeNull();
+    expect(decodeSearchCursor(Buffer.from('{"s":"x"}').toString('base64url'))).toBeNull();
+  });
+});
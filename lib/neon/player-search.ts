@@ -0,0 +1,141 @@
+/**
+ * Football Player Search
+ *
+ * Ranked search over footballplayers backed by pg_trgm GIN indexes
+ * (migrations/add_footballplayers_trigram_search.sql).
+ *
+ * - Digit-only terms take the player_id prefix fast path (btree, pattern ops)
+ * - Other terms match name by substring or trigram word similarity and are
+ *   ranked by similarity, with a boost for name prefixes
+ * - Only the list-view columns are returned
+ * - Pagination is keyset-based: pass back `nextCursor` to get the next page
+ */
+
+import { auctionSql as sql } from './auction-config';
+
+export interface PlayerSearchResult {
+  id: string;
+  player_id: string;
+  name: string;
+  position?: string;
+  position_group?: string;
+  team_id?: string;
+  team_name?: string;
+  club?: string;
+  nationality?: string;
+  overall_rating?: number;
+  is_auction_eligible?: boolean;
+  is_sold?: boolean;
+  score: number;
+}
+
+export interface PlayerSearchPage {
+  players: PlayerSearchResult[];
+  nextCursor: string | null;
+}
+
+interface SearchCursor {
+  s: number;   // score of the last row
+  n: string;   // name (or player_id on the prefix path) of the last row
+  i: string;   // id of the last row
+}
+
+export const PLAYER_SEARCH_MAX_LIMIT = 100;
+
+const PLAYER_ID_PATTERN = /^\d+$/;
+
+/**
+ * Escape LIKE wildcards so user input is matched literally
+ */
+export function escapeLikePattern(term: string): string {
+  return term.replace(/[\\%_]/g, ch => `\\${ch}`);
+}
+
+export function encodeSearchCursor(cursor: SearchCursor): string {
+  return Buffer.from(JSON.stringify(cursor)).toString('base64url');
+}
+
+export function decodeSearchCursor(cursor?: string | null): SearchCursor | null {
+  if (!cursor) return null;
+  try {
+    const parsed = JSON.parse(Buffer.from(cursor, 'base64url').toString('utf8'));
+    if (typeof parsed.s === 'number' && typeof parsed.n === 'string' && typeof parsed.i === 'string') {
+      return parsed;
+    }
+  } catch {
+    // Fall through to treat a malformed cursor as the first page
+  }
+  return null;
+}
+
+/**
+ * Search football players, best matches first
+ */
+export async function searchPlayersRanked(
+  searchTerm: string,
+  options: { limit?: number; cursor?: string | null } = {}
+): Promise<PlayerSearchPage> {
+  if (!sql) {
+    throw new Error('Auction database not configured. Check NEON_AUCTION_DB_URL.');
+  }
+
+  const term = searchTerm.trim();
+  const limit = Math.min(Math.max(options.limit || 50, 1), PLAYER_SEARCH_MAX_LIMIT);
+  if (!term) {
+    return { players: [], nextCursor: null };
+  }
+
+  const cursor = decodeSearchCursor(options.cursor);
+  const escaped = escapeLikePattern(term);
+  let rows: Record<string, any>[];
+
+  if (PLAYER_ID_PATTERN.test(term)) {
+    // player_id prefix fast path - served by idx_footballplayers_player_id_pattern
+    rows = await sql`
+      SELECT id, player_id, name, position, position_group, team_id, team_name,
+             club, nationality, overall_rating, is_auction_eligible, is_sold,
+             1::float8 AS score
+      FROM footballplayers
+      WHERE player_id LIKE ${escaped + '%'}
+        ${cursor ? sql`AND (player_id, id) > (${cursor.n}, ${cursor.i})` : sql``}
+      ORDER BY player_id ASC, id ASC
+      LIMIT ${limit + 1}
+    `;
+  } else {
+    // Trigram path - both predicates are served by idx_footballplayers_name_trgm.
+    // Scores are rounded so keyset comparisons on them are exact.
+    rows = await sql`
+      SELECT * FROM (
+        SELECT id, player_id, name, position, position_group, team_id, team_name,
+               club, nationality, overall_rating, is_auction_eligible, is_sold,
+               ROUND((
+                 GREATEST(similarity(name, ${term}), word_similarity(${term}, name))
+                 + CASE WHEN name ILIKE ${escaped + '%'} THEN 1 ELSE 0 END
+               )::numeric, 6)::float8 AS score
+        FROM footballplayers
+        WHERE name ILIKE ${'%' + escaped + '%'}
+           OR ${term} <% name
+      ) ranked
+      ${cursor
+        ? sql`WHERE score < ${cursor.s} OR (score = ${cursor.s} AND (name, id) > (${cursor.n}, ${cursor.i}))`
+        : sql``}
+      ORDER BY score DESC, name ASC, id ASC
+      LIMIT ${limit + 1}
+    `;
+  }
+
+  const hasMore = rows.length > limit;
+  const players = (hasMore ? rows.slice(0, limit) : rows) as PlayerSearchResult[];
+  const last = players[players.length - 1];
+
+  return {
+    players,
+    nextCursor: hasMore && last
+      ? encodeSearchCursor({
+          s: last.score,
+          n: PLAYER_ID_PATTERN.test(term) ? last.player_id : last.name,
+          i: last.id,
+        })
+      : null,
+  };
+}
@@ -0,0 +1,118 @@
+import { describe, it, expect, vi } from 'vitest';
+
+vi.mock('./tournament-config', () => ({
+  getTournamentDb: vi.fn(),
+}));
+
+const {
+  decodeStatsCursor,
+  encodeStatsCursor,
+  isModernSeason,
+  queryPlayerStats,
+  resolvePlayerStatsScope
+} = await import('./player-stats');
+const { getTournamentDb } = await import('./tournament-config');
+
+// Tagged-template stand-in: every call (fragments included) returns `rows`
+function mockTournamentDb(rows: Record<string, any>[]) {
+  const sql: any = vi.fn(() => rows);
+  sql.unsafe = vi.fn((text: string) => text);
+  vi.mocked(getTournamentDb).mockReturnValue(sql);
+  return sql;
+}
+
+const primaryTournament = vi.fn(async (seasonId: string) => `${seasonId}-LEAGUE`);
+
+describe('resolvePlayerStatsScope', () => {
+  it('returns every season of a player, newest first', async () => {
+    expect(await resolvePlayerStatsScope({ playerId: 'sspslpsl0001' }, primaryTournament)).toEqual({
+      playerId: 'sspslpsl0001', category: undefined, sort: 'season'
+    });
+  });
+
+  it('looks up modern seasons by season_id and historical ones by tournament', async () => {
+    expect(await resolvePlayerStatsScope({ playerId: 'P1', seasonId: 'SSPSLS16' }, primaryTournament)).toMatchObject({
+      source: 'modern', seasonId: 'SSPSLS16', playerId: 'P1', single: true
+    });
+    expect(await resolvePlayerStatsScope({ teamId: 'T1', seasonId: 'SSPSLS12' }, primaryTournament)).toMatchObject({
+      source: 'historical', tournamentId: 'SSPSLS12-LEAGUE', teamId: 'T1', sort: 'points'
+    });
+  });
+
+  it('lists modern season registrations in registration order unless a sort is requested', async () => {
+    expect(await resolvePlayerStatsScope({ seasonId: 'SSPSLS16' }, primaryTournament)).toMatchObject({
+      source: 'modern', seasonId: 'SSPSLS16', sort: 'registration_date'
+    });
+    expect(await resolvePlayerStatsScope({ seasonId: 'SSPSLS16', sortBy: 'goals_scored' }, primaryTournament)).toMatchObject({
+      sort: 'goals_scored'
+    });
+    expect(primaryTournament).not.toHaveBeenCalledWith('SSPSLS16');
+  });
+
+  it('maps SEASON16-LEAGUE tournaments to the modern season and ignores unknown sorts', async () => {
+    expect(await resolvePlayerStatsScope(
+      { tournamentId: 'SEASON16-LEAGUE', category: 'Red', sortBy: 'id; DROP TABLE' },
+      primaryTournament
+    )).toEqual({ source: 'modern', seasonId: 'SEASON16', category: 'Red', sort: 'points' });
+
+    expect(await resolvePlayerStatsScope({ tournamentId: 'SSPSLS10L' }, primaryTournament)).toMatchObject({
+      source: 'historical', tournamentId: 'SSPSLS10L'
+    });
+  });
+
+  it('returns null without a player, season or tournament', async () => {
+    expect(await resolvePlayerStatsScope({ teamId: 'T1' }, primaryTournament)).toBeNull();
+  });
+});
+
+describe('stats cursors', () => {
+  it('round-trips through encode/decode', () => {
+    const cursor = { v: 42, n: 'Player One', i: 'sspslpsl0001_SSPSLS16' };
+    expect(decodeStatsCursor(encodeStatsCursor(cursor))).toEqual(cursor);
+  });
+
+  it('round-trips a NULL sort value and empty name', () => {
+    const cursor = { v: null, n: '', i: 'sspslpsl0002_SSPSLS16' };
+    expect(decodeStatsCursor(encodeStatsCursor(cursor))).toEqual(cursor);
+  });
+
+  it('treats missing or malformed cursors as the first page', () => {
+    expect(decodeStatsCursor(null)).toBeNull();
+    expect(decodeStatsCursor('not-a-cursor')).toBeNull();
+    expect(decodeStatsCursor(Buffer.from('{"v":{},"n":"x","i":"y"}').toString('base64url'))).toBeNull();
+  });
+});
+
+describe('queryPlayerStats', () => {
+  const scope = { source: 'modern' as const, seasonId: 'SSPSLS16', sort: 'registration_date' as const };
+
+  it('pages past rows with no registration date or player name', async () => {
+    mockTournamentDb([
+      { id: 'a_SSPSLS16', player_name: 'A', sort_value: new Date('2025-01-01T00:00:00Z') },
+      { id: 'b_SSPSLS16', player_name: null, sort_value: null },
+      { id: 'c_SSPSLS16', player_name: null, sort_value: null },
+    ]);
+
+    const page = await queryPlayerStats(scope, { limit: 2 });
+
+    expect(page.rows).toHaveLength(2);
+    expect(decodeStatsCursor(page.nextCursor)).toEqual({ v: null, n: '', i: 'b_SSPSLS16' });
+  });
+
+  it('sorts NULLs last and keeps to the NULL tail after a NULL cursor', async () => {
+    const sql = mockTournamentDb([]);
+
+    await queryPlayerStats(scope, { cursor: encodeStatsCursor({ v: null, n: '', i: 'b_SSPSLS16' }) });
+
+    const text = sql.mock.calls.map((call: any[]) => call[0].join('?')).join(' ');
+    expect(text).toContain('IS NULL AND (');
+    expect(text).toContain('NULLS LAST');
+  });
+});
+
+describe('isModernSeason', () => {
+  it('treats season 16 onwards as modern', () => {
+    expect(isModernSeason('SSPSLS16')).toBe(true);
+    expect(isModernSeason('SSPSLS15')).toBe(false);
+  });
+});
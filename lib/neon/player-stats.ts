@@ -0,0 +1,281 @@
+/**
+ * Player Statistics Queries
+ *
+ * Backs /api/stats/players with the player_stats_v view
+ * (migrations/create_player_stats_view.sql), which unions modern seasons
+ * (player_seasons, 16+) and historical seasons (realplayerstats, 1-15).
+ *
+ * - Every filter combination resolves to one scope (resolvePlayerStatsScope)
+ *   and runs the same parameterized query
+ * - Sorting is server-side on a whitelisted column (NULLs last), ties
+ *   broken by player_name (NULL as ''), id
+ * - Pagination is keyset-based: pass back `nextCursor` to get the next page
+ */
+
+import { getTournamentDb } from './tournament-config';
+
+export type PlayerStatsSort =
+  | 'points'
+  | 'goals_scored'
+  | 'assists'
+  | 'motm_awards'
+  | 'matches_played'
+  | 'registration_date'
+  | 'season';
+
+export interface PlayerStatsScope {
+  source?: 'modern' | 'historical';
+  seasonId?: string;
+  tournamentId?: string;
+  playerId?: string;
+  teamId?: string;
+  category?: string;
+  sort: PlayerStatsSort;
+  single?: boolean;  // Exactly one row expected (player + season)
+}
+
+export interface PlayerStatsPage {
+  rows: Record<string, any>[];
+  nextCursor: string | null;
+}
+
+interface StatsCursor {
+  v: number | string | null;  // sort value of the last row
+  n: string;                  // player_name of the last row ('' when NULL)
+  i: string;                  // id of the last row
+}
+
+export const PLAYER_STATS_DEFAULT_LIMIT = 100;
+export const PLAYER_STATS_MAX_LIMIT = 1000;
+
+// Sorts callers can request with ?sortBy=
+export const PUBLIC_SORTS: PlayerStatsSort[] = ['points', 'goals_scored', 'assists', 'motm_awards', 'matches_played'];
+
+const SORT_SPECS: Record<PlayerStatsSort, { expr: string; dir: 'ASC' | 'DESC' }> = {
+  points: { expr: 'points', dir: 'DESC' },
+  goals_scored: { expr: 'goals_scored', dir: 'DESC' },
+  assists: { expr: 'assists', dir: 'DESC' },
+  motm_awards: { expr: 'motm_awards', dir: 'DESC' },
+  matches_played: { expr: 'matches_played', dir: 'DESC' },
+  registration_date: { expr: 'registration_date', dir: 'ASC' },
+  season: { expr: 'COALESCE(season_number, 0)', dir: 'DESC' },
+};
+
+// Tie-break name; NULL names sort (and page) as ''
+const NAME_EXPR = `COALESCE(player_name, '')`;
+
+const VIEW_COLUMNS = `
+  id, player_id, player_name, season_id, tournament_id,
+  team, team_id, category,
+  matches_played, goals_scored, goals_conceded, assists, wins, draws, losses,
+  clean_sheets, motm_awards, points, star_rating,
+  base_points,
+  contract_id, contract_start_season, contract_end_season,
+  is_auto_registered, registration_date, registration_type,
+  auction_value, salary_per_match,
+  prevent_auto_promotion,
+  created_at, updated_at,
+  data_source
+`;
+
+/**
+ * Season number from a season or tournament id ("SSPSLS16", "SSPSLS16L",
+ * "SEASON16-LEAGUE" -> 16)
+ */
+export function seasonNumber(id: string): number {
+  const match = id.match(/(\d+)/);
+  return match ? parseInt(match[1]) : 0;
+}
+
+export function isModernSeason(seasonId: string): boolean {
+  return seasonNumber(seasonId) >= 16;
+}
+
+export function encodeStatsCursor(cursor: StatsCursor): string {
+  return Buffer.from(JSON.stringify(cursor)).toString('base64url');
+}
+
+export function decodeStatsCursor(cursor?: string | null): StatsCursor | null {
+  if (!cursor) return null;
+  try {
+    const parsed = JSON.parse(Buffer.from(cursor, 'base64url').toString('utf8'));
+    if (
+      (parsed.v === null || typeof parsed.v === 'number' || typeof parsed.v === 'string') &&
+      typeof parsed.n === 'string' &&
+      typeof parsed.i === 'string'
+    ) {
+      return parsed;
+    }
+  } catch {
+    // Fall through to treat a malformed cursor as the first page
+  }
+  return null;
+}
+
+/**
+ * Map request filters onto view filters. Season-scoped lookups go to one
+ * source: modern seasons by season_id, historical seasons by tournament_id
+ * (`historicalTournamentId` resolves the season's primary tournament).
+ */
+export async function resolvePlayerStatsScope(
+  params: {
+    seasonId?: string | null;
+    tournamentId?: string | null;
+    playerId?: string | null;
+    teamId?: string | null;
+    category?: string | null;
+    sortBy?: string | null;
+  },
+  historicalTournamentId: (seasonId: string) => Promise<string>
+): Promise<PlayerStatsScope | null> {
+  const { seasonId, playerId, teamId } = params;
+  const category = params.category || undefined;
+  const requestedSort = PUBLIC_SORTS.find(s => s === params.sortBy);
+  const tournamentId = params.tournamentId
+    || (seasonId && !isModernSeason(seasonId) && (playerId || teamId) ? await historicalTournamentId(seasonId) : undefined);
+
+  // All season stats for a player (player details page)
+  if (playerId && !seasonId) {
+    return { playerId, category, sort: requestedSort || 'season' };
+  }
+
+  if (seasonId && (playerId || teamId)) {
+    const base = isModernSeason(seasonId)
+      ? { source: 'modern' as const, seasonId }
+      : { source: 'historical' as const, tournamentId };
+    return playerId
+      ? { ...base, playerId, category, sort: 'points', single: true }
+      : { ...base, teamId: teamId!, category, sort: requestedSort || 'points' };
+  }
+
+  // All players for a season (contracts page, registration page, etc.)
+  if (seasonId) {
+    return isModernSeason(seasonId)
+      ? { source: 'modern', seasonId, category, sort: requestedSort || 'registration_date' }
+      : { source: 'historical', seasonId, category, sort: requestedSort || 'points' };
+  }
+
+  // Tournament leaderboard: SEASON16-LEAGUE style ids map to the modern season
+  if (tournamentId) {
+    const modernSeason = tournamentId.match(/SEASON(\d+)/);
+    if (modernSeason && parseInt(modernSeason[1]) >= 16) {
+      return { source: 'modern', seasonId: tournamentId.split('-')[0], category, sort: requestedSort || 'points' };
+    }
+    return { source: 'historical', tournamentId, category, sort: requestedSort || 'points' };
+  }
+
+  return null;
+}
+
+/**
+ * One page of player_stats_v rows for a scope
+ */
+export async function queryPlayerStats(
+  scope: PlayerStatsScope,
+  options: { limit?: number; cursor?: string | null } = {}
+): Promise<PlayerStatsPage> {
+  const sql = getTournamentDb();
+  const limit = Math.min(Math.max(options.limit || PLAYER_STATS_DEFAULT_LIMIT, 1), PLAYER_STATS_MAX_LIMIT);
+  const cursor = decodeStatsCursor(options.cursor);
+  const { expr, dir } = SORT_SPECS[scope.sort];
+  const sortExpr = sql.unsafe(expr);
+  const after = sql.unsafe(dir === 'DESC' ? '<' : '>');
+  const nameExpr = sql.unsafe(NAME_EXPR);
+
+  const rows = await sql`
+    SELECT ${sql.unsafe(VIEW_COLUMNS)}, ${sortExpr} AS sort_value
+    FROM player_stats_v
+    WHERE TRUE
+      ${scope.source ? sql`AND data_source = ${scope.source}` : sql``}
+      ${scope.seasonId ? sql`AND season_id = ${scope.seasonId}` : sql``}
+      ${scope.tournamentId ? sql`AND tournament_id = ${scope.tournamentId}` : sql``}
+      ${scope.playerId ? sql`AND player_id = ${scope.playerId}` : sql``}
+      ${scope.teamId ? sql`AND team_id = ${scope.teamId}` : sql``}
+      ${scope.category ? sql`AND category = ${scope.category}` : sql``}
+      ${!cursor
+        ? sql``
+        : cursor.v === null
+          // Already into the NULL tail: only NULL rows remain
+          ? sql`AND ${sortExpr} IS NULL AND (${nameExpr}, id) > (${cursor.n}, ${cursor.i})`
+          : sql`AND (${sortExpr} ${after} ${cursor.v} OR ${sortExpr} IS NULL OR (${sortExpr} = ${cursor.v} AND (${nameExpr}, id) > (${cursor.n}, ${cursor.i})))`}
+    ORDER BY ${sortExpr} ${sql.unsafe(dir)} NULLS LAST, ${nameExpr} ASC, id ASC
+    LIMIT ${scope.single ? 1 : limit + 1}
+  `;
+
+  const hasMore = !scope.single && rows.length > limit;
+  const page = hasMore ? rows.slice(0, limit) : rows;
+  const last = page[page.length - 1];
+
+  return {
+    rows: page.map(({ sort_value, ...row }) => row),
+    nextCursor: hasMore && last
+      ? encodeStatsCursor({
+          v: last.sort_value instanceof Date ? last.sort_value.toISOString() : last.sort_value,
+          n: last.player_name ?? '',
+          i: last.id,
+        })
+      : null,
+  };
+}
+
+/**
+ * Player stats aggregated from matchups for a round range of a modern
+ * season (round-wise leaderboards). Open bounds cover every round.
+ */
+export async function queryRoundRangePlayerStats(
+  seasonId: string,
+  options: { startRound?: number | null; endRound?: number | null; limit?: number } = {}
+): Promise<Record<string, any>[]> {
+  const sql = getTournamentDb();
+  const startRound = options.startRound ?? null;
+  const endRound = options.endRound ?? null;
+  const limit = Math.min(Math.max(options.limit || PLAYER_STATS_DEFAULT_LIMIT, 1), PLAYER_STATS_MAX_LIMIT);
+
+  return await sql`
+    WITH played AS (
+      SELECT m.*, f.id AS fid, f.motm_player_id
+      FROM matchups m
+      INNER JOIN fixtures f ON m.fixture_id = f.id
+      WHERE f.season_id = ${seasonId}
+        ${startRound !== null ? sql`AND f.round_number >= ${startRound}` : sql``}
+        ${endRound !== null ? sql`AND f.round_number <= ${endRound}` : sql``}
+        AND m.home_goals IS NOT NULL
+        AND m.away_goals IS NOT NULL
+    ),
+    player_match_stats AS (
+      -- Home and away side of every matchup
+      SELECT side.player_id, side.player_name, p.fid AS fixture_id,
+             side.goals, side.goals_conceded,
+             CASE WHEN p.motm_player_id = side.player_id THEN 1 ELSE 0 END AS motm
+      FROM played p
+      CROSS JOIN LATERAL (VALUES
+        (p.home_player_id, p.home_player_name, p.home_goals, p.away_goals),
+        (p.away_player_id, p.away_player_name, p.away_goals, p.home_goals)
+      ) AS side(player_id, player_name, goals, goals_conceded)
+    )
+    SELECT
+      pms.player_id,
+      MAX(pms.player_name) as player_name,
+      ${seasonId} as season_id,
+      MAX(ps.team) as team,
+      MAX(ps.team_id) as team_id,
+      MAX(ps.category) as category,
+      COUNT(DISTINCT pms.fixture_id) as matches_played,
+      SUM(CASE WHEN pms.goals > pms.goals_conceded THEN 1 ELSE 0 END) as wins,
+      SUM(CASE WHEN pms.goals = pms.goals_conceded THEN 1 ELSE 0 END) as draws,
+      SUM(CASE WHEN pms.goals < pms.goals_conceded THEN 1 ELSE 0 END) as losses,
+      SUM(pms.goals) as goals_scored,
+      SUM(pms.goals_conceded) as goals_conceded,
+      0 as assists,
+      SUM(CASE WHEN pms.goals_conceded = 0 THEN 1 ELSE 0 END) as clean_sheets,
+      SUM(pms.motm) as motm_awards,
+      0 as points,
+      MAX(ps.star_rating) as star_rating,
+      MAX(ps.base_points) as base_points
+    FROM player_match_stats pms
+    LEFT JOIN player_seasons ps ON pms.player_id = ps.player_id AND ps.season_id = ${seasonId}
+    GROUP BY pms.player_id
+    ORDER BY goals_scored DESC, motm_awards DESC
+    LIMIT ${limit}
+  `;
+}
@@ -0,0 +1,51 @@
+import { describe, it, expect, vi, beforeEach } from 'vitest';
+
+const mockQuery = vi.fn();
+
+vi.mock('./auction-config', () => ({
+  auctionSql: vi.fn(),
+  getAuctionPool: vi.fn(() => ({ query: mockQuery })),
+}));
+
+const { getPlayersPage, encodePlayerCursor, decodePlayerCursor } = await import('./players');
+
+describe('getPlayersPage', () => {
+  beforeEach(() => {
+    mockQuery.mockReset();
+  });
+
+  it('returns a cursor when more rows exist than the limit', async () => {
+    mockQuery.mockResolvedValue({
+      rows: [
+        { id: 'a', name: 'Alisson' },
+        { id: 'b', name: 'Benzema' },
+        { id: 'c', name: 'Casemiro' },
+      ],
+    });
+
+    const page = await getPlayersPage({ limit: 2, position: 'CF', view: 'list' });
+    const [query, params] = mockQuery.mock.calls[0];
+
+    expect(page.players).toHaveLength(2);
+    expect(decodePlayerCursor(page.nextCursor)).toEqual({ name: 'Benzema', id: 'b' });
+    expect(query).not.toContain('SELECT *');
+    expect(query).toContain('ORDER BY name ASC, id ASC');
+    expect(params).toEqual(['CF', 3]);
+  });
+
+  it('seeks past the cursor instead of using OFFSET', async () => {
+    mockQuery.mockResolvedValue({ rows: [{ id: 'c', name: 'Casemiro' }] });
+
+    const page = await getPlayersPage({
+      limit: 2,
+      offset: 500,
+      cursor: encodePlayerCursor({ name: 'Benzema', id: 'b' }),
+    });
+    const [query, params] = mockQuery.mock.calls[0];
+
+    expect(query).toContain('(name, id) > ($1, $2)');
+    expect(query).not.toContain('OFFSET');
+    expect(params).toEqual(['Benzema', 'b', 3]);
+    expect(page.nextCursor).toBeNull();
+  });
+});
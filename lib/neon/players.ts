@@ -1,4 +1,6 @@
-import { auctionSql as sql } from './auction-config';
+import { auctionSql as sql, getAuctionPool } from './auction-config';
+import { searchPlayersRanked } from './player-search';
+import { upsertPlayers } from './player-import';
 
 export interface FootballPlayer {
   id: string;
@@ -64,85 +66,133 @@ export interface FootballPlayer {
   updated_at?: Date;
 }
 
-/**
- * Get all players with optional filters
- */
-export async function getAllPlayers(filters?: {
+export interface PlayerFilters {
   position?: string;
   team_id?: string;
   season_id?: string;
   is_auction_eligible?: boolean;
   is_sold?: boolean;
   search?: string;
+}
+
+export interface PlayerPageOptions extends PlayerFilters {
   limit?: number;
-  offset?: number;
-}): Promise<FootballPlayer[]> {
-  try {
-    console.log('🔍 getAllPlayers called with filters:', filters);
+  offset?: number;       // Legacy paging; ignored when cursor is set
+  cursor?: string | null; // Keyset cursor from a previous page's nextCursor
+  view?: 'full' | 'list'; // 'list' returns PLAYER_LIST_COLUMNS only
+}
 
-    // If no filters, return all players
-    if (!filters || Object.keys(filters).filter(k => filters[k as keyof typeof filters] !== undefined).length === 0) {
-      const result = await sql`SELECT * FROM footballplayers ORDER BY name ASC`;
-      console.log(`✅ Fetched ${result.length} players from Neon`);
-      return result as FootballPlayer[];
-    }
+// Columns needed by player lists/tables (no attribute breakdown)
+export const PLAYER_LIST_COLUMNS = [
+  'id', 'player_id', 'name', 'position', 'position_group', 'team_id', 'team_name',
+  'season_id', 'club', 'nationality', 'age', 'playing_style', 'overall_rating',
+  'is_auction_eligible', 'is_sold', 'acquisition_value',
+] as const;
+
+export function encodePlayerCursor(last: { name: string; id: string }): string {
+  return Buffer.from(JSON.stringify({ n: last.name, i: last.id })).toString('base64url');
+}
 
-    // For filtered queries, we need to use Pool for parameterized queries
-    const { Pool } = await import('@neondatabase/serverless');
-    const pool = new Pool({ connectionString: process.env.NEON_AUCTION_DB_URL || process.env.NEON_DATABASE_URL });
-
-    try {
-      // Build WHERE conditions dynamically
-      let query = 'SELECT * FROM footballplayers WHERE 1=1';
-      const params: any[] = [];
-      let paramIndex = 1;
-
-      if (filters?.position) {
-        query += ` AND position = $${paramIndex++}`;
-        params.push(filters.position);
-      }
-      if (filters?.team_id) {
-        query += ` AND team_id = $${paramIndex++}`;
-        params.push(filters.team_id);
-      }
-      if (filters?.season_id) {
-        query += ` AND season_id = $${paramIndex++}`;
-        params.push(filters.season_id);
-      }
-      if (filters?.is_auction_eligible !== undefined) {
-        query += ` AND is_auction_eligible = $${paramIndex++}`;
-        params.push(filters.is_auction_eligible);
-      }
-      if (filters?.is_sold !== undefined) {
-        query += ` AND is_sold = $${paramIndex++}`;
-        params.push(filters.is_sold);
-      }
-      if (filters?.search) {
-        query += ` AND (name ILIKE $${paramIndex++} OR player_id ILIKE $${paramIndex++} OR position ILIKE $${paramIndex++})`;
-        const searchPattern = `%${filters.search}%`;
-        params.push(searchPattern, searchPattern, searchPattern);
-      }
-
-      query += ' ORDER BY name ASC';
-
-      if (filters?.limit) {
-        query += ` LIMIT $${paramIndex++}`;
-        params.push(filters.limit);
-      }
-      if (filters?.offset) {
-        query += ` OFFSET $${paramIndex++}`;
-        params.push(filters.offset);
-      }
-
-      console.log('📝 Query:', query);
-      console.log('📝 Params:', params);
-
-      const result = await pool.query(query, params);
-      console.log(`✅ Fetched ${result.rows.length} players from Neon`);
-      return result.rows as FootballPlayer[];
-    } finally {
-      await pool.end();
+export function decodePlayerCursor(cursor?: string | null): { name: string; id: string } | null {
+  if (!cursor) return null;
+  try {
+    const parsed = JSON.parse(Buffer.from(cursor, 'base64url').toString('utf8'));
+    if (typeof parsed.n === 'string' && typeof parsed.i === 'string') {
+      return { name: parsed.n, id: parsed.i };
     }
+  } catch {
+    // Malformed cursor - start from the first page
+  }
+  return null;
+}
+
+/**
+ * Build the WHERE clause shared by player list and count queries
+ */
+function buildPlayerFilters(filters: PlayerFilters = {}): { conditions: string[]; params: any[] } {
+  const conditions: string[] = [];
+  const params: any[] = [];
+
+  if (filters.position) {
+    params.push(filters.position);
+    conditions.push(`position = $${params.length}`);
+  }
+  if (filters.team_id) {
+    params.push(filters.team_id);
+    conditions.push(`team_id = $${params.length}`);
+  }
+  if (filters.season_id) {
+    params.push(filters.season_id);
+    conditions.push(`season_id = $${params.length}`);
+  }
+  if (filters.is_auction_eligible !== undefined) {
+    params.push(filters.is_auction_eligible);
+    conditions.push(`is_auction_eligible = $${params.length}`);
+  }
+  if (filters.is_sold !== undefined) {
+    params.push(filters.is_sold);
+    conditions.push(`is_sold = $${params.length}`);
+  }
+  if (filters.search) {
+    params.push(`%${filters.search}%`);
+    conditions.push(`(name ILIKE $${params.length} OR player_id ILIKE $${params.length} OR position ILIKE $${params.length})`);
+  }
+
+  return { conditions, params };
+}
+
+/**
+ * Get one page of players ordered by (name, id).
+ * Pass `cursor` (from nextCursor) for keyset paging; served by the
+ * composite indexes in migrations/add_footballplayers_keyset_indexes.sql.
+ */
+export async function getPlayersPage(
+  options: PlayerPageOptions = {}
+): Promise<{ players: FootballPlayer[]; nextCursor: string | null }> {
+  const { conditions, params } = buildPlayerFilters(options);
+  const cursor = decodePlayerCursor(options.cursor);
+
+  if (cursor) {
+    params.push(cursor.name, cursor.id);
+    conditions.push(`(name, id) > ($${params.length - 1}, $${params.length})`);
+  }
+
+  const columns = options.view === 'list' ? PLAYER_LIST_COLUMNS.join(', ') : '*';
+  let query = `SELECT ${columns} FROM footballplayers`;
+  if (conditions.length > 0) {
+    query += ` WHERE ${conditions.join(' AND ')}`;
+  }
+  query += ' ORDER BY name ASC, id ASC';
+
+  if (options.limit) {
+    // One extra row tells us whether another page exists
+    params.push(options.limit + 1);
+    query += ` LIMIT $${params.length}`;
+  }
+  if (options.offset && !cursor) {
+    params.push(options.offset);
+    query += ` OFFSET $${params.length}`;
+  }
+
+  const result = await getAuctionPool().query(query, params);
+  const hasMore = !!options.limit && result.rows.length > options.limit;
+  const players = (hasMore ? result.rows.slice(0, options.limit) : result.rows) as FootballPlayer[];
+  const last = players[players.length - 1];
+
+  return {
+    players,
+    nextCursor: hasMore && last ? encodePlayerCursor(last) : null,
+  };
+}
+
+/**
+ * Get all players with optional filters
+ */
+export async function getAllPlayers(filters?: PlayerPageOptions): Promise<FootballPlayer[]> {
+  try {
+    const { players } = await getPlayersPage(filters);
+    console.log(`✅ Fetched ${players.length} players from Neon`);
+    return players;
   } catch (error) {
     console.error('❌ Error in getAllPlayers:', error);
     throw error;
@@ -267,14 +317,8 @@ export async function updatePlayer(id: string, updates: Partial<FootballPlayer>)
     RETURNING *
   `;
 
-  const { Pool } = await import('@neondatabase/serverless');
-  const pool = new Pool({ connectionString: process.env.NEON_AUCTION_DB_URL || process.env.NEON_DATABASE_URL });
-  try {
-    const result = await pool.query(query, params);
-    return result.rows.length > 0 ? result.rows[0] as FootballPlayer : null;
-  } finally {
-    await pool.end();
-  }
+  const result = await getAuctionPool().query(query, params);
+  return result.rows.length > 0 ? result.rows[0] as FootballPlayer : null;
 }
 
 /**
@@ -296,21 +340,14 @@ export async function updatePlayerEligibility(id: string, isEligible: boolean):
 export async function bulkUpdateEligibility(playerIds: string[], isEligible: boolean): Promise<number> {
   if (playerIds.length === 0) return 0;
 
-  const { Pool } = await import('@neondatabase/serverless');
-  const pool = new Pool({ connectionString: process.env.NEON_AUCTION_DB_URL || process.env.NEON_DATABASE_URL });
+  const query = `
+    UPDATE footballplayers 
+    SET is_auction_eligible = $1
+    WHERE id = ANY($2::text[])
+  `;
 
-  try {
-    const query = `
-      UPDATE footballplayers 
-      SET is_auction_eligible = $1
-      WHERE id = ANY($2::text[])
-    `;
-
-    const result = await pool.query(query, [isEligible, playerIds]);
-    return result.rowCount || 0;
-  } finally {
-    await pool.end();
-  }
+  const result = await getAuctionPool().query(query, [isEligible, playerIds]);
+  return result.rowCount || 0;
 }
 
 /**
@@ -362,65 +399,12 @@ export async function getTotalPlayerCount(): Promise<number> {
 /**
  * Get total player count with filters
  */
-export async function getTotalPlayerCountWithFilters(filters?: {
-  position?: string;
-  team_id?: string;
-  season_id?: string;
-  is_auction_eligible?: boolean;
-  is_sold?: boolean;
-  search?: string;
-}): Promise<number> {
+export async function getTotalPlayerCountWithFilters(filters?: PlayerFilters): Promise<number> {
   try {
-    // If no filters, return all players count
-    if (!filters || Object.keys(filters).filter(k => filters[k as keyof typeof filters] !== undefined).length === 0) {
-      const result = await sql`SELECT COUNT(*) as count FROM footballplayers`;
-      return parseInt(result[0].count);
-    }
-
-    // For filtered queries, we need to use Pool for parameterized queries
-    const { Pool } = await import('@neondatabase/serverless');
-    const pool = new Pool({ connectionString: process.env.NEON_AUCTION_DB_URL || process.env.NEON_DATABASE_URL });
-
-    try {
-      // Build WHERE conditions dynamically
-      let query = 'SELECT COUNT(*) as count FROM footballplayers WHERE 1=1';
-      const params: any[] = [];
-      let paramIndex = 1;
-
-      if (filters?.position) {
-        query += ` AND position = $${paramIndex++}`;
-        params.push(filters.position);
-      }
-      if (filters?.team_id) {
-        query += ` AND team_id = $${paramIndex++}`;
-        params.push(filters.team_id);
-      }
-      if (filters?.season_id) {
-        query += ` AND season_id = $${paramIndex++}`;
-        params.push(filters.season_id);
-      }
-      if (filters?.is_auction_eligible !== undefined) {
-        query += ` AND is_auction_eligible = $${paramIndex++}`;
-        params.push(filters.is_auction_eligible);
-      }
-      if (filters?.is_sold !== undefined) {
-        query += ` AND is_sold = $${paramIndex++}`;
-        params.push(filters.is_sold);
-      }
-      if (filters?.search) {
-        query += ` AND (name ILIKE $${paramIndex++} OR player_id ILIKE $${paramIndex++} OR position ILIKE $${paramIndex++})`;
-        const searchPattern = `%${filters.search}%`;
-        params.push(searchPattern, searchPattern, searchPattern);
-      }
-
-      console.log('📝 Count Query:', query);
-      console.log('📝 Count Params:', params);
-
-      const result = await pool.query(query, params);
-      return parseInt(result.rows[0].count);
-    } finally {
-      await pool.end();
-    }
+    const { conditions, params } = buildPlayerFilters(filters);
+    const where = conditions.length > 0 ? ` WHERE ${conditions.join(' AND ')}` : '';
+    const result = await getAuctionPool().query(`SELECT COUNT(*) as count FROM footballplayers${where}`, params);
+    return parseInt(result.rows[0].count);
   } catch (error) {
     console.error('❌ Error in getTotalPlayerCountWithFilters:', error);
     throw error;
@@ -428,17 +412,12 @@ export async function getTotalPlayerCountWithFilters(filters?: {
 }
 
 /**
- * Search players by name
+ * Search players by name or player_id, best matches first
+ * See player-search.ts for the trigram-ranked implementation and pagination
  */
 export async function searchPlayers(searchTerm: string, limit: number = 50): Promise<FootballPlayer[]> {
-  const result = await sql`
-    SELECT * FROM footballplayers 
-    WHERE name ILIKE ${'%' + searchTerm + '%'}
-    OR player_id ILIKE ${'%' + searchTerm + '%'}
-    ORDER BY name ASC
-    LIMIT ${limit}
-  `;
-  return result as FootballPlayer[];
+  const { players } = await searchPlayersRanked(searchTerm, { limit });
+  return players as FootballPlayer[];
 }
 
 /**
@@ -449,350 +428,17 @@ export async function bulkUpdatePlayerStats(players: Omit<FootballPlayer, 'creat
   if (players.length === 0) return { updated: 0, inserted: 0, errors: 0 };
 
   console.log(`🔄 bulkUpdatePlayerStats called with ${players.length} players`);
-
-  const { Pool } = await import('@neondatabase/serverless');
-  const { randomUUID } = await import('crypto');
-  // Use AUCTION database URL for footballplayers table
-  const pool = new Pool({ connectionString: process.env.NEON_AUCTION_DB_URL || process.env.NEON_DATABASE_URL });
-
-  try {
-    let updatedCount = 0;
-    let insertedCount = 0;
-    let errorCount = 0;
-
-    for (let i = 0; i < players.length; i++) {
-      const p = players[i];
-      const playerNum = i + 1;
-
-      // Debug first player to see what fields are available
-      if (i === 0) {
-        console.log('🔍 DEBUG - First player data:', {
-          player_id: p.player_id,
-          name: p.name,
-          team_name: p.team_name,
-          club: p.club,
-          availableKeys: Object.keys(p).filter(k => k.toLowerCase().includes('team') || k.toLowerCase().includes('club'))
-        });
-      }
-
-      try {
-        // Look up existing player by player_id to get their current data
-        const existingPlayerResult = await pool.query(
-          'SELECT * FROM footballplayers WHERE player_id = $1',
-          [p.player_id]
-        );
-
-        // Use existing id if player exists, otherwise generate new UUID
-        const playerId = existingPlayerResult.rows.length > 0
-          ? existingPlayerResult.rows[0].id
-          : randomUUID();
-        
-        const exists = existingPlayerResult.rows.length > 0;
-        const oldPlayer = exists ? existingPlayerResult.rows[0] : null;
-
-        // This query will:
-        // - INSERT new players with all provided data
-        // - UPDATE existing players' stats/attributes ONLY (preserves team_id, team_name, is_sold, acquisition_value, season_id, round_id)
-        const query = `
-          INSERT INTO footballplayers (
-            id, player_id, name, position, position_group, overall_rating,
-            nationality, age, club, team_id, team_name, season_id, round_id,
-            is_auction_eligible, is_sold, acquisition_value, playing_style,
-            offensive_awareness, ball_control, dribbling, tight_possession,
-            low_pass, lofted_pass, finishing, heading, set_piece_taking, curl,
-            speed, acceleration, kicking_power, jumping, physical_contact, balance, stamina,
-            defensive_awareness, tackling, aggression, defensive_engagement,
-            gk_awareness, gk_catching, gk_parrying, gk_reflexes, gk_reach
-          ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16, $17, $18, $19, $20, $21, $22, $23, $24, $25, $26, $27, $28, $29, $30, $31, $32, $33, $34, $35, $36, $37, $38, $39, $40, $41, $42, $43)
-          ON CONFLICT (player_id) DO UPDATE SET
-            name = EXCLUDED.name,
-            position = EXCLUDED.position,
-            position_group = EXCLUDED.position_group,
-            overall_rating = EXCLUDED.overall_rating,
-            nationality = EXCLUDED.nationality,
-            age = EXCLUDED.age,
-            team_name = EXCLUDED.team_name,
-            playing_style = EXCLUDED.playing_style,
-            offensive_awareness = EXCLUDED.offensive_awareness,
-            ball_control = EXCLUDED.ball_control,
-            dribbling = EXCLUDED.dribbling,
-            tight_possession = EXCLUDED.tight_possession,
-            low_pass = EXCLUDED.low_pass,
-            lofted_pass = EXCLUDED.lofted_pass,
-            finishing = EXCLUDED.finishing,
-            heading = EXCLUDED.heading,
-            set_piece_taking = EXCLUDED.set_piece_taking,
-            curl = EXCLUDED.curl,
-            speed = EXCLUDED.speed,
-            acceleration = EXCLUDED.acceleration,
-            kicking_power = EXCLUDED.kicking_power,
-            jumping = EXCLUDED.jumping,
-            physical_contact = EXCLUDED.physical_contact,
-            balance = EXCLUDED.balance,
-            stamina = EXCLUDED.stamina,
-            defensive_awareness = EXCLUDED.defensive_awareness,
-            tackling = EXCLUDED.tackling,
-            aggression = EXCLUDED.aggression,
-            defensive_engagement = EXCLUDED.defensive_engagement,
-            gk_awareness = EXCLUDED.gk_awareness,
-            gk_catching = EXCLUDED.gk_catching,
-            gk_parrying = EXCLUDED.gk_parrying,
-            gk_reflexes = EXCLUDED.gk_reflexes,
-            gk_reach = EXCLUDED.gk_reach,
-            updated_at = NOW()
-            -- NOTE: team_id, is_sold, acquisition_value, season_id, round_id, club are NOT updated
-            -- This preserves ownership data for existing players
-        `;
-
-        const values = [
-          playerId,
-          p.player_id,
-          p.name,
-          p.position || null,
-          p.position_group || null,
-          p.overall_rating || null,
-          p.nationality || null,
-          p.age || null,
-          p.club || null,
-          p.team_id || null,
-          p.team_name || null,
-          p.season_id || null,
-          p.round_id || null,
-          p.is_auction_eligible !== undefined ? p.is_auction_eligible : false,
-          p.is_sold !== undefined ? p.is_sold : false,
-          p.acquisition_value || null,
-          p.playing_style || null,
-          // Offensive attributes
-          p.offensive_awareness || null,
-          p.ball_control || null,
-          p.dribbling || null,
-          p.tight_possession || null,
-          p.low_pass || null,
-          p.lofted_pass || null,
-          p.finishing || null,
-          p.heading || null,
-          p.set_piece_taking || null,
-          p.curl || null,
-          // Physical attributes
-          p.speed || null,
-          p.acceleration || null,
-          p.kicking_power || null,
-          p.jumping || null,
-          p.physical_contact || null,
-          p.balance || null,
-          p.stamina || null,
-          // Defensive attributes
-          p.defensive_awareness || null,
-          p.tackling || null,
-          p.aggression || null,
-          p.defensive_engagement || null,
-          // Goalkeeper attributes
-          p.gk_awareness || null,
-          p.gk_catching || null,
-          p.gk_parrying || null,
-          p.gk_reflexes || null,
-          p.gk_reach || null
-        ];
-
-        // Execute the query
-        await pool.query(query, values);
-
-        // Log what was updated/inserted
-        if (exists && oldPlayer) {
-          updatedCount++;
-          const changes: string[] = [];
-          
-          // Check all important fields for changes
-          // IMPORTANT: team_name = real-world team (FC Barcelona, Girona, etc.)
-          if (oldPlayer.team_name !== p.team_name && p.team_name) 
-            changes.push(`Team:${oldPlayer.team_name || 'null'}→${p.team_name}`);
-          if (oldPlayer.overall_rating !== p.overall_rating && p.overall_rating) 
-            changes.push(`OVR:${oldPlayer.overall_rating}→${p.overall_rating}`);
-          if (oldPlayer.position !== p.position && p.position) 
-            changes.push(`Pos:${oldPlayer.position}→${p.position}`);
-          if (oldPlayer.speed !== p.speed && p.speed) 
-            changes.push(`SPD:${oldPlayer.speed}→${p.speed}`);
-          if (oldPlayer.acceleration !== p.acceleration && p.acceleration) 
-            changes.push(`ACC:${oldPlayer.acceleration}→${p.acceleration}`);
-          if (oldPlayer.finishing !== p.finishing && p.finishing) 
-            changes.push(`FIN:${oldPlayer.finishing}→${p.finishing}`);
-          if (oldPlayer.low_pass !== p.low_pass && p.low_pass) 
-            changes.push(`PAS:${oldPlayer.low_pass}→${p.low_pass}`);
-          if (oldPlayer.dribbling !== p.dribbling && p.dribbling) 
-            changes.push(`DRI:${oldPlayer.dribbling}→${p.dribbling}`);
-          if (oldPlayer.ball_control !== p.ball_control && p.ball_control) 
-            changes.push(`BC:${oldPlayer.ball_control}→${p.ball_control}`);
-          if (oldPlayer.defensive_awareness !== p.defensive_awareness && p.defensive_awareness) 
-            changes.push(`DEF:${oldPlayer.defensive_awareness}→${p.defensive_awareness}`);
-          if (oldPlayer.tackling !== p.tackling && p.tackling) 
-            changes.push(`TAC:${oldPlayer.tackling}→${p.tackling}`);
-          if (oldPlayer.physical_contact !== p.physical_contact && p.physical_contact) 
-            changes.push(`PHY:${oldPlayer.physical_contact}→${p.physical_contact}`);
-          if (oldPlayer.stamina !== p.stamina && p.stamina) 
-            changes.push(`STA:${oldPlayer.stamina}→${p.stamina}`);
-          
-          if (changes.length > 0) {
-            console.log(`✓ ${playerNum}/${players.length}: ${p.name} - ${changes.join(', ')}`);
-          } else {
-            console.log(`✓ ${playerNum}/${players.length}: ${p.name} - No changes`);
-          }
-        } else {
-          insertedCount++;
-          console.log(`➕ ${playerNum}/${players.length}: ${p.name} (NEW - OVR:${p.overall_rating}, Pos:${p.position}, Team:${p.team_name || 'None'})`);
-        }
-      } catch (error: any) {
-        errorCount++;
-        console.error(`   ❌ Failed to process player ${playerNum}/${players.length} (${p.name}):`, error.message);
-      }
-    }
-
-    console.log(`🎉 Bulk update complete: ${updatedCount} updated, ${insertedCount} inserted, ${errorCount} errors`);
-    return { updated: updatedCount, inserted: insertedCount, errors: errorCount };
-  } finally {
-    await pool.end();
-  }
+  const { updated, inserted, errors } = await upsertPlayers(players, 'stats');
+  return { updated, inserted, errors };
 }
 
 /**
- * Bulk import players (overwrites everything including team assignments)
+ * Bulk import players (overwrites player data; ownership columns on existing rows are kept)
  */
 export async function bulkImportPlayers(players: Omit<FootballPlayer, 'created_at' | 'updated_at'>[]): Promise<number> {
   if (players.length === 0) return 0;
 
-  console.log(`🔥 bulkImportPlayers called with ${players.length} players - inserting one by one`);
-
-  const { Pool } = await import('@neondatabase/serverless');
-  const { randomUUID } = await import('crypto');
-  const pool = new Pool({ connectionString: process.env.NEON_AUCTION_DB_URL || process.env.NEON_DATABASE_URL });
-
-  try {
-    let insertedCount = 0;
-    let errorCount = 0;
-
-    // Insert players one by one
-    for (let i = 0; i < players.length; i++) {
-      const p = players[i];
-      const playerNum = i + 1;
-
-      try {
-        // Generate ID if not provided
-        const playerId = p.id || randomUUID();
-
-        const query = `
-          INSERT INTO footballplayers (
-            id, player_id, name, position, position_group, overall_rating,
-            nationality, age, club, team_id, team_name, season_id, round_id,
-            is_auction_eligible, is_sold, acquisition_value, playing_style,
-            offensive_awareness, ball_control, dribbling, tight_possession,
-            low_pass, lofted_pass, finishing, heading, set_piece_taking, curl,
-            speed, acceleration, kicking_power, jumping, physical_contact, balance, stamina,
-            defensive_awareness, tackling, aggression, defensive_engagement,
-            gk_awareness, gk_catching, gk_parrying, gk_reflexes, gk_reach
-          ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16, $17, $18, $19, $20, $21, $22, $23, $24, $25, $26, $27, $28, $29, $30, $31, $32, $33, $34, $35, $36, $37, $38, $39, $40, $41, $42, $43)
-          ON CONFLICT (player_id) DO UPDATE SET
-            name = EXCLUDED.name,
-            position = EXCLUDED.position,
-            position_group = EXCLUDED.position_group,
-            overall_rating = EXCLUDED.overall_rating,
-            nationality = EXCLUDED.nationality,
-            age = EXCLUDED.age,
-            club = EXCLUDED.club,
-            playing_style = EXCLUDED.playing_style,
-            offensive_awareness = EXCLUDED.offensive_awareness,
-            ball_control = EXCLUDED.ball_control,
-            dribbling = EXCLUDED.dribbling,
-            tight_possession = EXCLUDED.tight_possession,
-            low_pass = EXCLUDED.low_pass,
-            lofted_pass = EXCLUDED.lofted_pass,
-            finishing = EXCLUDED.finishing,
-            heading = EXCLUDED.heading,
-            set_piece_taking = EXCLUDED.set_piece_taking,
-            curl = EXCLUDED.curl,
-            speed = EXCLUDED.speed,
-            acceleration = EXCLUDED.acceleration,
-            kicking_power = EXCLUDED.kicking_power,
-            jumping = EXCLUDED.jumping,
-            physical_contact = EXCLUDED.physical_contact,
-            balance = EXCLUDED.balance,
-            stamina = EXCLUDED.stamina,
-            defensive_awareness = EXCLUDED.defensive_awareness,
-            tackling = EXCLUDED.tackling,
-            aggression = EXCLUDED.aggression,
-            defensive_engagement = EXCLUDED.defensive_engagement,
-            gk_awareness = EXCLUDED.gk_awareness,
-            gk_catching = EXCLUDED.gk_catching,
-            gk_parrying = EXCLUDED.gk_parrying,
-            gk_reflexes = EXCLUDED.gk_reflexes,
-            gk_reach = EXCLUDED.gk_reach
-        `;
-
-        const values = [
-          playerId,
-          p.player_id,
-          p.name,
-          p.position || null,
-          p.position_group || null,
-          p.overall_rating || null,
-          p.nationality || null,
-          p.age || null,
-          p.club || null,
-          p.team_id || null,
-          p.team_name || null,
-          p.season_id || null,
-          p.round_id || null,
-          p.is_auction_eligible !== undefined ? p.is_auction_eligible : false,
-          p.is_sold !== undefined ? p.is_sold : false,
-          p.acquisition_value || null,
-          p.playing_style || null,
-          // Offensive attributes
-          p.offensive_awareness || null,
-          p.ball_control || null,
-          p.dribbling || null,
-          p.tight_possession || null,
-          p.low_pass || null,
-          p.lofted_pass || null,
-          p.finishing || null,
-          p.heading || null,
-          p.set_piece_taking || null,
-          p.curl || null,
-          // Physical attributes
-          p.speed || null,
-          p.acceleration || null,
-          p.kicking_power || null,
-          p.jumping || null,
-          p.physical_contact || null,
-          p.balance || null,
-          p.stamina || null,
-          // Defensive attributes
-          p.defensive_awareness || null,
-          p.tackling || null,
-          p.aggression || null,
-          p.defensive_engagement || null,
-          // Goalkeeper attributes
-          p.gk_awareness || null,
-          p.gk_catching || null,
-          p.gk_parrying || null,
-          p.gk_reflexes || null,
-          p.gk_reach || null
-        ];
-
-        const result = await pool.query(query, values);
-        insertedCount++;
-
-        // Log every 10 players
-        if (playerNum % 10 === 0 || playerNum === players.length) {
-          console.log(`   ✅ Inserted ${playerNum}/${players.length}: ${p.name}`);
-        }
-      } catch (error: any) {
-        errorCount++;
-        console.error(`   ❌ Failed to insert player ${playerNum}/${players.length} (${p.name}):`, error.message);
-      }
-    }
-
-    console.log(`🎉 Bulk import complete: ${insertedCount} inserted, ${errorCount} errors`);
-    return insertedCount;
-  } finally {
-    await pool.end();
-  }
+  console.log(`🔥 bulkImportPlayers called with ${players.length} players`);
+  const { updated, inserted } = await upsertPlayers(players, 'import');
+  return updated + inserted;
 }
-
@@ -0,0 +1,125 @@
+import { describe, it, expect, vi } from 'vitest';
+
+vi.mock('./auction-config', () => ({
+  getAuctionDb: vi.fn(),
+}));
+
+vi.mock('./tournament-config', () => ({
+  getTournamentDb: vi.fn(),
+}));
+
+vi.mock('@/lib/firebase/admin', () => ({
+  adminDb: { collection: vi.fn() },
+}));
+
+vi.mock('@/lib/firebase/batch', () => ({
+  batchGetFirebaseFields: vi.fn(),
+}));
+
+const { mergeTeamSources, buildLeagueStatsFrom, getSeasonAggregates } = await import('./season-aggregates');
+const { getAuctionDb } = await import('./auction-config');
+const { adminDb } = await import('@/lib/firebase/admin');
+
+const statsRow = (team_id: string, points: number, goal_difference: number) => ({
+  team_id,
+  team_name: `Stats ${team_id}`,
+  matches_played: 3,
+  wins: 1,
+  draws: 1,
+  losses: 1,
+  points,
+  goal_difference,
+});
+
+describe('mergeTeamSources', () => {
+  it('joins team_seasons identity with teamstats results', () => {
+    const [team] = mergeTeamSources(
+      'SSPSLS16',
+      new Map([['T1', { team_name: 'Blue Lions', username: 'owner1', budget: 420, logo_url: 'x.png' }]]),
+      [statsRow('T1', 4, 2)]
+    );
+
+    expect(team).toMatchObject({
+      team_id: 'T1',
+      team_name: 'Blue Lions',
+      team_code: 'BLU',
+      owner_name: 'owner1',
+      balance: 420,
+      logo_url: 'x.png',
+      season_id: 'SSPSLS16',
+    });
+    expect(team.stats).toEqual({
+      matches_played: 3, matches_won: 1, matches_drawn: 1, matches_lost: 1, points: 4, goal_difference: 2,
+    });
+  });
+
+  it('keeps teams found in only one source', () => {
+    const teams = mergeTeamSources(
+      'SSPSLS16',
+      new Map([['T1', { team_name: 'New Team' }]]),
+      [statsRow('T2', 0, 0)]
+    );
+
+    expect(teams.map(t => [t.team_id, t.team_name])).toEqual(
+      expect.arrayContaining([['T1', 'New Team'], ['T2', 'Stats T2']])
+    );
+    expect(teams.find(t => t.team_id === 'T1')!.stats.points).toBe(0);
+  });
+
+  it('sorts by points, then goal difference', () => {
+    const teams = mergeTeamSources(
+      'SSPSLS16',
+      new Map(),
+      [statsRow('T1', 4, 1), statsRow('T2', 7, -3), statsRow('T3', 4, 5)]
+    );
+
+    expect(teams.map(t => t.team_id)).toEqual(['T2', 'T3', 'T1']);
+  });
+});
+
+describe('buildLeagueStatsFrom', () => {
+  it('totals sold players and reuses the standings order', () => {
+    const teams = mergeTeamSources('SSPSLS16', new Map(), [statsRow('T1', 3, 0)]);
+    const player = (id: string, sold_price: number | null, is_sold: boolean) => ({
+      id, name: id, primary_position: 'CF', team_id: null, team_name: null, team_code: null,
+      base_price: 0, sold_price, is_sold, season_id: 'SSPSLS16',
+      stats: { matches_played: 0, goals: 0, assists: 0, yellow_cards: 0, red_cards: 0 },
+      player_image: null, card_type: 'Gold',
+    });
+
+    const topScorers = [{ id: 'R1', name: 'Striker', goals: 9, team_name: 'Stats T1' }];
+
+    const stats = buildLeagueStatsFrom(
+      teams,
+      [player('P1', 100, true), player('P2', 50, true), player('P3', null, false)],
+      '2026-01-01T00:00:00.000Z',
+      topScorers
+    );
+
+    expect(stats).toMatchObject({
+      totalTeams: 1,
+      totalPlayers: 3,
+      soldPlayers: 2,
+      totalSpent: 150,
+      averagePlayerPrice: 75,
+      topScorers,
+      lastUpdated: '2026-01-01T00:00:00.000Z',
+    });
+    expect(stats.standings).toBe(teams);
+  });
+});
+
+describe('getSeasonAggregates', () => {
+  it('returns an empty result for unknown seasons without building anything', async () => {
+    const db = { query: vi.fn(async () => [{ version: 0, seasons: 0 }]), transaction: vi.fn() };
+    vi.mocked(getAuctionDb).mockReturnValue(db as any);
+    vi.mocked(adminDb.collection).mockReturnValue({
+      doc: () => ({ get: async () => ({ exists: false }) }),
+    } as any);
+
+    const result = await getSeasonAggregates('NOT_A_SEASON');
+
+    expect(result).toMatchObject({ version: 0, teams: [], players: [] });
+    expect(db.transaction).not.toHaveBeenCalled();
+  });
+});
@@ -0,0 +1,506 @@
+/**
+ * Season Aggregates - materialized per-season team and player summaries
+ *
+ * Rows live in season_team_aggregates / season_player_aggregates (Auction DB,
+ * see migrations/create_season_aggregate_tables.sql) and are refreshed for just
+ * the teams or players that changed after results, auctions and transfers.
+ * Every refresh bumps the season's row in season_aggregate_versions, and reads
+ * are cached in memory under that version, so a page view costs one small
+ * version lookup instead of full team_seasons / teams / players scans.
+ */
+
+import { getAuctionDb } from './auction-config';
+import { getTournamentDb } from './tournament-config';
+import { adminDb } from '@/lib/firebase/admin';
+import { batchGetFirebaseFields } from '@/lib/firebase/batch';
+import { memoryCache, withCache } from '@/lib/cache/memory-cache';
+import type { TeamSummary, PlayerSummary, LeagueStatsSummary } from '@/lib/firebase/aggregates';
+
+const TEAM_SEASON_FIELDS = [
+  'team_id', 'team_name', 'team_code', 'username', 'owner_name',
+  'logo_url', 'team_logo', 'logo', 'budget', 'football_budget', 'players_count'
+];
+
+// Version lookups are cached briefly so bursts of page views share one query
+const VERSION_TTL = 30;
+// Snapshots are keyed by version, so they only expire to free memory
+const SNAPSHOT_TTL = 60 * 60;
+
+export interface SeasonAggregates {
+  version: number;
+  teams: TeamSummary[];
+  players: PlayerSummary[];
+  stats: LeagueStatsSummary;
+}
+
+/**
+ * Limit a refresh to the teams and/or players that changed.
+ * Omit both to rebuild the whole season.
+ */
+export interface AggregateRefreshScope {
+  teamIds?: string[];
+  playerIds?: string[];
+}
+
+export interface TeamStatsRow {
+  team_id: string;
+  team_name: string | null;
+  matches_played: number | null;
+  wins: number | null;
+  draws: number | null;
+  losses: number | null;
+  points: number | null;
+  goal_difference: number | null;
+}
+
+function versionKey(seasonId?: string) {
+  return `season-aggregates:version:${seasonId || 'all'}`;
+}
+
+/**
+ * Standings order: points, then goal difference
+ */
+export function compareStandings(a: TeamSummary, b: TeamSummary): number {
+  if (b.stats.points !== a.stats.points) {
+    return b.stats.points - a.stats.points;
+  }
+  return b.stats.goal_difference - a.stats.goal_difference;
+}
+
+/**
+ * Merge team_seasons docs (identity, balance) with teamstats rows (results)
+ * into one summary per team. A team only needs to appear in one source.
+ */
+export function mergeTeamSources(
+  seasonId: string,
+  teamSeasons: Map<string, Record<string, any>>,
+  statsRows: TeamStatsRow[]
+): TeamSummary[] {
+  const statsByTeam = new Map(statsRows.map(row => [row.team_id, row]));
+  const teamIds = new Set([...teamSeasons.keys(), ...statsByTeam.keys()]);
+  const teams: TeamSummary[] = [];
+
+  for (const teamId of teamIds) {
+    const data = teamSeasons.get(teamId) || {};
+    const stats = statsByTeam.get(teamId);
+    const teamName = data.team_name || stats?.team_name || 'Unknown Team';
+    const logoUrl = data.logo_url || data.team_logo || data.logo || null;
+
+    teams.push({
+      id: teamId,
+      team_id: teamId,
+      team_name: teamName,
+      team_code: data.team_code || teamName.substring(0, 3).toUpperCase() || 'UNK',
+      owner_name: data.username || data.owner_name || '',
+      balance: data.budget ?? data.football_budget ?? 0,
+      players_count: data.players_count || 0,
+      stats: {
+        matches_played: Number(stats?.matches_played) || 0,
+        matches_won: Number(stats?.wins) || 0,
+        matches_drawn: Number(stats?.draws) || 0,
+        matches_lost: Number(stats?.losses) || 0,
+        points: Number(stats?.points) || 0,
+        goal_difference: Number(stats?.goal_difference) || 0,
+      },
+      logo: logoUrl,
+      logo_url: logoUrl,
+      season_id: seasonId,
+    });
+  }
+
+  return teams.sort(compareStandings);
+}
+
+/**
+ * League stats derived from already-built team and player summaries.
+ * Auction players carry no match stats, so top scorers come from the
+ * tournament DB (see loadTopScorers) and are passed in.
+ */
+export function buildLeagueStatsFrom(
+  teams: TeamSummary[],
+  players: PlayerSummary[],
+  lastUpdated: string,
+  topScorers: LeagueStatsSummary['topScorers'] = []
+): LeagueStatsSummary {
+  const soldPlayers = players.filter(p => p.is_sold);
+  const totalSpent = soldPlayers.reduce((sum, p) => sum + (p.sold_price || 0), 0);
+
+  return {
+    totalTeams: teams.length,
+    totalPlayers: players.length,
+    soldPlayers: soldPlayers.length,
+    totalSpent,
+    averagePlayerPrice: soldPlayers.length > 0 ? totalSpent / soldPlayers.length : 0,
+    topScorers,
+    standings: teams,
+    lastUpdated,
+  };
+}
+
+/**
+ * Load team_seasons docs for a season (or just the given teams), keyed by team ID
+ */
+async function loadTeamSeasons(seasonId: string, teamIds?: string[]) {
+  const teamSeasons = new Map<string, Record<string, any>>();
+
+  if (teamIds) {
+    const docs = await batchGetFirebaseFields(
+      'team_seasons',
+      teamIds.map(teamId => `${teamId}_${seasonId}`),
+      TEAM_SEASON_FIELDS
+    );
+    docs.forEach((data, docId) => {
+      teamSeasons.set(data.team_id || docId.slice(0, -(seasonId.length + 1)), data);
+    });
+    return teamSeasons;
+  }
+
+  const snapshot = await adminDb
+    .collection('team_seasons')
+    .where('season_id', '==', seasonId)
+    .select(...TEAM_SEASON_FIELDS)
+    .get();
+
+  snapshot.forEach(doc => {
+    const data = doc.data();
+    teamSeasons.set(data.team_id || doc.id.slice(0, -(seasonId.length + 1)), data);
+  });
+  return teamSeasons;
+}
+
+/**
+ * Load results for the season's primary tournament (LEAGUE fallback)
+ */
+async function loadTeamStats(seasonId: string, teamIds?: string[]): Promise<TeamStatsRow[]> {
+  const sql = getTournamentDb();
+  const rows = await sql.query(`
+    SELECT team_id, team_name, matches_played, wins, draws, losses,
+           points - COALESCE(points_deducted, 0) AS points, goal_difference
+    FROM teamstats
+    WHERE tournament_id = COALESCE(
+      (SELECT id FROM tournaments WHERE season_id = $1 AND is_primary = true LIMIT 1),
+      $1 || '-LEAGUE'
+    )
+      AND ($2::text[] IS NULL OR team_id = ANY($2::text[]))
+  `, [seasonId, teamIds ?? null]);
+  return rows as TeamStatsRow[];
+}
+
+/**
+ * Top 10 scorers for a season (or all seasons) from player_stats_v, which
+ * covers both player_seasons and historical realplayerstats
+ */
+async function loadTopScorers(seasonId?: string): Promise<LeagueStatsSummary['topScorers']> {
+  const sql = getTournamentDb();
+  const rows = await sql.query(`
+    SELECT player_id, player_name, team, goals_scored
+    FROM player_stats_v
+    WHERE ($1::text IS NULL OR season_id = $1)
+      AND goals_scored > 0
+    ORDER BY goals_scored DESC, player_name
+    LIMIT 10
+  `, [seasonId ?? null]);
+
+  return (rows as any[]).map(row => ({
+    id: row.player_id,
+    name: row.player_name,
+    goals: Number(row.goals_scored),
+    team_name: row.team || null,
+  }));
+}
+
+/**
+ * Rebuild season_team_aggregates rows from team_seasons and teamstats
+ */
+async function refreshTeamRows(seasonId: string, teamIds?: string[]) {
+  const [teamSeasons, statsRows] = await Promise.all([
+    loadTeamSeasons(seasonId, teamIds),
+    loadTeamStats(seasonId, teamIds),
+  ]);
+  const teams = mergeTeamSources(seasonId, teamSeasons, statsRows);
+  const ids = teams.map(t => t.team_id);
+  const sql = getAuctionDb();
+
+  return [
+    sql.query(`
+      INSERT INTO season_team_aggregates (
+        season_id, team_id, team_name, team_code, owner_name, logo_url, balance, players_count,
+        matches_played, matches_won, matches_drawn, matches_lost, points, goal_difference, refreshed_at
+      )
+      SELECT $1::text, t.*, NOW()
+      FROM UNNEST(
+        $2::text[], $3::text[], $4::text[], $5::text[], $6::text[], $7::numeric[], $8::int[],
+        $9::int[], $10::int[], $11::int[], $12::int[], $13::int[], $14::int[]
+      ) AS t
+      ON CONFLICT (season_id, team_id) DO UPDATE SET
+        team_name = EXCLUDED.team_name,
+        team_code = EXCLUDED.team_code,
+        owner_name = EXCLUDED.owner_name,
+        logo_url = EXCLUDED.logo_url,
+        balance = EXCLUDED.balance,
+        players_count = EXCLUDED.players_count,
+        matches_played = EXCLUDED.matches_played,
+        matches_won = EXCLUDED.matches_won,
+        matches_drawn = EXCLUDED.matches_drawn,
+        matches_lost = EXCLUDED.matches_lost,
+        points = EXCLUDED.points,
+        goal_difference = EXCLUDED.goal_difference,
+        refreshed_at = NOW()
+    `, [
+      seasonId,
+      ids,
+      teams.map(t => t.team_name),
+      teams.map(t => t.team_code),
+      teams.map(t => t.owner_name),
+      teams.map(t => t.logo_url),
+      teams.map(t => t.balance),
+      teams.map(t => t.players_count),
+      teams.map(t => t.stats.matches_played),
+      teams.map(t => t.stats.matches_won),
+      teams.map(t => t.stats.matches_drawn),
+      teams.map(t => t.stats.matches_lost),
+      teams.map(t => t.stats.points),
+      teams.map(t => t.stats.goal_difference),
+    ]),
+    // Drop teams (within the refreshed scope) that no longer exist in either source
+    sql.query(`
+      DELETE FROM season_team_aggregates
+      WHERE season_id = $1
+        AND ($2::text[] IS NULL OR team_id = ANY($2::text[]))
+        AND NOT (team_id = ANY($3::text[]))
+    `, [seasonId, teamIds ?? null, ids]),
+  ];
+}
+
+/**
+ * Rebuild season_player_aggregates rows straight from footballplayers
+ */
+function refreshPlayerRows(seasonId: string, playerIds?: string[]) {
+  const sql = getAuctionDb();
+  const scope = playerIds ?? null;
+
+  return [
+    sql.query(`
+      INSERT INTO season_player_aggregates (
+        season_id, player_id, name, primary_position, team_id, team_name, sold_price, is_sold, refreshed_at
+      )
+      SELECT season_id, player_id, name, COALESCE(position, 'Unknown'), team_id, team_name,
+             acquisition_value, COALESCE(is_sold, false), NOW()
+      FROM footballplayers
+      WHERE season_id = $1
+        AND ($2::text[] IS NULL OR player_id = ANY($2::text[]))
+      ON CONFLICT (season_id, player_id) DO UPDATE SET
+        name = EXCLUDED.name,
+        primary_position = EXCLUDED.primary_position,
+        team_id = EXCLUDED.team_id,
+        team_name = EXCLUDED.team_name,
+        sold_price = EXCLUDED.sold_price,
+        is_sold = EXCLUDED.is_sold,
+        refreshed_at = NOW()
+    `, [seasonId, scope]),
+    sql.query(`
+      DELETE FROM season_player_aggregates a
+      WHERE a.season_id = $1
+        AND ($2::text[] IS NULL OR a.player_id = ANY($2::text[]))
+        AND NOT EXISTS (
+          SELECT 1 FROM footballplayers fp
+          WHERE fp.season_id = a.season_id AND fp.player_id = a.player_id
+        )
+    `, [seasonId, scope]),
+  ];
+}
+
+/**
+ * Refresh a season's aggregate rows and bump its version.
+ *
+ * With no scope the whole season is rebuilt; otherwise only the given teams
+ * and/or players are re-read from their sources. Row writes and the version
+ * bump run in one transaction, so readers never see a half-applied refresh.
+ */
+export async function refreshSeasonAggregates(
+  seasonId: string,
+  scope: AggregateRefreshScope = {}
+): Promise<number> {
+  const full = !scope.teamIds && !scope.playerIds;
+  const refreshTeams = full || !!scope.teamIds?.length;
+  const refreshPlayers = full || !!scope.playerIds?.length;
+  const sql = getAuctionDb();
+
+  const queries = [
+    ...(refreshTeams ? await refreshTeamRows(seasonId, scope.teamIds) : []),
+    ...(refreshPlayers ? refreshPlayerRows(seasonId, scope.playerIds) : []),
+    sql.query(`
+      INSERT INTO season_aggregate_versions (season_id, version, teams_refreshed_at, players_refreshed_at, updated_at)
+      VALUES ($1, 1, CASE WHEN $2 THEN NOW() END, CASE WHEN $3 THEN NOW() END, NOW())
+      ON CONFLICT (season_id) DO UPDATE SET
+        version = season_aggregate_versions.version + 1,
+        teams_refreshed_at = CASE WHEN $2 THEN NOW() ELSE season_aggregate_versions.teams_refreshed_at END,
+        players_refreshed_at = CASE WHEN $3 THEN NOW() ELSE season_aggregate_versions.players_refreshed_at END,
+        updated_at = NOW()
+      RETURNING version
+    `, [seasonId, refreshTeams, refreshPlayers]),
+  ];
+
+  const results = await sql.transaction(queries);
+  const version = Number((results[results.length - 1] as any[])[0].version);
+
+  memoryCache.delete(versionKey(seasonId));
+  memoryCache.delete(versionKey());
+
+  console.log(`✅ Season aggregates refreshed for ${seasonId} (v${version}${full ? ', full' : ''})`);
+  return version;
+}
+
+/**
+ * Refresh after a write elsewhere has already succeeded.
+ * Failures are logged, not thrown - the next refresh or a full rebuild catches up.
+ */
+export async function refreshSeasonAggregatesAfterChange(
+  seasonId: string,
+  scope: AggregateRefreshScope = {}
+): Promise<void> {
+  try {
+    await refreshSeasonAggregates(seasonId, scope);
+  } catch (error) {
+    console.error(`Failed to refresh season aggregates for ${seasonId}:`, error);
+  }
+}
+
+/**
+ * Current aggregate version for a season (or the sum across seasons), null if never built
+ */
+async function getAggregateVersion(seasonId?: string): Promise<number | null> {
+  return withCache(versionKey(seasonId), async () => {
+    const sql = getAuctionDb();
+    const rows = await sql.query(`
+      SELECT COALESCE(SUM(version), 0)::bigint AS version, COUNT(*)::int AS seasons
+      FROM season_aggregate_versions
+      WHERE ($1::text IS NULL OR season_id = $1)
+    `, [seasonId ?? null]);
+    return rows[0].seasons > 0 ? Number(rows[0].version) : null;
+  }, VERSION_TTL);
+}
+
+function toTeamSummary(row: Record<string, any>): TeamSummary {
+  return {
+    id: row.team_id,
+    team_id: row.team_id,
+    team_name: row.team_name,
+    team_code: row.team_code,
+    owner_name: row.owner_name,
+    balance: Number(row.balance),
+    players_count: row.players_count,
+    stats: {
+      matches_played: row.matches_played,
+      matches_won: row.matches_won,
+      matches_drawn: row.matches_drawn,
+      matches_lost: row.matches_lost,
+      points: row.points,
+      goal_difference: row.goal_difference,
+    },
+    logo: row.logo_url,
+    logo_url: row.logo_url,
+    season_id: row.season_id,
+  };
+}
+
+function toPlayerSummary(row: Record<string, any>): PlayerSummary {
+  return {
+    id: row.player_id,
+    name: row.name,
+    primary_position: row.primary_position,
+    team_id: row.team_id,
+    team_name: row.team_name,
+    team_code: null,
+    base_price: 0,
+    sold_price: row.sold_price,
+    is_sold: row.is_sold,
+    season_id: row.season_id,
+    // footballplayers has no base price, image or match stats; goals for the
+    // league are reported through stats.topScorers instead
+    stats: {
+      matches_played: 0,
+      goals: 0,
+      assists: 0,
+      yellow_cards: 0,
+      red_cards: 0,
+    },
+    player_image: null,
+    card_type: 'Gold',
+  };
+}
+
+async function loadSnapshot(seasonId: string | undefined, version: number): Promise<SeasonAggregates> {
+  const sql = getAuctionDb();
+  const [[teamRows, playerRows, versionRows], topScorers] = await Promise.all([sql.transaction([
+    sql.query(`
+      SELECT * FROM season_team_aggregates
+      WHERE ($1::text IS NULL OR season_id = $1)
+      ORDER BY points DESC, goal_difference DESC, team_id
+    `, [seasonId ?? null]),
+    sql.query(`
+      SELECT * FROM season_player_aggregates
+      WHERE ($1::text IS NULL OR season_id = $1)
+      ORDER BY name, player_id
+    `, [seasonId ?? null]),
+    sql.query(`
+      SELECT MAX(updated_at) AS updated_at FROM season_aggregate_versions
+      WHERE ($1::text IS NULL OR season_id = $1)
+    `, [seasonId ?? null]),
+  ], { readOnly: true }), loadTopScorers(seasonId)]);
+
+  const teams = (teamRows as any[]).map(toTeamSummary);
+  const players = (playerRows as any[]).map(toPlayerSummary);
+  const updatedAt = (versionRows as any[])[0]?.updated_at;
+  const lastUpdated = updatedAt ? new Date(updatedAt).toISOString() : new Date().toISOString();
+
+  return { version, teams, players, stats: buildLeagueStatsFrom(teams, players, lastUpdated, topScorers) };
+}
+
+/**
+ * Build every season in the seasons collection (first all-seasons read)
+ */
+async function buildAllSeasonAggregates(): Promise<number> {
+  const snapshot = await adminDb.collection('seasons').select().get();
+  for (const doc of snapshot.docs) {
+    await refreshSeasonAggregates(doc.id);
+  }
+  return (await getAggregateVersion()) ?? 0;
+}
+
+/**
+ * Whether a season doc exists (cached briefly, so unknown IDs from public
+ * routes cost one read per VERSION_TTL)
+ */
+async function seasonExists(seasonId: string): Promise<boolean> {
+  return withCache(`season-aggregates:exists:${seasonId}`, async () => {
+    const doc = await adminDb.collection('seasons').doc(seasonId).get();
+    return doc.exists;
+  }, VERSION_TTL);
+}
+
+function emptyAggregates(): SeasonAggregates {
+  return { version: 0, teams: [], players: [], stats: buildLeagueStatsFrom([], [], new Date().toISOString()) };
+}
+
+/**
+ * Read a season's aggregates (or all seasons when seasonId is omitted).
+ * Seasons that have never been built are built once on first read; IDs
+ * with no season doc return an empty result and write nothing.
+ */
+export async function getSeasonAggregates(seasonId?: string): Promise<SeasonAggregates> {
+  let version = await getAggregateVersion(seasonId);
+
+  if (version === null) {
+    if (seasonId && !(await seasonExists(seasonId))) {
+      return emptyAggregates();
+    }
+    version = seasonId ? await refreshSeasonAggregates(seasonId) : await buildAllSeasonAggregates();
+  }
+
+  return withCache(
+    `season-aggregates:${seasonId || 'all'}:v${version}`,
+    () => loadSnapshot(seasonId, version as number),
+    SNAPSHOT_TTL
+  );
+}
@@ -6,7 +6,8 @@ import {
   NewsLanguage,
   REPORTERS,
 } from './types';
-import { generatePrompt } from './prompts-bilingual';
+import { generatePrompt, NEWS_PROMPT_VERSION } from './prompts-bilingual';
+import { withGenerationCache } from './generation-cache';
 import { determineTone } from './determine-tone';
 
 // Prompt templates for different event types
@@ -625,49 +626,24 @@ export async function generateBilingualNews(
     
     const model = getGeminiModel();
     
-    // Generate English version
     const enPrompt = generatePrompt(input, 'en');
-    console.log('📝 EN prompt generated, length:', enPrompt.length);
-    
-    let enResult: NewsGenerationResult | null = null;
-    for (let attempt = 1; attempt <= MAX_RETRIES; attempt++) {
-      try {
-        console.log(`🔄 Calling Gemini for English... (${attempt}/${MAX_RETRIES})`);
-        const result = await model.generateContent(enPrompt);
-        const text = result.response.text();
-        enResult = await parseGeminiResponse(text);
-        if (enResult.success) break;
-      } catch (error: any) {
-        if (attempt === MAX_RETRIES) throw error;
-        await new Promise(resolve => setTimeout(resolve, INITIAL_DELAY * Math.pow(2, attempt - 1)));
-      }
-    }
-    
-    if (!enResult?.success) {
-      throw new Error('Failed to generate English content');
-    }
-    
-    // Generate Malayalam version
     const mlPrompt = generatePrompt(input, 'ml');
-    console.log('📝 ML prompt generated, length:', mlPrompt.length);
+    console.log('📝 Prompts generated, length:', { en: enPrompt.length, ml: mlPrompt.length });
     
-    let mlResult: NewsGenerationResult | null = null;
-    for (let attempt = 1; attempt <= MAX_RETRIES; attempt++) {
-      try {
-        console.log(`🔄 Calling Gemini for Malayalam... (${attempt}/${MAX_RETRIES})`);
-        const result = await model.generateContent(mlPrompt);
-        const text = result.response.text();
-        mlResult = await parseGeminiResponse(text);
-        if (mlResult.success) break;
-      } catch (error: any) {
-        if (attempt === MAX_RETRIES) throw error;
-        await new Promise(resolve => setTimeout(resolve, INITIAL_DELAY * Math.pow(2, attempt - 1)));
-      }
-    }
-    
-    if (!mlResult?.success) {
-      throw new Error('Failed to generate Malayalam content');
-    }
+    // The two languages are independent, so generate them concurrently.
+    // Identical inputs (e.g. a re-saved result) reuse the cached generation.
+    const [enResult, mlResult] = await Promise.all([
+      withGenerationCache(
+        { kind: 'text', eventType: input.event_type, payload: input, promptVersion: NEWS_PROMPT_VERSION, language: 'en' },
+        () => generateWithRetry(model, enPrompt, 'English', MAX_RETRIES, INITIAL_DELAY),
+        result => result.success
+      ),
+      withGenerationCache(
+        { kind: 'text', eventType: input.event_type, payload: input, promptVersion: NEWS_PROMPT_VERSION, language: 'ml' },
+        () => generateWithRetry(model, mlPrompt, 'Malayalam', MAX_RETRIES, INITIAL_DELAY),
+        result => result.success
+      ),
+    ]);
     
     console.log('✅ Bilingual generation complete!');
     
@@ -689,6 +665,33 @@ export async function generateBilingualNews(
   }
 }
 
+/**
+ * Call Gemini for one prompt, retrying with exponential backoff until the
+ * response parses into a successful result
+ */
+async function generateWithRetry(
+  model: ReturnType<typeof getGeminiModel>,
+  prompt: string,
+  label: string,
+  maxRetries: number,
+  initialDelay: number
+): Promise<NewsGenerationResult> {
+  for (let attempt = 1; attempt <= maxRetries; attempt++) {
+    try {
+      console.log(`🔄 Calling Gemini for ${label}... (${attempt}/${maxRetries})`);
+      const result = await model.generateContent(prompt);
+      const text = result.response.text();
+      const parsed = await parseGeminiResponse(text);
+      if (parsed.success) return parsed;
+    } catch (error: any) {
+      if (attempt === maxRetries) throw error;
+      await new Promise(resolve => setTimeout(resolve, initialDelay * Math.pow(2, attempt - 1)));
+    }
+  }
+
+  throw new Error(`Failed to generate ${label} content`);
+}
+
 /**
  * Generate news content using Gemini AI (LEGACY - for backward compatibility)
  */
@@ -0,0 +1,34 @@
+import crypto from 'crypto';
+
+/**
+ * Normalize a value for hashing: object keys sorted, null/undefined fields
+ * dropped and strings trimmed, so cosmetically different payloads hash equally
+ */
+export function stableStringify(value: unknown): string {
+  if (value === null || value === undefined) {
+    return 'null';
+  }
+  if (typeof value === 'string') {
+    return JSON.stringify(value.trim());
+  }
+  if (typeof value !== 'object') {
+    return JSON.stringify(value);
+  }
+  if (value instanceof Date) {
+    return JSON.stringify(value.toISOString());
+  }
+  if (Array.isArray(value)) {
+    return `[${value.map(stableStringify).join(',')}]`;
+  }
+  const entries = Object.entries(value as Record<string, unknown>)
+    .filter(([, v]) => v !== undefined && v !== null)
+    .sort(([a], [b]) => (a < b ? -1 : a > b ? 1 : 0));
+  return `{${entries.map(([k, v]) => `${JSON.stringify(k)}:${stableStringify(v)}`).join(',')}}`;
+}
+
+/**
+ * SHA-256 (hex) of the normalized value
+ */
+export function hashContent(value: unknown): string {
+  return crypto.createHash('sha256').update(stableStringify(value)).digest('hex');
+}
@@ -0,0 +1,75 @@
+import { describe, it, expect, vi, beforeEach } from 'vitest';
+
+const mockSql = vi.fn();
+
+vi.mock('../neon/tournament-config', () => ({
+  getTournamentDb: vi.fn(() => mockSql),
+}));
+
+const { getGenerationCacheKey, withGenerationCache } = await import('./generation-cache');
+
+const baseKey = {
+  kind: 'text' as const,
+  eventType: 'match_result',
+  promptVersion: 1,
+  language: 'en' as const,
+};
+
+describe('getGenerationCacheKey', () => {
+  it('ignores key order, whitespace and empty fields in the payload', () => {
+    const a = getGenerationCacheKey({
+      ...baseKey,
+      payload: { metadata: { home_team_name: 'Red Panthers ', home_score: 2, away_score: 1 }, context: undefined },
+    });
+    const b = getGenerationCacheKey({
+      ...baseKey,
+      payload: { metadata: { away_score: 1, home_score: 2, home_team_name: 'Red Panthers', motm: null } },
+    });
+
+    expect(a).toBe(b);
+  });
+
+  it('changes with prompt version, language and payload', () => {
+    const payload = { metadata: { home_score: 2, away_score: 1 } };
+    const key = getGenerationCacheKey({ ...baseKey, payload });
+
+    expect(getGenerationCacheKey({ ...baseKey, payload, promptVersion: 2 })).not.toBe(key);
+    expect(getGenerationCacheKey({ ...baseKey, payload, language: 'ml' })).not.toBe(key);
+    expect(getGenerationCacheKey({ ...baseKey, payload: { metadata: { home_score: 3, away_score: 1 } } })).not.toBe(key);
+  });
+});
+
+describe('withGenerationCache', () => {
+  beforeEach(() => {
+    vi.clearAllMocks();
+  });
+
+  it('skips generation on a hit', async () => {
+    mockSql.mockResolvedValueOnce([{ payload: { success: true, title: 'Cached' } }]);
+    const generate = vi.fn();
+
+    const result = await withGenerationCache({ ...baseKey, payload: {} }, generate);
+
+    expect(result).toEqual({ success: true, title: 'Cached' });
+    expect(generate).not.toHaveBeenCalled();
+  });
+
+  it('generates and stores on a miss, but not rejected values', async () => {
+    mockSql.mockResolvedValue([]);
+
+    await withGenerationCache({ ...baseKey, payload: {} }, async () => ({ success: true }), r => r.success);
+    expect(mockSql).toHaveBeenCalledTimes(2);
+
+    mockSql.mockClear();
+    await withGenerationCache({ ...baseKey, payload: {} }, async () => ({ success: false }), r => r.success);
+    expect(mockSql).toHaveBeenCalledTimes(1);
+  });
+
+  it('treats cache errors as a miss', async () => {
+    mockSql.mockRejectedValue(new Error('relation "news_generation_cache" does not exist'));
+
+    const result = await withGenerationCache({ ...baseKey, payload: {} }, async () => ({ success: true }));
+
+    expect(result).toEqual({ success: true });
+  });
+});
@@ -0,0 +1,140 @@
+/**
+ * News Generation Cache
+ *
+ * Stores AI-generated news text and image URLs in news_generation_cache
+ * (tournament DB), keyed by a normalized hash of the generation input, the
+ * prompt version and the language. Re-saving or editing a result with the
+ * same data reuses the earlier generation instead of calling the model.
+ *
+ * Cache failures are never fatal: every error is treated as a miss.
+ */
+
+import { getTournamentDb } from '../neon/tournament-config';
+import { hashContent } from './content-hash';
+import { NewsLanguage } from './types';
+
+export const NEWS_CACHE_TTL_DAYS = 30;
+export const NEWS_CACHE_MAX_ENTRIES = 5000;
+
+export type GenerationCacheKind = 'text' | 'image';
+
+export interface GenerationCacheKey {
+  kind: GenerationCacheKind;
+  eventType: string;
+  payload: unknown;
+  promptVersion: number;
+  language?: NewsLanguage;
+}
+
+/**
+ * Hash a cache key; payload key order, whitespace and empty fields don't matter
+ */
+export function getGenerationCacheKey(key: GenerationCacheKey): string {
+  return hashContent({
+    kind: key.kind,
+    event_type: key.eventType,
+    payload: key.payload,
+    prompt_version: key.promptVersion,
+    language: key.language,
+  });
+}
+
+/**
+ * Look up a cached generation, bumping its LRU timestamp on hit
+ */
+export async function getCachedGeneration<T>(key: GenerationCacheKey): Promise<T | null> {
+  try {
+    const sql = getTournamentDb();
+    const rows = await sql`
+      UPDATE news_generation_cache
+      SET last_accessed_at = NOW(), hit_count = hit_count + 1
+      WHERE cache_key = ${getGenerationCacheKey(key)}
+        AND expires_at > NOW()
+      RETURNING payload
+    `;
+    return rows.length > 0 ? (rows[0].payload as T) : null;
+  } catch (error) {
+    console.warn('News generation cache read failed (treated as miss):', error);
+    return null;
+  }
+}
+
+/**
+ * Store a generation result
+ */
+export async function setCachedGeneration(
+  key: GenerationCacheKey,
+  payload: unknown,
+  ttlDays: number = NEWS_CACHE_TTL_DAYS
+): Promise<void> {
+  try {
+    const sql = getTournamentDb();
+    await sql`
+      INSERT INTO news_generation_cache (
+        cache_key, kind, event_type, language, prompt_version, payload, expires_at
+      ) VALUES (
+        ${getGenerationCacheKey(key)},
+        ${key.kind},
+        ${key.eventType},
+        ${key.language || null},
+        ${key.promptVersion},
+        ${JSON.stringify(payload)}::jsonb,
+        NOW() + make_interval(days => ${ttlDays})
+      )
+      ON CONFLICT (cache_key) DO UPDATE SET
+        payload = EXCLUDED.payload,
+        prompt_version = EXCLUDED.prompt_version,
+        last_accessed_at = NOW(),
+        expires_at = EXCLUDED.expires_at
+    `;
+  } catch (error) {
+    console.warn('News generation cache write failed:', error);
+  }
+}
+
+/**
+ * Return the cached value for `key`, or run `generate` and cache its result
+ * when `shouldCache` accepts it
+ */
+export async function withGenerationCache<T>(
+  key: GenerationCacheKey,
+  generate: () => Promise<T>,
+  shouldCache: (value: T) => boolean = value => value !== null && value !== undefined
+): Promise<T> {
+  const cached = await getCachedGeneration<T>(key);
+  if (cached !== null) {
+    console.log(`♻️ News ${key.kind} cache hit for ${key.eventType}${key.language ? ` (${key.language})` : ''}`);
+    return cached;
+  }
+
+  const value = await generate();
+  if (shouldCache(value)) {
+    await setCachedGeneration(key, value);
+  }
+  return value;
+}
+
+/**
+ * Drop expired entries, then least-recently-used entries beyond maxEntries
+ */
+export async function evictGenerationCache(
+  maxEntries: number = NEWS_CACHE_MAX_ENTRIES
+): Promise<number> {
+  try {
+    const sql = getTournamentDb();
+    const deleted = await sql`
+      DELETE FROM news_generation_cache
+      WHERE expires_at <= NOW()
+        OR cache_key IN (
+          SELECT cache_key FROM news_generation_cache
+          ORDER BY last_accessed_at DESC
+          OFFSET ${maxEntries}
+        )
+      RETURNING cache_key
+    `;
+    return deleted.length;
+  } catch (error) {
+    console.warn('News generation cache eviction failed:', error);
+    return 0;
+  }
+}
@@ -0,0 +1,197 @@
+/**
+ * News Job Queue
+ *
+ * Postgres-backed queue (news_jobs, tournament DB) for AI news generation.
+ * Request handlers enqueue with a single INSERT; the cron worker
+ * (/api/cron/process-news-jobs) claims jobs with FOR UPDATE SKIP LOCKED and
+ * runs generation with bounded concurrency.
+ */
+
+import { getTournamentDb } from '../neon/tournament-config';
+import { generateAndStoreNews } from './publish';
+import { hashContent } from './content-hash';
+import { evictGenerationCache } from './generation-cache';
+import { NewsGenerationInput } from './types';
+
+// Identical events enqueued within this window are generated once
+export const NEWS_JOB_DEDUPE_WINDOW_MINUTES = 10;
+
+// A job stuck in 'processing' longer than this is assumed to have lost its worker
+const LOCK_TIMEOUT_MINUTES = 5;
+
+export interface NewsJob {
+  id: number;
+  input: NewsGenerationInput;
+  attempts: number;
+  max_attempts: number;
+}
+
+export interface ProcessNewsJobsOptions {
+  concurrency?: number;   // Jobs generated in parallel
+  maxJobs?: number;       // Upper bound on jobs handled per invocation
+  timeBudgetMs?: number;  // Stop claiming new jobs after this much time
+}
+
+export interface ProcessNewsJobsResult {
+  processed: number;
+  completed: number;
+  failed: number;
+  results: Array<{ job_id: number; success: boolean; news_id?: string; error?: string; duration_ms: number }>;
+}
+
+/**
+ * Deduplication key for a generation input
+ */
+export function getNewsJobDedupeKey(input: NewsGenerationInput): string {
+  return hashContent(input);
+}
+
+/**
+ * Enqueue a news generation job. Skips the insert when an identical job
+ * completed within the dedupe window or is still pending/processing; the
+ * partial unique index idx_news_jobs_active_dedupe makes the latter hold for
+ * concurrent triggers too.
+ */
+export async function enqueueNewsJob(
+  input: NewsGenerationInput,
+  dedupeWindowMinutes: number = NEWS_JOB_DEDUPE_WINDOW_MINUTES
+): Promise<{ enqueued: boolean; jobId?: number }> {
+  const sql = getTournamentDb();
+  const dedupeKey = getNewsJobDedupeKey(input);
+
+  const result = await sql`
+    INSERT INTO news_jobs (event_type, dedupe_key, input)
+    SELECT ${input.event_type}, ${dedupeKey}, ${JSON.stringify(input)}::jsonb
+    WHERE NOT EXISTS (
+      SELECT 1 FROM news_jobs
+      WHERE dedupe_key = ${dedupeKey}
+        AND status = 'completed'
+        AND created_at > NOW() - make_interval(mins => ${dedupeWindowMinutes})
+    )
+    ON CONFLICT (dedupe_key) WHERE status IN ('pending', 'processing') DO NOTHING
+    RETURNING id
+  `;
+
+  if (result.length === 0) {
+    return { enqueued: false };
+  }
+  return { enqueued: true, jobId: Number(result[0].id) };
+}
+
+/**
+ * Atomically claim up to `limit` runnable jobs. Concurrent workers skip rows
+ * another worker has locked instead of blocking on them. Jobs whose lease
+ * expired are reclaimed; if that was already their final attempt they are
+ * marked failed rather than left in 'processing'.
+ */
+export async function claimNewsJobs(limit: number): Promise<NewsJob[]> {
+  const sql = getTournamentDb();
+
+  await sql`
+    UPDATE news_jobs
+    SET status = 'failed',
+        locked_at = NULL,
+        last_error = COALESCE(last_error, 'Worker lease expired on final attempt'),
+        updated_at = NOW()
+    WHERE status = 'processing'
+      AND attempts >= max_attempts
+      AND locked_at < NOW() - make_interval(mins => ${LOCK_TIMEOUT_MINUTES})
+  `;
+
+  const rows = await sql`
+    UPDATE news_jobs
+    SET status = 'processing',
+        locked_at = NOW(),
+        attempts = attempts + 1,
+        updated_at = NOW()
+    WHERE id IN (
+      SELECT id FROM news_jobs
+      WHERE run_after <= NOW()
+        AND attempts < max_attempts
+        AND (
+          status = 'pending'
+          OR (status = 'processing' AND locked_at < NOW() - make_interval(mins => ${LOCK_TIMEOUT_MINUTES}))
+        )
+      ORDER BY run_after, id
+      LIMIT ${limit}
+      FOR UPDATE SKIP LOCKED
+    )
+    RETURNING id, input, attempts, max_attempts
+  `;
+
+  return rows.map(row => ({
+    id: Number(row.id),
+    input: row.input as NewsGenerationInput,
+    attempts: row.attempts,
+    max_attempts: row.max_attempts,
+  }));
+}
+
+async function completeNewsJob(jobId: number, newsId: string): Promise<void> {
+  const sql = getTournamentDb();
+  await sql`
+    UPDATE news_jobs
+    SET status = 'completed', news_id = ${newsId}, locked_at = NULL, last_error = NULL, updated_at = NOW()
+    WHERE id = ${jobId}
+  `;
+}
+
+async function failNewsJob(job: NewsJob, error: string): Promise<void> {
+  const sql = getTournamentDb();
+  const exhausted = job.attempts >= job.max_attempts;
+  // Back off 1, 2, 4... minutes between attempts
+  const retryDelayMinutes = Math.pow(2, job.attempts - 1);
+
+  await sql`
+    UPDATE news_jobs
+    SET status = ${exhausted ? 'failed' : 'pending'},
+        run_after = NOW() + make_interval(mins => ${retryDelayMinutes}),
+        locked_at = NULL,
+        last_error = ${error},
+        updated_at = NOW()
+    WHERE id = ${job.id}
+  `;
+}
+
+/**
+ * Worker entry point: drain the queue with bounded concurrency until it is
+ * empty, maxJobs is reached or the time budget runs out.
+ */
+export async function processNewsJobs(
+  options: ProcessNewsJobsOptions = {}
+): Promise<ProcessNewsJobsResult> {
+  const { concurrency = 2, maxJobs = 10, timeBudgetMs = 15000 } = options;
+  const startedAt = Date.now();
+  const summary: ProcessNewsJobsResult = { processed: 0, completed: 0, failed: 0, results: [] };
+
+  while (summary.processed < maxJobs && Date.now() - startedAt < timeBudgetMs) {
+    const jobs = await claimNewsJobs(Math.min(concurrency, maxJobs - summary.processed));
+    if (jobs.length === 0) break;
+
+    await Promise.all(
+      jobs.map(async job => {
+        const jobStart = Date.now();
+        try {
+          const { newsId } = await generateAndStoreNews(job.input);
+          await completeNewsJob(job.id, newsId);
+          summary.completed++;
+          summary.results.push({ job_id: job.id, success: true, news_id: newsId, duration_ms: Date.now() - jobStart });
+        } catch (error: any) {
+          console.error(`❌ News job ${job.id} failed (attempt ${job.attempts}/${job.max_attempts}):`, error);
+          await failNewsJob(job, error.message || 'Unknown error');
+          summary.failed++;
+          summary.results.push({ job_id: job.id, success: false, error: error.message, duration_ms: Date.now() - jobStart });
+        }
+      })
+    );
+
+    summary.processed += jobs.length;
+  }
+
+  // Keep the generation cache bounded (TTL + LRU) as it grows with new jobs
+  if (summary.completed > 0) {
+    await evictGenerationCache();
+  }
+
+  return summary;
+}
@@ -6,6 +6,12 @@
 import { NewsGenerationInput, NewsLanguage, REPORTERS } from './types';
 import { determineTone, getTonePersonality, getToneInstructions } from './determine-tone';
 
+/**
+ * Version of the prompt templates below. Bump it whenever a template changes
+ * so cached generations (news_generation_cache) are not reused.
+ */
+export const NEWS_PROMPT_VERSION = 1;
+
 /**
  * Generate prompt for any event type in specified language
  */
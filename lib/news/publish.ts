@@ -0,0 +1,86 @@
+import { getTournamentDb } from '../neon/tournament-config';
+import { generateBilingualNews } from './auto-generate';
+import { generateNewsImage } from '../images/generate';
+import { NewsGenerationInput } from './types';
+
+/**
+ * Generate bilingual news with AI, render its image and store it in the news table.
+ * Shared by POST /api/news (generate_with_ai) and the news job worker.
+ */
+export async function generateAndStoreNews(input: NewsGenerationInput) {
+  // Generate bilingual content (English + Malayalam)
+  const bilingualResult = await generateBilingualNews(input);
+
+  const sql = getTournamentDb();
+  const newsId = `news_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`;
+
+  // Image generation failures never block publishing
+  let imageUrl: string | null = null;
+  try {
+    console.log('🎨 Generating image for news...');
+    imageUrl = await generateNewsImage(
+      input.event_type,
+      input.metadata || {},
+      newsId
+    );
+    console.log(imageUrl ? '✅ Image generated!' : '⚠️ Image generation skipped');
+  } catch (imageError) {
+    console.error('Image generation failed (non-fatal):', imageError);
+  }
+
+  // Insert into Neon database with bilingual content
+  await sql`
+    INSERT INTO news (
+      id, title_en, title_ml, content_en, content_ml,
+      summary_en, summary_ml, category, event_type,
+      season_id, season_name, is_published, published_at,
+      generated_by, edited_by_admin, metadata, image_url,
+      tone, reporter_en, reporter_ml
+    ) VALUES (
+      ${newsId},
+      ${bilingualResult.en.title},
+      ${bilingualResult.ml.title},
+      ${bilingualResult.en.content},
+      ${bilingualResult.ml.content},
+      ${bilingualResult.en.summary},
+      ${bilingualResult.ml.summary},
+      ${input.category},
+      ${input.event_type},
+      ${input.season_id || null},
+      ${input.season_name || null},
+      true,
+      NOW(),
+      'ai',
+      false,
+      ${JSON.stringify(input.metadata || {})},
+      ${imageUrl},
+      ${bilingualResult.en.tone},
+      ${bilingualResult.en.reporter},
+      ${bilingualResult.ml.reporter}
+    )
+  `;
+
+  const news = {
+    id: newsId,
+    title_en: bilingualResult.en.title,
+    title_ml: bilingualResult.ml.title,
+    content_en: bilingualResult.en.content,
+    content_ml: bilingualResult.ml.content,
+    summary_en: bilingualResult.en.summary,
+    summary_ml: bilingualResult.ml.summary,
+    category: input.category,
+    event_type: input.event_type,
+    season_id: input.season_id || null,
+    season_name: input.season_name || null,
+    is_published: true,
+    generated_by: 'ai',
+    edited_by_admin: false,
+    metadata: input.metadata || {},
+    image_url: imageUrl,
+    tone: bilingualResult.en.tone,
+    reporter_en: bilingualResult.en.reporter,
+    reporter_ml: bilingualResult.ml.reporter,
+  };
+
+  return { newsId, news };
+}
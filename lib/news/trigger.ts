@@ -1,32 +1,20 @@
 import { NewsGenerationInput, NewsEventType, NewsCategory, NewsMetadata } from './types';
+import { enqueueNewsJob } from './job-queue';
 
 /**
  * Trigger AI news generation for an event
  * This function can be called from any API route
- * It makes a request to the news API to generate and save news
+ * It only enqueues a job (one INSERT); /api/cron/process-news-jobs generates
+ * and saves the news in the background
  */
 export async function triggerNewsGeneration(input: NewsGenerationInput): Promise<void> {
   try {
-    // Make internal API call to generate news
-    const baseUrl = process.env.NEXT_PUBLIC_SITE_URL || 'http://localhost:3000';
-    
-    const response = await fetch(`${baseUrl}/api/news`, {
-      method: 'POST',
-      headers: {
-        'Content-Type': 'application/json',
-      },
-      body: JSON.stringify({
-        generate_with_ai: true,
-        generation_input: input,
-      }),
-    });
+    const { enqueued, jobId } = await enqueueNewsJob(input);
 
-    if (!response.ok) {
-      const error = await response.json();
-      console.error('Failed to generate news:', error);
+    if (enqueued) {
+      console.log('News generation queued:', jobId);
     } else {
-      const result = await response.json();
-      console.log('News generated successfully:', result.news_id);
+      console.log('Duplicate news event skipped:', input.event_type);
     }
   } catch (error) {
     // Silently fail - don't break the main operation
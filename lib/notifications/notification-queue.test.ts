@@ -0,0 +1,122 @@
+import { describe, it, expect, vi, beforeEach } from 'vitest';
+
+const mockSql = vi.fn();
+const mockSendEachForMulticast = vi.fn();
+
+vi.mock('@neondatabase/serverless', () => ({
+  neon: vi.fn(() => mockSql),
+}));
+
+vi.mock('firebase-admin', () => ({
+  default: {
+    messaging: vi.fn(() => ({ sendEachForMulticast: mockSendEachForMulticast })),
+  },
+}));
+
+const {
+  NotificationQueue,
+  chunkTokens,
+  resolveTargetUserIds,
+  FCM_MULTICAST_LIMIT,
+} = await import('./notification-queue');
+
+function multicastResponse(tokens: string[], failing: string[] = []) {
+  const responses = tokens.map(token =>
+    failing.includes(token)
+      ? { success: false, error: { code: 'messaging/registration-token-not-registered' } }
+      : { success: true }
+  );
+  return {
+    responses,
+    successCount: responses.filter(r => r.success).length,
+    failureCount: responses.filter(r => !r.success).length,
+  };
+}
+
+describe('notification-queue helpers', () => {
+  it('chunks tokens into FCM multicast-sized groups', () => {
+    const tokens = Array.from({ length: FCM_MULTICAST_LIMIT * 2 + 1 }, (_, i) => `t${i}`);
+    const chunks = chunkTokens(tokens);
+
+    expect(chunks).toHaveLength(3);
+    expect(chunks[0]).toHaveLength(FCM_MULTICAST_LIMIT);
+    expect(chunks[2]).toEqual([`t${FCM_MULTICAST_LIMIT * 2}`]);
+  });
+
+  it('resolves targets and applies exclusions without querying', () => {
+    expect(resolveTargetUserIds({ teamIds: ['a', 'b', 'a', 'c'], excludeUserIds: ['c'] })).toEqual(['a', 'b']);
+    expect(resolveTargetUserIds({ allUsers: true })).toBeNull();
+    expect(resolveTargetUserIds({})).toEqual([]);
+  });
+});
+
+describe('NotificationQueue.flush', () => {
+  beforeEach(() => {
+    vi.clearAllMocks();
+  });
+
+  it('resolves tokens once, dedupes shared devices and prunes dead tokens in one update', async () => {
+    mockSql.mockResolvedValueOnce([
+      { token: 'tok-a', user_id: 'team-a', device_name: 'phone' },
+      { token: 'tok-shared', user_id: 'team-a', device_name: 'tablet' },
+      { token: 'tok-shared', user_id: 'team-b', device_name: 'tablet' },
+      { token: 'tok-dead', user_id: 'team-b', device_name: 'old phone' },
+    ]);
+    mockSql.mockResolvedValue([]);
+    mockSendEachForMulticast.mockImplementation(async (message: { tokens: string[] }) =>
+      multicastResponse(message.tokens, ['tok-dead'])
+    );
+
+    const queue = new NotificationQueue();
+    queue.enqueue({ title: 'Round Finalized', body: 'Results are in' }, { teamIds: ['team-a', 'team-b'] });
+    queue.enqueue({ title: 'Player Won', body: 'You won a player' }, { teamId: 'team-a' });
+    queue.enqueue({ title: 'Nobody', body: 'No tokens' }, { teamId: 'team-c' });
+
+    const results = await queue.flush();
+
+    expect(results).toEqual([
+      { success: true, sentCount: 2, failedCount: 1 },
+      { success: true, sentCount: 2, failedCount: 0 },
+      { success: false, sentCount: 0, failedCount: 0, error: 'No active FCM tokens found' },
+    ]);
+    expect(mockSendEachForMulticast.mock.calls[0][0].tokens).toEqual(['tok-a', 'tok-shared', 'tok-dead']);
+
+    // token lookup + last_used_at update + deactivation update
+    expect(mockSql).toHaveBeenCalledTimes(3);
+    const deactivateCall = mockSql.mock.calls.find(call => call[0].join('').includes('is_active = false'));
+    expect(deactivateCall?.[1]).toEqual(['tok-dead']);
+    expect(queue.size).toBe(0);
+  });
+
+  it('keeps the other results and token bookkeeping when one send throws', async () => {
+    mockSql.mockResolvedValueOnce([
+      { token: 'tok-a', user_id: 'team-a', device_name: 'phone' },
+      { token: 'tok-b', user_id: 'team-b', device_name: 'phone' },
+    ]);
+    mockSql.mockResolvedValue([]);
+    mockSendEachForMulticast.mockImplementation(async (message: { tokens: string[] }) => {
+      if (message.tokens.includes('tok-b')) throw new Error('Quota exceeded');
+      return multicastResponse(message.tokens);
+    });
+
+    const queue = new NotificationQueue();
+    queue.enqueue({ title: 'A', body: 'a' }, { teamId: 'team-a' });
+    queue.enqueue({ title: 'B', body: 'b' }, { teamId: 'team-b' });
+
+    const results = await queue.flush();
+
+    expect(results).toEqual([
+      { success: true, sentCount: 1, failedCount: 0 },
+      { success: false, sentCount: 0, failedCount: 1, error: 'Quota exceeded' },
+    ]);
+    const liveCall = mockSql.mock.calls.find(call => call[0].join('').includes('last_used_at = NOW()'));
+    expect(liveCall?.[1]).toEqual(['tok-a']);
+    expect(mockSql.mock.calls.some(call => call[0].join('').includes('is_active = false'))).toBe(false);
+  });
+
+  it('returns an empty result list when nothing is queued', async () => {
+    const queue = new NotificationQueue();
+    await expect(queue.flush()).resolves.toEqual([]);
+    expect(mockSql).not.toHaveBeenCalled();
+  });
+});
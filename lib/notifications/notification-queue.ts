@@ -0,0 +1,279 @@
+import admin from 'firebase-admin';
+import { neon } from '@neondatabase/serverless';
+import type { NotificationPayload, NotificationOptions } from './send-notification';
+
+const sql = neon(process.env.NEON_TOURNAMENT_DB_URL!);
+
+/**
+ * FCM rejects multicast messages with more than 500 tokens
+ */
+export const FCM_MULTICAST_LIMIT = 500;
+
+export interface NotificationResult {
+  success: boolean;
+  sentCount: number;
+  failedCount: number;
+  error?: string;
+}
+
+interface QueuedNotification {
+  payload: NotificationPayload;
+  options: NotificationOptions;
+}
+
+interface TokenRow {
+  token: string;
+  user_id: string;
+  device_name: string | null;
+}
+
+/**
+ * Split a token list into FCM-sized multicast chunks
+ */
+export function chunkTokens(tokens: string[], size: number = FCM_MULTICAST_LIMIT): string[][] {
+  const chunks: string[][] = [];
+  for (let i = 0; i < tokens.length; i += size) {
+    chunks.push(tokens.slice(i, i + size));
+  }
+  return chunks;
+}
+
+/**
+ * Resolve the user IDs a notification targets, without touching the database.
+ * Returns null when the notification targets all users (resolved at flush time).
+ */
+export function resolveTargetUserIds(options: NotificationOptions): string[] | null {
+  let targetUserIds: string[];
+
+  if (options.userId) {
+    targetUserIds = [options.userId];
+  } else if (options.userIds) {
+    targetUserIds = options.userIds;
+  } else if (options.teamId) {
+    // Team ID is same as user ID in Firebase Auth
+    targetUserIds = [options.teamId];
+  } else if (options.teamIds) {
+    targetUserIds = options.teamIds;
+  } else if (options.allUsers) {
+    return null;
+  } else {
+    targetUserIds = [];
+  }
+
+  return applyExclusions(targetUserIds, options);
+}
+
+function applyExclusions(userIds: string[], options: NotificationOptions): string[] {
+  const excluded = new Set(options.excludeUserIds || []);
+  return Array.from(new Set(userIds.filter(id => id && !excluded.has(id))));
+}
+
+/**
+ * Build the FCM multicast message for a payload and a chunk of tokens
+ */
+export function buildMulticastMessage(
+  payload: NotificationPayload,
+  tokens: string[]
+): admin.messaging.MulticastMessage {
+  return {
+    tokens,
+    notification: {
+      title: payload.title,
+      body: payload.body,
+      // Only include imageUrl if it's a valid full URL
+      ...(payload.icon && (payload.icon.startsWith('http://') || payload.icon.startsWith('https://'))
+        ? { imageUrl: payload.icon }
+        : {}
+      )
+    },
+    data: {
+      url: payload.url || '/',
+      ...payload.data
+    },
+    webpush: {
+      fcmOptions: {
+        link: payload.url || '/'
+      },
+      notification: {
+        icon: payload.icon || '/logo.png',
+        badge: '/badge.png'
+      }
+    }
+  };
+}
+
+/**
+ * Collects notifications and sends them together on flush().
+ *
+ * A flush resolves all recipients' tokens with one query, deduplicates tokens
+ * per notification, sends in chunks of FCM_MULTICAST_LIMIT and then updates
+ * token bookkeeping (last_used_at / dead tokens) with one statement each.
+ *
+ * @example
+ * const queue = new NotificationQueue();
+ * for (const allocation of allocations) {
+ *   queue.enqueue({ title: '🎉 Player Won!', body: '...' }, { teamId: allocation.team_id });
+ * }
+ * await queue.flush();
+ */
+export class NotificationQueue {
+  private pending: QueuedNotification[] = [];
+
+  enqueue(payload: NotificationPayload, options: NotificationOptions): void {
+    this.pending.push({ payload, options });
+  }
+
+  get size(): number {
+    return this.pending.length;
+  }
+
+  /**
+   * Send every queued notification. Results are returned in enqueue order.
+   */
+  async flush(): Promise<NotificationResult[]> {
+    const batch = this.pending;
+    this.pending = [];
+
+    if (batch.length === 0) {
+      return [];
+    }
+
+    // Resolve recipients; "all users" is looked up at most once per flush
+    let allUserIds: string[] | null = null;
+    const targets: string[][] = [];
+    for (const item of batch) {
+      const resolved = resolveTargetUserIds(item.options);
+      if (resolved === null) {
+        if (allUserIds === null) {
+          const usersResult = await sql`
+            SELECT DISTINCT user_id
+            FROM fcm_tokens
+            WHERE is_active = true
+          `;
+          allUserIds = usersResult.map(u => u.user_id as string);
+        }
+        targets.push(applyExclusions(allUserIds, item.options));
+      } else {
+        targets.push(resolved);
+      }
+    }
+
+    const uniqueUserIds = Array.from(new Set(targets.flat()));
+
+    // One token lookup for every recipient in the batch
+    const tokensByUser = new Map<string, TokenRow[]>();
+    if (uniqueUserIds.length > 0) {
+      const tokensResult = await sql`
+        SELECT token, user_id, device_name
+        FROM fcm_tokens
+        WHERE user_id = ANY(${uniqueUserIds})
+          AND is_active = true
+        ORDER BY last_used_at DESC
+      `;
+      for (const row of tokensResult as TokenRow[]) {
+        const rows = tokensByUser.get(row.user_id) || [];
+        rows.push(row);
+        tokensByUser.set(row.user_id, rows);
+      }
+    }
+
+    const deviceNames = new Map<string, string | null>();
+    const succeededTokens = new Set<string>();
+    const failedTokens = new Set<string>();
+
+    const results = await Promise.all(
+      batch.map(async (item, index): Promise<NotificationResult> => {
+        const userIds = targets[index];
+        if (userIds.length === 0) {
+          return { success: false, sentCount: 0, failedCount: 0, error: 'No target users found' };
+        }
+
+        // Deduplicate tokens shared between recipients (e.g. one device, two accounts)
+        const tokens: string[] = [];
+        const seen = new Set<string>();
+        for (const userId of userIds) {
+          for (const row of tokensByUser.get(userId) || []) {
+            if (!seen.has(row.token)) {
+              seen.add(row.token);
+              tokens.push(row.token);
+              deviceNames.set(row.token, row.device_name);
+            }
+          }
+        }
+
+        if (tokens.length === 0) {
+          return { success: false, sentCount: 0, failedCount: 0, error: 'No active FCM tokens found' };
+        }
+
+        let sentCount = 0;
+        let failedCount = 0;
+        let sendError: string | undefined;
+        for (const chunk of chunkTokens(tokens)) {
+          let response;
+          try {
+            response = await admin.messaging().sendEachForMulticast(
+              buildMulticastMessage(item.payload, chunk)
+            );
+          } catch (error: any) {
+            // Quota / network errors say nothing about the tokens themselves,
+            // so they are counted as failed but not deactivated
+            console.error(`❌ FCM send failed for "${item.payload.title}":`, error);
+            sendError = error?.message || 'Failed to send notification';
+            failedCount += chunk.length;
+            continue;
+          }
+          sentCount += response.successCount;
+          failedCount += response.failureCount;
+          response.responses.forEach((resp, idx) => {
+            if (resp.success) {
+              succeededTokens.add(chunk[idx]);
+            } else {
+              console.error(`❌ FCM Error for device ${deviceNames.get(chunk[idx])}:`, resp.error?.code);
+              failedTokens.add(chunk[idx]);
+            }
+          });
+        }
+
+        console.log(`📬 Notification sent: "${item.payload.title}" to ${sentCount}/${tokens.length} devices`);
+
+        return { success: sentCount > 0, sentCount, failedCount, ...(sendError ? { error: sendError } : {}) };
+      })
+    );
+
+    // A token that delivered in any message of this flush is still alive
+    const deadTokens = Array.from(failedTokens).filter(token => !succeededTokens.has(token));
+    const liveTokens = Array.from(succeededTokens);
+
+    await Promise.all([
+      liveTokens.length > 0
+        ? sql`
+            UPDATE fcm_tokens
+            SET last_used_at = NOW()
+            WHERE token = ANY(${liveTokens}) AND is_active = true
+          `
+        : null,
+      deadTokens.length > 0
+        ? sql`
+            UPDATE fcm_tokens
+            SET is_active = false, updated_at = NOW()
+            WHERE token = ANY(${deadTokens})
+          `
+        : null,
+    ]);
+
+    return results;
+  }
+}
+
+/**
+ * Send several notifications in a single flush
+ */
+export async function sendNotifications(
+  items: Array<{ payload: NotificationPayload; options: NotificationOptions }>
+): Promise<NotificationResult[]> {
+  const queue = new NotificationQueue();
+  for (const item of items) {
+    queue.enqueue(item.payload, item.options);
+  }
+  return queue.flush();
+}
@@ -1,5 +1,8 @@
-import admin from 'firebase-admin';
 import { neon } from '@neondatabase/serverless';
+import { NotificationQueue, type NotificationResult } from './notification-queue';
+
+export { NotificationQueue, sendNotifications } from './notification-queue';
+export type { NotificationResult } from './notification-queue';
 
 const sql = neon(process.env.NEON_TOURNAMENT_DB_URL!);
 
@@ -41,124 +44,19 @@ export interface NotificationOptions {
  *   { title: 'Season Started', body: 'Season 16 has begun!' },
  *   { allUsers: true }
  * );
+ *
+ * Use NotificationQueue (./notification-queue) when sending many
+ * notifications at once so tokens are resolved and cleaned up in bulk.
  */
 export async function sendNotification(
   payload: NotificationPayload,
   options: NotificationOptions
-): Promise<{ success: boolean; sentCount: number; failedCount: number; error?: string }> {
+): Promise<NotificationResult> {
   try {
-    let targetUserIds: string[] = [];
-
-    // Determine target users
-    if (options.userId) {
-      targetUserIds = [options.userId];
-    } else if (options.userIds) {
-      targetUserIds = options.userIds;
-    } else if (options.teamId) {
-      // Team ID is same as user ID in Firebase Auth
-      targetUserIds = [options.teamId];
-    } else if (options.teamIds) {
-      targetUserIds = options.teamIds;
-    } else if (options.allUsers) {
-      // Get all users with active FCM tokens
-      const usersResult = await sql`
-        SELECT DISTINCT user_id
-        FROM fcm_tokens
-        WHERE is_active = true
-      `;
-      targetUserIds = usersResult.map(u => u.user_id);
-    }
-
-    // Apply exclusions
-    if (options.excludeUserIds && options.excludeUserIds.length > 0) {
-      targetUserIds = targetUserIds.filter(id => !options.excludeUserIds!.includes(id));
-    }
-
-    if (targetUserIds.length === 0) {
-      return { success: false, sentCount: 0, failedCount: 0, error: 'No target users found' };
-    }
-
-    // Get all FCM tokens for target users
-    const tokensResult = await sql`
-      SELECT token, user_id, device_name
-      FROM fcm_tokens
-      WHERE user_id = ANY(${targetUserIds})
-        AND is_active = true
-      ORDER BY last_used_at DESC
-    `;
-
-    if (tokensResult.length === 0) {
-      return { success: false, sentCount: 0, failedCount: 0, error: 'No active FCM tokens found' };
-    }
-
-    const tokens = tokensResult.map(t => t.token);
-
-    // Prepare FCM message
-    const message: admin.messaging.MulticastMessage = {
-      tokens,
-      notification: {
-        title: payload.title,
-        body: payload.body,
-        // Only include imageUrl if it's a valid full URL
-        ...(payload.icon && (payload.icon.startsWith('http://') || payload.icon.startsWith('https://')) 
-          ? { imageUrl: payload.icon } 
-          : {}
-        )
-      },
-      data: {
-        url: payload.url || '/',
-        ...payload.data
-      },
-      webpush: {
-        fcmOptions: {
-          link: payload.url || '/'
-        },
-        notification: {
-          icon: payload.icon || '/logo.png',
-          badge: '/badge.png'
-        }
-      }
-    };
-
-    // Send notification
-    const response = await admin.messaging().sendEachForMulticast(message);
-
-    console.log(`📬 Notification sent: "${payload.title}" to ${response.successCount}/${tokens.length} devices`);
-
-    // Update last_used_at for successful tokens
-    if (response.successCount > 0) {
-      await sql`
-        UPDATE fcm_tokens
-        SET last_used_at = NOW()
-        WHERE user_id = ANY(${targetUserIds}) AND is_active = true
-      `;
-    }
-
-    // Mark failed tokens as inactive
-    if (response.failureCount > 0) {
-      const failedTokens: string[] = [];
-      response.responses.forEach((resp, idx) => {
-        if (!resp.success) {
-          console.error(`❌ FCM Error for device ${tokensResult[idx].device_name}:`, resp.error?.code);
-          failedTokens.push(tokens[idx]);
-        }
-      });
-
-      if (failedTokens.length > 0) {
-        await sql`
-          UPDATE fcm_tokens
-          SET is_active = false, updated_at = NOW()
-          WHERE token = ANY(${failedTokens})
-        `;
-      }
-    }
-
-    return {
-      success: response.successCount > 0,
-      sentCount: response.successCount,
-      failedCount: response.failureCount
-    };
-
+    const queue = new NotificationQueue();
+    queue.enqueue(payload, options);
+    const [result] = await queue.flush();
+    return result;
   } catch (error: any) {
     console.error('❌ Error sending notification:', error);
     return {
@@ -0,0 +1,767 @@
+/**
+ * Player Transfer System V2 - Transfer Window Batches
+ *
+ * Executes a committee's whole list of transfers and swaps in one pass:
+ * 1. Loads one snapshot: contract rows (one query per player type),
+ *    team_seasons budgets (batched getAll) and transfer limits (one query)
+ * 2. Orders moves deterministically and validates them in memory against
+ *    running budgets and limit counts, so earlier moves affect later ones
+ * 3. Applies every accepted move with one Neon transaction per database
+ *    and one Firestore batch for budgets + player_transactions
+ * 4. Writes ledger entries and news with batched writes
+ *
+ * Single moves still go through executeTransferV2 / executeSwapV2; both
+ * paths share the same calculations, budget deltas and document builders.
+ */
+
+import { adminDb } from './firebase/admin';
+import { batchGetFirebase } from './firebase/batch';
+import {
+  PlayerType,
+  PlayerData,
+  MultiseasonTransferError,
+  ContractUpdate,
+  ContractBeforeImage,
+  BudgetDeltas,
+  fetchPlayerContracts,
+  currentSeasonContract,
+  fetchFutureSeasonContracts,
+  applyContractUpdates,
+  restoreContracts,
+  readTeamBudget,
+  checkTeamBudget,
+  toIncrementUpdate,
+  transferBudgetDeltas,
+  swapBudgetDeltas,
+  buildTransferTransactionDoc,
+  buildTransferNewsDoc,
+  buildSwapTransactionDoc,
+  buildSwapLedgerDocs,
+  buildSwapNewsDoc
+} from './player-transfers-v2';
+import {
+  calculateTransferDetails,
+  TransferCalculation,
+  calculateSwapDetails,
+  SwapCalculation
+} from './player-transfers-v2-utils';
+import { MAX_TRANSFERS_PER_SEASON, getTransferLimitStatuses } from './transfer-limits';
+import {
+  TransactionData,
+  logTransactions,
+  buildTransferPaymentLog,
+  buildTransferCompensationLog
+} from './transaction-logger';
+import { refreshSeasonAggregatesAfterChange } from './neon/season-aggregates';
+
+// ============================================================================
+// TYPES AND INTERFACES
+// ============================================================================
+
+/**
+ * Largest batch accepted. Keeps budget updates (≤ 2 per move) plus
+ * player_transactions docs (1 per move) inside a single 500-write Firestore batch.
+ */
+export const MAX_BATCH_MOVES = 150;
+
+const FIRESTORE_BATCH_LIMIT = 500;
+
+interface MoveOrdering {
+  priority?: number;    // Lower runs first (e.g. committee approval order)
+  requestedAt?: string; // ISO timestamp, earlier runs first
+}
+
+export interface BatchTransferMove extends MoveOrdering {
+  kind: 'transfer';
+  playerId: string;
+  playerType: PlayerType;
+  newTeamId: string;
+}
+
+export interface BatchSwapMove extends MoveOrdering {
+  kind: 'swap';
+  playerAId: string;
+  playerAType: PlayerType;
+  playerBId: string;
+  playerBType: PlayerType;
+  cashAmount?: number;
+  cashDirection?: 'A_to_B' | 'B_to_A' | 'none';
+}
+
+export type TransferWindowMove = BatchTransferMove | BatchSwapMove;
+
+export interface TransferWindowBatchRequest {
+  seasonId: string;
+  moves: TransferWindowMove[];
+  processedBy: string;
+  processedByName: string;
+}
+
+export interface TransferWindowMoveResult {
+  key: string;
+  kind: TransferWindowMove['kind'];
+  success: boolean;
+  message: string;
+  calculation?: TransferCalculation | SwapCalculation;
+  transactionId?: string;
+  error?: string;
+  errorCode?: string;
+}
+
+export interface TransferWindowBatchResult {
+  success: boolean;
+  message: string;
+  results: TransferWindowMoveResult[];
+  applied: number;
+  rejected: number;
+  teamsUpdated: number;
+  error?: string;
+  errorCode?: string;
+}
+
+/**
+ * Everything validation needs, loaded up front
+ */
+export interface TransferWindowSnapshot {
+  players: Map<string, SnapshotPlayer>;           // Keyed by playerKey(type, id)
+  teamSeasons: Map<string, Record<string, any>>;  // Keyed by team ID
+  transfersUsed: Map<string, number>;             // Keyed by team ID
+}
+
+export interface SnapshotPlayer {
+  current: PlayerData | null;
+  futureSeasonIds: string[];
+  futureError?: string;
+}
+
+/**
+ * A validated move with everything needed to write it
+ */
+export type PlannedMove =
+  | {
+      kind: 'transfer';
+      key: string;
+      player: PlayerData;
+      newTeamId: string;
+      futureSeasonIds: string[];
+      calculation: TransferCalculation;
+      buyingTeamBalance: number;
+      sellingTeamBalance: number;
+      deltas: BudgetDeltas;
+    }
+  | {
+      kind: 'swap';
+      key: string;
+      playerA: PlayerData;
+      playerB: PlayerData;
+      calculation: SwapCalculation;
+      teamABalance: number;
+      teamBBalance: number;
+      deltas: BudgetDeltas;
+    };
+
+// ============================================================================
+// ORDERING AND VALIDATION
+// ============================================================================
+
+export function playerKey(playerType: PlayerType, playerId: string): string {
+  return `${playerType}:${playerId}`;
+}
+
+/**
+ * Stable identifier for a move, used as the final ordering tie-break
+ */
+export function moveKey(move: TransferWindowMove): string {
+  return move.kind === 'transfer'
+    ? `transfer:${move.playerType}:${move.playerId}:${move.newTeamId}`
+    : `swap:${move.playerAType}:${move.playerAId}:${move.playerBType}:${move.playerBId}`;
+}
+
+/**
+ * Order moves deterministically: priority, then request time, then move key.
+ * Moves without a priority or request time sort after those that have one.
+ */
+export function orderMoves<T extends TransferWindowMove>(moves: T[]): T[] {
+  const priorityOf = (m: T) => m.priority ?? Number.POSITIVE_INFINITY;
+  const timeOf = (m: T) => m.requestedAt ? Date.parse(m.requestedAt) : Number.POSITIVE_INFINITY;
+
+  return [...moves].sort((a, b) =>
+    (priorityOf(a) - priorityOf(b)) ||
+    (timeOf(a) - timeOf(b)) ||
+    (moveKey(a) < moveKey(b) ? -1 : moveKey(a) > moveKey(b) ? 1 : 0)
+  );
+}
+
+function rejected(
+  move: TransferWindowMove,
+  errorCode: string,
+  message: string,
+  error: string = message,
+  calculation?: TransferCalculation | SwapCalculation
+): TransferWindowMoveResult {
+  return { key: moveKey(move), kind: move.kind, success: false, message, error, errorCode, calculation };
+}
+
+/**
+ * Validate moves in order against the snapshot
+ *
+ * Pure: running budgets and limit counts live in local state, so an
+ * accepted move changes what later moves in the batch can afford. A player
+ * may only move once per batch; later moves involving them are rejected
+ * with PLAYER_CONFLICT.
+ */
+export function planTransferWindow(
+  seasonId: string,
+  moves: TransferWindowMove[],
+  snapshot: TransferWindowSnapshot
+): { planned: PlannedMove[]; rejections: TransferWindowMoveResult[] } {
+  const planned: PlannedMove[] = [];
+  const rejections: TransferWindowMoveResult[] = [];
+  const movedPlayers = new Set<string>();
+  const transfersUsed = new Map(snapshot.transfersUsed);
+  const balances = new Map<string, Record<string, any> | undefined>();
+
+  // Running copy of a team's team_seasons fields
+  const teamData = (teamId: string) => {
+    if (!balances.has(teamId)) {
+      const data = snapshot.teamSeasons.get(teamId);
+      balances.set(teamId, data ? { ...data } : undefined);
+    }
+    return balances.get(teamId);
+  };
+
+  const budgetOf = (teamId: string, playerType: PlayerType): number => {
+    const data = teamData(teamId);
+    if (!data) {
+      throw new MultiseasonTransferError(
+        'BUDGET_VALIDATION_FAILED',
+        `Failed to validate team budget: Team season document not found: ${teamId}_${seasonId}`
+      );
+    }
+    try {
+      return readTeamBudget(data, teamId, seasonId, playerType);
+    } catch (error) {
+      throw new MultiseasonTransferError('BUDGET_FIELD_MISSING', (error as Error).message);
+    }
+  };
+
+  const limitError = (teamIds: string[]): string | null => {
+    for (const teamId of teamIds) {
+      const used = transfersUsed.get(teamId) || 0;
+      if (used >= MAX_TRANSFERS_PER_SEASON) {
+        return `Team ${teamId} has reached the maximum of ${MAX_TRANSFERS_PER_SEASON} transfers this season`;
+      }
+    }
+    return null;
+  };
+
+  const accept = (move: PlannedMove, teamIds: string[], playerKeys: string[]) => {
+    for (const [teamId, fields] of Object.entries(move.deltas)) {
+      const data = teamData(teamId)!; // Budget was read for every team in deltas
+      for (const [field, delta] of Object.entries(fields)) {
+        data[field] = (data[field] || 0) + delta;
+      }
+    }
+    teamIds.forEach(teamId => transfersUsed.set(teamId, (transfersUsed.get(teamId) || 0) + 1));
+    playerKeys.forEach(key => movedPlayers.add(key));
+    planned.push(move);
+  };
+
+  for (const move of orderMoves(moves)) {
+    const key = moveKey(move);
+
+    if (move.kind === 'transfer') {
+      const pKey = playerKey(move.playerType, move.playerId);
+      if (movedPlayers.has(pKey)) {
+        rejections.push(rejected(move, 'PLAYER_CONFLICT', `Player ${move.playerId} already moves earlier in this batch`));
+        continue;
+      }
+
+      const snap = snapshot.players.get(pKey);
+      if (!snap?.current) {
+        rejections.push(rejected(move, 'PLAYER_NOT_FOUND', 'Player not found', 'Player not found or not available for transfer'));
+        continue;
+      }
+      if (snap.futureError) {
+        rejections.push(rejected(move, 'FUTURE_SEASON_ERROR', 'Failed to validate multi-season contracts', snap.futureError));
+        continue;
+      }
+
+      const player = snap.current;
+      const oldTeamId = player.team_id;
+      if (oldTeamId === move.newTeamId) {
+        rejections.push(rejected(move, 'SAME_TEAM', 'Cannot transfer player to the same team', 'Player is already on this team'));
+        continue;
+      }
+
+      const limitMessage = limitError([oldTeamId, move.newTeamId]);
+      if (limitMessage) {
+        rejections.push(rejected(move, 'TRANSFER_LIMIT_EXCEEDED', limitMessage));
+        continue;
+      }
+
+      let calculation: TransferCalculation;
+      try {
+        calculation = calculateTransferDetails(player.auction_value, player.star_rating, player.points, player.type);
+      } catch (error) {
+        rejections.push(rejected(move, 'CALCULATION_ERROR', 'Transfer calculation failed', (error as Error).message));
+        continue;
+      }
+
+      let buyingTeamBalance: number;
+      let sellingTeamBalance: number;
+      try {
+        buyingTeamBalance = budgetOf(move.newTeamId, move.playerType);
+        checkTeamBudget(buyingTeamBalance, move.playerType, calculation.buyingTeamPays, 'transfer', 'Buying team');
+        sellingTeamBalance = budgetOf(oldTeamId, move.playerType);
+      } catch (error) {
+        const e = error as MultiseasonTransferError;
+        rejections.push(rejected(move, e.code, 'Budget validation failed', e.message, calculation));
+        continue;
+      }
+
+      accept({
+        kind: 'transfer',
+        key,
+        player,
+        newTeamId: move.newTeamId,
+        futureSeasonIds: snap.futureSeasonIds,
+        calculation,
+        buyingTeamBalance,
+        sellingTeamBalance,
+        deltas: transferBudgetDeltas(
+          move.newTeamId, oldTeamId, move.playerType,
+          calculation.buyingTeamPays, calculation.newValue,
+          calculation.sellingTeamReceives, calculation.originalValue
+        )
+      }, [oldTeamId, move.newTeamId], [pKey]);
+
+    } else {
+      const aKey = playerKey(move.playerAType, move.playerAId);
+      const bKey = playerKey(move.playerBType, move.playerBId);
+      const conflict = [aKey, bKey].find(k => movedPlayers.has(k));
+      if (conflict) {
+        rejections.push(rejected(move, 'PLAYER_CONFLICT', `Player ${conflict.split(':')[1]} already moves earlier in this batch`));
+        continue;
+      }
+
+      const playerA = snapshot.players.get(aKey)?.current;
+      const playerB = snapshot.players.get(bKey)?.current;
+      if (!playerA || !playerB) {
+        const label = !playerA ? 'Player A' : 'Player B';
+        rejections.push(rejected(move, 'PLAYER_NOT_FOUND', `${label} not found`, `${label} not found or not available for swap`));
+        continue;
+      }
+
+      const teamAId = playerA.team_id;
+      const teamBId = playerB.team_id;
+      if (teamAId === teamBId) {
+        rejections.push(rejected(move, 'SAME_TEAM_SWAP', 'Cannot swap players from the same team', 'Both players belong to the same team'));
+        continue;
+      }
+
+      const limitMessage = limitError([teamAId, teamBId]);
+      if (limitMessage) {
+        rejections.push(rejected(move, 'TRANSFER_LIMIT_EXCEEDED', limitMessage));
+        continue;
+      }
+
+      let calculation: SwapCalculation;
+      try {
+        calculation = calculateSwapDetails(
+          { value: playerA.auction_value, starRating: playerA.star_rating, points: playerA.points, type: playerA.type },
+          { value: playerB.auction_value, starRating: playerB.star_rating, points: playerB.points, type: playerB.type },
+          move.cashAmount || 0,
+          move.cashDirection || 'none'
+        );
+      } catch (error) {
+        rejections.push(rejected(move, 'CALCULATION_ERROR', 'Swap calculation failed', (error as Error).message));
+        continue;
+      }
+
+      // Same budget fields executeSwapV2 validates
+      let teamABalance: number;
+      let teamBBalance: number;
+      try {
+        teamABalance = budgetOf(teamAId, move.playerAType);
+        checkTeamBudget(teamABalance, move.playerAType, calculation.teamAPays, 'swap', 'Team A');
+        teamBBalance = budgetOf(teamBId, move.playerBType);
+        checkTeamBudget(teamBBalance, move.playerBType, calculation.teamBPays, 'swap', 'Team B');
+      } catch (error) {
+        const e = error as MultiseasonTransferError;
+        rejections.push(rejected(move, e.code, 'Budget validation failed', e.message, calculation));
+        continue;
+      }
+
+      accept({
+        kind: 'swap',
+        key,
+        playerA,
+        playerB,
+        calculation,
+        teamABalance,
+        teamBBalance,
+        deltas: swapBudgetDeltas(
+          teamAId, teamBId, move.playerAType, move.playerBType,
+          calculation.playerA.newValue, calculation.playerB.newValue,
+          calculation.playerA.originalValue, calculation.playerB.originalValue,
+          calculation.teamAPays, calculation.teamBPays
+        )
+      }, [teamAId, teamBId], [aKey, bKey]);
+    }
+  }
+
+  return { planned, rejections };
+}
+
+/**
+ * Sum per-move budget deltas into one change set per team
+ */
+export function mergeBudgetDeltas(all: BudgetDeltas[]): BudgetDeltas {
+  const merged: BudgetDeltas = {};
+  for (const deltas of all) {
+    for (const [teamId, fields] of Object.entries(deltas)) {
+      merged[teamId] = merged[teamId] || {};
+      for (const [field, delta] of Object.entries(fields)) {
+        merged[teamId][field] = (merged[teamId][field] || 0) + delta;
+      }
+    }
+  }
+  return merged;
+}
+
+/**
+ * Contract updates for accepted moves (swaps move the current season only,
+ * as in executeSwapV2)
+ */
+export function toContractUpdates(seasonId: string, planned: PlannedMove[]): ContractUpdate[] {
+  return planned.flatMap((move): ContractUpdate[] => {
+    if (move.kind === 'transfer') {
+      const { player, calculation } = move;
+      return [{
+        playerId: player.player_id,
+        playerType: player.type,
+        currentSeasonId: seasonId,
+        currentSeasonUpdates: {
+          team_id: move.newTeamId,
+          auction_value: calculation.newValue,
+          star_rating: calculation.newStarRating,
+          points: player.points + calculation.pointsAdded,
+          salary_per_match: calculation.newSalary
+        },
+        futureSeasonIds: move.futureSeasonIds
+      }];
+    }
+
+    const { playerA, playerB, calculation } = move;
+    return [
+      {
+        playerId: playerA.player_id,
+        playerType: playerA.type,
+        currentSeasonId: seasonId,
+        currentSeasonUpdates: {
+          team_id: playerB.team_id,
+          auction_value: calculation.playerA.newValue,
+          star_rating: calculation.playerA.newStarRating,
+          points: playerA.points + calculation.playerA.pointsAdded,
+          salary_per_match: calculation.playerA.newSalary
+        }
+      },
+      {
+        playerId: playerB.player_id,
+        playerType: playerB.type,
+        currentSeasonId: seasonId,
+        currentSeasonUpdates: {
+          team_id: playerA.team_id,
+          auction_value: calculation.playerB.newValue,
+          star_rating: calculation.playerB.newStarRating,
+          points: playerB.points + calculation.playerB.pointsAdded,
+          salary_per_match: calculation.playerB.newSalary
+        }
+      }
+    ];
+  });
+}
+
+// ============================================================================
+// SNAPSHOT AND WRITES
+// ============================================================================
+
+/**
+ * Load the validation snapshot in two rounds: contracts, then budgets + limits
+ */
+async function loadSnapshot(seasonId: string, moves: TransferWindowMove[]): Promise<TransferWindowSnapshot> {
+  const idsByType: Record<PlayerType, string[]> = { real: [], football: [] };
+  for (const move of moves) {
+    if (move.kind === 'transfer') {
+      idsByType[move.playerType].push(move.playerId);
+    } else {
+      idsByType[move.playerAType].push(move.playerAId);
+      idsByType[move.playerBType].push(move.playerBId);
+    }
+  }
+
+  console.log(`📋 Loading contracts for ${idsByType.real.length + idsByType.football.length} player(s)...`);
+  const [realContracts, footballContracts] = await Promise.all([
+    fetchPlayerContracts(idsByType.real, 'real'),
+    fetchPlayerContracts(idsByType.football, 'football')
+  ]);
+  const contractsByType: Record<PlayerType, Map<string, any[]>> = { real: realContracts, football: footballContracts };
+
+  const players = new Map<string, SnapshotPlayer>();
+  const teamIds = new Set<string>();
+  for (const playerType of ['real', 'football'] as PlayerType[]) {
+    for (const playerId of Array.from(new Set(idsByType[playerType]))) {
+      const rows = contractsByType[playerType].get(playerId);
+      const current = currentSeasonContract(rows, playerType, seasonId);
+      const snap: SnapshotPlayer = { current, futureSeasonIds: [] };
+
+      if (current) {
+        teamIds.add(current.team_id);
+        try {
+          const futures = await fetchFutureSeasonContracts(playerId, playerType, seasonId, current.team_id, rows || []);
+          snap.futureSeasonIds = futures.map(c => c.season_id);
+        } catch (error) {
+          snap.futureError = error instanceof Error ? error.message : 'Unknown error';
+        }
+      }
+      players.set(playerKey(playerType, playerId), snap);
+    }
+  }
+  moves.forEach(move => { if (move.kind === 'transfer') teamIds.add(move.newTeamId); });
+
+  const teamIdList = Array.from(teamIds);
+  console.log(`💵 Loading budgets and transfer limits for ${teamIdList.length} team(s)...`);
+  const [teamSeasonDocs, limitStatuses] = await Promise.all([
+    batchGetFirebase('team_seasons', teamIdList.map(teamId => `${teamId}_${seasonId}`)),
+    getTransferLimitStatuses(teamIdList, seasonId)
+  ]);
+
+  const teamSeasons = new Map<string, Record<string, any>>();
+  const transfersUsed = new Map<string, number>();
+  for (const teamId of teamIdList) {
+    const data = teamSeasonDocs.get(`${teamId}_${seasonId}`);
+    if (data) teamSeasons.set(teamId, data);
+    transfersUsed.set(teamId, limitStatuses.get(teamId)?.transfersUsed || 0);
+  }
+
+  return { players, teamSeasons, transfersUsed };
+}
+
+/**
+ * Commit writes in Firestore batches of up to 500
+ */
+async function commitInChunks(
+  writes: Array<(batch: FirebaseFirestore.WriteBatch) => void>
+): Promise<void> {
+  for (let i = 0; i < writes.length; i += FIRESTORE_BATCH_LIMIT) {
+    const batch = adminDb.batch();
+    writes.slice(i, i + FIRESTORE_BATCH_LIMIT).forEach(write => write(batch));
+    await batch.commit();
+  }
+}
+
+// ============================================================================
+// MAIN BATCH FUNCTION
+// ============================================================================
+
+/**
+ * Execute a transfer window's transfers and swaps as one batch
+ *
+ * Rejected moves are reported individually and never block the rest.
+ * Accepted moves are written together: if the contract or budget writes
+ * fail, every accepted move is rolled back and reported as SYSTEM_ERROR.
+ *
+ * @example
+ * const result = await executeTransferWindowBatch({
+ *   seasonId: 'SSPSLS16',
+ *   processedBy: 'admin123',
+ *   processedByName: 'Admin User',
+ *   moves: [
+ *     { kind: 'transfer', playerId: 'SSPSPL0001', playerType: 'real', newTeamId: 'SSPSLT0002', priority: 1 },
+ *     { kind: 'swap', playerAId: 'SSPSPL0003', playerAType: 'real', playerBId: 'SSPSPL0004', playerBType: 'real' }
+ *   ]
+ * });
+ */
+export async function executeTransferWindowBatch(
+  request: TransferWindowBatchRequest
+): Promise<TransferWindowBatchResult> {
+  const { seasonId, moves, processedBy, processedByName } = request;
+
+  if (moves.length > MAX_BATCH_MOVES) {
+    return {
+      success: false,
+      message: `Batch too large (${moves.length} moves, max ${MAX_BATCH_MOVES})`,
+      error: `A batch may contain at most ${MAX_BATCH_MOVES} moves`,
+      errorCode: 'BATCH_TOO_LARGE',
+      results: [],
+      applied: 0,
+      rejected: moves.length,
+      teamsUpdated: 0
+    };
+  }
+
+  let beforeImages: ContractBeforeImage[] = [];
+  let planned: PlannedMove[] = [];
+  let rejections: TransferWindowMoveResult[] = [];
+
+  try {
+    // Step 1: Snapshot
+    const snapshot = await loadSnapshot(seasonId, moves);
+
+    // Step 2: Validate in order against running state
+    ({ planned, rejections } = planTransferWindow(seasonId, moves, snapshot));
+    console.log(`🔍 ${planned.length} move(s) accepted, ${rejections.length} rejected`);
+
+    if (planned.length === 0) {
+      return summarize(planned, rejections, new Map(), 0);
+    }
+
+    // Step 3: Contracts - one transaction per database
+    console.log('📝 Updating player records...');
+    ({ beforeImages } = await applyContractUpdates(toContractUpdates(seasonId, planned)));
+
+    // Step 4: Budgets and player_transactions in one Firestore batch
+    console.log('💸 Updating team budgets and transaction records...');
+    const budgetDeltas = mergeBudgetDeltas(planned.map(move => move.deltas));
+    const transactionIds = new Map<string, string>();
+    const coreWrites: Array<(batch: FirebaseFirestore.WriteBatch) => void> = [];
+
+    for (const [teamId, fields] of Object.entries(budgetDeltas)) {
+      const ref = adminDb.collection('team_seasons').doc(`${teamId}_${seasonId}`);
+      coreWrites.push(batch => batch.update(ref, toIncrementUpdate(fields)));
+    }
+    for (const move of planned) {
+      const ref = adminDb.collection('player_transactions').doc();
+      transactionIds.set(move.key, ref.id);
+      const doc = move.kind === 'transfer'
+        ? buildTransferTransactionDoc(
+            seasonId, move.player, move.player.team_id, move.newTeamId, move.calculation,
+            processedBy, processedByName, [seasonId, ...move.futureSeasonIds], move.futureSeasonIds
+          )
+        : buildSwapTransactionDoc(
+            seasonId, move.playerA, move.playerB, move.calculation, processedBy, processedByName
+          );
+      coreWrites.push(batch => batch.set(ref, doc));
+    }
+
+    try {
+      await commitInChunks(coreWrites);
+    } catch (error) {
+      console.log(`🔄 Rolling back ${beforeImages.length} season record(s)...`);
+      await restoreContracts(beforeImages).catch(rollbackError =>
+        console.error('Failed to rollback player records:', rollbackError)
+      );
+      throw error;
+    }
+
+    // Step 5: Ledger and news (failures are logged, not fatal)
+    console.log('📝 Logging financial transactions and news...');
+    await writeLedgerAndNews(seasonId, planned).catch(error =>
+      console.error('Error logging batch transactions:', error)
+    );
+
+    const footballPlayerIds = planned.flatMap(move => move.kind === 'transfer'
+      ? [move.player]
+      : [move.playerA, move.playerB]
+    ).filter(p => p.type === 'football').map(p => p.player_id);
+    await refreshSeasonAggregatesAfterChange(seasonId, {
+      teamIds: Object.keys(budgetDeltas),
+      playerIds: footballPlayerIds
+    });
+
+    console.log(`✅ Transfer window batch completed: ${planned.length} move(s) applied`);
+    return summarize(planned, rejections, transactionIds, Object.keys(budgetDeltas).length);
+
+  } catch (error) {
+    console.error('❌ Transfer window batch failed:', error);
+    const message = error instanceof Error ? error.message : 'Unknown error';
+    const failed = planned.map(move => ({
+      key: move.key,
+      kind: move.kind,
+      success: false,
+      message: 'Batch failed due to system error',
+      error: message,
+      errorCode: 'SYSTEM_ERROR',
+      calculation: move.calculation
+    }));
+
+    return {
+      success: false,
+      message: 'Transfer window batch failed due to system error',
+      error: message,
+      errorCode: 'SYSTEM_ERROR',
+      results: [...failed, ...rejections],
+      applied: 0,
+      rejected: failed.length + rejections.length,
+      teamsUpdated: 0
+    };
+  }
+}
+
+/**
+ * Write ledger entries (balance_before from the running balances) and news
+ */
+async function writeLedgerAndNews(seasonId: string, planned: PlannedMove[]): Promise<void> {
+  const transferLogs: TransactionData[] = [];
+  const writes: Array<(batch: FirebaseFirestore.WriteBatch) => void> = [];
+  const addDoc = (collection: string, doc: Record<string, any>) => {
+    const ref = adminDb.collection(collection).doc();
+    writes.push(batch => batch.set(ref, doc));
+  };
+
+  for (const move of planned) {
+    if (move.kind === 'transfer') {
+      const { player, calculation } = move;
+      transferLogs.push(
+        buildTransferPaymentLog(
+          move.newTeamId, seasonId, player.player_name, player.player_id, player.type,
+          calculation.buyingTeamPays, move.buyingTeamBalance, player.team_id
+        ),
+        buildTransferCompensationLog(
+          player.team_id, seasonId, player.player_name, player.player_id, player.type,
+          calculation.sellingTeamReceives, move.sellingTeamBalance, move.newTeamId
+        )
+      );
+      addDoc('news', buildTransferNewsDoc(
+        seasonId, player, player.team_name || 'Previous Team', 'New Team', calculation
+      ));
+    } else {
+      const { playerA, playerB, calculation } = move;
+      buildSwapLedgerDocs(
+        playerA.team_id, playerB.team_id, seasonId, playerA, playerB,
+        calculation, move.teamABalance, move.teamBBalance
+      ).forEach(doc => addDoc('transactions', doc));
+      addDoc('news', buildSwapNewsDoc(seasonId, playerA, playerB, calculation));
+    }
+  }
+
+  await Promise.all([logTransactions(transferLogs), commitInChunks(writes)]);
+}
+
+function summarize(
+  planned: PlannedMove[],
+  rejections: TransferWindowMoveResult[],
+  transactionIds: Map<string, string>,
+  teamsUpdated: number
+): TransferWindowBatchResult {
+  const applied: TransferWindowMoveResult[] = planned.map(move => ({
+    key: move.key,
+    kind: move.kind,
+    success: true,
+    message: move.kind === 'transfer'
+      ? `${move.player.player_name} successfully transferred`
+      : `${move.playerA.player_name} and ${move.playerB.player_name} successfully swapped`,
+    calculation: move.calculation,
+    transactionId: transactionIds.get(move.key)
+  }));
+
+  return {
+    success: true,
+    message: `${applied.length} move(s) applied, ${rejections.length} rejected`,
+    results: [...applied, ...rejections],
+    applied: applied.length,
+    rejected: rejections.length,
+    teamsUpdated
+  };
+}
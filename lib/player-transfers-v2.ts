@@ -13,6 +13,7 @@
 
 import { getTournamentDb } from '@/lib/neon/tournament-config';
 import { getAuctionDb } from '@/lib/neon/auction-config';
+import { refreshSeasonAggregatesAfterChange } from '@/lib/neon/season-aggregates';
 import { adminDb } from './firebase/admin';
 import admin from 'firebase-admin';
 import { 
@@ -200,20 +201,7 @@ async function fetchPlayerData(
       return null;
     }
     
-    const row = result[0];
-    return {
-      id: row.id,
-      player_id: row.player_id,
-      player_name: row.player_name,
-      team_id: row.team_id,
-      team_name: row.team_name,
-      auction_value: parseFloat(row.auction_value),
-      star_rating: parseInt(row.star_rating) || 5,
-      points: parseInt(row.points) || 180,
-      salary_per_match: row.salary_per_match ? parseFloat(row.salary_per_match) : undefined,
-      season_id: row.season_id,
-      type: playerType
-    };
+    return toPlayerData(result[0], playerType);
     
   } catch (error) {
     console.error('Error fetching player data:', error);
@@ -221,6 +209,77 @@ async function fetchPlayerData(
   }
 }
 
+/**
+ * Map a player_seasons / footballplayers row to PlayerData
+ */
+function toPlayerData(row: any, playerType: PlayerType): PlayerData {
+  return {
+    id: row.id,
+    player_id: row.player_id,
+    player_name: row.player_name,
+    team_id: row.team_id,
+    team_name: row.team_name,
+    auction_value: parseFloat(row.auction_value),
+    star_rating: parseInt(row.star_rating) || 5,
+    points: parseInt(row.points) || 180,
+    salary_per_match: row.salary_per_match ? parseFloat(row.salary_per_match) : undefined,
+    season_id: row.season_id,
+    type: playerType
+  };
+}
+
+/**
+ * Fetch every season's contract rows for many players of one type in a single query
+ * 
+ * @returns Map of player ID to its rows (ordered by season_id), in the shape
+ *          fetchFutureSeasonContracts accepts as preloadedRows
+ */
+export async function fetchPlayerContracts(
+  playerIds: string[],
+  playerType: PlayerType
+): Promise<Map<string, any[]>> {
+  const contracts = new Map<string, any[]>();
+  if (playerIds.length === 0) {
+    return contracts;
+  }
+  
+  const sql = getPlayerDb(playerType);
+  const nameColumn = playerType === 'real' ? 'player_name' : 'name as player_name';
+  const rows = await sql.query(`
+    SELECT 
+      id,
+      player_id,
+      ${nameColumn},
+      team_id,
+      team_id as team_name,
+      auction_value,
+      star_rating,
+      points,
+      salary_per_match,
+      season_id
+    FROM ${getTableName(playerType)}
+    WHERE player_id = ANY($1::text[])
+    ORDER BY player_id, season_id
+  `, [Array.from(new Set(playerIds))]);
+  
+  for (const row of rows as any[]) {
+    contracts.set(row.player_id, [...(contracts.get(row.player_id) || []), row]);
+  }
+  return contracts;
+}
+
+/**
+ * Pick the given season's row from fetchPlayerContracts output
+ */
+export function currentSeasonContract(
+  rows: any[] | undefined,
+  playerType: PlayerType,
+  seasonId: string
+): PlayerData | null {
+  const row = rows?.find(r => r.season_id === seasonId);
+  return row ? toPlayerData(row, playerType) : null;
+}
+
 /**
  * Parse season ID to extract season number
  * @example parseSeasonNumber("SSPSLS16") => 16
@@ -244,6 +303,7 @@ function parseSeasonNumber(seasonId: string): number {
  * @param playerType - Type of player ('real' or 'football')
  * @param currentSeasonId - Current season ID (e.g., "SSPSLS16")
  * @param currentTeamId - Current team ID to validate against
+ * @param preloadedRows - All contract rows for the player, if already fetched (skips the query)
  * @returns Array of PlayerData for future seasons
  * @throws Error if future season has mismatched team_id
  * 
@@ -256,7 +316,8 @@ export async function fetchFutureSeasonContracts(
   playerId: string,
   playerType: PlayerType,
   currentSeasonId: string,
-  currentTeamId: string
+  currentTeamId: string,
+  preloadedRows?: any[]
 ): Promise<PlayerData[]> {
   try {
     console.log(`🔍 Checking for future season contracts for player ${playerId}...`);
@@ -271,7 +332,9 @@ export async function fetchFutureSeasonContracts(
     let query: string;
     let result: any[];
     
-    if (playerType === 'real') {
+    if (preloadedRows) {
+      result = preloadedRows;
+    } else if (playerType === 'real') {
       // Query player_seasons table for future seasons
       query = `
         SELECT 
@@ -327,19 +390,7 @@ export async function fetchFutureSeasonContracts(
           );
         }
         
-        futureContracts.push({
-          id: row.id,
-          player_id: row.player_id,
-          player_name: row.player_name,
-          team_id: row.team_id,
-          team_name: row.team_name,
-          auction_value: parseFloat(row.auction_value),
-          star_rating: parseInt(row.star_rating) || 5,
-          points: parseInt(row.points) || 180,
-          salary_per_match: row.salary_per_match ? parseFloat(row.salary_per_match) : undefined,
-          season_id: row.season_id,
-          type: playerType
-        });
+        futureContracts.push(toPlayerData(row, playerType));
       }
     }
     
@@ -422,121 +473,187 @@ export async function fetchFutureSeasonContracts(
 }
 
 /**
- * Update player record in Neon database with multi-season support
- * 
- * This function updates the current season with full changes (team_id, value, star, points, salary)
- * and updates future seasons with ONLY team_id changes. All updates are performed within a
- * database transaction to ensure atomicity.
- * 
- * @param playerId - Player ID to update
- * @param playerType - Type of player ('real' or 'football')
- * @param currentSeasonId - Current season ID being transferred
- * @param currentSeasonUpdates - Full updates for current season
- * @param futureSeasonIds - Array of future season IDs to update (optional)
- * @returns Array of successfully updated season IDs
- * 
- * @example
- * // Update current season S16 and future season S17
- * const updated = await updatePlayerInNeon(
- *   'SSPSPL0001', 'real', 'SSPSLS16',
- *   { team_id: 'SSPSLT0002', auction_value: 281.25, star_rating: 6, points: 200, salary_per_match: 2.5 },
- *   ['SSPSLS17']
- * );
- * // Returns: ['SSPSLS16', 'SSPSLS17']
+ * Contract change for one player: full changes for the current season,
+ * team_id only for future seasons
  */
-async function updatePlayerInNeon(
-  playerId: string,
-  playerType: PlayerType,
-  currentSeasonId: string,
+export interface ContractUpdate {
+  playerId: string;
+  playerType: PlayerType;
+  currentSeasonId: string;
   currentSeasonUpdates: {
     team_id: string;
     auction_value: number;
     star_rating: number;
     points: number;
     salary_per_match: number;
-  },
-  futureSeasonIds: string[] = []
-): Promise<string[]> {
-  const sql = getPlayerDb(playerType);
-  const tableName = getTableName(playerType);
-  const updatedSeasonIds: string[] = [];
-  
+  };
+  futureSeasonIds?: string[];
+}
+
+/**
+ * Contract row as it was before an update, used to restore it on failure
+ */
+export interface ContractBeforeImage {
+  player_id: string;
+  season_id: string;
+  team_id: string;
+  auction_value: number;
+  star_rating: number;
+  points: number;
+  salary_per_match: number;
+  type: PlayerType;
+}
+
+/**
+ * Build the single-statement contract update for one player.
+ *
+ * One UPDATE covers the current and all future seasons (season_id = ANY).
+ * The `before` CTE locks the rows and captures their pre-update values,
+ * which the statement returns as before-images.
+ */
+function buildContractUpdateQuery(sql: ReturnType<typeof getPlayerDb>, update: ContractUpdate) {
+  const tableName = getTableName(update.playerType);
+  const { currentSeasonId, currentSeasonUpdates: u } = update;
+  const seasonIds = [currentSeasonId, ...(update.futureSeasonIds || [])];
+
+  return sql.query(`
+    WITH before AS (
+      SELECT player_id, season_id, team_id, auction_value, star_rating, points, salary_per_match
+      FROM ${tableName}
+      WHERE player_id = $1 AND season_id = ANY($2::text[])
+      FOR UPDATE
+    ), updated AS (
+      UPDATE ${tableName} t
+      SET
+        team_id = $3,
+        auction_value = CASE WHEN t.season_id = $4 THEN $5 ELSE t.auction_value END,
+        star_rating = CASE WHEN t.season_id = $4 THEN $6 ELSE t.star_rating END,
+        points = CASE WHEN t.season_id = $4 THEN $7 ELSE t.points END,
+        salary_per_match = CASE WHEN t.season_id = $4 THEN $8 ELSE t.salary_per_match END,
+        updated_at = NOW()
+      FROM before b
+      WHERE t.player_id = b.player_id AND t.season_id = b.season_id
+      RETURNING t.season_id
+    )
+    SELECT b.* FROM before b JOIN updated USING (season_id)
+  `, [
+    update.playerId,
+    seasonIds,
+    u.team_id,
+    currentSeasonId,
+    Math.round(u.auction_value), // Round to integer
+    u.star_rating,
+    Math.round(u.points), // Round to integer
+    parseFloat(u.salary_per_match.toFixed(2)) // Keep 2 decimals for salary
+  ]);
+}
+
+/**
+ * Apply contract updates for one or more players atomically
+ *
+ * Updates are grouped per database and sent as one transaction request each,
+ * so a transfer costs one round trip and a same-type swap costs one round trip
+ * for both players. Either every season row in a database is updated or none is;
+ * if one database fails, rows already written in the other are restored before
+ * the error is thrown.
+ *
+ * @returns Updated season IDs per player and before-images for compensation
+ *
+ * @example
+ * const { updatedSeasonIds, beforeImages } = await applyContractUpdates([{
+ *   playerId: 'SSPSPL0001', playerType: 'real', currentSeasonId: 'SSPSLS16',
+ *   currentSeasonUpdates: { team_id: 'SSPSLT0002', auction_value: 281.25, star_rating: 6, points: 200, salary_per_match: 2.5 },
+ *   futureSeasonIds: ['SSPSLS17']
+ * }]);
+ * // updatedSeasonIds.get('SSPSPL0001') => ['SSPSLS16', 'SSPSLS17']
+ */
+export async function applyContractUpdates(
+  updates: ContractUpdate[]
+): Promise<{ updatedSeasonIds: Map<string, string[]>; beforeImages: ContractBeforeImage[] }> {
+  const updatedSeasonIds = new Map<string, string[]>();
+  const beforeImages: ContractBeforeImage[] = [];
+  const byType = new Map<PlayerType, ContractUpdate[]>();
+
+  for (const update of updates) {
+    byType.set(update.playerType, [...(byType.get(update.playerType) || []), update]);
+  }
+
   try {
-    console.log(`📝 Updating player ${playerId} in ${tableName}...`);
-    console.log(`   Current season: ${currentSeasonId}`);
-    if (futureSeasonIds.length > 0) {
-      console.log(`   Future seasons: ${futureSeasonIds.join(', ')}`);
+    // Real and football players live in different databases; write both concurrently
+    const settled = await Promise.allSettled(
+      Array.from(byType.entries()).map(async ([playerType, group]) => {
+        const sql = getPlayerDb(playerType);
+        console.log(`📝 Updating ${group.length} player contract(s) in ${getTableName(playerType)}...`);
+        const results = await sql.transaction(group.map(update => buildContractUpdateQuery(sql, update)));
+        return group.map((update, i) => ({ update, rows: results[i] as any[] }));
+      })
+    );
+    const appliedByType = settled.flatMap(r => r.status === 'fulfilled' ? r.value : []);
+    const failure = settled.find((r): r is PromiseRejectedResult => r.status === 'rejected');
+
+    for (const { update, rows } of appliedByType) {
+      rows.sort((a, b) => parseSeasonNumber(a.season_id) - parseSeasonNumber(b.season_id));
+      const seasons = rows.map(row => row.season_id as string);
+      if (!seasons.includes(update.currentSeasonId)) {
+        console.warn(`⚠️ No ${update.currentSeasonId} contract row found for player ${update.playerId}`);
+      }
+      updatedSeasonIds.set(update.playerId, seasons);
+
+      for (const row of rows) {
+        beforeImages.push({
+          player_id: row.player_id,
+          season_id: row.season_id,
+          team_id: row.team_id,
+          auction_value: parseFloat(row.auction_value) || 0,
+          star_rating: parseInt(row.star_rating) || 0,
+          points: parseFloat(row.points) || 0,
+          salary_per_match: parseFloat(row.salary_per_match) || 0,
+          type: update.playerType
+        });
+      }
+      console.log(`   ✅ ${update.playerId}: updated ${seasons.join(', ')}`);
     }
-    
-    // Begin transaction
-    await sql.query('BEGIN');
-    
-    try {
-      // Update current season with full changes
-      const currentSeasonQuery = `
-        UPDATE ${tableName}
-        SET 
-          team_id = $1,
-          auction_value = $2,
-          star_rating = $3,
-          points = $4,
-          salary_per_match = $5,
-          updated_at = NOW()
-        WHERE player_id = $6 AND season_id = $7
-      `;
-      
-      await sql.query(currentSeasonQuery, [
-        currentSeasonUpdates.team_id,
-        Math.round(currentSeasonUpdates.auction_value), // Round to integer
-        currentSeasonUpdates.star_rating,
-        Math.round(currentSeasonUpdates.points), // Round to integer
-        parseFloat(currentSeasonUpdates.salary_per_match.toFixed(2)), // Keep 2 decimals for salary
-        playerId,
-        currentSeasonId
-      ]);
-      
-      updatedSeasonIds.push(currentSeasonId);
-      console.log(`   ✅ Updated current season ${currentSeasonId} with full changes`);
-      
-      // Update future seasons with team_id only
-      for (const futureSeasonId of futureSeasonIds) {
-        const futureSeasonQuery = `
-          UPDATE ${tableName}
-          SET 
-            team_id = $1,
-            updated_at = NOW()
-          WHERE player_id = $2 AND season_id = $3
-        `;
-        
-        await sql.query(futureSeasonQuery, [
-          currentSeasonUpdates.team_id,
-          playerId,
-          futureSeasonId
-        ]);
-        
-        updatedSeasonIds.push(futureSeasonId);
-        console.log(`   ✅ Updated future season ${futureSeasonId} with team_id only`);
+
+    // One database committed and the other didn't: undo the committed group
+    // so callers never see a half-applied cross-type swap
+    if (failure) {
+      if (beforeImages.length > 0) {
+        console.log(`🔄 Rolling back ${beforeImages.length} season record(s)...`);
+        await restoreContracts(beforeImages).catch(error =>
+          console.error('Failed to rollback player records:', error)
+        );
       }
-      
-      // Commit transaction
-      await sql.query('COMMIT');
-      console.log(`✅ Successfully updated ${updatedSeasonIds.length} season(s) in transaction`);
-      
-      return updatedSeasonIds;
-      
-    } catch (error) {
-      // Rollback transaction on error
-      await sql.query('ROLLBACK');
-      console.error('❌ Transaction rolled back due to error');
-      throw error;
+      throw failure.reason;
     }
-    
+
+    return { updatedSeasonIds, beforeImages };
   } catch (error) {
-    console.error('Error updating player in Neon:', error);
+    console.error('Error updating player contracts in Neon:', error);
     throw new Error(`Failed to update player: ${error instanceof Error ? error.message : 'Unknown error'}`);
   }
 }
 
+/**
+ * Update player record in Neon database with multi-season support
+ * 
+ * Updates the current season with full changes (team_id, value, star, points, salary)
+ * and future seasons with ONLY team_id changes, in a single atomic statement.
+ * 
+ * @returns Updated season IDs and before-images for compensation
+ */
+async function updatePlayerInNeon(
+  playerId: string,
+  playerType: PlayerType,
+  currentSeasonId: string,
+  currentSeasonUpdates: ContractUpdate['currentSeasonUpdates'],
+  futureSeasonIds: string[] = []
+): Promise<{ updatedSeasonIds: string[]; beforeImages: ContractBeforeImage[] }> {
+  const { updatedSeasonIds, beforeImages } = await applyContractUpdates([
+    { playerId, playerType, currentSeasonId, currentSeasonUpdates, futureSeasonIds }
+  ]);
+  return { updatedSeasonIds: updatedSeasonIds.get(playerId) || [], beforeImages };
+}
+
 /**
  * Get team balance from Firestore
  * 
@@ -566,27 +683,7 @@ async function getTeamBalance(teamId: string, seasonId: string, playerType: Play
       throw new Error(`Team season document not found: ${teamSeasonId}`);
     }
     
-    const data = doc.data();
-    
-    // Return the appropriate budget based on player type
-    // Throw error if the required field is missing (no fallback to deprecated fields)
-    if (playerType === 'real') {
-      if (data?.real_player_budget === undefined) {
-        throw new Error(
-          `Team ${teamId} season ${seasonId} is missing required field 'real_player_budget'. ` +
-          `The team_seasons document needs to be migrated to include budget tracking fields.`
-        );
-      }
-      return data.real_player_budget;
-    } else {
-      if (data?.football_budget === undefined) {
-        throw new Error(
-          `Team ${teamId} season ${seasonId} is missing required field 'football_budget'. ` +
-          `The team_seasons document needs to be migrated to include budget tracking fields.`
-        );
-      }
-      return data.football_budget;
-    }
+    return readTeamBudget(doc.data(), teamId, seasonId, playerType);
     
   } catch (error) {
     console.error('Error getting team balance:', error);
@@ -594,6 +691,27 @@ async function getTeamBalance(teamId: string, seasonId: string, playerType: Play
   }
 }
 
+/**
+ * Read the budget for a player type from a team_seasons document
+ * 
+ * Throws if the required field is missing (no fallback to deprecated fields).
+ */
+export function readTeamBudget(
+  data: Record<string, any> | undefined,
+  teamId: string,
+  seasonId: string,
+  playerType: PlayerType
+): number {
+  const budgetField = playerType === 'real' ? 'real_player_budget' : 'football_budget';
+  if (data?.[budgetField] === undefined) {
+    throw new Error(
+      `Team ${teamId} season ${seasonId} is missing required field '${budgetField}'. ` +
+      `The team_seasons document needs to be migrated to include budget tracking fields.`
+    );
+  }
+  return data[budgetField];
+}
+
 /**
  * Validate team budget for a transfer operation
  * 
@@ -631,45 +749,7 @@ async function validateTeamBudget(
     // Get the current budget using the correct field
     const currentBudget = await getTeamBalance(teamId, seasonId, playerType);
     
-    // Determine which budget field is being used for logging
-    const budgetFieldName = playerType === 'real' ? 'real_player_budget' : 'football_budget';
-    
-    console.log(`   ${teamLabel} current ${budgetFieldName}: ${currentBudget.toFixed(2)}`);
-    console.log(`   Required amount: ${requiredAmount.toFixed(2)}`);
-    
-    // Validate sufficient funds
-    if (currentBudget < requiredAmount) {
-      const shortfall = requiredAmount - currentBudget;
-      const errorMessage = 
-        `${teamLabel} has insufficient ${playerType} player budget. ` +
-        `Required: ${requiredAmount.toFixed(2)}, Available: ${currentBudget.toFixed(2)}, ` +
-        `Shortfall: ${shortfall.toFixed(2)}`;
-      
-      console.error(`❌ ${errorMessage}`);
-      
-      throw new MultiseasonTransferError(
-        'BUDGET_VALIDATION_FAILED',
-        errorMessage
-      );
-    }
-    
-    // Validate that the update won't result in negative budget
-    const projectedBudget = currentBudget - requiredAmount;
-    if (projectedBudget < 0) {
-      const errorMessage = 
-        `${teamLabel} budget would become negative after ${operationType}. ` +
-        `Current: ${currentBudget.toFixed(2)}, Required: ${requiredAmount.toFixed(2)}, ` +
-        `Projected: ${projectedBudget.toFixed(2)}`;
-      
-      console.error(`❌ ${errorMessage}`);
-      
-      throw new MultiseasonTransferError(
-        'BUDGET_VALIDATION_FAILED',
-        errorMessage
-      );
-    }
-    
-    console.log(`   ✅ Budget validation passed. Projected balance: ${projectedBudget.toFixed(2)}`);
+    checkTeamBudget(currentBudget, playerType, requiredAmount, operationType, teamLabel);
     
     return currentBudget;
     
@@ -695,6 +775,59 @@ async function validateTeamBudget(
   }
 }
 
+/**
+ * Check a known budget against the amount an operation requires
+ * 
+ * @throws MultiseasonTransferError (BUDGET_VALIDATION_FAILED) if funds are insufficient
+ */
+export function checkTeamBudget(
+  currentBudget: number,
+  playerType: PlayerType,
+  requiredAmount: number,
+  operationType: 'transfer' | 'swap',
+  teamLabel: string
+): void {
+  // Determine which budget field is being used for logging
+  const budgetFieldName = playerType === 'real' ? 'real_player_budget' : 'football_budget';
+  
+  console.log(`   ${teamLabel} current ${budgetFieldName}: ${currentBudget.toFixed(2)}`);
+  console.log(`   Required amount: ${requiredAmount.toFixed(2)}`);
+  
+  // Validate sufficient funds
+  if (currentBudget < requiredAmount) {
+    const shortfall = requiredAmount - currentBudget;
+    const errorMessage = 
+      `${teamLabel} has insufficient ${playerType} player budget. ` +
+      `Required: ${requiredAmount.toFixed(2)}, Available: ${currentBudget.toFixed(2)}, ` +
+      `Shortfall: ${shortfall.toFixed(2)}`;
+    
+    console.error(`❌ ${errorMessage}`);
+    
+    throw new MultiseasonTransferError(
+      'BUDGET_VALIDATION_FAILED',
+      errorMessage
+    );
+  }
+  
+  // Validate that the update won't result in negative budget
+  const projectedBudget = currentBudget - requiredAmount;
+  if (projectedBudget < 0) {
+    const errorMessage = 
+      `${teamLabel} budget would become negative after ${operationType}. ` +
+      `Current: ${currentBudget.toFixed(2)}, Required: ${requiredAmount.toFixed(2)}, ` +
+      `Projected: ${projectedBudget.toFixed(2)}`;
+    
+    console.error(`❌ ${errorMessage}`);
+    
+    throw new MultiseasonTransferError(
+      'BUDGET_VALIDATION_FAILED',
+      errorMessage
+    );
+  }
+  
+  console.log(`   ✅ Budget validation passed. Projected balance: ${projectedBudget.toFixed(2)}`);
+}
+
 /**
  * Update team budgets in Firestore with budget-specific fields
  * 
@@ -762,18 +895,15 @@ async function updateTeamBudgets(
     console.log(`   Buying team: -${buyingTeamCost} budget, +${newPlayerValue} spent`);
     console.log(`   Selling team: +${sellingTeamCompensation} budget, -${originalPlayerValue} spent`);
     
+    const deltas = transferBudgetDeltas(
+      buyingTeamId, sellingTeamId, playerType,
+      buyingTeamCost, newPlayerValue, sellingTeamCompensation, originalPlayerValue
+    );
+    
     // Update both teams' budgets atomically using FieldValue.increment()
     await Promise.all([
-      buyingTeamRef.update({
-        [budgetField]: admin.firestore.FieldValue.increment(-buyingTeamCost),
-        [spentField]: admin.firestore.FieldValue.increment(newPlayerValue),
-        updated_at: admin.firestore.FieldValue.serverTimestamp()
-      }),
-      sellingTeamRef.update({
-        [budgetField]: admin.firestore.FieldValue.increment(sellingTeamCompensation),
-        [spentField]: admin.firestore.FieldValue.increment(-originalPlayerValue),
-        updated_at: admin.firestore.FieldValue.serverTimestamp()
-      })
+      buyingTeamRef.update(toIncrementUpdate(deltas[buyingTeamId])),
+      sellingTeamRef.update(toIncrementUpdate(deltas[sellingTeamId]))
     ]);
     
     console.log(`✅ Team budgets updated successfully`);
@@ -784,6 +914,45 @@ async function updateTeamBudgets(
   }
 }
 
+/**
+ * Per-team budget field changes, keyed by team ID then Firestore field
+ */
+export type BudgetDeltas = Record<string, Record<string, number>>;
+
+/**
+ * Convert budget field deltas into a Firestore increment update
+ */
+export function toIncrementUpdate(fields: Record<string, number>): Record<string, any> {
+  const update: Record<string, any> = {
+    updated_at: admin.firestore.FieldValue.serverTimestamp()
+  };
+  for (const [field, delta] of Object.entries(fields)) {
+    update[field] = admin.firestore.FieldValue.increment(delta);
+  }
+  return update;
+}
+
+/**
+ * Budget field changes for a transfer (see updateTeamBudgets)
+ */
+export function transferBudgetDeltas(
+  buyingTeamId: string,
+  sellingTeamId: string,
+  playerType: PlayerType,
+  buyingTeamCost: number,
+  newPlayerValue: number,
+  sellingTeamCompensation: number,
+  originalPlayerValue: number
+): BudgetDeltas {
+  const budgetField = playerType === 'real' ? 'real_player_budget' : 'football_budget';
+  const spentField = playerType === 'real' ? 'real_player_spent' : 'football_spent';
+
+  return {
+    [buyingTeamId]: { [budgetField]: -buyingTeamCost, [spentField]: newPlayerValue },
+    [sellingTeamId]: { [budgetField]: sellingTeamCompensation, [spentField]: -originalPlayerValue }
+  };
+}
+
 /**
  * @deprecated Use updateTeamBudgets instead
  * Legacy function for backward compatibility - redirects to updateTeamBudgets
@@ -806,61 +975,52 @@ async function updateTeamBalances(
 // ============================================================================
 
 /**
- * Rollback a single player season update
+ * Restore contract rows from before-images
  * 
- * This helper function restores a player's original data for a specific season.
- * It's used during rollback operations when a multi-season transfer fails.
+ * Used when a transfer or swap fails after its Neon update. All rows of a
+ * database are restored with one UPDATE ... FROM jsonb_to_recordset.
  * 
- * @param playerId - Player ID to rollback
- * @param playerType - Type of player ('real' or 'football')
- * @param seasonId - Season ID to rollback
- * @param originalData - Original player data to restore
- * @returns Promise that resolves when rollback is complete
+ * @param beforeImages - Before-images returned by applyContractUpdates
  * 
  * @example
- * await rollbackPlayerUpdate('SSPSPL0001', 'real', 'SSPSLS16', originalPlayerData);
+ * await restoreContracts(beforeImages);
  */
-async function rollbackPlayerUpdate(
-  playerId: string,
-  playerType: PlayerType,
-  seasonId: string,
-  originalData: PlayerData
-): Promise<void> {
-  try {
-    console.log(`   🔄 Rolling back player ${playerId} season ${seasonId}...`);
-    
-    const sql = getPlayerDb(playerType);
-    const tableName = getTableName(playerType);
-    
-    // Restore all original values for this season
-    const query = `
-      UPDATE ${tableName}
-      SET 
-        team_id = $1,
-        auction_value = $2,
-        star_rating = $3,
-        points = $4,
-        salary_per_match = $5,
-        updated_at = NOW()
-      WHERE player_id = $6 AND season_id = $7
-    `;
-    
-    await sql.query(query, [
-      originalData.team_id,
-      Math.round(originalData.auction_value),
-      originalData.star_rating,
-      Math.round(originalData.points),
-      originalData.salary_per_match ? parseFloat(originalData.salary_per_match.toFixed(2)) : 0,
-      playerId,
-      seasonId
-    ]);
-    
-    console.log(`   ✅ Successfully rolled back season ${seasonId}`);
-    
-  } catch (error) {
-    console.error(`   ❌ Failed to rollback season ${seasonId}:`, error);
-    throw new Error(`Failed to rollback player update for season ${seasonId}: ${error instanceof Error ? error.message : 'Unknown error'}`);
+export async function restoreContracts(beforeImages: ContractBeforeImage[]): Promise<void> {
+  const byType = new Map<PlayerType, ContractBeforeImage[]>();
+  for (const image of beforeImages) {
+    byType.set(image.type, [...(byType.get(image.type) || []), image]);
   }
+
+  await Promise.all(
+    Array.from(byType.entries()).map(async ([playerType, images]) => {
+      const sql = getPlayerDb(playerType);
+      const tableName = getTableName(playerType);
+      const seasons = images.map(image => `${image.player_id}/${image.season_id}`).join(', ');
+
+      try {
+        console.log(`   🔄 Restoring ${images.length} contract row(s) in ${tableName}: ${seasons}`);
+        await sql.query(`
+          UPDATE ${tableName} t
+          SET 
+            team_id = r.team_id,
+            auction_value = ROUND(r.auction_value),
+            star_rating = r.star_rating,
+            points = ROUND(r.points),
+            salary_per_match = ROUND(r.salary_per_match, 2),
+            updated_at = NOW()
+          FROM jsonb_to_recordset($1::jsonb) AS r(
+            player_id text, season_id text, team_id text,
+            auction_value numeric, star_rating integer, points numeric, salary_per_match numeric
+          )
+          WHERE t.player_id = r.player_id AND t.season_id = r.season_id
+        `, [JSON.stringify(images)]);
+        console.log(`   ✅ Restored ${images.length} contract row(s)`);
+      } catch (error) {
+        console.error(`   ❌ Failed to restore contracts (${seasons}):`, error);
+        throw new Error(`Failed to restore contracts ${seasons}: ${error instanceof Error ? error.message : 'Unknown error'}`);
+      }
+    })
+  );
 }
 
 /**
@@ -977,51 +1137,13 @@ async function createTransactionRecord(
   try {
     const transactionRef = adminDb.collection('player_transactions').doc();
     
-    // Determine which budget fields were used based on player type
-    const budgetFieldUsed = playerData.type === 'real' ? 'real_player_budget' : 'football_budget';
-    const spentFieldUsed = playerData.type === 'real' ? 'real_player_spent' : 'football_spent';
-    
-    // Determine if this is a multi-season transfer
-    const isMultiSeason = futureSeasonIds.length > 0;
-    
-    console.log(`   Transaction type: ${isMultiSeason ? 'Multi-season' : 'Single-season'}`);
+    console.log(`   Transaction type: ${futureSeasonIds.length > 0 ? 'Multi-season' : 'Single-season'}`);
     console.log(`   Affected seasons: ${affectedSeasonIds.join(', ')}`);
-    console.log(`   Budget fields: ${budgetFieldUsed}, ${spentFieldUsed}`);
-    
-    await transactionRef.set({
-      // Existing fields
-      transaction_type: 'transfer',
-      season_id: seasonId,
-      player_id: playerData.player_id,
-      player_name: playerData.player_name,
-      player_type: playerData.type,
-      old_team_id: oldTeamId,
-      new_team_id: newTeamId,
-      old_value: calculation.originalValue,
-      new_value: calculation.newValue,
-      committee_fee: calculation.committeeFee,
-      buying_team_paid: calculation.buyingTeamPays,
-      selling_team_received: calculation.sellingTeamReceives,
-      old_star_rating: playerData.star_rating,
-      new_star_rating: calculation.newStarRating,
-      points_added: calculation.pointsAdded,
-      new_salary: calculation.newSalary,
-      processed_by: transferredBy,
-      processed_by_name: transferredByName,
-      
-      // NEW: Multi-season tracking fields
-      affected_season_ids: affectedSeasonIds,
-      is_multi_season: isMultiSeason,
-      future_seasons_updated: futureSeasonIds,
-      
-      // NEW: Budget field tracking
-      budget_field_used: budgetFieldUsed,
-      spent_field_used: spentFieldUsed,
-      
-      // Timestamps
-      created_at: admin.firestore.FieldValue.serverTimestamp(),
-      updated_at: admin.firestore.FieldValue.serverTimestamp()
-    });
+    
+    await transactionRef.set(buildTransferTransactionDoc(
+      seasonId, playerData, oldTeamId, newTeamId, calculation,
+      transferredBy, transferredByName, affectedSeasonIds, futureSeasonIds
+    ));
     
     return transactionRef.id;
     
@@ -1031,6 +1153,63 @@ async function createTransactionRecord(
   }
 }
 
+/**
+ * Build the player_transactions document for a transfer
+ */
+export function buildTransferTransactionDoc(
+  seasonId: string,
+  playerData: PlayerData,
+  oldTeamId: string,
+  newTeamId: string,
+  calculation: TransferCalculation,
+  transferredBy: string,
+  transferredByName: string,
+  affectedSeasonIds: string[] = [seasonId],
+  futureSeasonIds: string[] = []
+): Record<string, any> {
+  // Determine which budget fields were used based on player type
+  const budgetFieldUsed = playerData.type === 'real' ? 'real_player_budget' : 'football_budget';
+  const spentFieldUsed = playerData.type === 'real' ? 'real_player_spent' : 'football_spent';
+  
+  // Determine if this is a multi-season transfer
+  const isMultiSeason = futureSeasonIds.length > 0;
+  
+  return {
+    // Existing fields
+    transaction_type: 'transfer',
+    season_id: seasonId,
+    player_id: playerData.player_id,
+    player_name: playerData.player_name,
+    player_type: playerData.type,
+    old_team_id: oldTeamId,
+    new_team_id: newTeamId,
+    old_value: calculation.originalValue,
+    new_value: calculation.newValue,
+    committee_fee: calculation.committeeFee,
+    buying_team_paid: calculation.buyingTeamPays,
+    selling_team_received: calculation.sellingTeamReceives,
+    old_star_rating: playerData.star_rating,
+    new_star_rating: calculation.newStarRating,
+    points_added: calculation.pointsAdded,
+    new_salary: calculation.newSalary,
+    processed_by: transferredBy,
+    processed_by_name: transferredByName,
+    
+    // NEW: Multi-season tracking fields
+    affected_season_ids: affectedSeasonIds,
+    is_multi_season: isMultiSeason,
+    future_seasons_updated: futureSeasonIds,
+    
+    // NEW: Budget field tracking
+    budget_field_used: budgetFieldUsed,
+    spent_field_used: spentFieldUsed,
+    
+    // Timestamps
+    created_at: admin.firestore.FieldValue.serverTimestamp(),
+    updated_at: admin.firestore.FieldValue.serverTimestamp()
+  };
+}
+
 /**
  * Create news entry for transfer
  */
@@ -1042,26 +1221,9 @@ async function createTransferNews(
   calculation: TransferCalculation
 ): Promise<void> {
   try {
-    const newsRef = adminDb.collection('news').doc();
-    
-    const starUpgradeText = calculation.newStarRating > playerData.star_rating
-      ? ` ${playerData.player_name}'s star rating has been upgraded from ${playerData.star_rating}⭐ to ${calculation.newStarRating}⭐.`
-      : '';
-    
-    const content = `${playerData.player_name} has been transferred from ${oldTeamName} to ${newTeamName}. ` +
-      `The player's new value is $${calculation.newValue.toFixed(2)} (increased from $${calculation.originalValue.toFixed(2)}). ` +
-      `${newTeamName} paid $${calculation.buyingTeamPays.toFixed(2)} (including $${calculation.committeeFee.toFixed(2)} committee fee), ` +
-      `while ${oldTeamName} received $${calculation.sellingTeamReceives.toFixed(2)}.${starUpgradeText}`;
-    
-    await newsRef.set({
-      title: `Transfer: ${playerData.player_name} Joins ${newTeamName}`,
-      content,
-      season_id: seasonId,
-      category: 'player_movement',
-      is_published: true,
-      created_at: admin.firestore.FieldValue.serverTimestamp(),
-      updated_at: admin.firestore.FieldValue.serverTimestamp()
-    });
+    await adminDb.collection('news').doc().set(
+      buildTransferNewsDoc(seasonId, playerData, oldTeamName, newTeamName, calculation)
+    );
     
     console.log('✅ Transfer news created');
     
@@ -1071,6 +1233,36 @@ async function createTransferNews(
   }
 }
 
+/**
+ * Build the news document for a transfer
+ */
+export function buildTransferNewsDoc(
+  seasonId: string,
+  playerData: PlayerData,
+  oldTeamName: string,
+  newTeamName: string,
+  calculation: TransferCalculation
+): Record<string, any> {
+  const starUpgradeText = calculation.newStarRating > playerData.star_rating
+    ? ` ${playerData.player_name}'s star rating has been upgraded from ${playerData.star_rating}⭐ to ${calculation.newStarRating}⭐.`
+    : '';
+  
+  const content = `${playerData.player_name} has been transferred from ${oldTeamName} to ${newTeamName}. ` +
+    `The player's new value is $${calculation.newValue.toFixed(2)} (increased from $${calculation.originalValue.toFixed(2)}). ` +
+    `${newTeamName} paid $${calculation.buyingTeamPays.toFixed(2)} (including $${calculation.committeeFee.toFixed(2)} committee fee), ` +
+    `while ${oldTeamName} received $${calculation.sellingTeamReceives.toFixed(2)}.${starUpgradeText}`;
+  
+  return {
+    title: `Transfer: ${playerData.player_name} Joins ${newTeamName}`,
+    content,
+    season_id: seasonId,
+    category: 'player_movement',
+    is_published: true,
+    created_at: admin.firestore.FieldValue.serverTimestamp(),
+    updated_at: admin.firestore.FieldValue.serverTimestamp()
+  };
+}
+
 // ============================================================================
 // MAIN TRANSFER FUNCTION
 // ============================================================================
@@ -1116,8 +1308,8 @@ export async function executeTransferV2(
   } = request;
   
   let updatedSeasonIds: string[] = [];
+  let beforeImages: ContractBeforeImage[] = [];
   let balancesUpdated = false;
-  let originalPlayerData: Map<string, PlayerData> = new Map();
   let buyingTeamOriginalBalance = 0;
   let sellingTeamOriginalBalance = 0;
   let calculation: TransferCalculation | null = null;
@@ -1138,8 +1330,6 @@ export async function executeTransferV2(
       };
     }
     
-    // Store original data for current season
-    originalPlayerData.set(seasonId, { ...playerData });
     oldTeamId = playerData.team_id;
     
     // Step 1.5: Fetch future season contracts (NEW)
@@ -1152,11 +1342,6 @@ export async function executeTransferV2(
         oldTeamId
       );
       
-      // Store original data for all future seasons
-      futureContracts.forEach(contract => {
-        originalPlayerData.set(contract.season_id, { ...contract });
-      });
-      
       if (futureContracts.length > 0) {
         console.log(`✅ Found ${futureContracts.length} future season contract(s) that will be transferred`);
       }
@@ -1254,13 +1439,13 @@ export async function executeTransferV2(
     // Step 5: Update player record in Neon (with multi-season support)
     console.log('📝 Updating player record...');
     const futureSeasonIds = futureContracts.map(c => c.season_id);
-    updatedSeasonIds = await updatePlayerInNeon(playerId, playerType, seasonId, {
+    ({ updatedSeasonIds, beforeImages } = await updatePlayerInNeon(playerId, playerType, seasonId, {
       team_id: newTeamId,
       auction_value: calculation.newValue,
       star_rating: calculation.newStarRating,
       points: playerData.points + calculation.pointsAdded,
       salary_per_match: calculation.newSalary
-    }, futureSeasonIds);
+    }, futureSeasonIds));
     
     console.log(`✅ Updated ${updatedSeasonIds.length} season(s): ${updatedSeasonIds.join(', ')}`);
     
@@ -1327,6 +1512,11 @@ export async function executeTransferV2(
       calculation
     );
     
+    await refreshSeasonAggregatesAfterChange(seasonId, {
+      teamIds: [oldTeamId, newTeamId],
+      playerIds: playerData.type === 'football' ? [playerData.player_id] : undefined
+    });
+    
     console.log('✅ Transfer completed successfully');
     
     // Build success message with season information
@@ -1350,25 +1540,15 @@ export async function executeTransferV2(
     
     let rollbackErrors: string[] = [];
     
-    // Rollback all updated season records using helper function
-    if (updatedSeasonIds.length > 0) {
-      console.log(`🔄 Rolling back ${updatedSeasonIds.length} season record(s)...`);
-      
-      for (const seasonIdToRollback of updatedSeasonIds) {
-        const original = originalPlayerData.get(seasonIdToRollback);
-        if (original) {
-          try {
-            await rollbackPlayerUpdate(playerId, playerType, seasonIdToRollback, original);
-          } catch (rollbackError) {
-            const errorMsg = `Failed to rollback season ${seasonIdToRollback}: ${rollbackError instanceof Error ? rollbackError.message : 'Unknown error'}`;
-            rollbackErrors.push(errorMsg);
-            console.error(`   ❌ ${errorMsg}`);
-          }
-        } else {
-          const errorMsg = `No original data found for season ${seasonIdToRollback}`;
-          rollbackErrors.push(errorMsg);
-          console.error(`   ❌ ${errorMsg}`);
-        }
+    // Restore all updated season records from their before-images in one statement
+    if (beforeImages.length > 0) {
+      console.log(`🔄 Rolling back ${beforeImages.length} season record(s)...`);
+      try {
+        await restoreContracts(beforeImages);
+      } catch (rollbackError) {
+        const errorMsg = rollbackError instanceof Error ? rollbackError.message : 'Unknown error';
+        rollbackErrors.push(errorMsg);
+        console.error(`   ❌ ${errorMsg}`);
       }
     }
     
@@ -1493,55 +1673,16 @@ async function updateSwapBalances(
       throw new Error(`Team B season document not found: ${teamBSeasonId}`);
     }
     
-    // Team A is giving away Player A (playerAType) and receiving Player B (playerBType)
-    // Team B is giving away Player B (playerBType) and receiving Player A (playerAType)
-    
-    // Determine which budget fields Team A needs to update
-    // Team A loses playerAType budget and gains playerBType budget
-    const teamAGivingBudgetField = playerAType === 'real' ? 'real_player_budget' : 'football_budget';
-    const teamAGivingSpentField = playerAType === 'real' ? 'real_player_spent' : 'football_spent';
-    const teamAReceivingBudgetField = playerBType === 'real' ? 'real_player_budget' : 'football_budget';
-    const teamAReceivingSpentField = playerBType === 'real' ? 'real_player_spent' : 'football_spent';
-    
-    // Determine which budget fields Team B needs to update
-    // Team B loses playerBType budget and gains playerAType budget
-    const teamBGivingBudgetField = playerBType === 'real' ? 'real_player_budget' : 'football_budget';
-    const teamBGivingSpentField = playerBType === 'real' ? 'real_player_spent' : 'football_spent';
-    const teamBReceivingBudgetField = playerAType === 'real' ? 'real_player_budget' : 'football_budget';
-    const teamBReceivingSpentField = playerAType === 'real' ? 'real_player_spent' : 'football_spent';
-    
     console.log(`   Team A: Giving ${playerAType} player, receiving ${playerBType} player`);
     console.log(`   Team B: Giving ${playerBType} player, receiving ${playerAType} player`);
     
-    // Build Team A update object
-    const teamAUpdate: any = {
-      updated_at: admin.firestore.FieldValue.serverTimestamp()
-    };
-    
-    // Team A releases Player A (playerAType)
-    // Add back original value to budget, remove from spent
-    teamAUpdate[teamAGivingBudgetField] = admin.firestore.FieldValue.increment(playerAOriginalValue);
-    teamAUpdate[teamAGivingSpentField] = admin.firestore.FieldValue.increment(-playerAOriginalValue);
-    
-    // Team A receives Player B (playerBType)
-    // Deduct payment (fee + cash) from budget, add new value to spent
-    teamAUpdate[teamAReceivingBudgetField] = admin.firestore.FieldValue.increment(-teamAPays);
-    teamAUpdate[teamAReceivingSpentField] = admin.firestore.FieldValue.increment(playerBNewValue);
-    
-    // Build Team B update object
-    const teamBUpdate: any = {
-      updated_at: admin.firestore.FieldValue.serverTimestamp()
-    };
-    
-    // Team B releases Player B (playerBType)
-    // Add back original value to budget, remove from spent
-    teamBUpdate[teamBGivingBudgetField] = admin.firestore.FieldValue.increment(playerBOriginalValue);
-    teamBUpdate[teamBGivingSpentField] = admin.firestore.FieldValue.increment(-playerBOriginalValue);
-    
-    // Team B receives Player A (playerAType)
-    // Deduct payment (fee + cash) from budget, add new value to spent
-    teamBUpdate[teamBReceivingBudgetField] = admin.firestore.FieldValue.increment(-teamBPays);
-    teamBUpdate[teamBReceivingSpentField] = admin.firestore.FieldValue.increment(playerANewValue);
+    const deltas = swapBudgetDeltas(
+      teamAId, teamBId, playerAType, playerBType,
+      playerANewValue, playerBNewValue, playerAOriginalValue, playerBOriginalValue,
+      teamAPays, teamBPays
+    );
+    const teamAUpdate = toIncrementUpdate(deltas[teamAId]);
+    const teamBUpdate = toIncrementUpdate(deltas[teamBId]);
     
     console.log(`   Team A updates:`, teamAUpdate);
     console.log(`   Team B updates:`, teamBUpdate);
@@ -1560,6 +1701,47 @@ async function updateSwapBalances(
   }
 }
 
+/**
+ * Budget field changes for a swap (see updateSwapBalances)
+ * 
+ * Team A gives Player A (playerAType) and receives Player B (playerBType);
+ * Team B the reverse. Fields are assigned in this order, so when both
+ * players share a type the receiving-side change replaces the releasing one.
+ */
+export function swapBudgetDeltas(
+  teamAId: string,
+  teamBId: string,
+  playerAType: PlayerType,
+  playerBType: PlayerType,
+  playerANewValue: number,
+  playerBNewValue: number,
+  playerAOriginalValue: number,
+  playerBOriginalValue: number,
+  teamAPays: number,
+  teamBPays: number
+): BudgetDeltas {
+  const budgetField = (type: PlayerType) => type === 'real' ? 'real_player_budget' : 'football_budget';
+  const spentField = (type: PlayerType) => type === 'real' ? 'real_player_spent' : 'football_spent';
+
+  const teamA: Record<string, number> = {};
+  // Team A releases Player A: add back original value to budget, remove from spent
+  teamA[budgetField(playerAType)] = playerAOriginalValue;
+  teamA[spentField(playerAType)] = -playerAOriginalValue;
+  // Team A receives Player B: deduct payment (fee + cash) from budget, add new value to spent
+  teamA[budgetField(playerBType)] = -teamAPays;
+  teamA[spentField(playerBType)] = playerBNewValue;
+
+  const teamB: Record<string, number> = {};
+  // Team B releases Player B
+  teamB[budgetField(playerBType)] = playerBOriginalValue;
+  teamB[spentField(playerBType)] = -playerBOriginalValue;
+  // Team B receives Player A
+  teamB[budgetField(playerAType)] = -teamBPays;
+  teamB[spentField(playerAType)] = playerANewValue;
+
+  return { [teamAId]: teamA, [teamBId]: teamB };
+}
+
 /**
  * Create transaction record for swap in player_transactions collection
  * 
@@ -1591,85 +1773,13 @@ async function createSwapTransactionRecord(
   try {
     const transactionRef = adminDb.collection('player_transactions').doc();
     
-    // Determine which budget fields were used for each player
-    const playerABudgetField = playerAData.type === 'real' ? 'real_player_budget' : 'football_budget';
-    const playerASpentField = playerAData.type === 'real' ? 'real_player_spent' : 'football_spent';
-    const playerBBudgetField = playerBData.type === 'real' ? 'real_player_budget' : 'football_budget';
-    const playerBSpentField = playerBData.type === 'real' ? 'real_player_spent' : 'football_spent';
-    
-    // Determine if this is a multi-season swap
-    const isMultiSeason = playerAFutureSeasonIds.length > 0 || playerBFutureSeasonIds.length > 0;
-    
-    // Combine all affected season IDs (deduplicated)
-    const allAffectedSeasons = Array.from(new Set([...playerASeasonIds, ...playerBSeasonIds]));
-    
-    console.log(`   Transaction type: ${isMultiSeason ? 'Multi-season' : 'Single-season'} swap`);
     console.log(`   Player A affected seasons: ${playerASeasonIds.join(', ')}`);
     console.log(`   Player B affected seasons: ${playerBSeasonIds.join(', ')}`);
-    console.log(`   Player A budget fields: ${playerABudgetField}, ${playerASpentField}`);
-    console.log(`   Player B budget fields: ${playerBBudgetField}, ${playerBSpentField}`);
     
-    await transactionRef.set({
-      transaction_type: 'swap',
-      season_id: seasonId,
-      
-      // Player A details
-      player_a_id: playerAData.player_id,
-      player_a_name: playerAData.player_name,
-      player_a_type: playerAData.type,
-      player_a_old_value: calculation.playerA.originalValue,
-      player_a_new_value: calculation.playerA.newValue,
-      player_a_old_star: playerAData.star_rating,
-      player_a_new_star: calculation.playerA.newStarRating,
-      player_a_points_added: calculation.playerA.pointsAdded,
-      player_a_new_salary: calculation.playerA.newSalary,
-      
-      // Player B details
-      player_b_id: playerBData.player_id,
-      player_b_name: playerBData.player_name,
-      player_b_type: playerBData.type,
-      player_b_old_value: calculation.playerB.originalValue,
-      player_b_new_value: calculation.playerB.newValue,
-      player_b_old_star: playerBData.star_rating,
-      player_b_new_star: calculation.playerB.newStarRating,
-      player_b_points_added: calculation.playerB.pointsAdded,
-      player_b_new_salary: calculation.playerB.newSalary,
-      
-      // Team details
-      team_a_id: playerAData.team_id,
-      team_b_id: playerBData.team_id,
-      team_a_fee: calculation.playerB.committeeFee, // Team A pays fee for Player B
-      team_b_fee: calculation.playerA.committeeFee, // Team B pays fee for Player A
-      team_a_pays: calculation.teamAPays,
-      team_b_pays: calculation.teamBPays,
-      
-      // Cash details
-      cash_amount: calculation.cashAmount,
-      cash_direction: calculation.cashDirection,
-      
-      // Committee fees
-      total_committee_fees: calculation.totalCommitteeFees,
-      
-      // NEW: Multi-season tracking fields
-      affected_season_ids: allAffectedSeasons,
-      is_multi_season: isMultiSeason,
-      player_a_affected_seasons: playerASeasonIds,
-      player_b_affected_seasons: playerBSeasonIds,
-      player_a_future_seasons: playerAFutureSeasonIds,
-      player_b_future_seasons: playerBFutureSeasonIds,
-      
-      // NEW: Budget field tracking
-      player_a_budget_field: playerABudgetField,
-      player_a_spent_field: playerASpentField,
-      player_b_budget_field: playerBBudgetField,
-      player_b_spent_field: playerBSpentField,
-      
-      // Metadata
-      processed_by: swappedBy,
-      processed_by_name: swappedByName,
-      created_at: admin.firestore.FieldValue.serverTimestamp(),
-      updated_at: admin.firestore.FieldValue.serverTimestamp()
-    });
+    await transactionRef.set(buildSwapTransactionDoc(
+      seasonId, playerAData, playerBData, calculation, swappedBy, swappedByName,
+      playerASeasonIds, playerBSeasonIds, playerAFutureSeasonIds, playerBFutureSeasonIds
+    ));
     
     return transactionRef.id;
     
@@ -1679,6 +1789,96 @@ async function createSwapTransactionRecord(
   }
 }
 
+/**
+ * Build the player_transactions document for a swap
+ */
+export function buildSwapTransactionDoc(
+  seasonId: string,
+  playerAData: PlayerData,
+  playerBData: PlayerData,
+  calculation: SwapCalculation,
+  swappedBy: string,
+  swappedByName: string,
+  playerASeasonIds: string[] = [seasonId],
+  playerBSeasonIds: string[] = [seasonId],
+  playerAFutureSeasonIds: string[] = [],
+  playerBFutureSeasonIds: string[] = []
+): Record<string, any> {
+  // Determine which budget fields were used for each player
+  const playerABudgetField = playerAData.type === 'real' ? 'real_player_budget' : 'football_budget';
+  const playerASpentField = playerAData.type === 'real' ? 'real_player_spent' : 'football_spent';
+  const playerBBudgetField = playerBData.type === 'real' ? 'real_player_budget' : 'football_budget';
+  const playerBSpentField = playerBData.type === 'real' ? 'real_player_spent' : 'football_spent';
+  
+  // Determine if this is a multi-season swap
+  const isMultiSeason = playerAFutureSeasonIds.length > 0 || playerBFutureSeasonIds.length > 0;
+  
+  // Combine all affected season IDs (deduplicated)
+  const allAffectedSeasons = Array.from(new Set([...playerASeasonIds, ...playerBSeasonIds]));
+  
+  return {
+    transaction_type: 'swap',
+    season_id: seasonId,
+    
+    // Player A details
+    player_a_id: playerAData.player_id,
+    player_a_name: playerAData.player_name,
+    player_a_type: playerAData.type,
+    player_a_old_value: calculation.playerA.originalValue,
+    player_a_new_value: calculation.playerA.newValue,
+    player_a_old_star: playerAData.star_rating,
+    player_a_new_star: calculation.playerA.newStarRating,
+    player_a_points_added: calculation.playerA.pointsAdded,
+    player_a_new_salary: calculation.playerA.newSalary,
+    
+    // Player B details
+    player_b_id: playerBData.player_id,
+    player_b_name: playerBData.player_name,
+    player_b_type: playerBData.type,
+    player_b_old_value: calculation.playerB.originalValue,
+    player_b_new_value: calculation.playerB.newValue,
+    player_b_old_star: playerBData.star_rating,
+    player_b_new_star: calculation.playerB.newStarRating,
+    player_b_points_added: calculation.playerB.pointsAdded,
+    player_b_new_salary: calculation.playerB.newSalary,
+    
+    // Team details
+    team_a_id: playerAData.team_id,
+    team_b_id: playerBData.team_id,
+    team_a_fee: calculation.playerB.committeeFee, // Team A pays fee for Player B
+    team_b_fee: calculation.playerA.committeeFee, // Team B pays fee for Player A
+    team_a_pays: calculation.teamAPays,
+    team_b_pays: calculation.teamBPays,
+    
+    // Cash details
+    cash_amount: calculation.cashAmount,
+    cash_direction: calculation.cashDirection,
+    
+    // Committee fees
+    total_committee_fees: calculation.totalCommitteeFees,
+    
+    // NEW: Multi-season tracking fields
+    affected_season_ids: allAffectedSeasons,
+    is_multi_season: isMultiSeason,
+    player_a_affected_seasons: playerASeasonIds,
+    player_b_affected_seasons: playerBSeasonIds,
+    player_a_future_seasons: playerAFutureSeasonIds,
+    player_b_future_seasons: playerBFutureSeasonIds,
+    
+    // NEW: Budget field tracking
+    player_a_budget_field: playerABudgetField,
+    player_a_spent_field: playerASpentField,
+    player_b_budget_field: playerBBudgetField,
+    player_b_spent_field: playerBSpentField,
+    
+    // Metadata
+    processed_by: swappedBy,
+    processed_by_name: swappedByName,
+    created_at: admin.firestore.FieldValue.serverTimestamp(),
+    updated_at: admin.firestore.FieldValue.serverTimestamp()
+  };
+}
+
 /**
  * Log swap financial transactions for both teams
  */
@@ -1694,38 +1894,13 @@ async function logSwapTransactions(
 ): Promise<void> {
   try {
     const transactionsRef = adminDb.collection('transactions');
+    const [teamAEntry, teamBEntry] = buildSwapLedgerDocs(
+      teamAId, teamBId, seasonId, playerAData, playerBData,
+      calculation, teamAOriginalBalance, teamBOriginalBalance
+    );
     
-    // Create transaction for Team A
-    await transactionsRef.add({
-      team_id: teamAId,
-      season_id: seasonId,
-      transaction_type: 'swap_committee_fee',
-      amount: -calculation.teamAPays,
-      balance_before: teamAOriginalBalance,
-      balance_after: teamAOriginalBalance - calculation.teamAPays,
-      description: `Swap: ${playerAData.player_name} ↔ ${playerBData.player_name} (Fee: ${calculation.playerB.committeeFee}${calculation.cashAmount > 0 && calculation.cashDirection === 'A_to_B' ? `, Cash: ${calculation.cashAmount}` : ''})`,
-      player_id: playerBData.player_id,
-      player_name: playerBData.player_name,
-      player_type: playerBData.type,
-      related_team_id: teamBId,
-      created_at: admin.firestore.FieldValue.serverTimestamp()
-    });
-    
-    // Create transaction for Team B
-    await transactionsRef.add({
-      team_id: teamBId,
-      season_id: seasonId,
-      transaction_type: 'swap_committee_fee',
-      amount: -calculation.teamBPays,
-      balance_before: teamBOriginalBalance,
-      balance_after: teamBOriginalBalance - calculation.teamBPays,
-      description: `Swap: ${playerBData.player_name} ↔ ${playerAData.player_name} (Fee: ${calculation.playerA.committeeFee}${calculation.cashAmount > 0 && calculation.cashDirection === 'B_to_A' ? `, Cash: ${calculation.cashAmount}` : ''})`,
-      player_id: playerAData.player_id,
-      player_name: playerAData.player_name,
-      player_type: playerAData.type,
-      related_team_id: teamAId,
-      created_at: admin.firestore.FieldValue.serverTimestamp()
-    });
+    await transactionsRef.add(teamAEntry);
+    await transactionsRef.add(teamBEntry);
     
     console.log('✅ Swap financial transactions logged');
     
@@ -1735,6 +1910,48 @@ async function logSwapTransactions(
   }
 }
 
+/**
+ * Build the financial transaction entries (Team A, Team B) for a swap
+ */
+export function buildSwapLedgerDocs(
+  teamAId: string,
+  teamBId: string,
+  seasonId: string,
+  playerAData: PlayerData,
+  playerBData: PlayerData,
+  calculation: SwapCalculation,
+  teamAOriginalBalance: number,
+  teamBOriginalBalance: number
+): [Record<string, any>, Record<string, any>] {
+  return [{
+    team_id: teamAId,
+    season_id: seasonId,
+    transaction_type: 'swap_committee_fee',
+    amount: -calculation.teamAPays,
+    balance_before: teamAOriginalBalance,
+    balance_after: teamAOriginalBalance - calculation.teamAPays,
+    description: `Swap: ${playerAData.player_name} ↔ ${playerBData.player_name} (Fee: ${calculation.playerB.committeeFee}${calculation.cashAmount > 0 && calculation.cashDirection === 'A_to_B' ? `, Cash: ${calculation.cashAmount}` : ''})`,
+    player_id: playerBData.player_id,
+    player_name: playerBData.player_name,
+    player_type: playerBData.type,
+    related_team_id: teamBId,
+    created_at: admin.firestore.FieldValue.serverTimestamp()
+  }, {
+    team_id: teamBId,
+    season_id: seasonId,
+    transaction_type: 'swap_committee_fee',
+    amount: -calculation.teamBPays,
+    balance_before: teamBOriginalBalance,
+    balance_after: teamBOriginalBalance - calculation.teamBPays,
+    description: `Swap: ${playerBData.player_name} ↔ ${playerAData.player_name} (Fee: ${calculation.playerA.committeeFee}${calculation.cashAmount > 0 && calculation.cashDirection === 'B_to_A' ? `, Cash: ${calculation.cashAmount}` : ''})`,
+    player_id: playerAData.player_id,
+    player_name: playerAData.player_name,
+    player_type: playerAData.type,
+    related_team_id: teamAId,
+    created_at: admin.firestore.FieldValue.serverTimestamp()
+  }];
+}
+
 /**
  * Create news entry for swap
  */
@@ -1745,42 +1962,9 @@ async function createSwapNews(
   calculation: SwapCalculation
 ): Promise<void> {
   try {
-    const newsRef = adminDb.collection('news').doc();
-    
-    // Build upgrade text for both players
-    const playerAUpgradeText = calculation.playerA.newStarRating > playerAData.star_rating
-      ? ` ${playerAData.player_name} upgraded from ${playerAData.star_rating}⭐ to ${calculation.playerA.newStarRating}⭐.`
-      : '';
-    
-    const playerBUpgradeText = calculation.playerB.newStarRating > playerBData.star_rating
-      ? ` ${playerBData.player_name} upgraded from ${playerBData.star_rating}⭐ to ${calculation.playerB.newStarRating}⭐.`
-      : '';
-    
-    const upgradesText = (playerAUpgradeText || playerBUpgradeText)
-      ? ` Star Rating Upgrades:${playerAUpgradeText}${playerBUpgradeText}`
-      : '';
-    
-    // Build cash text
-    const cashText = calculation.cashAmount > 0
-      ? ` ${calculation.cashDirection === 'A_to_B' ? playerAData.team_name : playerBData.team_name} also paid ${calculation.cashAmount.toFixed(2)} in cash.`
-      : '';
-    
-    const content = `Player swap completed: ${playerAData.player_name} (${playerAData.team_name}) ↔ ${playerBData.player_name} (${playerBData.team_name}). ` +
-      `${playerAData.player_name}'s new value: ${calculation.playerA.newValue.toFixed(2)} (from ${calculation.playerA.originalValue.toFixed(2)}). ` +
-      `${playerBData.player_name}'s new value: ${calculation.playerB.newValue.toFixed(2)} (from ${calculation.playerB.originalValue.toFixed(2)}). ` +
-      `${playerAData.team_name} paid ${calculation.teamAPays.toFixed(2)} (committee fee: ${calculation.playerB.committeeFee}). ` +
-      `${playerBData.team_name} paid ${calculation.teamBPays.toFixed(2)} (committee fee: ${calculation.playerA.committeeFee}).` +
-      `${cashText}${upgradesText}`;
-    
-    await newsRef.set({
-      title: `Player Swap: ${playerAData.player_name} ↔ ${playerBData.player_name}`,
-      content,
-      season_id: seasonId,
-      category: 'player_movement',
-      is_published: true,
-      created_at: admin.firestore.FieldValue.serverTimestamp(),
-      updated_at: admin.firestore.FieldValue.serverTimestamp()
-    });
+    await adminDb.collection('news').doc().set(
+      buildSwapNewsDoc(seasonId, playerAData, playerBData, calculation)
+    );
     
     console.log('✅ Swap news created');
     
@@ -1790,6 +1974,51 @@ async function createSwapNews(
   }
 }
 
+/**
+ * Build the news document for a swap
+ */
+export function buildSwapNewsDoc(
+  seasonId: string,
+  playerAData: PlayerData,
+  playerBData: PlayerData,
+  calculation: SwapCalculation
+): Record<string, any> {
+  // Build upgrade text for both players
+  const playerAUpgradeText = calculation.playerA.newStarRating > playerAData.star_rating
+    ? ` ${playerAData.player_name} upgraded from ${playerAData.star_rating}⭐ to ${calculation.playerA.newStarRating}⭐.`
+    : '';
+  
+  const playerBUpgradeText = calculation.playerB.newStarRating > playerBData.star_rating
+    ? ` ${playerBData.player_name} upgraded from ${playerBData.star_rating}⭐ to ${calculation.playerB.newStarRating}⭐.`
+    : '';
+  
+  const upgradesText = (playerAUpgradeText || playerBUpgradeText)
+    ? ` Star Rating Upgrades:${playerAUpgradeText}${playerBUpgradeText}`
+    : '';
+  
+  // Build cash text
+  const cashText = calculation.cashAmount > 0
+    ? ` ${calculation.cashDirection === 'A_to_B' ? playerAData.team_name : playerBData.team_name} also paid ${calculation.cashAmount.toFixed(2)} in cash.`
+    : '';
+  
+  const content = `Player swap completed: ${playerAData.player_name} (${playerAData.team_name}) ↔ ${playerBData.player_name} (${playerBData.team_name}). ` +
+    `${playerAData.player_name}'s new value: ${calculation.playerA.newValue.toFixed(2)} (from ${calculation.playerA.originalValue.toFixed(2)}). ` +
+    `${playerBData.player_name}'s new value: ${calculation.playerB.newValue.toFixed(2)} (from ${calculation.playerB.originalValue.toFixed(2)}). ` +
+    `${playerAData.team_name} paid ${calculation.teamAPays.toFixed(2)} (committee fee: ${calculation.playerB.committeeFee}). ` +
+    `${playerBData.team_name} paid ${calculation.teamBPays.toFixed(2)} (committee fee: ${calculation.playerA.committeeFee}).` +
+    `${cashText}${upgradesText}`;
+  
+  return {
+    title: `Player Swap: ${playerAData.player_name} ↔ ${playerBData.player_name}`,
+    content,
+    season_id: seasonId,
+    category: 'player_movement',
+    is_published: true,
+    created_at: admin.firestore.FieldValue.serverTimestamp(),
+    updated_at: admin.firestore.FieldValue.serverTimestamp()
+  };
+}
+
 /**
  * Execute a player swap with fixed committee fees and star upgrades
  * 
@@ -1838,8 +2067,7 @@ export async function executeSwapV2(
     swappedByName
   } = request;
   
-  let playerAUpdated = false;
-  let playerBUpdated = false;
+  let beforeImages: ContractBeforeImage[] = [];
   let balancesUpdated = false;
   let originalPlayerAData: PlayerData | null = null;
   let originalPlayerBData: PlayerData | null = null;
@@ -1956,27 +2184,35 @@ export async function executeSwapV2(
       throw error;
     }
     
-    // Step 5: Update Player A record in Neon (swap to Team B)
-    console.log('📝 Updating Player A record...');
-    await updatePlayerInNeon(playerAId, playerAType, seasonId, {
-      team_id: teamBId,
-      auction_value: calculation.playerA.newValue,
-      star_rating: calculation.playerA.newStarRating,
-      points: playerAData.points + calculation.playerA.pointsAdded,
-      salary_per_match: calculation.playerA.newSalary
-    }, []); // Empty array for now - will be populated with future seasons in task 11
-    playerAUpdated = true;
-    
-    // Step 6: Update Player B record in Neon (swap to Team A)
-    console.log('📝 Updating Player B record...');
-    await updatePlayerInNeon(playerBId, playerBType, seasonId, {
-      team_id: teamAId,
-      auction_value: calculation.playerB.newValue,
-      star_rating: calculation.playerB.newStarRating,
-      points: playerBData.points + calculation.playerB.pointsAdded,
-      salary_per_match: calculation.playerB.newSalary
-    }, []); // Empty array for now - will be populated with future seasons in task 11
-    playerBUpdated = true;
+    // Steps 5-6: Update both player records in Neon in one atomic write
+    // (Player A to Team B, Player B to Team A; future seasons will be populated in task 11)
+    console.log('📝 Updating Player A and Player B records...');
+    ({ beforeImages } = await applyContractUpdates([
+      {
+        playerId: playerAId,
+        playerType: playerAType,
+        currentSeasonId: seasonId,
+        currentSeasonUpdates: {
+          team_id: teamBId,
+          auction_value: calculation.playerA.newValue,
+          star_rating: calculation.playerA.newStarRating,
+          points: playerAData.points + calculation.playerA.pointsAdded,
+          salary_per_match: calculation.playerA.newSalary
+        }
+      },
+      {
+        playerId: playerBId,
+        playerType: playerBType,
+        currentSeasonId: seasonId,
+        currentSeasonUpdates: {
+          team_id: teamAId,
+          auction_value: calculation.playerB.newValue,
+          star_rating: calculation.playerB.newStarRating,
+          points: playerBData.points + calculation.playerB.pointsAdded,
+          salary_per_match: calculation.playerB.newSalary
+        }
+      }
+    ]));
     
     // Step 7: Update team budgets in Firestore
     console.log('💸 Updating team budgets...');
@@ -2028,6 +2264,13 @@ export async function executeSwapV2(
       calculation
     );
     
+    await refreshSeasonAggregatesAfterChange(seasonId, {
+      teamIds: [teamAId, teamBId],
+      playerIds: [playerAData, playerBData]
+        .filter(p => p.type === 'football')
+        .map(p => p.player_id)
+    });
+    
     console.log('✅ Swap completed successfully');
     
     return {
@@ -2064,33 +2307,12 @@ export async function executeSwapV2(
       }
     }
     
-    if (playerBUpdated && originalPlayerBData) {
-      console.log('🔄 Rolling back Player B record...');
-      try {
-        await updatePlayerInNeon(playerBId, playerBType, seasonId, {
-          team_id: originalPlayerBData.team_id,
-          auction_value: originalPlayerBData.auction_value,
-          star_rating: originalPlayerBData.star_rating,
-          points: originalPlayerBData.points,
-          salary_per_match: originalPlayerBData.salary_per_match || 0
-        }, []); // No future seasons in rollback
-      } catch (rollbackError) {
-        console.error('Failed to rollback Player B:', rollbackError);
-      }
-    }
-    
-    if (playerAUpdated && originalPlayerAData) {
-      console.log('🔄 Rolling back Player A record...');
+    if (beforeImages.length > 0) {
+      console.log('🔄 Rolling back player records...');
       try {
-        await updatePlayerInNeon(playerAId, playerAType, seasonId, {
-          team_id: originalPlayerAData.team_id,
-          auction_value: originalPlayerAData.auction_value,
-          star_rating: originalPlayerAData.star_rating,
-          points: originalPlayerAData.points,
-          salary_per_match: originalPlayerAData.salary_per_match || 0
-        }, []); // No future seasons in rollback
+        await restoreContracts(beforeImages);
       } catch (rollbackError) {
-        console.error('Failed to rollback Player A:', rollbackError);
+        console.error('Failed to rollback player records:', rollbackError);
       }
     }
     
@@ -9,6 +9,12 @@ import {
   createSeasonChampionPoll,
   createSeasonMVPPoll,
 } from './poll-helpers';
+import {
+  runPollScheduler,
+  DAILY_POLL_TYPES,
+  WEEKLY_POLL_TYPES,
+  type PollRunResult,
+} from './poll-scheduler';
 
 /**
  * Auto-trigger poll creation when a match is scheduled
@@ -520,20 +526,20 @@ export async function triggerSeasonMVPPoll(seasonId: string): Promise<string | n
 
 /**
  * Run all daily poll triggers for a given season and date
+ * All rules share one snapshot (see poll-scheduler.ts)
  */
-export async function runDailyPollTriggers(seasonId: string, date: Date = new Date()): Promise<void> {
+export async function runDailyPollTriggers(seasonId: string, date: Date = new Date()): Promise<PollRunResult[]> {
   console.log('🤖 Running daily poll triggers for:', date.toISOString().split('T')[0]);
   
-  await triggerDailyBestPlayerPoll(seasonId, date);
-  await triggerDailyBestTeamPoll(seasonId, date);
+  return runPollScheduler(seasonId, { date, pollTypes: DAILY_POLL_TYPES });
 }
 
 /**
  * Run all weekly poll triggers for a given season and week
+ * All rules share one snapshot (see poll-scheduler.ts)
  */
-export async function runWeeklyPollTriggers(seasonId: string, weekNumber: number): Promise<void> {
+export async function runWeeklyPollTriggers(seasonId: string, weekNumber: number): Promise<PollRunResult[]> {
   console.log('🤖 Running weekly poll triggers for week:', weekNumber);
   
-  await triggerWeeklyTopPlayerPoll(seasonId, weekNumber);
-  await triggerWeeklyTopTeamPoll(seasonId, weekNumber);
+  return runPollScheduler(seasonId, { weekNumber, pollTypes: WEEKLY_POLL_TYPES });
 }
@@ -0,0 +1,90 @@
+import { describe, it, expect, vi, beforeEach } from 'vitest';
+
+const mockSql = vi.fn();
+
+vi.mock('@/lib/neon/tournament-config', () => ({
+  getTournamentDb: vi.fn(() => mockSql),
+}));
+
+vi.mock('./poll-helpers', () => ({
+  createDailyBestPlayerPoll: vi.fn(async () => 'poll_daily_player'),
+  createDailyBestTeamPoll: vi.fn(async () => 'poll_daily_team'),
+  createWeeklyTopPlayerPoll: vi.fn(async () => 'poll_weekly_player'),
+  createWeeklyTopTeamPoll: vi.fn(async () => 'poll_weekly_team'),
+  createSeasonChampionPoll: vi.fn(async () => 'poll_champion'),
+  createSeasonMVPPoll: vi.fn(async () => 'poll_mvp'),
+}));
+
+const { runPollScheduler, pollCandidates } = await import('./poll-scheduler');
+const helpers = await import('./poll-helpers');
+
+const players = [
+  { id: 'p1', name: 'Star', star_rating: 5, matches_played: 4, played_on_day: false },
+  { id: 'p2', name: 'Regular', star_rating: 4, matches_played: 2, played_on_day: true },
+  { id: 'p3', name: 'Veteran', star_rating: 4, matches_played: 6, played_on_day: true },
+];
+const teams = [
+  { id: 't1', name: 'Lions', played_on_day: true },
+  { id: 't2', name: 'Tigers', played_on_day: false },
+];
+
+describe('pollCandidates', () => {
+  const snapshot = {
+    seasonId: 'SSPSLS16',
+    dateStr: '2026-10-18',
+    existingPolls: new Map(),
+    players,
+    teams,
+  };
+
+  it('selects daily candidates from players and teams that played that day', () => {
+    expect(pollCandidates.dailyBestPlayer(snapshot).map(p => p.id)).toEqual(['p2', 'p3']);
+    expect(pollCandidates.dailyBestTeam(snapshot).map(t => t.id)).toEqual(['t1']);
+  });
+
+  it('requires three matches for MVP and breaks rating ties by matches played', () => {
+    expect(pollCandidates.seasonMVP(snapshot).map(p => p.id)).toEqual(['p1', 'p3']);
+  });
+});
+
+describe('runPollScheduler', () => {
+  beforeEach(() => {
+    vi.clearAllMocks();
+  });
+
+  it('loads one snapshot for all rules and skips polls that already exist', async () => {
+    mockSql
+      .mockResolvedValueOnce([{ id: 'poll_existing', poll_type: 'daily_best_team', period: '2026-10-18' }])
+      .mockResolvedValueOnce(players)
+      .mockResolvedValueOnce(teams)
+      .mockResolvedValue([{ season_id: 'SSPSLS16' }]);
+
+    const results = await runPollScheduler('SSPSLS16', {
+      date: new Date('2026-10-18T12:00:00Z'),
+      weekNumber: 3,
+    });
+
+    expect(results.map(r => [r.poll_type, r.status])).toEqual([
+      ['daily_best_player', 'created'],
+      ['daily_best_team', 'exists'],
+      ['weekly_top_player', 'created'],
+      ['weekly_top_team', 'created'],
+    ]);
+    expect(helpers.createDailyBestTeamPoll).not.toHaveBeenCalled();
+    // 3 snapshot queries + (claim + record) per created poll
+    expect(mockSql).toHaveBeenCalledTimes(3 + 3 * 2);
+  });
+
+  it('does not create a poll whose slot another run already claimed', async () => {
+    mockSql
+      .mockResolvedValueOnce([])
+      .mockResolvedValueOnce(players)
+      .mockResolvedValueOnce(teams)
+      .mockResolvedValueOnce([]);
+
+    const results = await runPollScheduler('SSPSLS16', { pollTypes: ['season_mvp'] });
+
+    expect(results[0].status).toBe('exists');
+    expect(helpers.createSeasonMVPPoll).not.toHaveBeenCalled();
+  });
+});
@@ -0,0 +1,341 @@
+import { getTournamentDb } from '@/lib/neon/tournament-config';
+import {
+  createDailyBestPlayerPoll,
+  createDailyBestTeamPoll,
+  createWeeklyTopPlayerPoll,
+  createWeeklyTopTeamPoll,
+  createSeasonChampionPoll,
+  createSeasonMVPPoll,
+} from './poll-helpers';
+
+/**
+ * Poll Scheduler
+ *
+ * Evaluates every scheduled poll rule (daily, weekly, season) against one
+ * shared snapshot of the season: existing polls, teams and player
+ * participation are each loaded with a single query, whichever rules run.
+ *
+ * Every created poll is claimed in poll_trigger_log first (unique per
+ * season, poll type and period), so overlapping or repeated cron runs never
+ * create the same poll twice.
+ */
+
+export type ScheduledPollType =
+  | 'daily_best_player'
+  | 'daily_best_team'
+  | 'weekly_top_player'
+  | 'weekly_top_team'
+  | 'season_champion'
+  | 'season_mvp';
+
+export const DAILY_POLL_TYPES: ScheduledPollType[] = ['daily_best_player', 'daily_best_team'];
+export const WEEKLY_POLL_TYPES: ScheduledPollType[] = ['weekly_top_player', 'weekly_top_team'];
+export const SEASON_POLL_TYPES: ScheduledPollType[] = ['season_champion', 'season_mvp'];
+
+export interface PollSchedulerOptions {
+  date?: Date;           // Day evaluated by the daily rules
+  weekNumber?: number;   // Required by the weekly rules
+  pollTypes?: ScheduledPollType[];
+}
+
+export interface SnapshotPlayer {
+  id: string;
+  name: string;
+  star_rating: number;
+  matches_played: number;   // Completed season fixtures with participation
+  played_on_day: boolean;   // In a lineup or participation record on the snapshot date
+}
+
+export interface SnapshotTeam {
+  id: string;
+  name: string;
+  played_on_day: boolean;
+}
+
+export interface PollSnapshot {
+  seasonId: string;
+  dateStr: string;
+  weekNumber?: number;
+  existingPolls: Map<string, string>; // `${poll_type}:${period}` -> poll id
+  players: SnapshotPlayer[];          // Sorted by star rating, highest first
+  teams: SnapshotTeam[];              // Sorted by name
+}
+
+export interface PollRunResult {
+  poll_type: ScheduledPollType;
+  period: string;
+  status: 'created' | 'exists' | 'skipped' | 'error';
+  poll_id?: string | null;
+  reason?: string;
+}
+
+interface PollRule {
+  pollType: ScheduledPollType;
+  period: (snapshot: PollSnapshot) => string | null;
+  create: (snapshot: PollSnapshot) => Promise<string | null>;
+}
+
+function dayBounds(date: Date) {
+  const startOfDay = new Date(date);
+  startOfDay.setHours(0, 0, 0, 0);
+  const endOfDay = new Date(date);
+  endOfDay.setHours(23, 59, 59, 999);
+  return { startOfDay, endOfDay };
+}
+
+function toPlayerOptions(players: SnapshotPlayer[]) {
+  return players.map(p => ({ id: p.id, name: p.name, starRating: p.star_rating }));
+}
+
+function toTeamOptions(teams: SnapshotTeam[]) {
+  return teams.map(t => ({ id: t.id, name: t.name }));
+}
+
+/**
+ * Candidate selection per rule. Pure functions over the snapshot.
+ */
+export const pollCandidates = {
+  dailyBestPlayer: (s: PollSnapshot) => s.players.filter(p => p.played_on_day).slice(0, 20),
+  dailyBestTeam: (s: PollSnapshot) => s.teams.filter(t => t.played_on_day),
+  weeklyTopPlayer: (s: PollSnapshot) => s.players.filter(p => p.matches_played > 0).slice(0, 15),
+  weeklyTopTeam: (s: PollSnapshot) => s.teams,
+  seasonChampion: (s: PollSnapshot) => s.teams,
+  seasonMVP: (s: PollSnapshot) =>
+    s.players
+      .filter(p => p.matches_played >= 3)
+      .sort((a, b) => b.star_rating - a.star_rating || b.matches_played - a.matches_played)
+      .slice(0, 20),
+};
+
+const RULES: PollRule[] = [
+  {
+    pollType: 'daily_best_player',
+    period: s => s.dateStr,
+    create: async s => {
+      const players = pollCandidates.dailyBestPlayer(s);
+      if (players.length === 0) return null;
+      return createDailyBestPlayerPoll({ seasonId: s.seasonId, date: s.dateStr, players: toPlayerOptions(players) });
+    },
+  },
+  {
+    pollType: 'daily_best_team',
+    period: s => s.dateStr,
+    create: async s => {
+      const teams = pollCandidates.dailyBestTeam(s);
+      if (teams.length === 0) return null;
+      return createDailyBestTeamPoll({ seasonId: s.seasonId, date: s.dateStr, teams: toTeamOptions(teams) });
+    },
+  },
+  {
+    pollType: 'weekly_top_player',
+    period: s => (s.weekNumber !== undefined ? s.weekNumber.toString() : null),
+    create: async s => {
+      const players = pollCandidates.weeklyTopPlayer(s);
+      if (players.length === 0) return null;
+      return createWeeklyTopPlayerPoll({ seasonId: s.seasonId, weekNumber: s.weekNumber!, players: toPlayerOptions(players) });
+    },
+  },
+  {
+    pollType: 'weekly_top_team',
+    period: s => (s.weekNumber !== undefined ? s.weekNumber.toString() : null),
+    create: async s => {
+      const teams = pollCandidates.weeklyTopTeam(s);
+      if (teams.length === 0) return null;
+      return createWeeklyTopTeamPoll({ seasonId: s.seasonId, weekNumber: s.weekNumber!, teams: toTeamOptions(teams) });
+    },
+  },
+  {
+    pollType: 'season_champion',
+    period: () => 'season',
+    create: async s => {
+      const teams = pollCandidates.seasonChampion(s);
+      if (teams.length === 0) return null;
+      return createSeasonChampionPoll({ seasonId: s.seasonId, seasonName: s.seasonId, teams: toTeamOptions(teams) });
+    },
+  },
+  {
+    pollType: 'season_mvp',
+    period: () => 'season',
+    create: async s => {
+      const players = pollCandidates.seasonMVP(s);
+      if (players.length === 0) return null;
+      return createSeasonMVPPoll({ seasonId: s.seasonId, seasonName: s.seasonId, players: toPlayerOptions(players) });
+    },
+  },
+];
+
+/**
+ * Load everything the poll rules need for a season in three queries
+ */
+export async function loadPollSnapshot(
+  seasonId: string,
+  options: { date?: Date; weekNumber?: number } = {}
+): Promise<PollSnapshot> {
+  const sql = getTournamentDb();
+  const date = options.date || new Date();
+  const dateStr = date.toISOString().split('T')[0];
+  const { startOfDay, endOfDay } = dayBounds(date);
+  const start = startOfDay.toISOString();
+  const end = endOfDay.toISOString();
+
+  const [existingRows, playerRows, teamRows] = await Promise.all([
+    sql`
+      SELECT id, poll_type,
+        CASE
+          WHEN poll_type LIKE 'daily_%' THEN metadata->>'date'
+          WHEN poll_type LIKE 'weekly_%' THEN metadata->>'week_number'
+          ELSE 'season'
+        END AS period
+      FROM polls
+      WHERE season_id = ${seasonId}
+        AND poll_type = ANY(${[...DAILY_POLL_TYPES, ...WEEKLY_POLL_TYPES, ...SEASON_POLL_TYPES]})
+    `,
+    sql`
+      WITH day_fixtures AS (
+        SELECT id FROM fixtures
+        WHERE season_id = ${seasonId}
+          AND status = 'completed'
+          AND updated_at >= ${start}
+          AND updated_at <= ${end}
+      ),
+      season_participation AS (
+        SELECT fp.player_id, COUNT(DISTINCT fp.fixture_id) AS matches_played
+        FROM fixture_participation fp
+        JOIN fixtures f ON f.id = fp.fixture_id
+        WHERE f.season_id = ${seasonId}
+          AND f.status = 'completed'
+        GROUP BY fp.player_id
+      ),
+      day_participants AS (
+        SELECT player_id FROM lineup_players WHERE fixture_id IN (SELECT id FROM day_fixtures)
+        UNION
+        SELECT player_id FROM fixture_participation WHERE fixture_id IN (SELECT id FROM day_fixtures)
+      )
+      SELECT
+        p.id, p.current_name AS name, p.star_rating,
+        COALESCE(sp.matches_played, 0)::int AS matches_played,
+        (dp.player_id IS NOT NULL) AS played_on_day
+      FROM players p
+      LEFT JOIN season_participation sp ON sp.player_id = p.id
+      LEFT JOIN day_participants dp ON dp.player_id = p.id
+      WHERE sp.player_id IS NOT NULL OR dp.player_id IS NOT NULL
+      ORDER BY p.star_rating DESC
+    `,
+    sql`
+      SELECT
+        t.id, t.name,
+        BOOL_OR(f.status = 'completed' AND f.updated_at >= ${start} AND f.updated_at <= ${end}) AS played_on_day
+      FROM teams t
+      JOIN fixtures f ON (f.home_team_id = t.id OR f.away_team_id = t.id)
+      WHERE f.season_id = ${seasonId}
+      GROUP BY t.id, t.name
+      ORDER BY t.name
+    `,
+  ]);
+
+  const existingPolls = new Map<string, string>();
+  for (const row of existingRows) {
+    existingPolls.set(`${row.poll_type}:${row.period}`, row.id);
+  }
+
+  return {
+    seasonId,
+    dateStr,
+    weekNumber: options.weekNumber,
+    existingPolls,
+    players: playerRows.map((p: any) => ({
+      id: p.id,
+      name: p.name,
+      star_rating: Number(p.star_rating) || 0,
+      matches_played: Number(p.matches_played) || 0,
+      played_on_day: !!p.played_on_day,
+    })),
+    teams: teamRows.map((t: any) => ({ id: t.id, name: t.name, played_on_day: !!t.played_on_day })),
+  };
+}
+
+/**
+ * Claim a (season, poll type, period) slot. Returns false if another run
+ * already claimed it.
+ */
+async function claimPollSlot(seasonId: string, pollType: string, period: string): Promise<boolean> {
+  const sql = getTournamentDb();
+  const claimed = await sql`
+    INSERT INTO poll_trigger_log (season_id, poll_type, period)
+    VALUES (${seasonId}, ${pollType}, ${period})
+    ON CONFLICT (season_id, poll_type, period) DO NOTHING
+    RETURNING season_id
+  `;
+  return claimed.length > 0;
+}
+
+async function recordPollSlot(seasonId: string, pollType: string, period: string, pollId: string | null) {
+  const sql = getTournamentDb();
+  if (pollId) {
+    await sql`
+      UPDATE poll_trigger_log
+      SET poll_id = ${pollId}
+      WHERE season_id = ${seasonId} AND poll_type = ${pollType} AND period = ${period}
+    `;
+  } else {
+    // Nothing to poll yet (e.g. no matches today) - release so a later run can retry
+    await sql`
+      DELETE FROM poll_trigger_log
+      WHERE season_id = ${seasonId} AND poll_type = ${pollType} AND period = ${period}
+    `;
+  }
+}
+
+/**
+ * Evaluate the requested poll rules against one season snapshot and create
+ * every poll that is due and doesn't exist yet
+ */
+export async function runPollScheduler(
+  seasonId: string,
+  options: PollSchedulerOptions = {}
+): Promise<PollRunResult[]> {
+  const pollTypes = options.pollTypes || [...DAILY_POLL_TYPES, ...WEEKLY_POLL_TYPES];
+  const rules = RULES.filter(rule => pollTypes.includes(rule.pollType));
+  const snapshot = await loadPollSnapshot(seasonId, options);
+  const results: PollRunResult[] = [];
+
+  for (const rule of rules) {
+    const period = rule.period(snapshot);
+    if (period === null) {
+      results.push({ poll_type: rule.pollType, period: '', status: 'skipped', reason: 'No week number given' });
+      continue;
+    }
+
+    const existingId = snapshot.existingPolls.get(`${rule.pollType}:${period}`);
+    if (existingId) {
+      results.push({ poll_type: rule.pollType, period, status: 'exists', poll_id: existingId });
+      continue;
+    }
+
+    try {
+      if (!(await claimPollSlot(seasonId, rule.pollType, period))) {
+        results.push({ poll_type: rule.pollType, period, status: 'exists', reason: 'Claimed by another run' });
+        continue;
+      }
+
+      let pollId: string | null = null;
+      try {
+        pollId = await rule.create(snapshot);
+      } finally {
+        await recordPollSlot(seasonId, rule.pollType, period, pollId);
+      }
+
+      if (pollId) {
+        console.log(`✅ ${rule.pollType} poll created:`, pollId);
+        results.push({ poll_type: rule.pollType, period, status: 'created', poll_id: pollId });
+      } else {
+        results.push({ poll_type: rule.pollType, period, status: 'skipped', reason: 'No candidates' });
+      }
+    } catch (error: any) {
+      console.error(`Error creating ${rule.pollType} poll:`, error);
+      results.push({ poll_type: rule.pollType, period, status: 'error', reason: error.message });
+    }
+  }
+
+  return results;
+}
@@ -0,0 +1,146 @@
+import { describe, it, expect, vi, beforeEach } from 'vitest';
+
+// Create mock sql function
+const mockSql = vi.fn();
+
+// Mock the neon database before importing the module
+vi.mock('@neondatabase/serverless', () => ({
+  neon: vi.fn(() => mockSql),
+}));
+
+const teamSeasonDocs = [
+  { id: 'SSPSLT0001_SSPSLS16', data: () => ({ team_id: 'SSPSLT0001', budget: 1000, players_count: 10 }) },
+  { id: 'SSPSLT0002_SSPSLS16', data: () => ({ team_id: 'SSPSLT0002', currency_system: 'dual', football_budget: 500, players_count: 20 }) },
+];
+const mockTeamSeasonsQuery = vi.fn(async () => ({ docs: teamSeasonDocs, size: teamSeasonDocs.length }));
+const mockTeamSeasonGet = vi.fn();
+
+vi.mock('./firebase/admin', () => {
+  const query: any = { where: () => query, get: mockTeamSeasonsQuery };
+  return {
+    adminDb: {
+      collection: () => ({
+        where: () => query,
+        doc: () => ({ get: mockTeamSeasonGet }),
+      }),
+    },
+  };
+});
+
+vi.mock('./auction-settings', () => ({
+  getAuctionSettings: vi.fn(),
+}));
+
+// Import after mocks are set up
+const {
+  calculateReserve,
+  calculateReserveCore,
+  clearRoundReserves,
+  getReserveSnapshot,
+  openRoundReserves,
+  recordReserveAllocation,
+  recordReserveBudgetChange,
+  validateBidAmount,
+} = await import('./reserve-calculator');
+const { getAuctionSettings } = await import('./auction-settings');
+
+const settings = {
+  phase_1_end_round: 18,
+  phase_1_min_balance: 30,
+  phase_2_end_round: 20,
+  phase_2_min_balance: 30,
+  phase_3_min_balance: 10,
+  max_squad_size: 25,
+};
+
+function mockRound(roundNumber: number) {
+  mockSql
+    .mockResolvedValueOnce([{ round_number: roundNumber, season_id: 'SSPSLS16', auction_settings_id: 1, ...settings }])
+    .mockResolvedValueOnce([{ id: 'SSPSLT0001', football_total_slots: '25' }, { id: 'SSPSLT0002', football_total_slots: '30' }]);
+}
+
+describe('reserve snapshots', () => {
+  beforeEach(() => {
+    mockSql.mockReset();
+    mockTeamSeasonsQuery.mockClear();
+    mockTeamSeasonGet.mockReset();
+    clearRoundReserves();
+  });
+
+  it('loads a round once and validates every team in memory', async () => {
+    mockRound(5);
+
+    expect(await openRoundReserves('round1', 'SSPSLS16')).toBe(2);
+    const first = await getReserveSnapshot('SSPSLT0001', 'round1', 'SSPSLS16');
+    const second = await getReserveSnapshot('SSPSLT0002', 'round1', 'SSPSLS16');
+
+    expect(mockSql).toHaveBeenCalledTimes(2);
+    expect(mockTeamSeasonGet).not.toHaveBeenCalled();
+    expect(first.info).toEqual(calculateReserveCore(5, 1000, 10, settings));
+    expect(second.config.max_squad_size).toBe(30);
+    expect(second.balance).toBe(500);
+  });
+
+  it('updates snapshots incrementally on allocation and budget change', async () => {
+    mockRound(19);
+    await openRoundReserves('round1', 'SSPSLS16');
+
+    recordReserveAllocation('SSPSLT0001', 'SSPSLS16', 200);
+    let snapshot = await getReserveSnapshot('SSPSLT0001', 'round1', 'SSPSLS16');
+    expect(snapshot.balance).toBe(800);
+    expect(snapshot.squadSize).toBe(11);
+    expect(snapshot.info).toEqual(calculateReserveCore(19, 800, 11, settings));
+
+    recordReserveBudgetChange('SSPSLT0001', 'SSPSLS16', 900);
+    snapshot = await getReserveSnapshot('SSPSLT0001', 'round1', 'SSPSLS16');
+    expect(snapshot.info.maxBid).toBe(900 - snapshot.info.floorReserve);
+  });
+
+  it('uses the balance and squad size passed by the caller', async () => {
+    mockRound(5);
+    await openRoundReserves('round1', 'SSPSLS16');
+
+    const snapshot = await getReserveSnapshot('SSPSLT0001', 'round1', 'SSPSLS16', { balance: 300, squadSize: 12 });
+
+    expect(snapshot.info).toEqual(calculateReserveCore(5, 300, 12, settings));
+    expect(validateBidAmount(301, 300, snapshot.info).valid).toBe(false);
+  });
+
+  it('re-reads team state once the cached balance and squad size go stale', async () => {
+    mockRound(5);
+    await openRoundReserves('round1', 'SSPSLS16');
+    mockTeamSeasonGet.mockResolvedValueOnce({ exists: true, data: () => ({ budget: 600, players_count: 14 }) });
+
+    const now = Date.now();
+    const clock = vi.spyOn(Date, 'now').mockReturnValue(now + 2 * 60 * 1000);
+    const snapshot = await getReserveSnapshot('SSPSLT0001', 'round1', 'SSPSLS16', { balance: 650 });
+    clock.mockRestore();
+
+    expect(mockTeamSeasonGet).toHaveBeenCalledTimes(1);
+    expect(snapshot.balance).toBe(650);
+    expect(snapshot.squadSize).toBe(14);
+  });
+
+  it('builds a missing snapshot from one team_seasons read', async () => {
+    mockRound(5);
+    mockTeamSeasonGet.mockResolvedValueOnce({ exists: true, data: () => ({ budget: 700, players_count: 3 }) });
+
+    const reserve = await calculateReserve('SSPSLT0001', 'round1', 'SSPSLS16');
+
+    expect(mockTeamSeasonGet).toHaveBeenCalledTimes(1);
+    expect(reserve.minimumReserve).toBe(calculateReserveCore(5, 700, 3, settings).floorReserve);
+    expect(reserve.requiresReserve).toBe(true);
+  });
+
+  it('falls back to season settings when the round has none', async () => {
+    mockSql
+      .mockResolvedValueOnce([{ round_number: 21, season_id: 'SSPSLS16', auction_settings_id: null }])
+      .mockResolvedValueOnce([]);
+    vi.mocked(getAuctionSettings).mockResolvedValueOnce(settings as any);
+
+    const snapshot = await getReserveSnapshot('SSPSLT0001', 'round2', 'SSPSLS16', { balance: 100, squadSize: 20 });
+
+    expect(getAuctionSettings).toHaveBeenCalledWith('SSPSLS16');
+    expect(snapshot.info.phase).toBe('phase_3');
+  });
+});
@@ -5,6 +5,15 @@
  * - Phase 1: Strict reserve (cumulative for all future phases)
  * - Phase 2: Soft reserve with floor enforcement
  * - Phase 3: Flexible (minimum £10 per player)
+ *
+ * Reserve snapshots: when a round opens, the round's phase config and every
+ * registered team's slot limit, balance and squad size are loaded once
+ * (one round query, one team_seasons query, one teams query) and kept in
+ * memory per (team, round). Allocations and budget changes update a snapshot
+ * in place, and bid endpoints pass the balance / squad size they already
+ * read, so validation needs no further reads. Snapshots are per instance:
+ * a cached balance / squad size is only reused for TEAM_STATE_TTL, since
+ * allocations made on other instances don't reach it.
  */
 
 import { neon } from '@neondatabase/serverless';
@@ -233,14 +242,288 @@ export function validateBidAmount(
   return { valid: true };
 }
 
+export interface TeamReserveState {
+  balance: number;
+  squadSize: number;
+}
+
+export interface ReserveSnapshot extends TeamReserveState {
+  teamId: string;
+  roundId: string;
+  seasonId: string;
+  roundNumber: number;
+  config: ReserveConfig;           // max_squad_size is the team's own slot limit
+  info: ReserveInfo;
+}
+
+interface RoundReserveBase {
+  roundId: string;
+  seasonId: string;
+  roundNumber: number;
+  config: ReserveConfig;
+  slots: Map<string, number>;      // team-specific football_total_slots
+  expiresAt: number;
+}
+
+const SNAPSHOT_TTL = 10 * 60 * 1000; // 10 minutes - config and slot limits don't change mid-round
+const TEAM_STATE_TTL = 60 * 1000; // 1 minute - balance / squad size read on this instance
+
+const roundBases = new Map<string, RoundReserveBase>();
+const pendingRoundLoads = new Map<string, Promise<RoundReserveBase>>();
+// stateExpiresAt: until when the snapshot's balance / squad size may be reused
+const reserveSnapshots = new Map<string, { snapshot: ReserveSnapshot; stateExpiresAt: number }>();
+const snapshotKey = (roundId: string, teamId: string) => `${roundId}:${teamId}`;
+
+function teamStateFromSeasonDoc(data: any): TeamReserveState {
+  const currencySystem = data?.currency_system || 'single';
+  return {
+    balance: currencySystem === 'dual' ? (data?.football_budget || 0) : (data?.budget || 0),
+    squadSize: data?.players_count || 0,
+  };
+}
+
+/**
+ * Build a team's snapshot for a round (pure)
+ */
+export function buildReserveSnapshot(
+  base: { roundId: string; seasonId: string; roundNumber: number; config: ReserveConfig },
+  teamId: string,
+  state: TeamReserveState,
+  maxSquadSize: number = base.config.max_squad_size
+): ReserveSnapshot {
+  const config = { ...base.config, max_squad_size: maxSquadSize };
+  return {
+    teamId,
+    roundId: base.roundId,
+    seasonId: base.seasonId,
+    roundNumber: base.roundNumber,
+    config,
+    balance: state.balance,
+    squadSize: state.squadSize,
+    info: calculateReserveCore(base.roundNumber, state.balance, state.squadSize, config),
+  };
+}
+
+/**
+ * Snapshot with a new balance / squad size; unchanged snapshots are returned as is (pure)
+ */
+export function updateReserveSnapshot(
+  snapshot: ReserveSnapshot,
+  state: Partial<TeamReserveState>
+): ReserveSnapshot {
+  const balance = state.balance ?? snapshot.balance;
+  const squadSize = state.squadSize ?? snapshot.squadSize;
+  if (balance === snapshot.balance && squadSize === snapshot.squadSize) return snapshot;
+  return {
+    ...snapshot,
+    balance,
+    squadSize,
+    info: calculateReserveCore(snapshot.roundNumber, balance, squadSize, snapshot.config),
+  };
+}
+
+/**
+ * Round number, phase config and team slot limits for a round (cached)
+ */
+async function getRoundReserveBase(roundId: string, seasonId?: string): Promise<RoundReserveBase> {
+  const cached = roundBases.get(roundId);
+  if (cached && cached.expiresAt > Date.now()) return cached;
+
+  let pending = pendingRoundLoads.get(roundId);
+  if (!pending) {
+    pending = loadRoundReserveBase(roundId, seasonId).finally(() => pendingRoundLoads.delete(roundId));
+    pendingRoundLoads.set(roundId, pending);
+  }
+  return pending;
+}
+
+async function loadRoundReserveBase(roundId: string, seasonIdHint?: string): Promise<RoundReserveBase> {
+  // Fetch round info with auction settings
+  const roundResult = await sql`
+    SELECT 
+      r.round_number,
+      r.season_id,
+      r.auction_settings_id,
+      a.phase_1_end_round,
+      a.phase_1_min_balance,
+      a.phase_2_end_round,
+      a.phase_2_min_balance,
+      a.phase_3_min_balance,
+      a.max_squad_size
+    FROM rounds r
+    LEFT JOIN auction_settings a ON r.auction_settings_id = a.id
+    WHERE r.id = ${roundId}
+  `;
+
+  if (roundResult.length === 0) {
+    throw new Error('Round not found');
+  }
+
+  const round = roundResult[0];
+  const seasonId = round.season_id || seasonIdHint;
+
+  let settings: any = round;
+  if (!round.auction_settings_id || !round.phase_1_end_round) {
+    console.warn(`⚠️ [Reserve Calculator] Round ${roundId} has no auction_settings_id, falling back to season settings`);
+    settings = await getAuctionSettings(seasonId);
+  }
+
+  // ✅ Team-specific slot limits from Neon teams table (one query for the season)
+  const slots = new Map<string, number>();
+  try {
+    const teamSlots = await sql`
+      SELECT id, football_total_slots
+      FROM teams
+      WHERE season_id = ${seasonId}
+    `;
+    for (const team of teamSlots) {
+      if (team.football_total_slots) slots.set(team.id, parseInt(team.football_total_slots));
+    }
+  } catch (error) {
+    console.warn(`⚠️ [Reserve Calculator] Failed to fetch team slots, using auction settings: ${settings.max_squad_size}`, error);
+  }
+
+  const base: RoundReserveBase = {
+    roundId,
+    seasonId,
+    roundNumber: round.round_number,
+    config: {
+      phase_1_end_round: settings.phase_1_end_round,
+      phase_1_min_balance: settings.phase_1_min_balance,
+      phase_2_end_round: settings.phase_2_end_round,
+      phase_2_min_balance: settings.phase_2_min_balance,
+      phase_3_min_balance: settings.phase_3_min_balance,
+      max_squad_size: settings.max_squad_size,
+    },
+    slots,
+    expiresAt: Date.now() + SNAPSHOT_TTL,
+  };
+  roundBases.set(roundId, base);
+  return base;
+}
+
+/**
+ * Compute reserve snapshots for every registered team when a round opens
+ */
+export async function openRoundReserves(roundId: string, seasonId?: string): Promise<number> {
+  const base = await getRoundReserveBase(roundId, seasonId);
+
+  const teamSeasons = await adminDb.collection('team_seasons')
+    .where('season_id', '==', base.seasonId)
+    .where('status', '==', 'registered')
+    .get();
+
+  for (const doc of teamSeasons.docs) {
+    const data = doc.data();
+    const teamId = data.team_id || doc.id.replace(`_${base.seasonId}`, '');
+    reserveSnapshots.set(snapshotKey(roundId, teamId), {
+      snapshot: buildReserveSnapshot(base, teamId, teamStateFromSeasonDoc(data), base.slots.get(teamId) ?? base.config.max_squad_size),
+      stateExpiresAt: Date.now() + TEAM_STATE_TTL,
+    });
+  }
+
+  console.log(`🔍 [Reserve Calculator] Round ${roundId}: ${teamSeasons.size} team reserve snapshots (round ${base.roundNumber})`);
+  return teamSeasons.size;
+}
+
+/**
+ * A team's reserve snapshot for a round, from memory when possible
+ *
+ * Pass the balance / squad size when the caller has just read them (bid
+ * endpoints do); the snapshot is updated to match. Anything not passed comes
+ * from the snapshot while its team state is fresh (TEAM_STATE_TTL), otherwise
+ * from one team_seasons read.
+ */
+export async function getReserveSnapshot(
+  teamId: string,
+  roundId: string,
+  seasonId: string,
+  state: Partial<TeamReserveState> = {}
+): Promise<ReserveSnapshot> {
+  const key = snapshotKey(roundId, teamId);
+  const base = await getRoundReserveBase(roundId, seasonId);
+  const cached = reserveSnapshots.get(key);
+  const fresh = cached && cached.stateExpiresAt > Date.now() ? cached : undefined;
+  let stateExpiresAt = fresh?.stateExpiresAt ?? 0;
+  const given: Partial<TeamReserveState> = {};
+  if (state.balance !== undefined) given.balance = state.balance;
+  if (state.squadSize !== undefined) given.squadSize = state.squadSize;
+
+  let teamState = { balance: fresh?.snapshot.balance, squadSize: fresh?.snapshot.squadSize, ...given };
+  if (given.balance !== undefined && given.squadSize !== undefined) {
+    stateExpiresAt = Date.now() + TEAM_STATE_TTL;
+  } else if (teamState.balance === undefined || teamState.squadSize === undefined) {
+    // Fetch team data from Firebase
+    const teamSeasonDoc = await adminDb.collection('team_seasons').doc(`${teamId}_${base.seasonId}`).get();
+    if (!teamSeasonDoc.exists) {
+      throw new Error('Team season data not found');
+    }
+    teamState = { ...teamStateFromSeasonDoc(teamSeasonDoc.data()), ...given };
+    stateExpiresAt = Date.now() + TEAM_STATE_TTL;
+  }
+
+  // Rebuilt from the (possibly reloaded) round base; the core calculation is arithmetic only
+  const snapshot = buildReserveSnapshot(base, teamId, teamState as TeamReserveState, base.slots.get(teamId) ?? base.config.max_squad_size);
+  reserveSnapshots.set(key, { snapshot, stateExpiresAt });
+  return snapshot;
+}
+
+/**
+ * Apply a change to every snapshot of a team in a season
+ */
+function updateTeamSnapshots(
+  teamId: string,
+  seasonId: string,
+  change: (snapshot: ReserveSnapshot) => Partial<TeamReserveState>
+): void {
+  reserveSnapshots.forEach((entry, key) => {
+    if (entry.snapshot.teamId === teamId && entry.snapshot.seasonId === seasonId) {
+      reserveSnapshots.set(key, { ...entry, snapshot: updateReserveSnapshot(entry.snapshot, change(entry.snapshot)) });
+    }
+  });
+}
+
+/**
+ * A player was allocated to a team: one more squad member, less budget
+ */
+export function recordReserveAllocation(teamId: string, seasonId: string, amount: number): void {
+  updateTeamSnapshots(teamId, seasonId, snapshot => ({
+    balance: snapshot.balance - amount,
+    squadSize: snapshot.squadSize + 1,
+  }));
+}
+
+/**
+ * A team's budget changed (refund, fine, transfer, ...)
+ */
+export function recordReserveBudgetChange(teamId: string, seasonId: string, balance: number): void {
+  updateTeamSnapshots(teamId, seasonId, () => ({ balance }));
+}
+
+/**
+ * Drop snapshots for a round (e.g. once it is finalized), or all of them
+ */
+export function clearRoundReserves(roundId?: string): void {
+  if (!roundId) {
+    roundBases.clear();
+    reserveSnapshots.clear();
+    return;
+  }
+  roundBases.delete(roundId);
+  reserveSnapshots.forEach((entry, key) => {
+    if (entry.snapshot.roundId === roundId) reserveSnapshots.delete(key);
+  });
+}
+
 /**
  * Async wrapper: Calculate reserve for a specific team and round
- * Fetches all necessary data from database
+ * Served from the team's reserve snapshot for the round
  */
 export async function calculateReserve(
   teamId: string,
   roundId: string,
-  seasonId: string
+  seasonId: string,
+  state?: Partial<TeamReserveState>
 ): Promise<{
   requiresReserve: boolean;
   minimumReserve: number;
@@ -248,108 +531,8 @@ export async function calculateReserve(
   phase: 'phase_1' | 'phase_2' | 'phase_3';
 }> {
   try {
-    // Fetch round info with auction settings
-    const roundResult = await sql`
-      SELECT 
-        r.round_number,
-        r.season_id,
-        r.auction_settings_id,
-        a.phase_1_end_round,
-        a.phase_1_min_balance,
-        a.phase_2_end_round,
-        a.phase_2_min_balance,
-        a.phase_3_min_balance,
-        a.max_squad_size
-      FROM rounds r
-      LEFT JOIN auction_settings a ON r.auction_settings_id = a.id
-      WHERE r.id = ${roundId}
-    `;
-    
-    if (roundResult.length === 0) {
-      throw new Error('Round not found');
-    }
-    
-    const round = roundResult[0];
-    const currentRoundNumber = round.round_number;
-    console.log(`🔍 [Reserve Calculator] Round ${roundId}: round_number = ${currentRoundNumber}, auction_settings_id = ${round.auction_settings_id}`);
-    
-    // Check if auction settings exist
-    if (!round.auction_settings_id || !round.phase_1_end_round) {
-      console.warn(`⚠️ [Reserve Calculator] Round ${roundId} has no auction_settings_id, falling back to season settings`);
-      // Fallback to old method for backward compatibility
-      const settings = await getAuctionSettings(round.season_id || seasonId);
-      const reserveInfo = calculateReserveCore(
-        currentRoundNumber,
-        0, // Will be filled from team data below
-        0,
-        {
-          phase_1_end_round: settings.phase_1_end_round,
-          phase_1_min_balance: settings.phase_1_min_balance,
-          phase_2_end_round: settings.phase_2_end_round,
-          phase_2_min_balance: settings.phase_2_min_balance,
-          phase_3_min_balance: settings.phase_3_min_balance,
-          max_squad_size: settings.max_squad_size,
-        }
-      );
-    }
-    
-    // Fetch team data from Firebase
-    const teamSeasonDoc = await adminDb.collection('team_seasons').doc(`${teamId}_${round.season_id || seasonId}`).get();
-    
-    if (!teamSeasonDoc.exists) {
-      throw new Error('Team season data not found');
-    }
-    
-    const teamData = teamSeasonDoc.data();
-    const currencySystem = teamData?.currency_system || 'single';
-    const teamBalance = currencySystem === 'dual' 
-      ? (teamData?.football_budget || 0) 
-      : (teamData?.budget || 0);
-    const teamSquadSize = teamData?.players_count || 0;
-    
-    // ✅ Get team-specific slot limit from Neon teams table
-    let maxSquadSize = round.max_squad_size; // Fallback to auction settings
-    try {
-      const teamSlotResult = await sql`
-        SELECT football_total_slots
-        FROM teams
-        WHERE id = ${teamId}
-        AND season_id = ${round.season_id || seasonId}
-      `;
-      
-      if (teamSlotResult.length > 0 && teamSlotResult[0].football_total_slots) {
-        maxSquadSize = parseInt(teamSlotResult[0].football_total_slots);
-        console.log(`✅ [Reserve Calculator] Using team-specific slot limit: ${maxSquadSize} (team ${teamId})`);
-      } else {
-        console.log(`⚠️ [Reserve Calculator] Team slot info not found, using auction settings: ${maxSquadSize}`);
-      }
-    } catch (error) {
-      console.warn(`⚠️ [Reserve Calculator] Failed to fetch team slots, using auction settings: ${maxSquadSize}`, error);
-    }
-    
-    // Use auction settings from round with team-specific max_squad_size
-    const settings = {
-      phase_1_end_round: round.phase_1_end_round,
-      phase_1_min_balance: round.phase_1_min_balance,
-      phase_2_end_round: round.phase_2_end_round,
-      phase_2_min_balance: round.phase_2_min_balance,
-      phase_3_min_balance: round.phase_3_min_balance,
-      max_squad_size: maxSquadSize, // ✅ Now uses team-specific value
-    };
-    
-    // Calculate reserve using core function
-    console.log(`🔍 [Reserve Calculator] Input: currentRound=${currentRoundNumber}, balance=${teamBalance}, squadSize=${teamSquadSize}`);
-    console.log(`🔍 [Reserve Calculator] Settings: phase1End=${settings.phase_1_end_round}, phase2End=${settings.phase_2_end_round}, maxSquad=${settings.max_squad_size}`);
-    
-    const reserveInfo = calculateReserveCore(
-      currentRoundNumber,
-      teamBalance,
-      teamSquadSize,
-      settings
-    );
-    
-    console.log(`🔍 [Reserve Calculator] Result: phase=${reserveInfo.phase}, reserve=${reserveInfo.floorReserve}, explanation="${reserveInfo.calculation}"`);
-    
+    const { info: reserveInfo } = await getReserveSnapshot(teamId, roundId, seasonId, state);
+
     return {
       requiresReserve: reserveInfo.enforceStrict,
       minimumReserve: reserveInfo.floorReserve,
@@ -0,0 +1,176 @@
+import { describe, it, expect, vi, beforeEach } from 'vitest';
+
+// Create mock sql function
+const mockSql = vi.fn();
+
+// Mock the neon database before importing the module
+vi.mock('@neondatabase/serverless', () => ({
+  neon: vi.fn(() => mockSql),
+}));
+
+// Mock the finalize-round module
+vi.mock('./finalize-round', () => ({
+  finalizeRound: vi.fn(),
+  applyFinalizationResults: vi.fn(),
+}));
+
+// Import after mocks are set up
+const { finalizeClaimedRound, runRoundFinalizationWorker } = await import('./round-finalization-worker');
+const finalizeRound = await import('./finalize-round');
+
+const sqlText = (call: any[]) => (call[0] as TemplateStringsArray).join('?');
+
+/**
+ * Serve claim queries from a queue of rounds (one per claim, like
+ * SKIP LOCKED with LIMIT 1); every other statement resolves to []
+ */
+function queueRounds(rounds: Array<{ id: string; position: string; status?: string }>) {
+  const queue = [...rounds];
+  mockSql.mockImplementation(async (strings: TemplateStringsArray) => {
+    if (strings.join('?').includes('SKIP LOCKED')) {
+      const next = queue.shift();
+      return next ? [{ end_time: new Date().toISOString(), status: 'finalizing', ...next }] : [];
+    }
+    return [];
+  });
+}
+
+describe('finalizeClaimedRound', () => {
+  beforeEach(() => {
+    vi.clearAllMocks();
+    mockSql.mockReset();
+    mockSql.mockResolvedValue([]);
+  });
+
+  it('should apply allocations and report timings', async () => {
+    vi.mocked(finalizeRound.finalizeRound).mockResolvedValueOnce({
+      success: true,
+      allocations: [
+        { team_id: 'T1', team_name: 'Team 1', player_id: 'P1', player_name: 'Player 1', amount: 100, bid_id: 'b1', phase: 'regular' },
+      ],
+    } as any);
+    vi.mocked(finalizeRound.applyFinalizationResults).mockResolvedValueOnce({ success: true });
+
+    const outcome = await finalizeClaimedRound({ id: 'R1', position: 'GK' });
+
+    expect(outcome.outcome).toBe('finalized');
+    expect(outcome.allocations_count).toBe(1);
+    expect(outcome.timings.total_ms).toBeGreaterThanOrEqual(0);
+    expect(finalizeRound.applyFinalizationResults).toHaveBeenCalledWith('R1', expect.any(Array));
+    expect(mockSql).not.toHaveBeenCalled();
+  });
+
+  it('should mark ties as tiebreaker_pending', async () => {
+    vi.mocked(finalizeRound.finalizeRound).mockResolvedValueOnce({
+      success: false,
+      allocations: [],
+      tieDetected: true,
+      tiedBids: [{}, {}],
+    } as any);
+
+    const outcome = await finalizeClaimedRound({ id: 'R1', position: 'GK' });
+
+    expect(outcome).toMatchObject({ outcome: 'tiebreaker', tied_bids: 2 });
+    expect(sqlText(mockSql.mock.calls[0])).toContain("'tiebreaker_pending'");
+    expect(finalizeRound.applyFinalizationResults).not.toHaveBeenCalled();
+  });
+
+  it('should release the claim when finalizeRound throws', async () => {
+    vi.mocked(finalizeRound.finalizeRound).mockRejectedValueOnce(new Error('Connection reset'));
+
+    await expect(finalizeClaimedRound({ id: 'R1', position: 'GK' })).rejects.toThrow('Connection reset');
+    expect(sqlText(mockSql.mock.calls[0])).toContain("status = 'active'");
+  });
+
+  it('should release the claim when finalization fails', async () => {
+    vi.mocked(finalizeRound.finalizeRound).mockResolvedValueOnce({
+      success: false,
+      allocations: [],
+      error: 'No bids',
+    } as any);
+
+    const outcome = await finalizeClaimedRound({ id: 'R1', position: 'GK' });
+
+    expect(outcome).toMatchObject({ outcome: 'failed', error: 'No bids' });
+    expect(sqlText(mockSql.mock.calls[0])).toContain("status = 'active'");
+  });
+});
+
+describe('runRoundFinalizationWorker', () => {
+  beforeEach(() => {
+    vi.clearAllMocks();
+    mockSql.mockReset();
+  });
+
+  it('should finalize every claimed round with at most `concurrency` in flight', async () => {
+    queueRounds([
+      { id: 'R1', position: 'GK' },
+      { id: 'R2', position: 'DEF' },
+      { id: 'R3', position: 'MID' },
+      { id: 'R4', position: 'FWD' },
+      { id: 'R5', position: 'MID', status: 'expired_pending_finalization' },
+    ]);
+
+    let inFlight = 0;
+    let maxInFlight = 0;
+    vi.mocked(finalizeRound.finalizeRound).mockImplementation(async () => {
+      inFlight++;
+      maxInFlight = Math.max(maxInFlight, inFlight);
+      await new Promise(resolve => setTimeout(resolve, 5));
+      inFlight--;
+      return { success: true, allocations: [] } as any;
+    });
+    vi.mocked(finalizeRound.applyFinalizationResults).mockResolvedValue({ success: true });
+
+    const result = await runRoundFinalizationWorker({ concurrency: 2 });
+
+    expect(result).toMatchObject({ processed: 5, finalized: 4, pending_manual: 1, failed: 0 });
+    expect(maxInFlight).toBe(2);
+    expect(result.rounds.map(r => r.round_id).sort()).toEqual(['R1', 'R2', 'R3', 'R4', 'R5']);
+  });
+
+  it('should stop claiming once maxRounds is reached', async () => {
+    queueRounds([
+      { id: 'R1', position: 'GK' },
+      { id: 'R2', position: 'DEF' },
+      { id: 'R3', position: 'MID' },
+    ]);
+    vi.mocked(finalizeRound.finalizeRound).mockResolvedValue({ success: true, allocations: [] } as any);
+    vi.mocked(finalizeRound.applyFinalizationResults).mockResolvedValue({ success: true });
+
+    const result = await runRoundFinalizationWorker({ concurrency: 3, maxRounds: 2 });
+
+    expect(result.processed).toBe(2);
+    expect(finalizeRound.finalizeRound).toHaveBeenCalledTimes(2);
+  });
+
+  it('should attempt a failing round once and still reach newer rounds', async () => {
+    // R1 is the oldest expired round and always fails, so it is released back
+    // to 'active' after every attempt
+    const active = ['R1', 'R2', 'R3'];
+    mockSql.mockImplementation(async (strings: TemplateStringsArray, ...values: any[]) => {
+      const text = strings.join('?');
+      if (text.includes('SKIP LOCKED')) {
+        const exclude: string[] = values.find(Array.isArray) || [];
+        const id = active.find(roundId => !exclude.includes(roundId));
+        if (!id) return [];
+        active.splice(active.indexOf(id), 1);
+        return [{ id, position: 'GK', end_time: new Date().toISOString(), status: 'finalizing' }];
+      }
+      if (text.includes("status = 'active'")) active.unshift(values[0]);
+      return [];
+    });
+    vi.mocked(finalizeRound.finalizeRound).mockImplementation(async (roundId: string) =>
+      (roundId === 'R1'
+        ? { success: false, allocations: [], error: 'No bids' }
+        : { success: true, allocations: [] }) as any
+    );
+    vi.mocked(finalizeRound.applyFinalizationResults).mockResolvedValue({ success: true });
+
+    const result = await runRoundFinalizationWorker({ concurrency: 1, maxRounds: 10 });
+
+    expect(result).toMatchObject({ processed: 3, finalized: 2, failed: 1 });
+    expect(finalizeRound.finalizeRound).toHaveBeenCalledTimes(3);
+    expect(active).toEqual(['R1']);
+  });
+});
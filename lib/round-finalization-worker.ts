@@ -0,0 +1,249 @@
+/**
+ * Round Finalization Worker
+ *
+ * Claims expired active rounds (auction DB) with FOR UPDATE SKIP LOCKED and
+ * finalizes them with bounded concurrency. Used by the finalize-rounds cron
+ * and by lazy finalization (checkAndFinalizeExpiredRound): a round moves
+ * active -> finalizing in one conditional UPDATE, so only the caller that
+ * claimed it ever runs finalizeRound / applyFinalizationResults.
+ */
+
+import { neon } from '@neondatabase/serverless';
+import { finalizeRound, applyFinalizationResults } from './finalize-round';
+
+const sql = neon(process.env.DATABASE_URL || process.env.NEON_DATABASE_URL!);
+
+export interface ClaimedRound {
+  id: string;
+  position: string;
+  end_time: string;
+  // 'expired_pending_finalization' for manual-mode rounds (committee finalizes)
+  status: 'finalizing' | 'expired_pending_finalization';
+}
+
+export interface RoundFinalizationTimings {
+  finalize_ms: number;  // finalizeRound (bid resolution)
+  apply_ms: number;     // applyFinalizationResults (writes)
+  total_ms: number;
+}
+
+export interface RoundFinalizationOutcome {
+  round_id: string;
+  position: string;
+  outcome: 'finalized' | 'tiebreaker' | 'pending_manual' | 'failed';
+  error?: string;
+  tied_bids?: number;
+  allocations_count?: number;
+  allocations?: Array<{ team_name: string; player_name: string; amount: number; phase: string }>;
+  timings: RoundFinalizationTimings;
+}
+
+export interface FinalizationWorkerOptions {
+  concurrency?: number;   // Rounds finalized in parallel
+  maxRounds?: number;     // Upper bound on rounds claimed per invocation
+  timeBudgetMs?: number;  // Stop claiming new rounds after this much time
+}
+
+export interface FinalizationWorkerResult {
+  processed: number;
+  finalized: number;
+  tiebreakers: number;
+  pending_manual: number;
+  failed: number;
+  duration_ms: number;
+  rounds: RoundFinalizationOutcome[];
+}
+
+/**
+ * Atomically claim up to `limit` expired active rounds, oldest first.
+ * Auto-mode rounds move to 'finalizing'; manual-mode rounds move to
+ * 'expired_pending_finalization' (same transition as lazy finalization).
+ * Concurrent workers skip rows another worker has locked instead of
+ * blocking on them. `excludeIds` skips rounds the caller already attempted,
+ * so a released round isn't claimed again straight away.
+ */
+export async function claimExpiredRounds(limit: number, excludeIds: string[] = []): Promise<ClaimedRound[]> {
+  const rows = await sql`
+    UPDATE rounds r
+    SET status = CASE
+          WHEN r.finalization_mode = 'manual' THEN 'expired_pending_finalization'
+          ELSE 'finalizing'
+        END,
+        updated_at = NOW()
+    FROM (
+      SELECT id FROM rounds
+      WHERE status = 'active'
+        AND end_time < NOW()
+        AND id <> ALL(${excludeIds})
+      ORDER BY end_time ASC, id
+      LIMIT ${limit}
+      FOR UPDATE SKIP LOCKED
+    ) expired
+    WHERE r.id = expired.id
+    RETURNING r.id, r.position, r.end_time, r.status
+  `;
+
+  return rows.map(row => ({
+    id: row.id,
+    position: row.position,
+    end_time: row.end_time,
+    status: row.status,
+  }));
+}
+
+/**
+ * Release a claimed round back to 'active' so a later run retries it
+ */
+async function releaseRoundClaim(roundId: string): Promise<void> {
+  await sql`
+    UPDATE rounds
+    SET status = 'active',
+        updated_at = NOW()
+    WHERE id = ${roundId} AND status = 'finalizing'
+  `;
+}
+
+/**
+ * Finalize a round the caller has already claimed (status 'finalizing').
+ *
+ * - Tie: the round moves to 'tiebreaker_pending' (finalizeRound has created
+ *   the tiebreaker), so applyFinalizationResults can run once it's resolved
+ * - finalizeRound failure (returned or thrown): the claim is released back
+ *   to 'active' so the next run retries
+ * - applyFinalizationResults failure: the round stays 'finalizing' for
+ *   /api/admin/fix-stuck-round, since results may be partially applied
+ */
+export async function finalizeClaimedRound(
+  round: Pick<ClaimedRound, 'id' | 'position'>
+): Promise<RoundFinalizationOutcome> {
+  const startedAt = Date.now();
+  const timings: RoundFinalizationTimings = { finalize_ms: 0, apply_ms: 0, total_ms: 0 };
+  const done = (outcome: Omit<RoundFinalizationOutcome, 'round_id' | 'position' | 'timings'>): RoundFinalizationOutcome => {
+    timings.total_ms = Date.now() - startedAt;
+    return { round_id: round.id, position: round.position, ...outcome, timings };
+  };
+
+  let finalizationResult: Awaited<ReturnType<typeof finalizeRound>>;
+  try {
+    finalizationResult = await finalizeRound(round.id);
+  } catch (error: any) {
+    await releaseRoundClaim(round.id);
+    throw error;
+  }
+  timings.finalize_ms = Date.now() - startedAt;
+
+  if (!finalizationResult.success) {
+    if (finalizationResult.tieDetected) {
+      await sql`
+        UPDATE rounds
+        SET status = 'tiebreaker_pending',
+            updated_at = NOW()
+        WHERE id = ${round.id} AND status = 'finalizing'
+      `;
+
+      console.log(`⚠️ Tie detected in round ${round.id}. Marked for tiebreaker.`);
+      return done({
+        outcome: 'tiebreaker',
+        error: 'Tie detected - tiebreaker required',
+        tied_bids: finalizationResult.tiedBids?.length || 0,
+      });
+    }
+
+    await releaseRoundClaim(round.id);
+
+    console.error(`❌ Failed to finalize round ${round.id}:`, finalizationResult.error);
+    return done({ outcome: 'failed', error: finalizationResult.error });
+  }
+
+  const applyStart = Date.now();
+  const applyResult = await applyFinalizationResults(round.id, finalizationResult.allocations);
+  timings.apply_ms = Date.now() - applyStart;
+
+  if (!applyResult.success) {
+    console.error(`❌ Failed to apply finalization for round ${round.id}:`, applyResult.error);
+    return done({ outcome: 'failed', error: applyResult.error });
+  }
+
+  return done({
+    outcome: 'finalized',
+    allocations_count: finalizationResult.allocations.length,
+    allocations: finalizationResult.allocations.map(alloc => ({
+      team_name: alloc.team_name,
+      player_name: alloc.player_name,
+      amount: alloc.amount,
+      phase: alloc.phase,
+    })),
+  });
+}
+
+/**
+ * Worker entry point: `concurrency` slots each claim one expired round at a
+ * time and finalize it, until no expired rounds are left, maxRounds have
+ * been claimed or the time budget runs out. Rounds are claimed only when a
+ * slot is free, so a timed-out invocation never strands unprocessed claims.
+ * Each round is attempted at most once per invocation: a round that fails
+ * and is released is left for the next run instead of starving newer ones.
+ */
+export async function runRoundFinalizationWorker(
+  options: FinalizationWorkerOptions = {}
+): Promise<FinalizationWorkerResult> {
+  const { concurrency = 3, maxRounds = 10, timeBudgetMs = 20000 } = options;
+  const startedAt = Date.now();
+  const rounds: RoundFinalizationOutcome[] = [];
+  const attempted = new Set<string>();
+  let claimed = 0;
+
+  const runSlot = async () => {
+    while (claimed < maxRounds && Date.now() - startedAt < timeBudgetMs) {
+      claimed++;
+      const [round] = await claimExpiredRounds(1, [...attempted]);
+      if (!round) {
+        claimed--;
+        return;
+      }
+      attempted.add(round.id);
+
+      if (round.status === 'expired_pending_finalization') {
+        console.log(`⏸️ Round ${round.id} expired with manual finalization mode - awaiting committee`);
+        rounds.push({
+          round_id: round.id,
+          position: round.position,
+          outcome: 'pending_manual',
+          timings: { finalize_ms: 0, apply_ms: 0, total_ms: 0 },
+        });
+        continue;
+      }
+
+      console.log(`🔒 Claimed round ${round.id} (${round.position}) for finalization`);
+      try {
+        const outcome = await finalizeClaimedRound(round);
+        console.log(`⏱️ Round ${round.id}: ${outcome.outcome} in ${outcome.timings.total_ms}ms (finalize ${outcome.timings.finalize_ms}ms, apply ${outcome.timings.apply_ms}ms)`);
+        rounds.push(outcome);
+      } catch (error: any) {
+        console.error(`Error processing round ${round.id}:`, error);
+        rounds.push({
+          round_id: round.id,
+          position: round.position,
+          outcome: 'failed',
+          error: error?.message || 'Unexpected error during finalization',
+          timings: { finalize_ms: 0, apply_ms: 0, total_ms: 0 },
+        });
+      }
+    }
+  };
+
+  await Promise.all(Array.from({ length: Math.max(1, concurrency) }, runSlot));
+
+  const count = (outcome: RoundFinalizationOutcome['outcome']) =>
+    rounds.filter(r => r.outcome === outcome).length;
+
+  return {
+    processed: rounds.length,
+    finalized: count('finalized'),
+    tiebreakers: count('tiebreaker'),
+    pending_manual: count('pending_manual'),
+    failed: count('failed'),
+    duration_ms: Date.now() - startedAt,
+    rounds,
+  };
+}
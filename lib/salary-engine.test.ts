@@ -0,0 +1,148 @@
+import { describe, it, expect, vi, beforeEach } from 'vitest';
+import fixtures from './salary-engine.fixtures.json';
+
+vi.mock('./neon/tournament-config', () => ({ getTournamentDb: vi.fn() }));
+// Firestore stand-in: docs by path, one runTransaction that records its writes
+const firestoreDocs = new Map<string, Record<string, any>>();
+const txWrites: Array<{ op: string; path: string; data: any }> = [];
+const docRef = (path: string) => ({ path });
+vi.mock('./firebase/admin', () => ({
+  adminDb: {
+    collection: (name: string) => ({
+      doc: (id: string = `auto-${txWrites.length}`) => docRef(`${name}/${id}`),
+    }),
+    runTransaction: async (fn: (tx: any) => Promise<any>) => fn({
+      getAll: async (...refs: Array<{ path: string }>) => refs.map(ref => ({
+        exists: firestoreDocs.has(ref.path),
+        data: () => firestoreDocs.get(ref.path),
+      })),
+      update: (ref: { path: string }, data: any) => txWrites.push({ op: 'update', path: ref.path, data }),
+      set: (ref: { path: string }, data: any) => txWrites.push({ op: 'set', path: ref.path, data }),
+    }),
+  },
+}));
+vi.mock('./transaction-logger', () => ({ toTransactionDoc: (data: any) => data }));
+vi.mock('./player-transfers-v2', () => ({ toIncrementUpdate: (fields: any) => fields }));
+vi.mock('./fixture-result-pipeline', () => ({ salaryCharges: vi.fn() }));
+
+// Import after mocks are set up
+const {
+  chunkChargesByFixture,
+  commitSalaryDeductions,
+  planCategoryChanges,
+  planSalaryDeductions,
+  resolveSalaryCharges,
+  toPlayerSalaryColumns,
+} = await import('./salary-engine');
+const { calculateRealPlayerSalary, calculateStarRating } = await import('./contracts');
+
+/**
+ * Same composition as run_case in scripts/salary_engine.py
+ */
+function runCase(testCase: any) {
+  const columns = toPlayerSalaryColumns(testCase.players);
+  const { resolved, skipped } = resolveSalaryCharges(testCase.charges, columns);
+  const plan = planSalaryDeductions(resolved, new Map(Object.entries(testCase.balances)) as Map<string, number>);
+  return {
+    charges: plan.charges,
+    teams: plan.teams,
+    skipped: [...skipped, ...plan.skipped],
+    category_changes: planCategoryChanges(columns),
+    salaries: (testCase.contracts || []).map(([value, stars]: number[]) => calculateRealPlayerSalary(value, stars)),
+    star_ratings: (testCase.star_points || []).map((points: number) => calculateStarRating(points)),
+  };
+}
+
+describe('salary engine (shared fixtures with scripts/salary_engine.py)', () => {
+  for (const testCase of fixtures.cases as any[]) {
+    it(testCase.name, () => {
+      const actual: Record<string, unknown> = runCase(testCase);
+      for (const [key, expected] of Object.entries(testCase.expected)) {
+        expect(actual[key], key).toEqual(expected);
+      }
+    });
+  }
+});
+
+describe('planSalaryDeductions', () => {
+  it('charges every player of a team against one running balance', () => {
+    const plan = planSalaryDeductions(
+      {
+        fixtureIds: ['f1', 'f2'],
+        playerIds: ['p1', 'p2'],
+        playerNames: ['One', 'Two'],
+        teamIds: ['T1', 'T1'],
+        salaries: [2, 3],
+      },
+      new Map([['T1', 10]])
+    );
+
+    expect(plan.charges.map(c => [c.balance_before, c.balance_after])).toEqual([[10, 8], [8, 5]]);
+    expect(plan.teams).toEqual([
+      { team_id: 'T1', total: 5, player_count: 2, balance_before: 10, balance_after: 5 },
+    ]);
+  });
+});
+
+describe('chunkChargesByFixture', () => {
+  it('keeps each fixture whole within the write limit', () => {
+    const chunks = chunkChargesByFixture(
+      {
+        fixtureIds: ['f1', 'f1', 'f2', 'f2', 'f3'],
+        playerIds: ['p1', 'p2', 'p3', 'p4', 'p5'],
+        playerNames: ['1', '2', '3', '4', '5'],
+        teamIds: ['T1', 'T2', 'T1', 'T2', 'T1'],
+        salaries: [1, 1, 1, 1, 1],
+      },
+      6
+    );
+
+    expect(chunks.map(c => c.fixtureIds)).toEqual([['f1', 'f1'], ['f2', 'f2'], ['f3']]);
+  });
+});
+
+describe('commitSalaryDeductions', () => {
+  const resolved = {
+    fixtureIds: ['f1', 'f2'],
+    playerIds: ['p1', 'p2'],
+    playerNames: ['One', 'Two'],
+    teamIds: ['T1', 'T1'],
+    salaries: [2, 3],
+  };
+
+  beforeEach(() => {
+    firestoreDocs.clear();
+    txWrites.length = 0;
+    firestoreDocs.set('team_seasons/T1_SSPSLS16', { real_player_budget: 10 });
+  });
+
+  it('writes budgets, logs and fixture markers in one transaction', async () => {
+    const result = await commitSalaryDeductions('SSPSLS16', resolved);
+
+    expect(result.charges).toHaveLength(2);
+    expect(result.alreadyCharged).toEqual([]);
+    expect(txWrites.filter(w => w.op === 'update')).toEqual([
+      { op: 'update', path: 'team_seasons/T1_SSPSLS16', data: { real_player_budget: -5, real_player_spent: 5 } },
+    ]);
+    expect(txWrites.filter(w => w.path.startsWith('transactions/'))).toHaveLength(2);
+    expect(txWrites.filter(w => w.path.startsWith('fixture_salary_charges/')).map(w => w.path)).toEqual([
+      'fixture_salary_charges/SSPSLS16_f1',
+      'fixture_salary_charges/SSPSLS16_f2',
+    ]);
+  });
+
+  it('skips fixtures whose marker already exists', async () => {
+    firestoreDocs.set('fixture_salary_charges/SSPSLS16_f1', { charge_count: 1 });
+
+    const result = await commitSalaryDeductions('SSPSLS16', resolved);
+
+    expect(result.alreadyCharged).toEqual(['f1']);
+    expect(result.charges.map(c => c.fixture_id)).toEqual(['f2']);
+    expect(result.teams).toEqual([
+      { team_id: 'T1', total: 3, player_count: 1, balance_before: 10, balance_after: 7 },
+    ]);
+    expect(result.skipped).toEqual([
+      { fixture_id: 'f1', player_id: 'p1', player_name: 'One', error: 'Fixture salaries already charged' },
+    ]);
+  });
+});
@@ -0,0 +1,499 @@
+/**
+ * Matchday Salary Engine
+ *
+ * Charges real player salaries for a whole matchday (every fixture, every
+ * team) and optionally re-ranks player categories, as one columnar pass over
+ * the season's player_seasons rows. Reads and writes are one per table:
+ *
+ * 1. Tournament DB: the matchday's matchups (one join) and player_seasons (one query)
+ * 2. Firestore: one transaction per chunk of fixtures that reads the
+ *    fixture_salary_charges markers and team_seasons budgets, then writes the
+ *    budget increments, transaction logs and markers together
+ * 3. Tournament DB: changed categories (one UNNEST update)
+ *
+ * The pure planners (resolveSalaryCharges, planSalaryDeductions,
+ * planCategoryChanges) are mirrored by scripts/salary_engine.py; both are
+ * checked against lib/salary-engine.fixtures.json.
+ */
+
+import { getTournamentDb } from './neon/tournament-config';
+import { adminDb } from './firebase/admin';
+import { calculatePlayerCategories } from './contracts';
+import { toTransactionDoc, TransactionData } from './transaction-logger';
+import { toIncrementUpdate } from './player-transfers-v2';
+import { ResultMatchup, salaryCharges } from './fixture-result-pipeline';
+
+const CATEGORY_NAMES = { legend: 'Legend', classic: 'Classic' } as const;
+const FIRESTORE_IN_LIMIT = 30;
+// Firestore allows 500 writes per transaction; leave room for budget updates
+const TRANSACTION_WRITE_LIMIT = 450;
+// One doc per charged fixture, written with the budget increments
+const SALARY_MARKER_COLLECTION = 'fixture_salary_charges';
+
+export interface SalaryChargeInput {
+  fixture_id: string;
+  player_id: string;
+  player_name: string;
+}
+
+export interface SkippedSalaryCharge extends SalaryChargeInput {
+  error: string;
+}
+
+/**
+ * player_seasons rows for a season, one array per column
+ */
+export interface PlayerSalaryColumns {
+  playerIds: string[];
+  teamIds: (string | null)[];
+  salaries: number[];
+  points: number[];
+  categories: (string | null)[];
+}
+
+/**
+ * Resolved charges, one array per column
+ */
+export interface ResolvedSalaryCharges {
+  fixtureIds: string[];
+  playerIds: string[];
+  playerNames: string[];
+  teamIds: string[];
+  salaries: number[];
+}
+
+export interface AppliedSalaryCharge extends SalaryChargeInput {
+  team_id: string;
+  salary: number;
+  balance_before: number;
+  balance_after: number;
+}
+
+export interface TeamSalaryDeduction {
+  team_id: string;
+  total: number;
+  player_count: number;
+  balance_before: number;
+  balance_after: number;
+}
+
+export interface SalaryDeductionPlan {
+  charges: AppliedSalaryCharge[];
+  teams: TeamSalaryDeduction[];
+  skipped: SkippedSalaryCharge[];
+}
+
+export interface SalaryCommitResult extends SalaryDeductionPlan {
+  alreadyCharged: string[];  // Fixtures skipped because their marker exists
+}
+
+export interface CategoryChange {
+  player_id: string;
+  category: string;
+}
+
+export function toPlayerSalaryColumns(rows: any[]): PlayerSalaryColumns {
+  const columns: PlayerSalaryColumns = { playerIds: [], teamIds: [], salaries: [], points: [], categories: [] };
+  for (const row of rows) {
+    columns.playerIds.push(row.player_id);
+    columns.teamIds.push(row.team_id || null);
+    columns.salaries.push(parseFloat(row.salary_per_match) || 0);
+    columns.points.push(Number(row.points) || 0);
+    columns.categories.push(row.category ?? null);
+  }
+  return columns;
+}
+
+/**
+ * Attach each charge's team and current salary; charges for players with no
+ * row, no team or no salary are skipped
+ */
+export function resolveSalaryCharges(
+  charges: SalaryChargeInput[],
+  columns: PlayerSalaryColumns
+): { resolved: ResolvedSalaryCharges; skipped: SkippedSalaryCharge[] } {
+  const indexById = new Map<string, number>();
+  columns.playerIds.forEach((playerId, index) => indexById.set(playerId, index));
+
+  const resolved: ResolvedSalaryCharges = { fixtureIds: [], playerIds: [], playerNames: [], teamIds: [], salaries: [] };
+  const skipped: SkippedSalaryCharge[] = [];
+
+  for (const charge of charges) {
+    const index = indexById.get(charge.player_id);
+    if (index === undefined) {
+      skipped.push({ ...charge, error: 'Not found in player_seasons' });
+      continue;
+    }
+    const teamId = columns.teamIds[index];
+    const salary = columns.salaries[index];
+    if (!teamId || salary <= 0) {
+      skipped.push({ ...charge, error: 'No team or salary' });
+      continue;
+    }
+    resolved.fixtureIds.push(charge.fixture_id);
+    resolved.playerIds.push(charge.player_id);
+    resolved.playerNames.push(charge.player_name);
+    resolved.teamIds.push(teamId);
+    resolved.salaries.push(salary);
+  }
+
+  return { resolved, skipped };
+}
+
+/**
+ * Running balances and per-team totals for resolved charges, in charge order
+ * Teams without a team_seasons balance are skipped
+ */
+export function planSalaryDeductions(
+  resolved: ResolvedSalaryCharges,
+  balances: Map<string, number>
+): SalaryDeductionPlan {
+  const plan: SalaryDeductionPlan = { charges: [], teams: [], skipped: [] };
+  const running = new Map(balances);
+  const teams = new Map<string, TeamSalaryDeduction>();
+
+  for (let i = 0; i < resolved.playerIds.length; i++) {
+    const teamId = resolved.teamIds[i];
+    const salary = resolved.salaries[i];
+    const charge = {
+      fixture_id: resolved.fixtureIds[i],
+      player_id: resolved.playerIds[i],
+      player_name: resolved.playerNames[i]
+    };
+
+    const balanceBefore = running.get(teamId);
+    if (balanceBefore === undefined) {
+      plan.skipped.push({ ...charge, error: 'Team season document not found' });
+      continue;
+    }
+
+    const balanceAfter = balanceBefore - salary;
+    running.set(teamId, balanceAfter);
+    plan.charges.push({ ...charge, team_id: teamId, salary, balance_before: balanceBefore, balance_after: balanceAfter });
+
+    const team = teams.get(teamId);
+    if (team) {
+      team.total += salary;
+      team.player_count += 1;
+      team.balance_after = balanceAfter;
+    } else {
+      teams.set(teamId, {
+        team_id: teamId,
+        total: salary,
+        player_count: 1,
+        balance_before: balanceBefore,
+        balance_after: balanceAfter
+      });
+    }
+  }
+
+  plan.teams = [...teams.values()].sort((a, b) => (a.team_id < b.team_id ? -1 : a.team_id > b.team_id ? 1 : 0));
+  return plan;
+}
+
+/**
+ * League-wide Legend / Classic categories by points; only changes are returned
+ */
+export function planCategoryChanges(columns: PlayerSalaryColumns): CategoryChange[] {
+  const categories = calculatePlayerCategories(columns.points);
+  const changes: CategoryChange[] = [];
+  categories.forEach((category, index) => {
+    const name = CATEGORY_NAMES[category];
+    if (columns.categories[index] !== name) {
+      changes.push({ player_id: columns.playerIds[index], category: name });
+    }
+  });
+  return changes;
+}
+
+/**
+ * Split resolved charges into chunks of whole fixtures, each small enough
+ * for one Firestore transaction (charge logs + fixture markers + teams)
+ */
+export function chunkChargesByFixture(
+  resolved: ResolvedSalaryCharges,
+  writeLimit: number = TRANSACTION_WRITE_LIMIT
+): ResolvedSalaryCharges[] {
+  const byFixture = new Map<string, number[]>();
+  resolved.fixtureIds.forEach((fixtureId, i) => {
+    byFixture.set(fixtureId, [...(byFixture.get(fixtureId) || []), i]);
+  });
+
+  const chunks: number[][] = [];
+  let current: number[] = [];
+  let fixtures = 0;
+  let teams = new Set<string>();
+  for (const indices of byFixture.values()) {
+    const nextTeams = new Set([...teams, ...indices.map(i => resolved.teamIds[i])]);
+    if (current.length > 0 && current.length + indices.length + fixtures + 1 + nextTeams.size > writeLimit) {
+      chunks.push(current);
+      current = [];
+      fixtures = 0;
+      teams = new Set();
+    }
+    current.push(...indices);
+    fixtures++;
+    indices.forEach(i => teams.add(resolved.teamIds[i]));
+  }
+  if (current.length > 0) chunks.push(current);
+
+  return chunks.map(indices => ({
+    fixtureIds: indices.map(i => resolved.fixtureIds[i]),
+    playerIds: indices.map(i => resolved.playerIds[i]),
+    playerNames: indices.map(i => resolved.playerNames[i]),
+    teamIds: indices.map(i => resolved.teamIds[i]),
+    salaries: indices.map(i => resolved.salaries[i]),
+  }));
+}
+
+function salaryMarkerRef(seasonId: string, fixtureId: string) {
+  return adminDb.collection(SALARY_MARKER_COLLECTION).doc(`${seasonId}_${fixtureId}`);
+}
+
+function toSalaryLog(seasonId: string, charge: AppliedSalaryCharge): TransactionData {
+  return {
+    team_id: charge.team_id,
+    season_id: seasonId,
+    transaction_type: 'salary_payment',
+    currency_type: 'real_player',
+    amount: -charge.salary,
+    balance_before: charge.balance_before,
+    balance_after: charge.balance_after,
+    description: `Salary: ${charge.player_name}`,
+    metadata: {
+      fixture_id: charge.fixture_id,
+      player_id: charge.player_id,
+      player_name: charge.player_name,
+      salary_amount: charge.salary,
+      player_count: 1
+    }
+  };
+}
+
+/**
+ * Charge one chunk in a Firestore transaction. Fixtures whose marker already
+ * exists are skipped; for the rest the budget increments, transaction logs
+ * and markers commit together, so a fixture is charged exactly once.
+ */
+async function commitSalaryChunk(
+  seasonId: string,
+  chunk: ResolvedSalaryCharges
+): Promise<SalaryCommitResult> {
+  const fixtureIds = [...new Set(chunk.fixtureIds)];
+  const teamIds = [...new Set(chunk.teamIds)];
+  const markerRefs = fixtureIds.map(fixtureId => salaryMarkerRef(seasonId, fixtureId));
+  const teamRefs = teamIds.map(teamId => adminDb.collection('team_seasons').doc(`${teamId}_${seasonId}`));
+
+  return adminDb.runTransaction(async tx => {
+    const docs = await tx.getAll(...markerRefs, ...teamRefs);
+    const alreadyCharged = new Set(fixtureIds.filter((_, i) => docs[i].exists));
+    const balances = new Map<string, number>();
+    docs.slice(markerRefs.length).forEach((doc, i) => {
+      if (doc.exists) balances.set(teamIds[i], doc.data()?.real_player_budget || 0);
+    });
+
+    const pending = chunk.fixtureIds.map((fixtureId, i) => alreadyCharged.has(fixtureId) ? -1 : i).filter(i => i >= 0);
+    const plan = planSalaryDeductions({
+      fixtureIds: pending.map(i => chunk.fixtureIds[i]),
+      playerIds: pending.map(i => chunk.playerIds[i]),
+      playerNames: pending.map(i => chunk.playerNames[i]),
+      teamIds: pending.map(i => chunk.teamIds[i]),
+      salaries: pending.map(i => chunk.salaries[i]),
+    }, balances);
+
+    for (const team of plan.teams) {
+      tx.update(teamRefs[teamIds.indexOf(team.team_id)], toIncrementUpdate({
+        real_player_budget: -team.total,
+        real_player_spent: team.total
+      }));
+    }
+    for (const charge of plan.charges) {
+      tx.set(adminDb.collection('transactions').doc(), toTransactionDoc(toSalaryLog(seasonId, charge)));
+    }
+    fixtureIds.forEach((fixtureId, i) => {
+      if (alreadyCharged.has(fixtureId)) return;
+      tx.set(markerRefs[i], {
+        season_id: seasonId,
+        fixture_id: fixtureId,
+        charge_count: plan.charges.filter(c => c.fixture_id === fixtureId).length,
+        charged_at: new Date()
+      });
+    });
+
+    chunk.fixtureIds.forEach((fixtureId, i) => {
+      if (!alreadyCharged.has(fixtureId)) return;
+      plan.skipped.push({
+        fixture_id: fixtureId,
+        player_id: chunk.playerIds[i],
+        player_name: chunk.playerNames[i],
+        error: 'Fixture salaries already charged'
+      });
+    });
+
+    return { ...plan, alreadyCharged: [...alreadyCharged] };
+  });
+}
+
+/**
+ * Combine per-chunk team totals (a team's first balance, last balance)
+ */
+function mergeTeamDeductions(teams: TeamSalaryDeduction[]): TeamSalaryDeduction[] {
+  const merged = new Map<string, TeamSalaryDeduction>();
+  for (const team of teams) {
+    const existing = merged.get(team.team_id);
+    if (existing) {
+      existing.total += team.total;
+      existing.player_count += team.player_count;
+      existing.balance_after = team.balance_after;
+    } else {
+      merged.set(team.team_id, { ...team });
+    }
+  }
+  return [...merged.values()].sort((a, b) => (a.team_id < b.team_id ? -1 : a.team_id > b.team_id ? 1 : 0));
+}
+
+/**
+ * Write a salary plan. Each chunk of fixtures is one Firestore transaction
+ * that checks the fixtures' charge markers, then writes budget increments,
+ * transaction logs and markers together, so repeated or overlapping runs
+ * never charge a fixture twice.
+ */
+export async function commitSalaryDeductions(
+  seasonId: string,
+  resolved: ResolvedSalaryCharges
+): Promise<SalaryCommitResult> {
+  const result: SalaryCommitResult = { charges: [], teams: [], skipped: [], alreadyCharged: [] };
+  if (resolved.playerIds.length === 0) return result;
+
+  for (const chunk of chunkChargesByFixture(resolved)) {
+    const chunkResult = await commitSalaryChunk(seasonId, chunk);
+    result.charges.push(...chunkResult.charges);
+    result.teams.push(...chunkResult.teams);
+    result.skipped.push(...chunkResult.skipped);
+    result.alreadyCharged.push(...chunkResult.alreadyCharged);
+  }
+  result.teams = mergeTeamDeductions(result.teams);
+
+  return result;
+}
+
+/**
+ * Fixtures that already have real player salary transactions (e.g. charged
+ * by the result pipeline, which writes no marker)
+ */
+async function alreadyChargedFixtures(fixtureIds: string[]): Promise<Set<string>> {
+  const charged = new Set<string>();
+  for (let i = 0; i < fixtureIds.length; i += FIRESTORE_IN_LIMIT) {
+    const snapshot = await adminDb.collection('transactions')
+      .where('metadata.fixture_id', 'in', fixtureIds.slice(i, i + FIRESTORE_IN_LIMIT))
+      .where('currency_type', '==', 'real_player')
+      .get();
+    snapshot.docs.forEach(doc => {
+      const data = doc.data();
+      if (['salary', 'salary_payment'].includes(data.transaction_type)) {
+        charged.add(data.metadata.fixture_id);
+      }
+    });
+  }
+  return charged;
+}
+
+export interface MatchdaySalaryFilter {
+  seasonId: string;
+  roundNumber?: number;
+  leg?: string;
+  fixtureIds?: string[];
+}
+
+export interface MatchdaySalaryReport {
+  fixtures: string[];
+  alreadyCharged: string[];
+  teams: TeamSalaryDeduction[];
+  charged: number;
+  skipped: SkippedSalaryCharge[];
+  categoryChanges: CategoryChange[];
+}
+
+/**
+ * Charge salaries for every completed fixture of a matchday in one pass
+ *
+ * Fixtures that already have salary transactions (e.g. charged by the result
+ * pipeline) or a fixture_salary_charges marker are left alone; the marker is
+ * written in the same transaction as the budget increments, so the run is
+ * safe to repeat or overlap.
+ */
+export async function runMatchdaySalaries(
+  filter: MatchdaySalaryFilter,
+  options: { recalculateCategories?: boolean } = {}
+): Promise<MatchdaySalaryReport> {
+  const sql = getTournamentDb();
+
+  const [matchupRows, playerRows] = await Promise.all([
+    sql`
+      SELECT m.fixture_id, m.position, m.home_player_id, m.home_player_name,
+             m.away_player_id, m.away_player_name, m.home_goals, m.away_goals
+      FROM matchups m
+      JOIN fixtures f ON f.id = m.fixture_id
+      WHERE f.season_id = ${filter.seasonId}
+        AND f.status = 'completed'
+        ${filter.roundNumber ? sql`AND f.round_number = ${filter.roundNumber}` : sql``}
+        ${filter.leg ? sql`AND COALESCE(f.leg, 'first') = ${filter.leg}` : sql``}
+        ${filter.fixtureIds ? sql`AND f.id = ANY(${filter.fixtureIds})` : sql``}
+      ORDER BY m.fixture_id, m.position
+    `,
+    sql`
+      SELECT player_id, team_id, salary_per_match, points, category
+      FROM player_seasons
+      WHERE season_id = ${filter.seasonId}
+    `
+  ]);
+
+  const byFixture = new Map<string, ResultMatchup[]>();
+  for (const row of matchupRows as any[]) {
+    const list = byFixture.get(row.fixture_id) || [];
+    list.push(row);
+    byFixture.set(row.fixture_id, list);
+  }
+
+  const fixtures = [...byFixture.keys()];
+  const charged = await alreadyChargedFixtures(fixtures);
+  const charges: SalaryChargeInput[] = [];
+  byFixture.forEach((matchups, fixtureId) => {
+    if (charged.has(fixtureId)) return;
+    for (const charge of salaryCharges(null, matchups)) {
+      charges.push({ fixture_id: fixtureId, player_id: charge.player_id, player_name: charge.player_name });
+    }
+  });
+
+  const columns = toPlayerSalaryColumns(playerRows as any[]);
+  const { resolved, skipped } = resolveSalaryCharges(charges, columns);
+  const plan = await commitSalaryDeductions(filter.seasonId, resolved);
+
+  let categoryChanges: CategoryChange[] = [];
+  if (options.recalculateCategories) {
+    categoryChanges = planCategoryChanges(columns);
+    if (categoryChanges.length > 0) {
+      await sql`
+        UPDATE player_seasons ps
+        SET category = c.category, updated_at = NOW()
+        FROM UNNEST(
+          ${categoryChanges.map(c => c.player_id)}::text[],
+          ${categoryChanges.map(c => c.category)}::text[]
+        ) AS c(player_id, category)
+        WHERE ps.player_id = c.player_id AND ps.season_id = ${filter.seasonId}
+      `;
+    }
+  }
+
+  const planSkipped = plan.skipped.filter(c => !plan.alreadyCharged.includes(c.fixture_id));
+  console.log(`💰 Matchday salaries: ${plan.charges.length} charged across ${plan.teams.length} teams, ${skipped.length + planSkipped.length} skipped`);
+
+  return {
+    fixtures,
+    alreadyCharged: [...charged, ...plan.alreadyCharged],
+    teams: plan.teams,
+    charged: plan.charges.length,
+    skipped: [...skipped, ...planSkipped],
+    categoryChanges
+  };
+}
@@ -0,0 +1,48 @@
+import { adminDb } from '@/lib/firebase/admin';
+import {
+  DEFAULT_STAR_RATING_CONFIG,
+  StarRatingConfigItem,
+  StarRatingTable,
+  invalidateStarRatingConfig,
+  loadStarRatingTable,
+} from '@/lib/contracts';
+
+/**
+ * Server-side star rating config (Firestore `seasons/{id}.star_rating_config`)
+ *
+ * The table is read once per season and cached in lib/contracts.ts, so API
+ * routes price players with synchronous lookups instead of an HTTP call each.
+ */
+
+/**
+ * Read a season's star rating config from Firestore (defaults if unset)
+ * Returns null if the season doesn't exist
+ */
+export async function readStarRatingConfig(seasonId: string): Promise<StarRatingConfigItem[] | null> {
+  const seasonDoc = await adminDb.collection('seasons').doc(seasonId).get();
+  if (!seasonDoc.exists) {
+    return null;
+  }
+  return seasonDoc.data()?.star_rating_config || DEFAULT_STAR_RATING_CONFIG;
+}
+
+/**
+ * Cached star rating table for a season
+ */
+export function getSeasonStarRatingTable(seasonId: string): Promise<StarRatingTable> {
+  return loadStarRatingTable(seasonId, readStarRatingConfig);
+}
+
+/**
+ * Save a season's star rating config and drop the cached table
+ */
+export async function saveStarRatingConfig(
+  seasonId: string,
+  config: StarRatingConfigItem[]
+): Promise<void> {
+  await adminDb.collection('seasons').doc(seasonId).update({
+    star_rating_config: config,
+    updated_at: new Date(),
+  });
+  invalidateStarRatingConfig(seasonId);
+}
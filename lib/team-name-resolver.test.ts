@@ -0,0 +1,92 @@
+import { describe, it, expect, vi, beforeEach } from 'vitest';
+
+// Create mock sql function
+const mockSql = vi.fn();
+
+// Mock the neon database before importing the module
+vi.mock('@neondatabase/serverless', () => ({
+  neon: vi.fn(() => mockSql),
+}));
+
+// Import after mocks are set up
+const {
+  getCurrentTeamNames,
+  getCurrentTeamNamesById,
+  getHistoricalTeamNames,
+  clearTeamNameCache,
+} = await import('./team-name-resolver');
+
+describe('team-name-resolver', () => {
+  beforeEach(() => {
+    mockSql.mockReset();
+    clearTeamNameCache();
+  });
+
+  it('resolves a batch of UIDs with one names query', async () => {
+    mockSql
+      .mockResolvedValueOnce([{ version: 1 }])
+      .mockResolvedValueOnce([
+        { key: 'uid1', name: 'Alpha FC' },
+        { key: 'uid2', name: 'Beta United' },
+      ]);
+
+    const names = await getCurrentTeamNames(['uid1', 'uid2', 'uid3', 'uid1']);
+
+    expect(mockSql).toHaveBeenCalledTimes(2);
+    expect(mockSql.mock.calls[1][1]).toEqual(['uid1', 'uid2', 'uid3']);
+    expect(names.get('uid1')).toBe('Alpha FC');
+    expect(names.get('uid2')).toBe('Beta United');
+    expect(names.get('uid3')).toBe('Unknown Team');
+  });
+
+  it('only queries cache misses on later calls', async () => {
+    mockSql
+      .mockResolvedValueOnce([{ version: 1 }])
+      .mockResolvedValueOnce([{ key: 'uid1', name: 'Alpha FC' }])
+      .mockResolvedValueOnce([{ key: 'uid4', name: 'Delta City' }]);
+
+    await getCurrentTeamNames(['uid1']);
+    const names = await getCurrentTeamNames(['uid1', 'uid4']);
+
+    // Version is cached, so the second call issues a single names query
+    expect(mockSql).toHaveBeenCalledTimes(3);
+    expect(mockSql.mock.calls[2][1]).toEqual(['uid4']);
+    expect(names.get('uid1')).toBe('Alpha FC');
+    expect(names.get('uid4')).toBe('Delta City');
+  });
+
+  it('keeps UID and team ID lookups apart', async () => {
+    mockSql
+      .mockResolvedValueOnce([{ version: 1 }])
+      .mockResolvedValueOnce([{ key: 'SSPSLT0001', name: 'Alpha FC' }]);
+
+    const names = await getCurrentTeamNamesById(['SSPSLT0001']);
+
+    expect(names.get('SSPSLT0001')).toBe('Alpha FC');
+    expect(mockSql.mock.calls[1][0].join('?')).toContain('WHERE id = ANY');
+  });
+
+  it('returns season names and falls back to current names', async () => {
+    mockSql
+      .mockResolvedValueOnce([{ version: 1 }])
+      .mockResolvedValueOnce([{ team_id: 'SSPSLT0001', name: 'Old Alpha' }])
+      .mockResolvedValueOnce([{ key: 'SSPSLT0002', name: 'Beta United' }]);
+
+    const names = await getHistoricalTeamNames(['SSPSLT0001', 'SSPSLT0002'], 'SSPSLS15');
+
+    expect(names.get('SSPSLT0001')).toBe('Old Alpha');
+    expect(names.get('SSPSLT0002')).toBe('Beta United');
+    expect(mockSql.mock.calls[2][1]).toEqual(['SSPSLT0002']);
+  });
+
+  it('falls back to Unknown Team when the query fails', async () => {
+    mockSql
+      .mockResolvedValueOnce([{ version: 1 }])
+      .mockRejectedValueOnce(new Error('connection lost'));
+    vi.spyOn(console, 'error').mockImplementation(() => {});
+
+    const names = await getCurrentTeamNames(['uid1']);
+
+    expect(names.get('uid1')).toBe('Unknown Team');
+  });
+});
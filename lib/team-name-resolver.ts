@@ -1,128 +1,236 @@
 import { neon } from '@neondatabase/serverless';
-import React from 'react';
+import { memoryCache, withCache } from '@/lib/cache/memory-cache';
 
-// Cache for team names to avoid repeated DB queries
-const teamNameCache = new Map<string, { name: string; expiresAt: number }>();
+/**
+ * Team name resolution (Auction DB `teams`, `team_name_history`)
+ *
+ * - Bulk: every lookup takes a list of Firebase UIDs or team IDs and
+ *   resolves all cache misses with one `= ANY(...)` query
+ * - Shared, bounded LRU cache for current and historical names
+ * - Entries carry the team-name version (team_name_version table); a rename
+ *   bumps it, so other instances drop stale names within VERSION_TTL
+ */
+
+const UNKNOWN_TEAM = 'Unknown Team';
+const CACHE_LIMIT = 2000;
 const CACHE_TTL = 5 * 60 * 1000; // 5 minutes
+const VERSION_TTL = 30; // seconds
+const VERSION_KEY = 'team_names:version';
+
+type Sql = ReturnType<typeof neon>;
+type LookupColumn = 'firebase_uid' | 'id';
+
+// Insertion-ordered Map used as an LRU: hits move to the end, oldest evicted first
+const teamNameCache = new Map<string, { name: string; version: number; expiresAt: number }>();
+
+function getDb(sql?: Sql): Sql {
+  return sql || neon(process.env.DATABASE_URL || process.env.NEON_DATABASE_URL!);
+}
+
+function cacheGet(key: string, version: number): string | null {
+  const entry = teamNameCache.get(key);
+  if (!entry) return null;
+  teamNameCache.delete(key);
+  if (entry.version !== version || entry.expiresAt <= Date.now()) return null;
+  teamNameCache.set(key, entry);
+  return entry.name;
+}
+
+function cacheSet(key: string, name: string, version: number): void {
+  teamNameCache.delete(key);
+  teamNameCache.set(key, { name, version, expiresAt: Date.now() + CACHE_TTL });
+  while (teamNameCache.size > CACHE_LIMIT) {
+    teamNameCache.delete(teamNameCache.keys().next().value!);
+  }
+}
 
 /**
- * Get the current team name from Neon database
- * Always returns the team's current name, regardless of historical names
- * 
- * @param firebaseUid - The Firebase UID of the team
- * @param sql - Optional Neon SQL instance (if already initialized)
- * @returns Current team name or original name if not found
+ * Current team-name version (cached briefly; 0 if the table is unavailable)
  */
-export async function getCurrentTeamName(
-  firebaseUid: string,
-  sql?: ReturnType<typeof neon>
-): Promise<string> {
-  // Check cache first
-  const cached = teamNameCache.get(firebaseUid);
-  if (cached && cached.expiresAt > Date.now()) {
-    return cached.name;
+async function getNameVersion(db: Sql): Promise<number> {
+  try {
+    return await withCache(VERSION_KEY, async () => {
+      const rows = await db`SELECT version FROM team_name_version WHERE id = TRUE` as any[];
+      return rows.length > 0 ? Number(rows[0].version) : 0;
+    }, VERSION_TTL);
+  } catch (error) {
+    console.error('Error fetching team name version:', error);
+    return 0;
   }
+}
+
+/**
+ * Current names for a set of Firebase UIDs or team IDs; misses are read in one query
+ */
+async function resolveCurrentNames(
+  column: LookupColumn,
+  keys: string[],
+  sql?: Sql
+): Promise<Map<string, string>> {
+  const result = new Map<string, string>();
+  const unique = [...new Set(keys.filter(key => key && typeof key === 'string'))];
+  if (unique.length === 0) return result;
 
-  // Initialize SQL if not provided
-  const db = sql || neon(process.env.DATABASE_URL || process.env.NEON_DATABASE_URL!);
+  const db = getDb(sql);
+  const version = await getNameVersion(db);
+
+  const misses: string[] = [];
+  for (const key of unique) {
+    const cached = cacheGet(`${column}:${key}`, version);
+    if (cached !== null) result.set(key, cached);
+    else misses.push(key);
+  }
+  if (misses.length === 0) return result;
 
   try {
-    const result = await db`
-      SELECT name FROM teams 
-      WHERE firebase_uid = ${firebaseUid} 
-      LIMIT 1
-    `;
-
-    if (result.length > 0 && result[0].name) {
-      const name = result[0].name;
-      // Cache the result
-      teamNameCache.set(firebaseUid, {
-        name,
-        expiresAt: Date.now() + CACHE_TTL
-      });
-      return name;
+    const teams = (column === 'id'
+      ? await db`SELECT id AS key, name FROM teams WHERE id = ANY(${misses})`
+      : await db`SELECT firebase_uid AS key, name FROM teams WHERE firebase_uid = ANY(${misses})`) as any[];
+
+    for (const team of teams) {
+      if (team.key && team.name) {
+        result.set(team.key, team.name);
+        cacheSet(`${column}:${team.key}`, team.name, version);
+      }
     }
   } catch (error) {
-    console.error('Error fetching current team name:', error);
+    console.error('Error fetching current team names:', error);
   }
 
-  return 'Unknown Team';
+  // Set unknown for any that weren't found
+  for (const key of misses) {
+    if (!result.has(key)) result.set(key, UNKNOWN_TEAM);
+  }
+  return result;
+}
+
+/**
+ * Get the current team name from Neon database
+ * Always returns the team's current name, regardless of historical names
+ *
+ * @param firebaseUid - The Firebase UID of the team
+ * @param sql - Optional Neon SQL instance (if already initialized)
+ * @returns Current team name or original name if not found
+ */
+export async function getCurrentTeamName(
+  firebaseUid: string,
+  sql?: Sql
+): Promise<string> {
+  const names = await resolveCurrentNames('firebase_uid', [firebaseUid], sql);
+  return names.get(firebaseUid) || UNKNOWN_TEAM;
 }
 
 /**
  * Get current team names for multiple Firebase UIDs
  * More efficient than calling getCurrentTeamName multiple times
- * 
+ *
  * @param firebaseUids - Array of Firebase UIDs
  * @param sql - Optional Neon SQL instance
  * @returns Map of firebaseUid -> current team name
  */
 export async function getCurrentTeamNames(
   firebaseUids: string[],
-  sql?: ReturnType<typeof neon>
+  sql?: Sql
 ): Promise<Map<string, string>> {
-  const result = new Map<string, string>();
-  
-  // Check which UIDs are in cache
-  const uncachedUids: string[] = [];
-  for (const uid of firebaseUids) {
-    const cached = teamNameCache.get(uid);
-    if (cached && cached.expiresAt > Date.now()) {
-      result.set(uid, cached.name);
-    } else {
-      uncachedUids.push(uid);
-    }
-  }
+  return resolveCurrentNames('firebase_uid', firebaseUids, sql);
+}
 
-  // If all are cached, return immediately
-  if (uncachedUids.length === 0) {
-    return result;
-  }
+/**
+ * Get current team names for multiple team IDs (e.g. SSPSLT0001)
+ *
+ * @returns Map of team ID -> current team name
+ */
+export async function getCurrentTeamNamesById(
+  teamIds: string[],
+  sql?: Sql
+): Promise<Map<string, string>> {
+  return resolveCurrentNames('id', teamIds, sql);
+}
 
-  // Initialize SQL if not provided
-  const db = sql || neon(process.env.DATABASE_URL || process.env.NEON_DATABASE_URL!);
+/**
+ * Team names as they were in a season (team_name_history), falling back to
+ * the current name for teams with no recorded name
+ *
+ * @returns Map of team ID -> name used in that season
+ */
+export async function getHistoricalTeamNames(
+  teamIds: string[],
+  seasonId: string,
+  sql?: Sql
+): Promise<Map<string, string>> {
+  const result = new Map<string, string>();
+  const unique = [...new Set(teamIds.filter(Boolean))];
+  if (unique.length === 0) return result;
 
-  try {
-    const teams = await db`
-      SELECT firebase_uid, name 
-      FROM teams 
-      WHERE firebase_uid = ANY(${uncachedUids})
-    `;
+  const db = getDb(sql);
+  const version = await getNameVersion(db);
 
-    for (const team of teams) {
-      if (team.firebase_uid && team.name) {
-        result.set(team.firebase_uid, team.name);
-        // Cache the result
-        teamNameCache.set(team.firebase_uid, {
-          name: team.name,
-          expiresAt: Date.now() + CACHE_TTL
-        });
-      }
-    }
+  const misses: string[] = [];
+  for (const teamId of unique) {
+    const cached = cacheGet(`season:${seasonId}:${teamId}`, version);
+    if (cached !== null) result.set(teamId, cached);
+    else misses.push(teamId);
+  }
+  if (misses.length === 0) return result;
 
-    // Set unknown for any that weren't found
-    for (const uid of uncachedUids) {
-      if (!result.has(uid)) {
-        result.set(uid, 'Unknown Team');
-      }
+  try {
+    const rows = await db`
+      SELECT team_id, name FROM team_name_history
+      WHERE season_id = ${seasonId} AND team_id = ANY(${misses})
+    ` as any[];
+    for (const row of rows) {
+      result.set(row.team_id, row.name);
+      cacheSet(`season:${seasonId}:${row.team_id}`, row.name, version);
     }
   } catch (error) {
-    console.error('Error fetching current team names:', error);
-    // Set unknown for all uncached UIDs on error
-    for (const uid of uncachedUids) {
-      if (!result.has(uid)) {
-        result.set(uid, 'Unknown Team');
-      }
-    }
+    console.error('Error fetching historical team names:', error);
   }
 
+  const unrecorded = misses.filter(teamId => !result.has(teamId));
+  if (unrecorded.length > 0) {
+    const current = await resolveCurrentNames('id', unrecorded, db);
+    current.forEach((name, teamId) => result.set(teamId, name));
+  }
   return result;
 }
 
+/**
+ * Rename a team: updates `teams`, records the name for the season and bumps
+ * the team-name version in one transaction, then drops local cache entries
+ */
+export async function renameTeam(
+  teamId: string,
+  name: string,
+  seasonId?: string | null,
+  sql?: Sql
+): Promise<void> {
+  const db = getDb(sql);
+  await db.transaction([
+    // Keep the outgoing name for the season the team was registered in
+    db`
+      INSERT INTO team_name_history (team_id, season_id, name)
+      SELECT id, season_id, name FROM teams
+      WHERE id = ${teamId} AND season_id IS NOT NULL AND season_id IS DISTINCT FROM ${seasonId ?? null}::text
+      ON CONFLICT (season_id, team_id) DO NOTHING
+    `,
+    db`UPDATE teams SET name = ${name}, updated_at = NOW() WHERE id = ${teamId}`,
+    ...(seasonId ? [db`
+      INSERT INTO team_name_history (team_id, season_id, name, recorded_at)
+      VALUES (${teamId}, ${seasonId}, ${name}, NOW())
+      ON CONFLICT (season_id, team_id) DO UPDATE SET name = EXCLUDED.name, recorded_at = NOW()
+    `] : []),
+    db`
+      INSERT INTO team_name_version (id, version, updated_at) VALUES (TRUE, 2, NOW())
+      ON CONFLICT (id) DO UPDATE SET version = team_name_version.version + 1, updated_at = NOW()
+    `,
+  ]);
+  clearTeamNameCache();
+}
+
 /**
  * Resolve team names in an array of objects
  * Replaces historical team_name with current name from Neon
- * 
+ *
  * @param items - Array of objects containing team_id and team_name
  * @param teamIdField - Field name containing Firebase UID (default: 'team_id')
  * @param teamNameField - Field name to update with current name (default: 'team_name')
@@ -170,9 +278,9 @@ export async function resolveTeamNames<T extends Record<string, any>>(
  */
 export function clearTeamNameCache(firebaseUid?: string): void {
   if (firebaseUid) {
-    teamNameCache.delete(firebaseUid);
+    teamNameCache.delete(`firebase_uid:${firebaseUid}`);
   } else {
     teamNameCache.clear();
+    memoryCache.delete(VERSION_KEY);
   }
 }
-
@@ -51,18 +51,7 @@ export async function logTransaction(data: TransactionData): Promise<void> {
   try {
     const db = getFirestore();
     
-    // Filter out undefined values from metadata
-    const cleanMetadata = data.metadata ? 
-      Object.fromEntries(
-        Object.entries(data.metadata).filter(([_, v]) => v !== undefined)
-      ) : {};
-    
-    await db.collection('transactions').add({
-      ...data,
-      metadata: Object.keys(cleanMetadata).length > 0 ? cleanMetadata : undefined,
-      created_at: new Date(),
-      updated_at: new Date()
-    });
+    await db.collection('transactions').add(toTransactionDoc(data));
     
     console.log(`✅ Transaction logged: ${data.transaction_type} - ${data.amount} for ${data.team_id}`);
   } catch (error) {
@@ -71,6 +60,48 @@ export async function logTransaction(data: TransactionData): Promise<void> {
   }
 }
 
+/**
+ * Build the stored document for a transaction (undefined metadata values dropped)
+ */
+export function toTransactionDoc(data: TransactionData): Record<string, any> {
+  const cleanMetadata = data.metadata ? 
+    Object.fromEntries(
+      Object.entries(data.metadata).filter(([_, v]) => v !== undefined)
+    ) : {};
+  
+  return {
+    ...data,
+    metadata: Object.keys(cleanMetadata).length > 0 ? cleanMetadata : undefined,
+    created_at: new Date(),
+    updated_at: new Date()
+  };
+}
+
+/**
+ * Log many transactions using batched writes (up to 500 per commit)
+ */
+export async function logTransactions(transactions: TransactionData[]): Promise<void> {
+  if (transactions.length === 0) return;
+  
+  try {
+    const db = getFirestore();
+    const BATCH_SIZE = 500;
+    
+    for (let i = 0; i < transactions.length; i += BATCH_SIZE) {
+      const batch = db.batch();
+      for (const data of transactions.slice(i, i + BATCH_SIZE)) {
+        batch.set(db.collection('transactions').doc(), toTransactionDoc(data));
+      }
+      await batch.commit();
+    }
+    
+    console.log(`✅ ${transactions.length} transactions logged`);
+  } catch (error) {
+    console.error('❌ Failed to log transactions:', error);
+    // Don't throw - transaction logging should not block main operation
+  }
+}
+
 /**
  * Log auction win transaction
  */
@@ -332,9 +363,27 @@ export async function logTransferPayment(
   balanceBefore: number,
   fromTeamId: string
 ): Promise<void> {
+  await logTransaction(buildTransferPaymentLog(
+    teamId, seasonId, playerName, playerId, playerType, amount, balanceBefore, fromTeamId
+  ));
+}
+
+/**
+ * Build the transfer payment entry (team acquiring player)
+ */
+export function buildTransferPaymentLog(
+  teamId: string,
+  seasonId: string,
+  playerName: string,
+  playerId: string,
+  playerType: 'real' | 'football',
+  amount: number,
+  balanceBefore: number,
+  fromTeamId: string
+): TransactionData {
   const currencyType: CurrencyType = playerType === 'real' ? 'real_player' : 'football';
   
-  await logTransaction({
+  return {
     team_id: teamId,
     season_id: seasonId,
     transaction_type: 'transfer_payment',
@@ -350,7 +399,7 @@ export async function logTransferPayment(
       from_team_id: fromTeamId,
       transfer_cost: amount
     }
-  });
+  };
 }
 
 /**
@@ -366,9 +415,27 @@ export async function logTransferCompensation(
   balanceBefore: number,
   toTeamId: string
 ): Promise<void> {
+  await logTransaction(buildTransferCompensationLog(
+    teamId, seasonId, playerName, playerId, playerType, compensation, balanceBefore, toTeamId
+  ));
+}
+
+/**
+ * Build the transfer compensation entry (team losing player)
+ */
+export function buildTransferCompensationLog(
+  teamId: string,
+  seasonId: string,
+  playerName: string,
+  playerId: string,
+  playerType: 'real' | 'football',
+  compensation: number,
+  balanceBefore: number,
+  toTeamId: string
+): TransactionData {
   const currencyType: CurrencyType = playerType === 'real' ? 'real_player' : 'football';
   
-  await logTransaction({
+  return {
     team_id: teamId,
     season_id: seasonId,
     transaction_type: 'transfer_compensation',
@@ -384,7 +451,7 @@ export async function logTransferCompensation(
       to_team_id: toTeamId,
       compensation_amount: compensation
     }
-  });
+  };
 }
 
 /**
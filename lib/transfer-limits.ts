@@ -61,42 +61,7 @@ export async function getTransferLimitStatus(
       .where('season_id', '==', seasonId)
       .get();
     
-    let transfersUsed = 0;
-    
-    // Count unique operations involving this team
-    const processedOperations = new Set<string>();
-    
-    for (const doc of snapshot.docs) {
-      const data = doc.data();
-      const operationId = doc.id;
-      
-      // Skip if already processed
-      if (processedOperations.has(operationId)) {
-        continue;
-      }
-      
-      let teamInvolved = false;
-      
-      // Check if team is involved in this transaction
-      if (data.transaction_type === 'transfer' || data.transaction_type === 'release') {
-        // For transfers and releases, count if team is old_team_id or new_team_id
-        if (data.old_team_id === teamId || data.new_team_id === teamId) {
-          teamInvolved = true;
-        }
-      } else if (data.transaction_type === 'swap') {
-        // For swaps, count if team is team_a_id or team_b_id
-        const teamAId = data.team_a_id || data.teams?.team_a_id;
-        const teamBId = data.team_b_id || data.teams?.team_b_id;
-        if (teamAId === teamId || teamBId === teamId) {
-          teamInvolved = true;
-        }
-      }
-      
-      if (teamInvolved) {
-        transfersUsed++;
-        processedOperations.add(operationId);
-      }
-    }
+    const transfersUsed = countTransfersByTeam(snapshot.docs).get(teamId) || 0;
     
     const transfersRemaining = Math.max(0, MAX_TRANSFERS_PER_SEASON - transfersUsed);
     const canTransfer = transfersUsed < MAX_TRANSFERS_PER_SEASON;
@@ -128,6 +93,79 @@ export async function getTransferLimitStatus(
   }
 }
 
+/**
+ * Count transfer operations per team from a season's player_transactions docs
+ * 
+ * Transfers and releases count for old_team_id and new_team_id; swaps count
+ * for team_a_id and team_b_id. Each operation counts once per team.
+ */
+export function countTransfersByTeam(
+  docs: Array<{ id: string; data: () => any }>
+): Map<string, number> {
+  const counts = new Map<string, number>();
+  const processedOperations = new Set<string>();
+  
+  for (const doc of docs) {
+    // Skip if already processed
+    if (processedOperations.has(doc.id)) {
+      continue;
+    }
+    processedOperations.add(doc.id);
+    
+    const data = doc.data();
+    const involvedTeams = new Set<string>();
+    
+    if (data.transaction_type === 'transfer' || data.transaction_type === 'release') {
+      if (data.old_team_id) involvedTeams.add(data.old_team_id);
+      if (data.new_team_id) involvedTeams.add(data.new_team_id);
+    } else if (data.transaction_type === 'swap') {
+      const teamAId = data.team_a_id || data.teams?.team_a_id;
+      const teamBId = data.team_b_id || data.teams?.team_b_id;
+      if (teamAId) involvedTeams.add(teamAId);
+      if (teamBId) involvedTeams.add(teamBId);
+    }
+    
+    involvedTeams.forEach(teamId => counts.set(teamId, (counts.get(teamId) || 0) + 1));
+  }
+  
+  return counts;
+}
+
+/**
+ * Get transfer limit status for many teams from a single season query
+ * 
+ * @param teamIds - Teams to report on
+ * @param seasonId - The season's unique identifier
+ * @returns Map of team ID to limit status
+ * 
+ * @example
+ * const statuses = await getTransferLimitStatuses(['SSPSLT0001', 'SSPSLT0002'], 'SSPSLS16');
+ */
+export async function getTransferLimitStatuses(
+  teamIds: string[],
+  seasonId: string
+): Promise<Map<string, TransferLimitStatus>> {
+  const snapshot = await adminDb.collection('player_transactions')
+    .where('season_id', '==', seasonId)
+    .get();
+  
+  const counts = countTransfersByTeam(snapshot.docs);
+  const statuses = new Map<string, TransferLimitStatus>();
+  
+  for (const teamId of Array.from(new Set(teamIds))) {
+    const transfersUsed = counts.get(teamId) || 0;
+    statuses.set(teamId, {
+      teamId,
+      seasonId,
+      transfersUsed,
+      transfersRemaining: Math.max(0, MAX_TRANSFERS_PER_SEASON - transfersUsed),
+      canTransfer: transfersUsed < MAX_TRANSFERS_PER_SEASON
+    });
+  }
+  
+  return statuses;
+}
+
 /**
  * Validate if a team can perform a transfer operation
  * 
@@ -0,0 +1,28 @@
+-- Keyset pagination indexes for footballplayers
+-- Database: Auction DB (Neon)
+-- Used by getAllPlayers / getPlayersPage in lib/neon/players.ts, which page on (name, id)
+
+-- Unfiltered browsing
+CREATE INDEX IF NOT EXISTS idx_footballplayers_name_id
+  ON footballplayers (name, id);
+
+-- Position filter on the player browser
+CREATE INDEX IF NOT EXISTS idx_footballplayers_position_name_id
+  ON footballplayers (position, name, id);
+
+-- Season / team views
+CREATE INDEX IF NOT EXISTS idx_footballplayers_season_name_id
+  ON footballplayers (season_id, name, id);
+
+CREATE INDEX IF NOT EXISTS idx_footballplayers_team_name_id
+  ON footballplayers (team_id, name, id) WHERE team_id IS NOT NULL;
+
+-- Committee round setup lists eligible players only
+CREATE INDEX IF NOT EXISTS idx_footballplayers_eligible_name_id
+  ON footballplayers (name, id) WHERE is_auction_eligible = true;
+
+-- Sold / unsold exports
+CREATE INDEX IF NOT EXISTS idx_footballplayers_sold_name_id
+  ON footballplayers (is_sold, name, id);
+
+ANALYZE footballplayers;
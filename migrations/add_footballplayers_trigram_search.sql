@@ -0,0 +1,16 @@
+-- Trigram search indexes for footballplayers
+-- Database: Auction DB (Neon)
+-- Used by lib/neon/player-search.ts (searchPlayers / searchPlayersRanked)
+-- Benchmark before/after with: python scripts/benchmark_player_search.py
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Substring (ILIKE '%term%') and word-similarity (term <% name) matches on name
+CREATE INDEX IF NOT EXISTS idx_footballplayers_name_trgm
+  ON footballplayers USING GIN (name gin_trgm_ops);
+
+-- player_id prefix lookups (LIKE 'term%') regardless of collation
+CREATE INDEX IF NOT EXISTS idx_footballplayers_player_id_pattern
+  ON footballplayers (player_id varchar_pattern_ops, id);
+
+ANALYZE footballplayers;
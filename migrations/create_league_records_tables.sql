@@ -0,0 +1,47 @@
+-- League records and hall-of-fame snapshots
+-- Database: Tournament DB (Neon)
+-- Maintained by lib/neon/league-records.ts: refreshed incrementally for the
+-- teams/players of each fixture result and rebuilt in full at season close
+-- and after historical imports. The public league-records and hall-of-fame
+-- endpoints read one snapshot row and serve it with an ETag.
+
+-- Single-season records ("most goals in a season"), one row per record
+CREATE TABLE IF NOT EXISTS league_season_records (
+  record_key VARCHAR(64) PRIMARY KEY,     -- e.g. 'player.mostGoals'
+  holder_id VARCHAR(255) NOT NULL,        -- team_id / player_id
+  source_id TEXT NOT NULL,                -- teamstats.id / player_stats_v.id
+  value NUMERIC NOT NULL,
+  details JSONB NOT NULL,                 -- row as returned by the API
+  updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- All-time per-player totals (hall of fame)
+CREATE TABLE IF NOT EXISTS player_career_totals (
+  player_id VARCHAR(255) PRIMARY KEY,
+  player_name VARCHAR(255) NOT NULL,
+  total_goals INTEGER NOT NULL DEFAULT 0,
+  total_assists INTEGER NOT NULL DEFAULT 0,
+  total_clean_sheets INTEGER NOT NULL DEFAULT 0,
+  total_matches INTEGER NOT NULL DEFAULT 0,
+  total_wins INTEGER NOT NULL DEFAULT 0,
+  total_points INTEGER NOT NULL DEFAULT 0,
+  seasons_played INTEGER NOT NULL DEFAULT 0,
+  updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_player_career_totals_goals ON player_career_totals (total_goals DESC);
+CREATE INDEX IF NOT EXISTS idx_player_career_totals_assists ON player_career_totals (total_assists DESC);
+CREATE INDEX IF NOT EXISTS idx_player_career_totals_clean_sheets ON player_career_totals (total_clean_sheets DESC);
+CREATE INDEX IF NOT EXISTS idx_player_career_totals_matches ON player_career_totals (total_matches DESC);
+CREATE INDEX IF NOT EXISTS idx_player_career_totals_points ON player_career_totals (total_points DESC);
+
+-- Response payloads; version only changes when the payload does (ETag)
+CREATE TABLE IF NOT EXISTS league_record_snapshots (
+  snapshot_key VARCHAR(64) PRIMARY KEY,   -- 'league-records' | 'hall-of-fame'
+  version BIGINT NOT NULL DEFAULT 1,
+  payload JSONB NOT NULL,
+  updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- Affected-row lookups during incremental refreshes
+CREATE INDEX IF NOT EXISTS idx_teamstats_team_id ON teamstats (team_id);
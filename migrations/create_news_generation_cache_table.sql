@@ -0,0 +1,22 @@
+-- Migration: Create news_generation_cache table for AI text/image reuse
+-- Database: Tournament DB (Neon)
+-- Date: 2026-10-19
+
+CREATE TABLE IF NOT EXISTS news_generation_cache (
+  cache_key VARCHAR(64) PRIMARY KEY,   -- SHA-256 of (kind, event type, payload, prompt version, language)
+  kind VARCHAR(20) NOT NULL,           -- 'text' or 'image'
+  event_type VARCHAR(100) NOT NULL,
+  language VARCHAR(5),                 -- 'en' / 'ml' for text, NULL for images
+  prompt_version INTEGER NOT NULL,
+  payload JSONB NOT NULL,              -- { title, content, summary } or { image_url }
+  hit_count INTEGER NOT NULL DEFAULT 0,
+  created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+  last_accessed_at TIMESTAMP NOT NULL DEFAULT NOW(),
+  expires_at TIMESTAMP NOT NULL
+);
+
+-- TTL and LRU eviction
+CREATE INDEX IF NOT EXISTS idx_news_generation_cache_expires ON news_generation_cache(expires_at);
+CREATE INDEX IF NOT EXISTS idx_news_generation_cache_lru ON news_generation_cache(last_accessed_at);
+
+COMMENT ON TABLE news_generation_cache IS 'Generated news text and image URLs keyed by a normalized content hash; re-saved results reuse earlier generations';
@@ -0,0 +1,48 @@
+-- Migration: Create news_jobs table for background AI news generation
+-- Database: Tournament DB (Neon)
+-- Date: 2026-10-19
+
+CREATE TABLE IF NOT EXISTS news_jobs (
+  id BIGSERIAL PRIMARY KEY,
+  event_type VARCHAR(100) NOT NULL,
+  dedupe_key VARCHAR(64) NOT NULL,
+  input JSONB NOT NULL,
+  status VARCHAR(20) NOT NULL DEFAULT 'pending', -- 'pending', 'processing', 'completed', 'failed'
+  attempts INTEGER NOT NULL DEFAULT 0,
+  max_attempts INTEGER NOT NULL DEFAULT 3,
+  run_after TIMESTAMP NOT NULL DEFAULT NOW(),
+  locked_at TIMESTAMP,
+  news_id VARCHAR(255),
+  last_error TEXT,
+  created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+  updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- Dequeue scans only runnable jobs, oldest first
+CREATE INDEX IF NOT EXISTS idx_news_jobs_runnable
+  ON news_jobs(run_after, id)
+  WHERE status IN ('pending', 'processing');
+
+-- Deduplication lookups within the dedupe window
+CREATE INDEX IF NOT EXISTS idx_news_jobs_dedupe
+  ON news_jobs(dedupe_key, created_at DESC);
+
+-- At most one pending/processing job per input; enqueue relies on this
+-- (ON CONFLICT DO NOTHING) so concurrent triggers can't insert duplicates.
+-- Fail any duplicates left by earlier versions before building the index.
+UPDATE news_jobs
+SET status = 'failed', locked_at = NULL, last_error = 'Duplicate of an active job', updated_at = NOW()
+WHERE status IN ('pending', 'processing')
+  AND id NOT IN (
+    SELECT MIN(id) FROM news_jobs
+    WHERE status IN ('pending', 'processing')
+    GROUP BY dedupe_key
+  );
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_news_jobs_active_dedupe
+  ON news_jobs(dedupe_key)
+  WHERE status IN ('pending', 'processing');
+
+COMMENT ON TABLE news_jobs IS 'Queue of AI news generation jobs, drained by /api/cron/process-news-jobs';
+COMMENT ON COLUMN news_jobs.dedupe_key IS 'SHA-256 of the normalized generation input; at most one active job per key, and completed jobs suppress re-enqueue inside the dedupe window';
+COMMENT ON COLUMN news_jobs.locked_at IS 'Set when a worker claims the job; stale locks are reclaimed after the lock timeout';
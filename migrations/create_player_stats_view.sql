@@ -0,0 +1,105 @@
+-- Unified player statistics view for /api/stats/players
+-- Database: Tournament DB (Neon)
+-- Modern seasons (16+) live in player_seasons, historical seasons (1-15) in
+-- realplayerstats. player_stats_v exposes both with one column set so the
+-- endpoint runs a single parameterized query (lib/neon/player-stats.ts).
+-- Filters on data_source prune the other branch of the UNION ALL.
+
+CREATE OR REPLACE VIEW player_stats_v AS
+SELECT
+  ps.id::text AS id,
+  ps.player_id,
+  ps.player_name,
+  ps.season_id,
+  NULL::text AS tournament_id,
+  NULLIF(regexp_replace(ps.season_id, '\D', '', 'g'), '')::int AS season_number,
+  ps.team,
+  ps.team_id,
+  ps.category,
+  COALESCE(ps.matches_played, 0) AS matches_played,
+  COALESCE(ps.goals_scored, 0) AS goals_scored,
+  COALESCE(ps.goals_conceded, 0) AS goals_conceded,
+  COALESCE(ps.assists, 0) AS assists,
+  COALESCE(ps.wins, 0) AS wins,
+  COALESCE(ps.draws, 0) AS draws,
+  COALESCE(ps.losses, 0) AS losses,
+  COALESCE(ps.clean_sheets, 0) AS clean_sheets,
+  COALESCE(ps.motm_awards, 0) AS motm_awards,
+  COALESCE(ps.points, 0) AS points,
+  ps.star_rating,
+  ps.base_points,
+  ps.contract_id,
+  ps.contract_start_season,
+  ps.contract_end_season,
+  ps.is_auto_registered,
+  ps.registration_date,
+  ps.registration_type,
+  ps.auction_value,
+  ps.salary_per_match,
+  ps.prevent_auto_promotion,
+  ps.created_at,
+  ps.updated_at,
+  'modern'::text AS data_source
+FROM player_seasons ps
+
+UNION ALL
+
+SELECT
+  rps.id::text AS id,
+  rps.player_id,
+  rps.player_name,
+  rps.season_id,
+  rps.tournament_id::text AS tournament_id,
+  NULLIF(regexp_replace(rps.season_id, '\D', '', 'g'), '')::int AS season_number,
+  rps.team,
+  rps.team_id,
+  rps.category,
+  COALESCE(rps.matches_played, 0),
+  COALESCE(rps.goals_scored, 0),
+  COALESCE(rps.goals_conceded, 0),
+  COALESCE(rps.assists, 0),
+  COALESCE(rps.wins, 0),
+  COALESCE(rps.draws, 0),
+  COALESCE(rps.losses, 0),
+  COALESCE(rps.clean_sheets, 0),
+  COALESCE(rps.motm_awards, 0),
+  COALESCE(rps.points, 0),
+  rps.star_rating,
+  NULL,  -- base_points
+  NULL,  -- contract_id
+  NULL,  -- contract_start_season
+  NULL,  -- contract_end_season
+  NULL,  -- is_auto_registered
+  NULL,  -- registration_date
+  NULL,  -- registration_type
+  NULL,  -- auction_value
+  NULL,  -- salary_per_match
+  NULL,  -- prevent_auto_promotion
+  rps.created_at,
+  rps.updated_at,
+  'historical'::text
+FROM realplayerstats rps;
+
+-- Season lists / leaderboards (season_id + optional category)
+CREATE INDEX IF NOT EXISTS idx_player_seasons_season_category
+  ON player_seasons (season_id, category);
+
+CREATE INDEX IF NOT EXISTS idx_realplayerstats_season_category
+  ON realplayerstats (season_id, category);
+
+-- Historical tournament leaderboards
+CREATE INDEX IF NOT EXISTS idx_realplayerstats_tournament_category
+  ON realplayerstats (tournament_id, category);
+
+-- Team squads and player history
+CREATE INDEX IF NOT EXISTS idx_player_seasons_team_season
+  ON player_seasons (team_id, season_id);
+
+CREATE INDEX IF NOT EXISTS idx_realplayerstats_team_tournament
+  ON realplayerstats (team_id, tournament_id);
+
+CREATE INDEX IF NOT EXISTS idx_player_seasons_player
+  ON player_seasons (player_id);
+
+CREATE INDEX IF NOT EXISTS idx_realplayerstats_player
+  ON realplayerstats (player_id);
@@ -0,0 +1,50 @@
+-- Per-season aggregate tables for the public season pages
+-- Database: Auction DB (Neon)
+-- Maintained by lib/neon/season-aggregates.ts, which refreshes rows for a season
+-- (or just the teams/players that changed) after results, auctions and transfers.
+
+-- Standings / team summary rows
+CREATE TABLE IF NOT EXISTS season_team_aggregates (
+  season_id VARCHAR(255) NOT NULL,
+  team_id VARCHAR(255) NOT NULL,
+  team_name VARCHAR(255) NOT NULL,
+  team_code VARCHAR(50) NOT NULL,
+  owner_name VARCHAR(255) NOT NULL DEFAULT '',
+  logo_url TEXT,
+  balance NUMERIC(12, 2) NOT NULL DEFAULT 0,
+  players_count INTEGER NOT NULL DEFAULT 0,
+  matches_played INTEGER NOT NULL DEFAULT 0,
+  matches_won INTEGER NOT NULL DEFAULT 0,
+  matches_drawn INTEGER NOT NULL DEFAULT 0,
+  matches_lost INTEGER NOT NULL DEFAULT 0,
+  points INTEGER NOT NULL DEFAULT 0,
+  goal_difference INTEGER NOT NULL DEFAULT 0,
+  refreshed_at TIMESTAMP NOT NULL DEFAULT NOW(),
+  PRIMARY KEY (season_id, team_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_season_team_aggregates_standings
+  ON season_team_aggregates (season_id, points DESC, goal_difference DESC);
+
+-- Player summary rows
+CREATE TABLE IF NOT EXISTS season_player_aggregates (
+  season_id VARCHAR(255) NOT NULL,
+  player_id VARCHAR(255) NOT NULL,
+  name VARCHAR(255) NOT NULL,
+  primary_position VARCHAR(50) NOT NULL DEFAULT 'Unknown',
+  team_id VARCHAR(255),
+  team_name VARCHAR(255),
+  sold_price INTEGER,
+  is_sold BOOLEAN NOT NULL DEFAULT false,
+  refreshed_at TIMESTAMP NOT NULL DEFAULT NOW(),
+  PRIMARY KEY (season_id, player_id)
+);
+
+-- One row per season; version is bumped on every refresh so readers can key caches on it
+CREATE TABLE IF NOT EXISTS season_aggregate_versions (
+  season_id VARCHAR(255) PRIMARY KEY,
+  version BIGINT NOT NULL DEFAULT 0,
+  teams_refreshed_at TIMESTAMP,
+  players_refreshed_at TIMESTAMP,
+  updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
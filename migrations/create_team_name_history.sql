@@ -0,0 +1,30 @@
+-- Team names per season and the team-name cache version
+-- Database: Auction DB (Neon)
+-- Used by lib/team-name-resolver.ts: historical names are looked up by
+-- (season_id, team_id) in one query, and every rename bumps the version so
+-- cached current names are dropped on all instances.
+
+CREATE TABLE IF NOT EXISTS team_name_history (
+  team_id VARCHAR(255) NOT NULL,
+  season_id VARCHAR(255) NOT NULL,
+  name VARCHAR(255) NOT NULL,
+  recorded_at TIMESTAMP NOT NULL DEFAULT NOW(),
+  PRIMARY KEY (season_id, team_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_team_name_history_team ON team_name_history (team_id);
+
+-- Seed with each team's current name for its registered season
+INSERT INTO team_name_history (team_id, season_id, name)
+SELECT id, season_id, name FROM teams
+WHERE season_id IS NOT NULL AND name IS NOT NULL
+ON CONFLICT (season_id, team_id) DO NOTHING;
+
+-- Single row; bumped by renames
+CREATE TABLE IF NOT EXISTS team_name_version (
+  id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+  version BIGINT NOT NULL DEFAULT 1,
+  updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+INSERT INTO team_name_version (id) VALUES (TRUE) ON CONFLICT (id) DO NOTHING;
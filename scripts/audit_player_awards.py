@@ -1,3 +1,4 @@
+import argparse
 import os
 import psycopg2
 from psycopg2.extras import RealDictCursor
@@ -8,13 +9,72 @@ from collections import defaultdict
 # Load environment variables
 load_dotenv('.env.local')
 
-DATABASE_URL = os.getenv('NEON_DATABASE_URL')
+# player_awards / player_seasons live in the tournament database
+DATABASE_URL = os.getenv('NEON_TOURNAMENT_DB_URL') or os.getenv('NEON_DATABASE_URL')
+
+POSITIONS = ['Winner', 'Runner Up', 'Third Place']
+CATEGORIES = ['Attacker', 'Midfielder', 'Defender', 'Goalkeeper']
 
 def connect_db():
     """Connect to the database"""
     return psycopg2.connect(DATABASE_URL, cursor_factory=RealDictCursor)
 
-def audit_player_awards():
+def rank_top(players, sort_key, top_n):
+    """Top N players by sort_key, ties broken by player_id (same as the SQL engine)"""
+    return sorted(players, key=lambda p: (sort_key(p), p['player_id']))[:top_n]
+
+
+def expected_awards(players, top_n=3):
+    """
+    Awards lib/award-player-awards.ts would give for one season's
+    player_seasons snapshot, as (player_id, award_category, award_type, award_position)
+    """
+    def num(p, field):
+        return p.get(field) or 0
+
+    def position(i):
+        return POSITIONS[min(i, len(POSITIONS) - 1)]
+
+    expected = set()
+    rankings = [
+        ('individual', 'Golden Boot', players,
+         lambda p: (-num(p, 'goals_scored'), -num(p, 'assists'))),
+        ('individual', 'Most Assists', players,
+         lambda p: (-num(p, 'assists'), -num(p, 'goals_scored'))),
+        ('individual', 'Most Clean Sheets', [p for p in players if p.get('category') == 'Goalkeeper'],
+         lambda p: (-num(p, 'clean_sheets'), num(p, 'goals_conceded'))),
+    ]
+    for category in CATEGORIES:
+        in_category = [p for p in players if p.get('category') == category]
+        if category in ('Defender', 'Goalkeeper'):
+            key = lambda p: (-num(p, 'clean_sheets'), -num(p, 'goals_scored'))
+        else:
+            key = lambda p: (-num(p, 'goals_scored'), -num(p, 'assists'))
+        rankings.append(('category', f'Best {category}', in_category, key))
+
+    for award_category, award_type, pool, key in rankings:
+        for i, p in enumerate(rank_top(pool, key, top_n)):
+            expected.add((p['player_id'], award_category, award_type, position(i)))
+    return expected
+
+
+def compare_award_counts(stored_counts, award_rows):
+    """awards_count per (player, season) vs the player_awards rows, both already loaded"""
+    actual = defaultdict(int)
+    for row in award_rows:
+        actual[(row['player_id'], row['season_id'])] += 1
+
+    mismatches = []
+    for row in stored_counts:
+        key = (row['player_id'], row['season_id'])
+        stored = row['awards_count'] or 0
+        if stored != actual[key]:
+            mismatches.append({**row, 'stored_count': stored, 'actual_count': actual[key]})
+    mismatches.sort(key=lambda m: (-m['stored_count'], str(m['season_id'])))
+    return mismatches
+
+
+def audit_player_awards(seasons=None, top_n=3):
     """Audit player awards data structure"""
     conn = connect_db()
     cur = conn.cursor()
@@ -183,39 +243,60 @@ def audit_player_awards():
         print("  ℹ️  No awards_count column found in player_season table")
     
     # 7. Compare awards_count with actual player_awards count
+    #    Both tables are loaded once and compared in memory
     mismatches = []
+    award_rows = []
+    if has_player_awards:
+        cur.execute("""
+            SELECT player_id, season_id, award_category, award_type, award_position, awarded_by
+            FROM player_awards
+        """)
+        award_rows = cur.fetchall()
+
     if has_player_awards and 'player_season' in table_names:
         print("\n7. AWARDS COUNT VALIDATION")
         print("-" * 80)
-        cur.execute("""
-            SELECT 
-                ps.player_id,
-                ps.season_id,
-                ps.awards_count as stored_count,
-                COUNT(pa.id) as actual_count,
-                CASE 
-                    WHEN ps.awards_count = COUNT(pa.id) THEN '✅ Match'
-                    ELSE '❌ Mismatch'
-                END as status
-            FROM player_season ps
-            LEFT JOIN player_awards pa ON pa.player_id = ps.player_id AND pa.season_id = ps.season_id
-            GROUP BY ps.player_id, ps.season_id, ps.awards_count
-            HAVING ps.awards_count != COUNT(pa.id) OR ps.awards_count > 0
-            ORDER BY ps.awards_count DESC, ps.season_id DESC
-            LIMIT 20
-        """)
-        mismatches = cur.fetchall()
+        cur.execute("SELECT player_id, season_id, awards_count FROM player_season")
+        mismatches = compare_award_counts(cur.fetchall(), award_rows)
         if mismatches:
-            print(f"  Found {len(mismatches)} records with mismatched or non-zero awards count:")
-            for mm in mismatches:
-                print(f"    {mm['status']} Player: {mm['player_id']}, Season: {mm['season_id']}, Stored: {mm['stored_count']}, Actual: {mm['actual_count']}")
+            print(f"  Found {len(mismatches)} records with mismatched awards count:")
+            for mm in mismatches[:20]:
+                print(f"    ❌ Mismatch Player: {mm['player_id']}, Season: {mm['season_id']}, Stored: {mm['stored_count']}, Actual: {mm['actual_count']}")
         else:
             print("  ✅ All awards counts match the actual player_awards records")
     else:
         print("\n7. AWARDS COUNT VALIDATION")
         print("-" * 80)
         print("  ⚠️  Cannot validate - player_awards or player_season table missing")
-    
+
+    # 7b. Compare system-awarded awards with what the award engine would give
+    award_drift = 0
+    if has_player_awards and seasons:
+        print("\n7b. SEASON AWARDS VS PLAYER_SEASONS SNAPSHOT")
+        print("-" * 80)
+        for season_id in seasons:
+            cur.execute("""
+                SELECT player_id, category, goals_scored, assists, clean_sheets, goals_conceded
+                FROM player_seasons
+                WHERE season_id = %s
+            """, (season_id,))
+            expected = expected_awards(cur.fetchall(), top_n)
+            stored = {
+                (r['player_id'], r['award_category'], r['award_type'], r['award_position'])
+                for r in award_rows
+                if str(r['season_id']) == season_id and r['awarded_by'] == 'system'
+            }
+            missing = sorted(expected - stored)
+            unexpected = sorted(stored - expected)
+            award_drift += len(missing) + len(unexpected)
+            status = '✅' if not missing and not unexpected else '❌'
+            print(f"  {status} {season_id}: {len(expected)} expected, {len(stored)} stored, "
+                  f"{len(missing)} missing, {len(unexpected)} unexpected")
+            for player_id, _, award_type, award_position in missing[:10]:
+                print(f"      missing    {award_type} {award_position}: {player_id}")
+            for player_id, _, award_type, award_position in unexpected[:10]:
+                print(f"      unexpected {award_type} {award_position}: {player_id}")
+
     # 8. Get active seasons
     print("\n8. ACTIVE SEASONS")
     print("-" * 80)
@@ -274,6 +355,9 @@ def audit_player_awards():
     else:
         print(f"  2. ✅ Awards counts are synchronized")
     
+    if award_drift > 0:
+        print(f"  ⚠️  {award_drift} system award(s) differ from the player_seasons snapshot - rerun auto-award")
+
     if stats_with_trophies > 0:
         print(f"  3. ℹ️  Review trophies JSONB structure in realplayerstats for consistency")
         print(f"     Consider migrating to separate columns if format varies")
@@ -284,4 +368,9 @@ def audit_player_awards():
     conn.close()
 
 if __name__ == '__main__':
-    audit_player_awards()
+    parser = argparse.ArgumentParser(description='Audit player awards and awards_count')
+    parser.add_argument('--season', action='append', dest='seasons',
+                        help='Season ID to compare against the award engine (repeatable)')
+    parser.add_argument('--top-n', type=int, default=3, help='Positions per award (default: 3)')
+    args = parser.parse_args()
+    audit_player_awards(args.seasons, args.top_n)
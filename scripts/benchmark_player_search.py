@@ -0,0 +1,154 @@
+"""
+Benchmark football player search: legacy ILIKE query vs trigram-ranked search
+
+Runs EXPLAIN ANALYZE for both query shapes used by lib/neon/player-search.ts
+and the old searchPlayers() query, for a few sample terms.
+
+Usage: python scripts/benchmark_player_search.py [term ...]
+Example: python scripts/benchmark_player_search.py messi ronaldo 1105
+"""
+
+import os
+import re
+import sys
+import time
+import psycopg2
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv('.env.local')
+
+DATABASE_URL = os.getenv('NEON_AUCTION_DB_URL') or os.getenv('NEON_DATABASE_URL')
+
+DEFAULT_TERMS = ['messi', 'van dijk', 'ronaldinho', '1105']
+LIMIT = 50
+
+# Previous searchPlayers() implementation
+LEGACY_QUERY = """
+    SELECT * FROM footballplayers
+    WHERE name ILIKE %(pattern)s
+    OR player_id ILIKE %(pattern)s
+    ORDER BY name ASC
+    LIMIT %(limit)s
+"""
+
+# Mirrors searchPlayersRanked() - trigram path
+TRIGRAM_QUERY = """
+    SELECT id, player_id, name, position, position_group, team_id, team_name,
+           club, nationality, overall_rating, is_auction_eligible, is_sold,
+           ROUND((
+             GREATEST(similarity(name, %(term)s), word_similarity(%(term)s, name))
+             + CASE WHEN name ILIKE %(prefix)s THEN 1 ELSE 0 END
+           )::numeric, 6)::float8 AS score
+    FROM footballplayers
+    WHERE name ILIKE %(pattern)s
+       OR %(term)s <%% name
+    ORDER BY score DESC, name ASC, id ASC
+    LIMIT %(limit)s
+"""
+
+# Mirrors searchPlayersRanked() - player_id prefix path
+PREFIX_QUERY = """
+    SELECT id, player_id, name, position, position_group, team_id, team_name,
+           club, nationality, overall_rating, is_auction_eligible, is_sold
+    FROM footballplayers
+    WHERE player_id LIKE %(prefix)s
+    ORDER BY player_id ASC, id ASC
+    LIMIT %(limit)s
+"""
+
+
+def escape_like(term):
+    """Escape LIKE wildcards so the term is matched literally"""
+    return re.sub(r'([\\%_])', r'\\\1', term)
+
+
+def explain(cur, query, params):
+    """Run EXPLAIN ANALYZE and return (plan lines, execution ms)"""
+    cur.execute('EXPLAIN (ANALYZE, BUFFERS) ' + query, params)
+    lines = [row[0] for row in cur.fetchall()]
+    execution_ms = None
+    for line in lines:
+        match = re.search(r'Execution Time: ([\d.]+) ms', line)
+        if match:
+            execution_ms = float(match.group(1))
+    return lines, execution_ms
+
+
+def uses_seq_scan(plan_lines):
+    return any('Seq Scan on footballplayers' in line for line in plan_lines)
+
+
+def benchmark(terms):
+    conn = None
+    try:
+        print('🔍 Connecting to database...\n')
+        conn = psycopg2.connect(DATABASE_URL)
+        cur = conn.cursor()
+
+        cur.execute("SELECT COUNT(*) FROM footballplayers")
+        print(f'📊 footballplayers rows: {cur.fetchone()[0]}\n')
+
+        cur.execute("""
+            SELECT indexname FROM pg_indexes
+            WHERE tablename = 'footballplayers'
+              AND indexname IN ('idx_footballplayers_name_trgm', 'idx_footballplayers_player_id_pattern')
+        """)
+        found = {row[0] for row in cur.fetchall()}
+        for index in ('idx_footballplayers_name_trgm', 'idx_footballplayers_player_id_pattern'):
+            print(f"  {'✅' if index in found else '❌'} {index}")
+        if len(found) < 2:
+            print('\n⚠️  Run migrations/add_footballplayers_trigram_search.sql to create missing indexes')
+        print()
+
+        summary = []
+        for term in terms:
+            escaped = escape_like(term)
+            params = {
+                'term': term,
+                'pattern': f'%{escaped}%',
+                'prefix': f'{escaped}%',
+                'limit': LIMIT,
+            }
+            new_query = PREFIX_QUERY if term.isdigit() else TRIGRAM_QUERY
+
+            start = time.time()
+            legacy_plan, legacy_ms = explain(cur, LEGACY_QUERY, params)
+            new_plan, new_ms = explain(cur, new_query, params)
+            wall = time.time() - start
+
+            print(f'━━━ "{term}" ({"player_id prefix" if term.isdigit() else "trigram"}) ━━━')
+            print('Legacy plan:')
+            for line in legacy_plan:
+                print(f'  {line}')
+            print('New plan:')
+            for line in new_plan:
+                print(f'  {line}')
+            print(f'(both plans in {wall:.3f}s wall time)\n')
+
+            summary.append((term, legacy_ms, uses_seq_scan(legacy_plan), new_ms, uses_seq_scan(new_plan)))
+
+        print(f"{'term':<20}{'legacy ms':>12}{'seq':>6}{'new ms':>12}{'seq':>6}")
+        for term, legacy_ms, legacy_seq, new_ms, new_seq in summary:
+            print(
+                f"{term:<20}{legacy_ms or 0:>12.2f}{'yes' if legacy_seq else 'no':>6}"
+                f"{new_ms or 0:>12.2f}{'yes' if new_seq else 'no':>6}"
+            )
+
+        cur.close()
+    finally:
+        if conn:
+            conn.close()
+
+
+if __name__ == '__main__':
+    if not DATABASE_URL:
+        print('❌ NEON_AUCTION_DB_URL not found')
+        sys.exit(1)
+
+    try:
+        benchmark(sys.argv[1:] or DEFAULT_TERMS)
+        print('\n✅ Benchmark completed')
+    except Exception as error:
+        print(f'\n❌ Benchmark failed: {error}')
+        sys.exit(1)
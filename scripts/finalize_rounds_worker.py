@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Drive the round finalization queue locally (backfills, catching up after downtime)
+
+Calls /api/cron/finalize-rounds until no expired active rounds are left.
+Each call claims rounds with FOR UPDATE SKIP LOCKED and finalizes them with
+bounded concurrency (lib/round-finalization-worker.ts), so --parallel
+callers, the Vercel cron and lazy finalization never pick the same round.
+Prints per-round timings as rounds complete.
+
+Usage:
+    python scripts/finalize_rounds_worker.py [--base-url http://localhost:3000]
+        [--concurrency 3] [--limit 10] [--parallel 1] [--max-runs 20] [--dry-run]
+
+--dry-run lists the expired active rounds (auction DB) without finalizing.
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+import psycopg2
+import requests
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv('.env.local')
+
+DATABASE_URL = os.getenv('NEON_AUCTION_DB_URL') or os.getenv('NEON_DATABASE_URL')
+CRON_SECRET = os.getenv('CRON_SECRET')
+
+EXPIRED_ROUNDS_QUERY = """
+    SELECT id, position, end_time, COALESCE(finalization_mode, 'auto')
+    FROM rounds
+    WHERE status = 'active'
+      AND end_time < NOW()
+    ORDER BY end_time ASC, id
+"""
+
+
+def list_expired_rounds():
+    conn = psycopg2.connect(DATABASE_URL)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(EXPIRED_ROUNDS_QUERY)
+            return cursor.fetchall()
+    finally:
+        conn.close()
+
+
+def run_worker(base_url, concurrency, limit):
+    """One worker invocation -> (response json, wall time ms)"""
+    headers = {'Authorization': f'Bearer {CRON_SECRET}'} if CRON_SECRET else {}
+    started = time.perf_counter()
+    response = requests.post(
+        f"{base_url.rstrip('/')}/api/cron/finalize-rounds",
+        params={'concurrency': concurrency, 'limit': limit},
+        headers=headers,
+        timeout=120,
+    )
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    response.raise_for_status()
+    return response.json(), elapsed_ms
+
+
+def print_rounds(data):
+    for round_ in data.get('finalized', []):
+        timings = round_.get('timings', {})
+        print(f"  ✅ {round_['round_id']} ({round_['position']}): "
+              f"{round_.get('allocations_count', 0)} allocations in {timings.get('total_ms', 0)}ms "
+              f"(finalize {timings.get('finalize_ms', 0)}ms, apply {timings.get('apply_ms', 0)}ms)")
+    for round_ in data.get('errors') or []:
+        timings = round_.get('timings', {})
+        print(f"  ⚠️  {round_['round_id']} ({round_['position']}): {round_.get('error')} "
+              f"after {timings.get('total_ms', 0)}ms")
+    for round_ in data.get('pending_manual') or []:
+        print(f"  ⏸️  {round_['round_id']} ({round_['position']}): manual mode - awaiting committee")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Finalize expired rounds through the finalization worker')
+    parser.add_argument('--base-url', default=os.getenv('NEXT_PUBLIC_APP_URL', 'http://localhost:3000'),
+                        help='App URL serving /api/cron/finalize-rounds')
+    parser.add_argument('--concurrency', type=int, default=3, help='Rounds finalized in parallel per call')
+    parser.add_argument('--limit', type=int, default=10, help='Rounds claimed per call')
+    parser.add_argument('--parallel', type=int, default=1, help='Worker calls issued at the same time')
+    parser.add_argument('--max-runs', type=int, default=20, help='Stop after this many calls')
+    parser.add_argument('--dry-run', action='store_true', help='List expired rounds without finalizing')
+    args = parser.parse_args()
+
+    if args.dry_run:
+        if not DATABASE_URL:
+            print("❌ ERROR: NEON_AUCTION_DB_URL / NEON_DATABASE_URL not found")
+            return 1
+        rounds = list_expired_rounds()
+        print(f"📋 {len(rounds)} expired active round(s):")
+        for round_id, position, end_time, mode in rounds:
+            print(f"  {round_id} {position} ended {end_time} ({mode})")
+        return 0
+
+    print(f"🔄 Draining round finalization queue via {args.base_url} "
+          f"(concurrency {args.concurrency}, limit {args.limit}, parallel {args.parallel})\n")
+
+    totals = {'processed': 0, 'finalized': 0, 'failed_or_tied': 0, 'pending_manual': 0}
+    started = time.perf_counter()
+    runs = 0
+
+    try:
+        with ThreadPoolExecutor(max_workers=args.parallel) as pool:
+            while runs < args.max_runs:
+                batch = min(args.parallel, args.max_runs - runs)
+                results = list(pool.map(
+                    lambda _: run_worker(args.base_url, args.concurrency, args.limit), range(batch)
+                ))
+                runs += batch
+
+                processed = failed = 0
+                for data, elapsed_ms in results:
+                    summary = data.get('summary') or {}
+                    processed += summary.get('total_expired', 0)
+                    failed += summary.get('failed_or_tied', 0)
+                    totals['processed'] += summary.get('total_expired', 0)
+                    totals['finalized'] += summary.get('successfully_finalized', 0)
+                    totals['failed_or_tied'] += summary.get('failed_or_tied', 0)
+                    totals['pending_manual'] += summary.get('pending_manual_finalization', 0)
+                    if summary:
+                        print(f"⏱️  Call finished in {elapsed_ms:.0f}ms "
+                              f"(worker {summary.get('duration_ms', 0)}ms): {data.get('message')}")
+                    print_rounds(data)
+
+                # Empty calls mean the queue is drained; a call that only hit
+                # failures would claim the same rounds again
+                if processed == 0 or processed == failed:
+                    break
+
+    except requests.exceptions.ConnectionError:
+        print("❌ Connection Error!")
+        print(f"   Make sure your Next.js server is running on {args.base_url}")
+        return 1
+    except requests.exceptions.HTTPError as e:
+        print(f"❌ HTTP Error: {e}")
+        return 1
+
+    print(f"\n📊 {runs} call(s) in {(time.perf_counter() - started):.1f}s: "
+          f"{totals['finalized']} finalized, {totals['failed_or_tied']} failed/tied, "
+          f"{totals['pending_manual']} awaiting manual finalization")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,197 +1,212 @@
 #!/usr/bin/env python3
 """
-Script to verify current trophy state and add missing trophies from JSON arrays
-Handles cases where multiple trophies were stored in one row as JSON array
+Backfill team_trophies from the trophy strings stored in teamstats.trophies
+
+teamstats.trophies is a JSONB array whose items are trophy strings or
+objects with a `name` (a string or a list of strings), e.g.
+["UCL CHAMPIONS", {"name": ["LEAGUE WINNERS", "CUP RUNNERS UP"]}].
+
+1. Expands every array server-side (jsonb_array_elements) into distinct
+   (team, season, trophy string) rows - one query
+2. Splits each string into name + position with one precompiled pattern
+3. Inserts the rows team_trophies doesn't have yet with one
+   INSERT ... SELECT FROM (VALUES ...) WHERE NOT EXISTS (execute_values)
+
+So a backfill after a historical import is two round trips in total.
+
+Usage: python scripts/fix_missing_trophies.py [--season SSPSLS12 ...] [--dry-run]
 """
 
+import argparse
 import os
-import sys
 import re
+import sys
 from pathlib import Path
 import psycopg2
+from psycopg2.extras import execute_values
 from dotenv import load_dotenv
 
 # Load environment variables from .env.local
 env_path = Path(__file__).parent.parent / '.env.local'
 load_dotenv(dotenv_path=env_path)
 
+# Trailing position suffix -> canonical trophy_position
+TROPHY_POSITION_PATTERN = re.compile(
+    r'^(?P<name>.*?)\s+(?:'
+    r'(?P<winner>WINNERS?)'
+    r'|(?P<runner_up>RUNNERS?\s+UP)'
+    r'|(?P<champions>CHAMPIONS?)'
+    r'|(?P<third_place>THIRD\s+PLACE)'
+    r'|(?P<ordinal>\d+(?:st|nd|rd|th)\s+Place)'
+    r')$',
+    re.IGNORECASE,
+)
+
+POSITION_LABELS = {
+    'winner': 'Winner',
+    'runner_up': 'Runner Up',
+    'champions': 'Champions',
+    'third_place': 'Third Place',
+}
+
+EXPAND_TROPHIES_SQL = """
+    WITH items AS (
+        SELECT ts.team_id, ts.team_name, ts.season_id, item
+        FROM teamstats ts
+        CROSS JOIN LATERAL jsonb_array_elements(
+            CASE WHEN jsonb_typeof(ts.trophies) = 'array' THEN ts.trophies ELSE '[]'::jsonb END
+        ) AS item
+        WHERE ts.trophies IS NOT NULL
+          AND (%(seasons)s::text[] IS NULL OR ts.season_id = ANY(%(seasons)s::text[]))
+    ),
+    strings AS (
+        SELECT team_id, team_name, season_id, s.value #>> '{}' AS trophy
+        FROM items
+        CROSS JOIN LATERAL jsonb_array_elements(
+            CASE
+                WHEN jsonb_typeof(item) = 'object' AND jsonb_typeof(item->'name') = 'array' THEN item->'name'
+                WHEN jsonb_typeof(item) = 'object' THEN jsonb_build_array(item->'name')
+                ELSE jsonb_build_array(item)
+            END
+        ) AS s(value)
+        WHERE jsonb_typeof(s.value) IN ('string', 'number')
+    )
+    SELECT DISTINCT ON (team_id, season_id, trophy) team_id, team_name, season_id, trophy
+    FROM strings
+    WHERE btrim(trophy) <> ''
+    ORDER BY team_id, season_id, trophy
+"""
+
+MISSING_SELECT = """
+    SELECT v.team_id, v.team_name, v.season_id, v.trophy_name, v.trophy_position
+    FROM (VALUES %s) AS v(team_id, team_name, season_id, trophy_name, trophy_position)
+    WHERE NOT EXISTS (
+        SELECT 1 FROM team_trophies t
+        WHERE t.team_id = v.team_id
+          AND t.season_id = v.season_id
+          AND t.trophy_name = v.trophy_name
+          AND t.trophy_position IS NOT DISTINCT FROM v.trophy_position
+    )
+"""
+
+INSERT_MISSING = """
+    INSERT INTO team_trophies (
+        team_id, team_name, season_id,
+        trophy_type, trophy_name, trophy_position,
+        awarded_by, notes, created_at, updated_at
+    )
+    SELECT team_id, team_name, season_id,
+           'cup', trophy_name, trophy_position,
+           'system', 'Recovered from teamstats during migration', NOW(), NOW()
+    FROM (""" + MISSING_SELECT + """) missing
+    ON CONFLICT DO NOTHING
+    RETURNING id, team_id, team_name, season_id, trophy_name, trophy_position
+"""
+
+VALUES_TEMPLATE = '(%s, %s, %s, %s, %s::text)'
+
+
 def parse_trophy_name(trophy_str):
-    """Parse trophy string into name and position"""
+    """
+    Parse trophy string into name and position
+
+    Examples:
+        "League Winner" -> ("League", "Winner")
+        "UCL RUNNERS UP" -> ("UCL", "Runner Up")
+        "FA Cup Champions" -> ("FA Cup", "Champions")
+        "League 4th Place" -> ("League", "4th Place")
+        "Runner Up" -> ("League", "Runner Up")
+    """
     normalized = trophy_str.strip()
-    
-    if re.search(r'\s+WINNERS?$', normalized, re.IGNORECASE):
-        trophy_name = re.sub(r'\s+WINNERS?$', '', normalized, flags=re.IGNORECASE).strip()
-        return (trophy_name, 'Winner')
-    
-    if re.search(r'\s+RUNNERS?\s+UP$', normalized, re.IGNORECASE):
-        trophy_name = re.sub(r'\s+RUNNERS?\s+UP$', '', normalized, flags=re.IGNORECASE).strip()
-        return (trophy_name, 'Runner Up')
-    
-    if re.search(r'\s+CHAMPIONS?$', normalized, re.IGNORECASE):
-        trophy_name = re.sub(r'\s+CHAMPIONS?$', '', normalized, flags=re.IGNORECASE).strip()
-        return (trophy_name, 'Champions')
-    
-    if re.search(r'\s+THIRD\s+PLACE$', normalized, re.IGNORECASE):
-        trophy_name = re.sub(r'\s+THIRD\s+PLACE$', '', normalized, flags=re.IGNORECASE).strip()
-        return (trophy_name, 'Third Place')
-    
+
+    match = TROPHY_POSITION_PATTERN.match(normalized)
+    if match:
+        name = match.group('name').strip()
+        if match.group('ordinal'):
+            return (name, match.group('ordinal'))
+        position = next(key for key in POSITION_LABELS if match.group(key))
+        return (name, POSITION_LABELS[position])
+
+    # Special case: just "Runner Up" -> ("League", "Runner Up")
+    if normalized.lower() == 'runner up':
+        return ('League', 'Runner Up')
+
     return (normalized, None)
 
+
+def normalize_rows(expanded):
+    """(team_id, team_name, season_id, trophy) -> distinct parsed VALUES rows"""
+    rows = {}
+    for team_id, team_name, season_id, trophy in expanded:
+        name, position = parse_trophy_name(trophy)
+        if not name:
+            continue
+        rows.setdefault((team_id, season_id, name, position), (team_id, team_name, season_id, name, position))
+    return list(rows.values())
+
+
+def backfill(conn, seasons=None, dry_run=False):
+    """Return the missing trophy rows (inserted unless dry_run)"""
+    with conn.cursor() as cursor:
+        cursor.execute(EXPAND_TROPHIES_SQL, {'seasons': seasons})
+        expanded = cursor.fetchall()
+        rows = normalize_rows(expanded)
+
+        print(f"📊 {len(expanded)} trophy string(s) in teamstats -> {len(rows)} distinct trophies")
+        if not rows:
+            return []
+
+        # One statement for the whole batch (page_size covers every row)
+        statement = MISSING_SELECT if dry_run else INSERT_MISSING
+        return execute_values(
+            cursor, statement, rows,
+            template=VALUES_TEMPLATE, page_size=len(rows), fetch=True
+        )
+
+
 def main():
-    print("🔍 Verifying trophy data and checking for missing entries...\n")
-    
+    parser = argparse.ArgumentParser(description='Backfill team_trophies from teamstats.trophies')
+    parser.add_argument('--season', action='append', dest='seasons',
+                        help='Only backfill this season (repeatable)')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='List missing trophies without inserting them')
+    args = parser.parse_args()
+
+    print("🔍 Checking teamstats trophies against team_trophies...\n")
+
     db_url = os.getenv('NEON_TOURNAMENT_DB_URL')
     if not db_url:
         print("❌ ERROR: NEON_TOURNAMENT_DB_URL not found")
         sys.exit(1)
-    
+
     try:
         conn = psycopg2.connect(db_url)
-        cursor = conn.cursor()
-        
-        # First, check current state
-        print("📊 Current trophy records:")
-        cursor.execute("""
-            SELECT id, team_id, team_name, season_id, trophy_name, trophy_position
-            FROM team_trophies
-            ORDER BY id
-        """)
-        
-        trophies = cursor.fetchall()
-        print(f"\nTotal trophies: {len(trophies)}\n")
-        
-        for trophy in trophies:
-            tid, team_id, team_name, season_id, name, position = trophy
-            print(f"ID {tid}: {team_name} - {name} {position or '(no position)'}")
-        
-        # Check the history/notes to find original JSON arrays
-        print("\n" + "="*60)
-        print("\n🔎 Checking for original JSON array data in notes...")
-        
-        # Look for trophy records that might have been part of arrays
-        # We need to check the teamstats.trophies JSONB column for the original data
-        cursor.execute("""
-            SELECT DISTINCT team_id, team_name, season_id, trophies
-            FROM teamstats
-            WHERE trophies IS NOT NULL 
-            AND trophies::text != '[]'
-            ORDER BY season_id, team_name
-        """)
-        
-        teamstats_trophies = cursor.fetchall()
-        
-        print(f"\nFound {len(teamstats_trophies)} team(s) with trophy data in teamstats\n")
-        
-        missing_trophies = []
-        
-        for team_id, team_name, season_id, trophies_json in teamstats_trophies:
-            print(f"\n{team_name} ({season_id}):")
-            print(f"  Original trophies JSON: {trophies_json}")
-            
-            # Parse the JSONB array
-            if isinstance(trophies_json, list):
-                trophy_list = trophies_json
-            else:
-                # Already parsed by psycopg2
-                trophy_list = trophies_json if isinstance(trophies_json, list) else []
-            
-            # Check each trophy in the JSON
-            for trophy_item in trophy_list:
-                trophy_strings = []
-                
-                if isinstance(trophy_item, dict):
-                    trophy_name_value = trophy_item.get('name', '')
-                    # Handle if name is a list or string
-                    if isinstance(trophy_name_value, list):
-                        trophy_strings = trophy_name_value
-                    else:
-                        trophy_strings = [trophy_name_value]
-                else:
-                    trophy_strings = [str(trophy_item)]
-                
-                # Process each trophy string (handles multiple trophies in one entry)
-                for trophy_str in trophy_strings:
-                    if not trophy_str or not isinstance(trophy_str, str):
-                        continue
-                        
-                    name, position = parse_trophy_name(trophy_str)
-                    
-                    # Check if this trophy exists in team_trophies
-                    cursor.execute("""
-                        SELECT id FROM team_trophies
-                        WHERE team_id = %s 
-                        AND season_id = %s 
-                        AND trophy_name = %s 
-                        AND trophy_position = %s
-                    """, (team_id, season_id, name, position))
-                    
-                    exists = cursor.fetchone()
-                    
-                    if exists:
-                        print(f"    ✅ {name} {position} - EXISTS (ID: {exists[0]})")
-                    else:
-                        print(f"    ❌ {name} {position} - MISSING")
-                        missing_trophies.append({
-                            'team_id': team_id,
-                            'team_name': team_name,
-                            'season_id': season_id,
-                            'trophy_name': name,
-                            'trophy_position': position
-                        })
-        
-        # Add missing trophies
-        if missing_trophies:
-            print("\n" + "="*60)
-            print(f"\n🔧 Adding {len(missing_trophies)} missing trophies...")
-            
-            for trophy in missing_trophies:
-                try:
-                    cursor.execute("""
-                        INSERT INTO team_trophies (
-                            team_id, team_name, season_id, 
-                            trophy_type, trophy_name, trophy_position,
-                            awarded_by, notes, created_at, updated_at
-                        ) VALUES (
-                            %s, %s, %s,
-                            'cup', %s, %s,
-                            'system', 'Recovered from teamstats during migration', NOW(), NOW()
-                        )
-                        RETURNING id
-                    """, (
-                        trophy['team_id'],
-                        trophy['team_name'],
-                        trophy['season_id'],
-                        trophy['trophy_name'],
-                        trophy['trophy_position']
-                    ))
-                    
-                    new_id = cursor.fetchone()[0]
-                    print(f"  ✅ Added: {trophy['team_name']} - {trophy['trophy_name']} {trophy['trophy_position']} (ID: {new_id})")
-                    
-                except psycopg2.Error as e:
-                    print(f"  ❌ Error adding trophy: {e}")
-            
-            conn.commit()
-            print(f"\n✅ Successfully added {len(missing_trophies)} missing trophies")
-        else:
+
+        missing = backfill(conn, args.seasons, args.dry_run)
+
+        if not missing:
             print("\n✅ All trophies are present - nothing to add!")
-        
-        # Final count
-        cursor.execute("SELECT COUNT(*) FROM team_trophies")
-        final_count = cursor.fetchone()[0]
-        print(f"\n📊 Final trophy count: {final_count}")
-        
-        cursor.close()
+        elif args.dry_run:
+            print(f"\n❌ {len(missing)} missing trophies (dry run, nothing inserted):")
+            for team_id, team_name, season_id, name, position in missing:
+                print(f"  {season_id} {team_name} ({team_id}) - {name} {position or '(no position)'}")
+        else:
+            conn.commit()
+            print(f"\n🔧 Added {len(missing)} missing trophies:")
+            for new_id, team_id, team_name, season_id, name, position in missing:
+                print(f"  ✅ {season_id} {team_name} - {name} {position or '(no position)'} (ID: {new_id})")
+
         conn.close()
-        
+
         print("\n🎉 Verification and fix complete!")
         return 0
-        
+
     except Exception as e:
         print(f"\n❌ Error: {e}")
         import traceback
         traceback.print_exc()
         return 1
 
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -0,0 +1,208 @@
+"""
+Bulk import / stat update of football players from a CSV or Excel export
+
+Feeds the same staging-table pipeline as lib/neon/player-import.ts:
+COPY rows into a temp table, then one INSERT ... ON CONFLICT DO UPDATE.
+
+  --mode stats   season rating update (keeps team_id, is_sold, acquisition_value,
+                 season_id, round_id and club on existing players) [default]
+  --mode import  full import (also overwrites club)
+
+Usage: python scripts/import_players.py players.csv [--mode stats|import] [--season-id SSPSLS16] [--dry-run]
+"""
+
+import argparse
+import csv
+import io
+import os
+import sys
+import uuid
+import psycopg2
+from dotenv import load_dotenv
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+# Load environment variables
+load_dotenv('.env.local')
+
+DATABASE_URL = os.getenv('NEON_AUCTION_DB_URL') or os.getenv('NEON_DATABASE_URL')
+
+STAGING_TABLE = 'footballplayers_staging'
+
+# Keep in sync with PLAYER_IMPORT_COLUMNS in lib/neon/player-import.ts
+COLUMNS = [
+    'id', 'player_id', 'name', 'position', 'position_group', 'overall_rating',
+    'nationality', 'age', 'club', 'team_id', 'team_name', 'season_id', 'round_id',
+    'is_auction_eligible', 'is_sold', 'acquisition_value', 'playing_style',
+    # Offensive attributes
+    'offensive_awareness', 'ball_control', 'dribbling', 'tight_possession',
+    'low_pass', 'lofted_pass', 'finishing', 'heading', 'set_piece_taking', 'curl',
+    # Physical attributes
+    'speed', 'acceleration', 'kicking_power', 'jumping', 'physical_contact', 'balance', 'stamina',
+    # Defensive attributes
+    'defensive_awareness', 'tackling', 'aggression', 'defensive_engagement',
+    # Goalkeeper attributes
+    'gk_awareness', 'gk_catching', 'gk_parrying', 'gk_reflexes', 'gk_reach',
+]
+
+ATTRIBUTE_COLUMNS = COLUMNS[COLUMNS.index('offensive_awareness'):]
+INTEGER_COLUMNS = {'overall_rating', 'age', 'acquisition_value', *ATTRIBUTE_COLUMNS}
+BOOLEAN_COLUMNS = {'is_auction_eligible', 'is_sold'}
+
+UPDATE_COLUMNS = {
+    'stats': ['name', 'position', 'position_group', 'overall_rating', 'nationality', 'age',
+              'team_name', 'playing_style', *ATTRIBUTE_COLUMNS],
+    'import': ['name', 'position', 'position_group', 'overall_rating', 'nationality', 'age',
+               'club', 'playing_style', *ATTRIBUTE_COLUMNS],
+}
+
+# Same header variations the committee import page accepts
+ALIASES = {
+    'name': ['name', 'player_name', 'full_name'],
+    'team_name': ['team_name', 'team', 'club', 'current_club'],
+}
+
+
+def build_upsert_sql(mode):
+    """Mirror of buildPlayerUpsertSql() in lib/neon/player-import.ts"""
+    columns = ', '.join(COLUMNS)
+    updates = [f'{column} = EXCLUDED.{column}' for column in UPDATE_COLUMNS[mode]]
+    if mode == 'stats':
+        updates.append('updated_at = NOW()')
+
+    return f"""
+        INSERT INTO footballplayers ({columns})
+        SELECT {columns}
+        FROM (
+          SELECT DISTINCT ON (player_id) *
+          FROM {STAGING_TABLE}
+          ORDER BY player_id, ordinal DESC
+        ) staged
+        ON CONFLICT (player_id) DO UPDATE SET
+          {', '.join(updates)}
+        RETURNING (xmax = 0) AS inserted
+    """
+
+
+def read_rows(path):
+    """Read an export into a list of dicts keyed by normalised header"""
+    if path.lower().endswith(('.xlsx', '.xlsm')):
+        if openpyxl is None:
+            raise RuntimeError('openpyxl is required for Excel files: pip install openpyxl')
+        sheet = openpyxl.load_workbook(path, read_only=True, data_only=True).active
+        rows = sheet.iter_rows(values_only=True)
+        headers = [str(h or '').strip() for h in next(rows)]
+        records = [dict(zip(headers, row)) for row in rows]
+    else:
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            records = list(csv.DictReader(f))
+
+    return [
+        {str(k).strip().lower().replace(' ', '_'): v for k, v in record.items() if k}
+        for record in records
+    ]
+
+
+def to_int(value):
+    if value is None or str(value).strip() == '':
+        return None
+    number = int(float(value))
+    return number or None
+
+
+def to_bool(value):
+    return str(value).strip().lower() in ('true', '1', 'yes', 'y')
+
+
+def normalise(record, season_id):
+    """Same rules as toStagingRow(): empty/zero -> NULL, flags default to false"""
+    for column, aliases in ALIASES.items():
+        if not record.get(column):
+            record[column] = next((record[a] for a in aliases if record.get(a)), None)
+
+    row = {}
+    for column in COLUMNS:
+        value = record.get(column)
+        if column in BOOLEAN_COLUMNS:
+            row[column] = to_bool(value) if value not in (None, '') else False
+        elif column in INTEGER_COLUMNS:
+            row[column] = to_int(value)
+        else:
+            row[column] = str(value).strip() if value not in (None, '') else None
+
+    row['id'] = row['id'] or str(uuid.uuid4())
+    row['season_id'] = row['season_id'] or season_id
+    return row
+
+
+def import_players(path, mode='stats', season_id=None, dry_run=False):
+    records = read_rows(path)
+    rows = [normalise(record, season_id) for record in records]
+    valid = [row for row in rows if row['player_id'] and row['name']]
+    errors = len(rows) - len(valid)
+
+    print(f'📄 {len(records)} rows read from {path} ({errors} without player_id/name skipped)')
+    if not valid:
+        return
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for ordinal, row in enumerate(valid):
+        writer.writerow([ordinal] + [row[column] for column in COLUMNS])
+    buffer.seek(0)
+
+    conn = None
+    try:
+        print('🔍 Connecting to database...')
+        conn = psycopg2.connect(DATABASE_URL)
+        cur = conn.cursor()
+
+        cur.execute(f'CREATE TEMP TABLE {STAGING_TABLE} (LIKE footballplayers, ordinal INTEGER) ON COMMIT DROP')
+        cur.copy_expert(
+            f"COPY {STAGING_TABLE} (ordinal, {', '.join(COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+        print(f'📦 Staged {cur.rowcount} rows')
+
+        cur.execute(build_upsert_sql(mode))
+        results = [row[0] for row in cur.fetchall()]
+        inserted = sum(1 for is_insert in results if is_insert)
+        updated = len(results) - inserted
+
+        if dry_run:
+            conn.rollback()
+            print(f'🧪 Dry run: would update {updated} and insert {inserted} players (rolled back)')
+        else:
+            conn.commit()
+            print(f'✅ {mode}: {updated} updated, {inserted} inserted, {len(valid) - len(results)} duplicates')
+
+        cur.close()
+    except Exception:
+        if conn:
+            conn.rollback()
+        raise
+    finally:
+        if conn:
+            conn.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Import football players from a CSV/Excel export')
+    parser.add_argument('file')
+    parser.add_argument('--mode', choices=['stats', 'import'], default='stats')
+    parser.add_argument('--season-id', help='season_id for players that do not have one')
+    parser.add_argument('--dry-run', action='store_true', help='run the upsert and roll it back')
+    args = parser.parse_args()
+
+    if not DATABASE_URL:
+        print('❌ NEON_AUCTION_DB_URL not found')
+        sys.exit(1)
+
+    try:
+        import_players(args.file, args.mode, args.season_id, args.dry_run)
+    except Exception as error:
+        print(f'\n❌ Import failed: {error}')
+        sys.exit(1)
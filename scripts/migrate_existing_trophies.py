@@ -9,8 +9,12 @@ import sys
 import re
 from pathlib import Path
 import psycopg2
+from psycopg2.extras import execute_values
 from dotenv import load_dotenv
 
+# Same precompiled name/position parser as the teamstats backfill
+from fix_missing_trophies import parse_trophy_name as parse_suffix
+
 # Load environment variables from .env.local
 env_path = Path(__file__).parent.parent / '.env.local'
 load_dotenv(dotenv_path=env_path)
@@ -41,34 +45,7 @@ def parse_trophy_name(full_name):
         # Remove quotes
         normalized = first_element.strip('"').strip()
     
-    # Check for position indicators at the end (case insensitive)
-    if re.search(r'\s+WINNERS?$', normalized, re.IGNORECASE):
-        trophy_name = re.sub(r'\s+WINNERS?$', '', normalized, flags=re.IGNORECASE).strip()
-        return (trophy_name, 'Winner')
-    
-    if re.search(r'\s+RUNNERS?\s+UP$', normalized, re.IGNORECASE):
-        trophy_name = re.sub(r'\s+RUNNERS?\s+UP$', '', normalized, flags=re.IGNORECASE).strip()
-        return (trophy_name, 'Runner Up')
-    
-    if re.search(r'\s+CHAMPIONS?$', normalized, re.IGNORECASE):
-        trophy_name = re.sub(r'\s+CHAMPIONS?$', '', normalized, flags=re.IGNORECASE).strip()
-        return (trophy_name, 'Champions')
-    
-    if re.search(r'\s+THIRD\s+PLACE$', normalized, re.IGNORECASE):
-        trophy_name = re.sub(r'\s+THIRD\s+PLACE$', '', normalized, flags=re.IGNORECASE).strip()
-        return (trophy_name, 'Third Place')
-    
-    # Check for ordinal positions (4th Place, 5th Place, etc.)
-    ordinal_match = re.match(r'^(.*?)\s+(\d+(?:st|nd|rd|th)\s+Place)$', normalized, re.IGNORECASE)
-    if ordinal_match:
-        return (ordinal_match.group(1).strip(), ordinal_match.group(2))
-    
-    # Special case: just "Runner Up" -> ("League", "Runner Up")
-    if normalized.lower() == 'runner up':
-        return ('League', 'Runner Up')
-    
-    # If no position indicator found, return full name with None position
-    return (normalized, None)
+    return parse_suffix(normalized)
 
 def migrate_trophies():
     """Migrate existing trophies to separate name and position format"""
@@ -109,41 +86,40 @@ def migrate_trophies():
             conn.close()
             return 0
         
-        # 2. Migrate each trophy
-        migrated = 0
+        # 2. Parse every trophy, then apply all updates in one statement
+        updates = []
         skipped = 0
-        errors = 0
         
         print("=" * 60)
         
         for trophy_id, trophy_name, trophy_position in existing_trophies:
             name, position = parse_trophy_name(trophy_name)
             
-            print(f"\nProcessing ID {trophy_id}: \"{trophy_name}\"")
-            print(f"  → Name: \"{name}\"")
-            print(f"  → Position: \"{position or 'NULL'}\"")
-            
             if position:
-                try:
-                    # Update the trophy with separated name and position
-                    cursor.execute("""
-                        UPDATE team_trophies
-                        SET 
-                            trophy_name = %s,
-                            trophy_position = %s,
-                            updated_at = NOW()
-                        WHERE id = %s
-                    """, (name, position, trophy_id))
-                    
-                    print(f"  ✅ Migrated")
-                    migrated += 1
-                except psycopg2.Error as e:
-                    print(f"  ❌ Error: {e}")
-                    errors += 1
+                updates.append((trophy_id, name, position))
+                print(f"  ID {trophy_id}: \"{trophy_name}\" → \"{name}\" / \"{position}\"")
             else:
-                print(f"  ⚠️  No position detected - keeping as-is")
+                print(f"  ⚠️  ID {trophy_id}: \"{trophy_name}\" - no position detected, keeping as-is")
                 skipped += 1
         
+        migrated = 0
+        errors = 0
+        if updates:
+            try:
+                execute_values(cursor, """
+                    UPDATE team_trophies t
+                    SET trophy_name = v.trophy_name,
+                        trophy_position = v.trophy_position,
+                        updated_at = NOW()
+                    FROM (VALUES %s) AS v(id, trophy_name, trophy_position)
+                    WHERE t.id = v.id
+                """, updates, page_size=len(updates))
+                migrated = len(updates)
+            except psycopg2.Error as e:
+                print(f"  ❌ Error: {e}")
+                conn.rollback()
+                errors = len(updates)
+        
         # Commit all changes
         conn.commit()
         
@@ -0,0 +1,356 @@
+"""
+Rebuild per-team, per-season transfer ledgers from Firestore `transactions`
+and check them against the Neon player tables in a single pass.
+
+Replaces the ad-hoc root scripts (check-transfers.js, list-transfers.js,
+verify-all-football-releases.js, verify-release-transactions.js,
+update-release-transactions-with-amounts.js, ...) that each re-read the
+whole dataset:
+
+1. Streams `transactions` once with a field projection, keeping one compact
+   row per entry and a ledger per (team, season, currency)
+2. Joins every referenced player against footballplayers / player_seasons
+   with one server-side cursor per database
+3. Compares the rebuilt ledger with team_seasons budgets (one get_all)
+4. Prints a compact diff table (and optionally writes it as JSON)
+
+Checks per entry:
+  balance_chain   balance_after != balance_before + amount
+  release_value   release auction_value differs from the player's Neon value
+  release_refund  refund_amount != floor(auction_value * refund_percentage / 100)
+  player_missing  player_id not found in the Neon table for that season
+  transfer_team   transfer_payment team no longer owns the player in Neon
+                  (only reported for the latest transfer of that player)
+Per ledger (when an initial_balance entry exists):
+  budget          sum of ledger amounts != team_seasons <currency>_budget
+
+Usage: python scripts/rebuild_transfer_ledger.py [--season SSPSLS16] [--team SSPSLT0001]
+                                                 [--tolerance 0.01] [--json diff.json] [--ledgers]
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+from collections import defaultdict, namedtuple
+
+import firebase_admin
+import psycopg2
+from dotenv import load_dotenv
+from firebase_admin import credentials, firestore
+
+# Load environment variables
+load_dotenv('.env.local')
+
+AUCTION_DB_URL = os.getenv('NEON_AUCTION_DB_URL') or os.getenv('NEON_DATABASE_URL')
+TOURNAMENT_DB_URL = os.getenv('NEON_TOURNAMENT_DB_URL')
+
+# Only these fields are transferred from Firestore
+PROJECTION = [
+    'team_id', 'season_id', 'transaction_type', 'currency_type', 'amount',
+    'balance_before', 'balance_after', 'player_id', 'player_name', 'player_type',
+    'auction_value', 'refund_amount', 'refund_percentage', 'metadata', 'created_at',
+]
+
+# Ledger columns: transaction_type -> bucket
+BUCKETS = {
+    'initial_balance': 'opening',
+    'auction_win': 'auction',
+    'transfer_payment': 'transfer_in',
+    'transfer_compensation': 'transfer_out',
+    'swap_committee_fee': 'swap',
+    'swap_fee_paid': 'swap',
+    'swap_fee_received': 'swap',
+    'release': 'release',
+    'release_refund': 'release',
+    'salary_payment': 'salary',
+    'real_player_fee': 'fees',
+    'fine': 'fees',
+}
+BUCKET_ORDER = ['opening', 'auction', 'transfer_in', 'transfer_out', 'swap', 'release', 'salary', 'fees', 'other']
+
+BUDGET_FIELDS = {'football': 'football_budget', 'real_player': 'real_player_budget'}
+
+Entry = namedtuple('Entry', 'doc_id team_id season_id type currency amount player_id player_type created_at')
+
+
+def init_firestore():
+    """Initialize Firebase Admin from the same env vars as lib/firebase/admin.ts"""
+    if not firebase_admin._apps:
+        project_id = os.getenv('FIREBASE_ADMIN_PROJECT_ID')
+        client_email = os.getenv('FIREBASE_ADMIN_CLIENT_EMAIL')
+        private_key = os.getenv('FIREBASE_ADMIN_PRIVATE_KEY')
+
+        if not all([project_id, client_email, private_key]):
+            print("❌ Firebase Admin credentials not found in .env.local")
+            print("   Required: FIREBASE_ADMIN_PROJECT_ID, FIREBASE_ADMIN_CLIENT_EMAIL, FIREBASE_ADMIN_PRIVATE_KEY")
+            sys.exit(1)
+
+        cred = credentials.Certificate({
+            'type': 'service_account',
+            'project_id': project_id,
+            'client_email': client_email,
+            'private_key': private_key.replace('\\n', '\n'),
+            'token_uri': 'https://oauth2.googleapis.com/token',
+        })
+        firebase_admin.initialize_app(cred)
+
+    return firestore.client()
+
+
+def to_number(value):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(number) else number
+
+
+def normalise(doc_id, data):
+    """Flatten the old (top-level) and new (metadata) transaction shapes"""
+    meta = data.get('metadata') or {}
+    tx_type = data.get('transaction_type') or 'unknown'
+    player_type = data.get('player_type') or meta.get('player_type')
+
+    currency = data.get('currency_type')
+    if not currency:
+        currency = 'real_player' if player_type == 'real' else 'football'
+
+    amount = to_number(data.get('amount'))
+    if amount is None and tx_type == 'release':
+        # Historical release docs only store refund_amount (income)
+        amount = to_number(data.get('refund_amount')) or 0.0
+
+    return Entry(
+        doc_id=doc_id,
+        team_id=data.get('team_id'),
+        season_id=data.get('season_id'),
+        type=tx_type,
+        currency=currency,
+        amount=amount or 0.0,
+        player_id=data.get('player_id') or meta.get('player_id'),
+        player_type=player_type,
+        created_at=data.get('created_at'),
+    )
+
+
+def stream_transactions(db, season_id=None, team_id=None):
+    """Yield (doc_id, projected data) for every matching transaction"""
+    query = db.collection('transactions')
+    if season_id:
+        query = query.where('season_id', '==', season_id)
+    if team_id:
+        query = query.where('team_id', '==', team_id)
+
+    for doc in query.select(PROJECTION).stream():
+        yield doc.id, doc.to_dict() or {}
+
+
+def stream_player_values(db_url, table, value_expr, name_expr, keys, itersize=2000):
+    """
+    Stream (player_id, season_id, team_id, value, name) for the given
+    player ids through a named (server-side) cursor.
+    """
+    if not keys:
+        return
+    conn = psycopg2.connect(db_url)
+    try:
+        with conn.cursor(name=f'ledger_{table}') as cur:
+            cur.itersize = itersize
+            cur.execute(f"""
+                SELECT player_id, season_id, team_id, {value_expr} AS value, {name_expr} AS name
+                FROM {table}
+                WHERE player_id = ANY(%s)
+            """, (sorted(keys),))
+            for row in cur:
+                yield row
+    finally:
+        conn.close()
+
+
+def rebuild(season_id=None, team_id=None, tolerance=0.01):
+    db = init_firestore()
+
+    ledgers = defaultdict(lambda: defaultdict(float))   # (team, season, currency) -> bucket -> amount
+    entry_counts = defaultdict(int)
+    has_opening = set()
+    diffs = []
+    releases = defaultdict(list)                        # (type, player_id, season) -> [(entry, data)]
+    payments = {}                                       # (type, player_id, season) -> latest transfer_payment
+    player_keys = {'football': set(), 'real': set()}
+    seen = 0
+
+    # Pass 1: stream transactions once
+    print('🔍 Streaming transactions...')
+    for doc_id, data in stream_transactions(db, season_id, team_id):
+        seen += 1
+        entry = normalise(doc_id, data)
+        if not entry.team_id or not entry.season_id:
+            continue
+
+        ledger_key = (entry.team_id, entry.season_id, entry.currency)
+        ledgers[ledger_key][BUCKETS.get(entry.type, 'other')] += entry.amount
+        entry_counts[ledger_key] += 1
+        if entry.type == 'initial_balance':
+            has_opening.add(ledger_key)
+
+        before, after = to_number(data.get('balance_before')), to_number(data.get('balance_after'))
+        if before is not None and after is not None and abs(before + entry.amount - after) > tolerance:
+            diffs.append((entry, 'balance_chain', before + entry.amount, after))
+
+        if entry.player_id and entry.player_type in player_keys:
+            player_key = (entry.player_type, entry.player_id, entry.season_id)
+            if entry.type == 'release':
+                player_keys[entry.player_type].add(entry.player_id)
+                releases[player_key].append((entry, data))
+            elif entry.type == 'transfer_payment':
+                player_keys[entry.player_type].add(entry.player_id)
+                latest = payments.get(player_key)
+                if latest is None or str(entry.created_at) > str(latest.created_at):
+                    payments[player_key] = entry
+
+    print(f'   {seen} transactions, {len(ledgers)} ledgers, '
+          f'{len(player_keys["football"])} football / {len(player_keys["real"])} real players referenced')
+
+    # Pass 2: join referenced players via server-side cursors
+    print('🔗 Joining against Neon player tables...')
+    players = {}
+    sources = [
+        ('football', AUCTION_DB_URL, 'footballplayers', 'COALESCE(acquisition_value, auction_value)', 'name'),
+        ('real', TOURNAMENT_DB_URL, 'player_seasons', 'auction_value', 'player_name'),
+    ]
+    for player_type, db_url, table, value_expr, name_expr in sources:
+        if not db_url:
+            print(f'   ⚠️  No database URL for {table}; skipping {player_type} player checks')
+            player_keys[player_type] = set()
+            continue
+        for pid, sid, tid, value, _name in stream_player_values(db_url, table, value_expr, name_expr, player_keys[player_type]):
+            players[(player_type, pid, sid)] = (tid, to_number(value))
+
+    for player_key, items in releases.items():
+        if player_key[1] not in player_keys[player_key[0]]:
+            continue
+        player = players.get(player_key)
+        for entry, data in items:
+            if player is None:
+                diffs.append((entry, 'player_missing', None, None))
+                continue
+            neon_value = player[1]
+            recorded_value = to_number(data.get('auction_value'))
+            if neon_value is not None and recorded_value is not None and abs(neon_value - recorded_value) > tolerance:
+                diffs.append((entry, 'release_value', neon_value, recorded_value))
+
+            percentage = to_number(data.get('refund_percentage'))
+            refund = to_number(data.get('refund_amount'))
+            if recorded_value is not None and percentage is not None and refund is not None:
+                expected = math.floor(recorded_value * percentage / 100)
+                if abs(expected - refund) > tolerance:
+                    diffs.append((entry, 'release_refund', expected, refund))
+
+    for player_key, entry in payments.items():
+        if player_key[1] not in player_keys[player_key[0]]:
+            continue
+        player = players.get(player_key)
+        if player is None:
+            diffs.append((entry, 'player_missing', None, None))
+        elif player[0] != entry.team_id:
+            diffs.append((entry, 'transfer_team', entry.team_id, player[0]))
+
+    # Pass 3: compare opening-balance ledgers with current budgets
+    budget_keys = sorted(k for k in has_opening if k[2] in BUDGET_FIELDS)
+    if budget_keys:
+        print('💵 Comparing ledgers with team_seasons budgets...')
+        doc_ids = sorted({f'{team}_{season}' for team, season, _ in budget_keys})
+        refs = [db.collection('team_seasons').document(doc_id) for doc_id in doc_ids]
+        budgets = {doc.id: doc.to_dict() or {} for doc in db.get_all(refs) if doc.exists}
+
+        for team, season, currency in budget_keys:
+            recorded = to_number(budgets.get(f'{team}_{season}', {}).get(BUDGET_FIELDS[currency]))
+            expected = sum(ledgers[(team, season, currency)].values())
+            if recorded is not None and abs(expected - recorded) > tolerance:
+                entry = Entry(f'{team}_{season}', team, season, 'ledger', currency, 0.0, None, None, None)
+                diffs.append((entry, 'budget', expected, recorded))
+
+    return ledgers, entry_counts, diffs
+
+
+def fmt(value):
+    if value is None:
+        return '-'
+    if isinstance(value, (int, float)):
+        return f'{value:.2f}'
+    return str(value)
+
+
+def print_ledgers(ledgers, entry_counts):
+    print(f"\n{'team':<12}{'season':<10}{'currency':<12}{'n':>5}" + ''.join(f'{b:>13}' for b in BUCKET_ORDER) + f"{'net':>12}")
+    for key in sorted(ledgers):
+        team, season, currency = key
+        buckets = ledgers[key]
+        print(
+            f'{team:<12}{season:<10}{currency:<12}{entry_counts[key]:>5}'
+            + ''.join(f'{buckets.get(b, 0.0):>13.2f}' for b in BUCKET_ORDER)
+            + f'{sum(buckets.values()):>12.2f}'
+        )
+
+
+def print_diffs(diffs):
+    if not diffs:
+        print('\n✅ No discrepancies found')
+        return
+
+    print(f"\n❌ {len(diffs)} discrepanc{'y' if len(diffs) == 1 else 'ies'}:\n")
+    print(f"{'team':<12}{'season':<10}{'check':<16}{'type':<22}{'player':<14}{'expected':>12}{'recorded':>12}  doc")
+    for entry, check, expected, recorded in sorted(diffs, key=lambda d: (d[0].team_id or '', d[0].season_id or '', d[1])):
+        print(
+            f'{entry.team_id or "-":<12}{entry.season_id or "-":<10}{check:<16}{entry.type:<22}'
+            f'{entry.player_id or "-":<14}{fmt(expected):>12}{fmt(recorded):>12}  {entry.doc_id}'
+        )
+
+    counts = defaultdict(int)
+    for _, check, _, _ in diffs:
+        counts[check] += 1
+    print('\n' + ', '.join(f'{check}: {n}' for check, n in sorted(counts.items())))
+
+
+def write_json(path, diffs):
+    rows = [{
+        'doc_id': entry.doc_id,
+        'team_id': entry.team_id,
+        'season_id': entry.season_id,
+        'check': check,
+        'transaction_type': entry.type,
+        'currency_type': entry.currency,
+        'player_id': entry.player_id,
+        'expected': expected,
+        'recorded': recorded,
+    } for entry, check, expected, recorded in diffs]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(rows, f, indent=2, default=str)
+    print(f'\n💾 Diff written to {path}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Rebuild transfer ledgers and diff them against Neon/Firestore')
+    parser.add_argument('--season', help='only this season_id')
+    parser.add_argument('--team', help='only this team_id')
+    parser.add_argument('--tolerance', type=float, default=0.01, help='allowed rounding difference')
+    parser.add_argument('--json', help='write the diff rows to this file')
+    parser.add_argument('--ledgers', action='store_true', help='also print the rebuilt ledger table')
+    args = parser.parse_args()
+
+    if not AUCTION_DB_URL and not TOURNAMENT_DB_URL:
+        print('❌ NEON_AUCTION_DB_URL / NEON_TOURNAMENT_DB_URL not found')
+        sys.exit(1)
+
+    try:
+        ledgers, entry_counts, diffs = rebuild(args.season, args.team, args.tolerance)
+        if args.ledgers:
+            print_ledgers(ledgers, entry_counts)
+        print_diffs(diffs)
+        if args.json:
+            write_json(args.json, diffs)
+    except Exception as error:
+        print(f'\n❌ Ledger rebuild failed: {error}')
+        sys.exit(1)
@@ -0,0 +1,379 @@
+"""
+Team finance reconciliation engine
+
+Computes the expected balance of every team and season from the
+transaction ledger and compares it with what is stored:
+
+  Firestore team_seasons   football_budget, real_player_budget, football_spent
+  Neon teams (auction DB)  football_budget, football_spent, football_players_count
+
+Reads (each once, regardless of the number of teams or seasons):
+  1. Firestore transactions  - one projected stream, grouped by (team, season, currency)
+  2. Firestore team_seasons  - one projected stream
+  3. Neon footballplayers    - one GROUP BY team_id, season_id query
+  4. Neon teams              - one query
+
+Expected values:
+  budget   = opening balance + sum of ledger amounts
+             (opening = initial_balance entries if logged, else
+              team_seasons <currency>_starting_balance)
+  spent / players_count = sold footballplayers grouped by team and season
+
+Differences are written to a fix plan (JSON) that can be reviewed and then
+applied in bulk: Firestore batched writes and one UPDATE ... FROM (VALUES)
+for Neon. Ledgers without an opening balance are reported but never fixed.
+
+Supersedes scripts/check_team_balances.py, audit-team-finances.js and the
+fix-team-finances*.js scripts. Suitable for a nightly cron:
+
+  python scripts/reconcile_team_finances.py --plan finance-plan.json
+
+Usage: python scripts/reconcile_team_finances.py [--season SSPSLS16 ...] [--plan plan.json]
+       python scripts/reconcile_team_finances.py --apply plan.json
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+import firebase_admin
+import psycopg2
+from dotenv import load_dotenv
+from firebase_admin import credentials, firestore
+from psycopg2.extras import execute_values
+
+# Load environment variables
+load_dotenv('.env.local')
+
+AUCTION_DB_URL = os.getenv('NEON_AUCTION_DB_URL') or os.getenv('NEON_DATABASE_URL')
+
+TOLERANCE = 0.01
+FIRESTORE_BATCH_LIMIT = 500
+
+TRANSACTION_FIELDS = ['team_id', 'season_id', 'transaction_type', 'currency_type', 'amount',
+                      'refund_amount', 'player_type', 'metadata']
+TEAM_SEASON_FIELDS = ['team_id', 'season_id', 'football_budget', 'real_player_budget', 'football_spent',
+                      'football_starting_balance', 'real_player_starting_balance']
+
+CURRENCIES = {
+    # currency_type: (budget field, starting balance field)
+    'football': ('football_budget', 'football_starting_balance'),
+    'real_player': ('real_player_budget', 'real_player_starting_balance'),
+}
+
+# Neon teams columns that may be fixed from the plan
+NEON_TEAM_COLUMNS = {'football_budget', 'football_spent', 'football_players_count'}
+
+
+def init_firestore():
+    """Initialize Firebase Admin from the same env vars as lib/firebase/admin.ts"""
+    if not firebase_admin._apps:
+        project_id = os.getenv('FIREBASE_ADMIN_PROJECT_ID')
+        client_email = os.getenv('FIREBASE_ADMIN_CLIENT_EMAIL')
+        private_key = os.getenv('FIREBASE_ADMIN_PRIVATE_KEY')
+
+        if not all([project_id, client_email, private_key]):
+            print("❌ Firebase Admin credentials not found in .env.local")
+            print("   Required: FIREBASE_ADMIN_PROJECT_ID, FIREBASE_ADMIN_CLIENT_EMAIL, FIREBASE_ADMIN_PRIVATE_KEY")
+            sys.exit(1)
+
+        cred = credentials.Certificate({
+            'type': 'service_account',
+            'project_id': project_id,
+            'client_email': client_email,
+            'private_key': private_key.replace('\\n', '\n'),
+            'token_uri': 'https://oauth2.googleapis.com/token',
+        })
+        firebase_admin.initialize_app(cred)
+
+    return firestore.client()
+
+
+def to_number(value):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(number) else number
+
+
+def differs(expected, recorded):
+    return recorded is None or abs(expected - recorded) > TOLERANCE
+
+
+def season_filtered(query, seasons):
+    """Apply a season filter; Firestore 'in' takes at most 30 values"""
+    if not seasons:
+        return [query]
+    return [query.where('season_id', 'in', seasons[i:i + 30]) for i in range(0, len(seasons), 30)]
+
+
+# ============================================================================
+# LOAD
+# ============================================================================
+
+def load_ledger(db, seasons):
+    """Stream transactions once and group amounts by (team, season, currency)"""
+    ledger = defaultdict(lambda: {'opening': 0.0, 'movements': 0.0, 'has_opening': False, 'entries': 0})
+
+    for query in season_filtered(db.collection('transactions'), seasons):
+        for doc in query.select(TRANSACTION_FIELDS).stream():
+            data = doc.to_dict() or {}
+            team_id, season_id = data.get('team_id'), data.get('season_id')
+            if not team_id or not season_id:
+                continue
+
+            player_type = data.get('player_type') or (data.get('metadata') or {}).get('player_type')
+            currency = data.get('currency_type') or ('real_player' if player_type == 'real' else 'football')
+            if currency not in CURRENCIES:
+                continue
+
+            amount = to_number(data.get('amount'))
+            if amount is None and data.get('transaction_type') == 'release':
+                # Historical release docs only store refund_amount (income)
+                amount = to_number(data.get('refund_amount'))
+
+            bucket = ledger[(team_id, season_id, currency)]
+            bucket['entries'] += 1
+            if data.get('transaction_type') == 'initial_balance':
+                bucket['opening'] += amount or 0.0
+                bucket['has_opening'] = True
+            else:
+                bucket['movements'] += amount or 0.0
+
+    return ledger
+
+
+def load_team_seasons(db, seasons):
+    team_seasons = {}
+    for query in season_filtered(db.collection('team_seasons'), seasons):
+        for doc in query.select(TEAM_SEASON_FIELDS).stream():
+            data = doc.to_dict() or {}
+            team_id = data.get('team_id') or doc.id.rsplit('_', 1)[0]
+            season_id = data.get('season_id') or doc.id.rsplit('_', 1)[-1]
+            team_seasons[(team_id, season_id)] = (doc.id, data)
+    return team_seasons
+
+
+def load_neon(seasons):
+    """Sold football players grouped by team/season, and the teams table"""
+    if not AUCTION_DB_URL:
+        print('⚠️  NEON_AUCTION_DB_URL not found; skipping Neon checks')
+        return {}, {}
+
+    season_clause = 'AND season_id = ANY(%(seasons)s)' if seasons else ''
+    params = {'seasons': seasons}
+
+    conn = psycopg2.connect(AUCTION_DB_URL)
+    try:
+        cur = conn.cursor()
+        cur.execute(f"""
+            SELECT team_id, season_id, COUNT(*), COALESCE(SUM(acquisition_value), 0)
+            FROM footballplayers
+            WHERE is_sold = true AND team_id IS NOT NULL {season_clause}
+            GROUP BY team_id, season_id
+        """, params)
+        squads = {(team_id, season_id): (int(count), float(spent)) for team_id, season_id, count, spent in cur.fetchall()}
+
+        cur.execute(f"""
+            SELECT id, season_id, football_budget, football_spent, football_players_count
+            FROM teams
+            WHERE true {season_clause}
+        """, params)
+        teams = {
+            (team_id, season_id): {
+                'football_budget': to_number(budget),
+                'football_spent': to_number(spent),
+                'football_players_count': count,
+            }
+            for team_id, season_id, budget, spent, count in cur.fetchall()
+        }
+        cur.close()
+        return squads, teams
+    finally:
+        conn.close()
+
+
+# ============================================================================
+# RECONCILE
+# ============================================================================
+
+def reconcile(db, seasons):
+    started = time.time()
+    ledger = load_ledger(db, seasons)
+    team_seasons = load_team_seasons(db, seasons)
+    squads, neon_teams = load_neon(seasons)
+    print(f'📥 Loaded {len(ledger)} ledgers, {len(team_seasons)} team_seasons, '
+          f'{len(squads)} squads, {len(neon_teams)} Neon teams in {time.time() - started:.1f}s')
+
+    fixes = []
+    unresolved = []
+
+    def fix(target, ref, field, current, expected, reason):
+        fixes.append({
+            'target': target, 'ref': ref, 'field': field,
+            'current': current, 'expected': round(expected, 2), 'reason': reason,
+        })
+
+    for (team_id, season_id), (doc_id, data) in sorted(team_seasons.items()):
+        expected_budgets = {}
+        for currency, (budget_field, starting_field) in CURRENCIES.items():
+            bucket = ledger.get((team_id, season_id, currency))
+            recorded = to_number(data.get(budget_field))
+            starting = to_number(data.get(starting_field))
+
+            if bucket and bucket['has_opening']:
+                opening = bucket['opening']
+            elif starting is not None:
+                opening = starting
+            else:
+                if bucket or recorded is not None:
+                    unresolved.append((team_id, season_id, currency, 'no opening balance'))
+                continue
+
+            expected = opening + (bucket['movements'] if bucket else 0.0)
+            expected_budgets[currency] = expected
+            if recorded is not None and differs(expected, recorded):
+                fix('firestore', f'team_seasons/{doc_id}', budget_field, recorded, expected, 'ledger')
+
+        squad = squads.get((team_id, season_id))
+        if squad is not None:
+            recorded_spent = to_number(data.get('football_spent'))
+            if recorded_spent is not None and differs(squad[1], recorded_spent):
+                fix('firestore', f'team_seasons/{doc_id}', 'football_spent', recorded_spent, squad[1], 'footballplayers')
+
+        neon = neon_teams.get((team_id, season_id))
+        if neon is not None:
+            if 'football' in expected_budgets and differs(expected_budgets['football'], neon['football_budget']):
+                fix('neon', f'teams/{team_id}/{season_id}', 'football_budget',
+                    neon['football_budget'], expected_budgets['football'], 'ledger')
+            count, spent = squad if squad else (0, 0.0)
+            if differs(spent, neon['football_spent']):
+                fix('neon', f'teams/{team_id}/{season_id}', 'football_spent', neon['football_spent'], spent, 'footballplayers')
+            if count != (neon['football_players_count'] or 0):
+                fix('neon', f'teams/{team_id}/{season_id}', 'football_players_count',
+                    neon['football_players_count'], count, 'footballplayers')
+
+    for team_id, season_id in sorted(set(neon_teams) - set(team_seasons)):
+        unresolved.append((team_id, season_id, 'football', 'Neon team has no team_seasons document'))
+
+    print(f'⏱️  Reconciled in {time.time() - started:.1f}s')
+    return fixes, unresolved
+
+
+def print_report(fixes, unresolved):
+    if fixes:
+        print(f"\n{'target':<10}{'ref':<42}{'field':<24}{'current':>12}{'expected':>12}{'diff':>12}  source")
+        for f in fixes:
+            current = f['current'] if f['current'] is not None else 0
+            print(
+                f"{f['target']:<10}{f['ref']:<42}{f['field']:<24}"
+                f"{current:>12.2f}{f['expected']:>12.2f}{f['expected'] - current:>12.2f}  {f['reason']}"
+            )
+    else:
+        print('\n✅ All balances match the ledger')
+
+    if unresolved:
+        print(f'\n⚠️  {len(unresolved)} ledger(s) could not be reconciled:')
+        for team_id, season_id, currency, reason in unresolved:
+            print(f'   {team_id} {season_id} {currency}: {reason}')
+
+    teams = {f['ref'] for f in fixes}
+    print(f'\n📊 {len(fixes)} fix(es) across {len(teams)} record(s), {len(unresolved)} unresolved')
+
+
+# ============================================================================
+# APPLY
+# ============================================================================
+
+def apply_plan(db, plan_path):
+    with open(plan_path, encoding='utf-8') as f:
+        plan = json.load(f)
+    fixes = plan['fixes']
+
+    # Firestore: group field changes per document, then batch
+    firestore_updates = defaultdict(dict)
+    neon_updates = defaultdict(dict)
+    for f in fixes:
+        if f['target'] == 'firestore':
+            firestore_updates[f['ref']][f['field']] = f['expected']
+        elif f['target'] == 'neon' and f['field'] in NEON_TEAM_COLUMNS:
+            _, team_id, season_id = f['ref'].split('/')
+            neon_updates[(team_id, season_id)][f['field']] = f['expected']
+
+    refs = list(firestore_updates.items())
+    for i in range(0, len(refs), FIRESTORE_BATCH_LIMIT):
+        batch = db.batch()
+        for ref, fields in refs[i:i + FIRESTORE_BATCH_LIMIT]:
+            batch.update(db.document(ref), {**fields, 'updated_at': firestore.SERVER_TIMESTAMP})
+        batch.commit()
+    print(f'✅ Firestore: {len(refs)} team_seasons document(s) updated')
+
+    if neon_updates:
+        if not AUCTION_DB_URL:
+            print('❌ NEON_AUCTION_DB_URL not found; Neon fixes not applied')
+            return
+        # NULL keeps the current value for columns a row does not change
+        rows = [
+            (team_id, season_id, fields.get('football_budget'), fields.get('football_spent'),
+             fields.get('football_players_count'))
+            for (team_id, season_id), fields in neon_updates.items()
+        ]
+        conn = psycopg2.connect(AUCTION_DB_URL)
+        try:
+            cur = conn.cursor()
+            execute_values(cur, """
+                UPDATE teams t SET
+                  football_budget = COALESCE(v.football_budget, t.football_budget),
+                  football_spent = COALESCE(v.football_spent, t.football_spent),
+                  football_players_count = COALESCE(v.football_players_count, t.football_players_count),
+                  updated_at = NOW()
+                FROM (VALUES %s) AS v(id, season_id, football_budget, football_spent, football_players_count)
+                WHERE t.id = v.id AND t.season_id = v.season_id
+            """, rows, template='(%s, %s, %s::numeric, %s::numeric, %s::integer)', page_size=len(rows))
+            conn.commit()
+            print(f'✅ Neon: {cur.rowcount} teams row(s) updated')
+            cur.close()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Reconcile team balances against the transaction ledger')
+    parser.add_argument('--season', action='append', dest='seasons', help='season_id to reconcile (repeatable, default all)')
+    parser.add_argument('--plan', help='write the fix plan to this JSON file')
+    parser.add_argument('--apply', metavar='PLAN', help='apply a previously written fix plan')
+    args = parser.parse_args()
+
+    db = init_firestore()
+
+    try:
+        if args.apply:
+            apply_plan(db, args.apply)
+            sys.exit(0)
+
+        fixes, unresolved = reconcile(db, args.seasons or [])
+        print_report(fixes, unresolved)
+
+        if args.plan:
+            with open(args.plan, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'generated_at': datetime.now(timezone.utc).isoformat(),
+                    'seasons': args.seasons or 'all',
+                    'fixes': fixes,
+                    'unresolved': [
+                        {'team_id': t, 'season_id': s, 'currency': c, 'reason': r} for t, s, c, r in unresolved
+                    ],
+                }, f, indent=2)
+            print(f'💾 Fix plan written to {args.plan} (apply with --apply {args.plan})')
+    except Exception as error:
+        print(f'\n❌ Reconciliation failed: {error}')
+        sys.exit(1)
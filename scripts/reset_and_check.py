@@ -2,6 +2,8 @@ import os
 import psycopg2
 from dotenv import load_dotenv
 
+from salary_engine import plan_salary_deductions
+
 load_dotenv()
 
 # Base points by star rating
@@ -98,29 +100,60 @@ def check_salary_deductions():
         tx_list = []
         for doc in transactions:
             data = doc.to_dict()
+            metadata = data.get('metadata', {})
             tx_list.append({
                 'team_id': data.get('team_id'),
                 'amount': abs(data.get('amount', 0)),
                 'balance_before': data.get('balance_before', 0),
                 'balance_after': data.get('balance_after', 0),
-                'fixture_id': data.get('metadata', {}).get('fixture_id'),
-                'player_count': data.get('metadata', {}).get('player_count')
+                'fixture_id': metadata.get('fixture_id'),
+                'player_id': metadata.get('player_id'),
+                'player_name': metadata.get('player_name') or '',
+                'player_count': metadata.get('player_count'),
+                'created_at': data.get('created_at'),
             })
         
         if len(tx_list) > 0:
             print(f"✅ Found {len(tx_list)} salary payment transactions:\n")
             
-            # Group by team
-            by_team = {}
-            for tx in tx_list:
-                team = tx['team_id']
-                if team not in by_team:
-                    by_team[team] = {'total': 0, 'count': 0}
-                by_team[team]['total'] += tx['amount']
-                by_team[team]['count'] += 1
+            # Replay the charges through the salary engine (same math as the app).
+            # Charges logged in one batch share a timestamp, so order them within
+            # a team and fixture by the balance they started from
+            tx_list.sort(key=lambda tx: (
+                tx['created_at'] is None,
+                tx['created_at'] or 0,
+                tx['team_id'] or '',
+                tx['fixture_id'] or '',
+                -(tx['balance_before'] or 0),
+            ))
+            
+            def replay(keys):
+                opening = {}
+                for key, tx in zip(keys, tx_list):
+                    opening.setdefault(key, tx['balance_before'])
+                return plan_salary_deductions({
+                    'fixture_ids': [tx['fixture_id'] for tx in tx_list],
+                    'player_ids': [tx['player_id'] for tx in tx_list],
+                    'player_names': [tx['player_name'] for tx in tx_list],
+                    'team_ids': keys,
+                    'salaries': [tx['amount'] for tx in tx_list],
+                }, opening)
+            
+            for team in replay([tx['team_id'] for tx in tx_list])['teams']:
+                print(f"  {team['team_id']}: ${team['total']:.2f} ({team['player_count']} transactions)")
             
-            for team in sorted(by_team.keys()):
-                print(f"  {team}: ${by_team[team]['total']:.2f} ({by_team[team]['count']} transactions)")
+            # Within one fixture a team's salary charges are consecutive, so each
+            # recorded balance must follow from the previous one
+            fixture_plan = replay([f"{tx['team_id']}|{tx['fixture_id']}" for tx in tx_list])
+            breaks = [
+                (tx, charge) for tx, charge in zip(tx_list, fixture_plan['charges'])
+                if abs(tx['balance_after'] - charge['balance_after']) > 0.005
+            ]
+            if breaks:
+                print(f"\n⚠️  {len(breaks)} salary transactions break the balance chain:")
+                for tx, charge in breaks[:20]:
+                    print(f"  {tx['team_id']} {tx['player_name']} ({tx['fixture_id']}): "
+                          f"recorded ${tx['balance_after']:.2f}, expected ${charge['balance_after']:.2f}")
         else:
             print("⚠️  No salary payment transactions found")
         
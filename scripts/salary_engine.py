@@ -0,0 +1,196 @@
+"""
+Matchday salary engine (Python mirror of lib/salary-engine.ts)
+
+Pure, columnar versions of the salary and category calculations used by the
+app, so maintenance scripts (e.g. reset_and_check.py) derive the same numbers
+as the TypeScript engine. Both implementations are checked against the
+shared cases in lib/salary-engine.fixtures.json:
+
+    python scripts/salary_engine.py --check
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+
+FIXTURES_PATH = os.path.join(os.path.dirname(__file__), '..', 'lib', 'salary-engine.fixtures.json')
+
+CATEGORY_NAMES = {'legend': 'Legend', 'classic': 'Classic'}
+
+STAR_RATING_THRESHOLDS = [
+    (400, 10),
+    (350, 10),
+    (300, 9),
+    (250, 8),
+    (210, 7),
+    (175, 6),
+    (145, 5),
+    (120, 4),
+    (100, 3),
+]
+
+
+def calculate_real_player_salary(auction_value, star_rating):
+    """(auction_value / 100) * star_rating / 10, as calculateRealPlayerSalary"""
+    return (auction_value / 100) * star_rating / 10
+
+
+def calculate_star_rating(points):
+    for threshold, stars in STAR_RATING_THRESHOLDS:
+        if points >= threshold:
+            return stars
+    return 3
+
+
+def calculate_player_categories(points):
+    """Legend for the top half by points; ties share the rank of the first of them"""
+    order = sorted(range(len(points)), key=lambda i: -points[i])
+    legend_threshold = math.ceil(len(points) * 0.5)
+    categories = [None] * len(points)
+
+    rank = 0
+    for position, index in enumerate(order):
+        if position > 0 and points[index] != points[order[position - 1]]:
+            rank = position
+        categories[index] = 'legend' if rank < legend_threshold else 'classic'
+
+    return categories
+
+
+def to_player_salary_columns(rows):
+    columns = {'player_ids': [], 'team_ids': [], 'salaries': [], 'points': [], 'categories': []}
+    for row in rows:
+        columns['player_ids'].append(row['player_id'])
+        columns['team_ids'].append(row.get('team_id') or None)
+        columns['salaries'].append(float(row.get('salary_per_match') or 0))
+        columns['points'].append(row.get('points') or 0)
+        columns['categories'].append(row.get('category'))
+    return columns
+
+
+def resolve_salary_charges(charges, columns):
+    index_by_id = {player_id: i for i, player_id in enumerate(columns['player_ids'])}
+    resolved = {'fixture_ids': [], 'player_ids': [], 'player_names': [], 'team_ids': [], 'salaries': []}
+    skipped = []
+
+    for charge in charges:
+        index = index_by_id.get(charge['player_id'])
+        if index is None:
+            skipped.append({**charge, 'error': 'Not found in player_seasons'})
+            continue
+        team_id = columns['team_ids'][index]
+        salary = columns['salaries'][index]
+        if not team_id or salary <= 0:
+            skipped.append({**charge, 'error': 'No team or salary'})
+            continue
+        resolved['fixture_ids'].append(charge['fixture_id'])
+        resolved['player_ids'].append(charge['player_id'])
+        resolved['player_names'].append(charge['player_name'])
+        resolved['team_ids'].append(team_id)
+        resolved['salaries'].append(salary)
+
+    return resolved, skipped
+
+
+def plan_salary_deductions(resolved, balances):
+    running = dict(balances)
+    teams = {}
+    plan = {'charges': [], 'teams': [], 'skipped': []}
+
+    for i, player_id in enumerate(resolved['player_ids']):
+        team_id = resolved['team_ids'][i]
+        salary = resolved['salaries'][i]
+        charge = {
+            'fixture_id': resolved['fixture_ids'][i],
+            'player_id': player_id,
+            'player_name': resolved['player_names'][i],
+        }
+
+        if team_id not in running:
+            plan['skipped'].append({**charge, 'error': 'Team season document not found'})
+            continue
+
+        balance_before = running[team_id]
+        balance_after = balance_before - salary
+        running[team_id] = balance_after
+        plan['charges'].append({
+            **charge,
+            'team_id': team_id,
+            'salary': salary,
+            'balance_before': balance_before,
+            'balance_after': balance_after,
+        })
+
+        team = teams.get(team_id)
+        if team:
+            team['total'] += salary
+            team['player_count'] += 1
+            team['balance_after'] = balance_after
+        else:
+            teams[team_id] = {
+                'team_id': team_id,
+                'total': salary,
+                'player_count': 1,
+                'balance_before': balance_before,
+                'balance_after': balance_after,
+            }
+
+    plan['teams'] = sorted(teams.values(), key=lambda t: t['team_id'])
+    return plan
+
+
+def plan_category_changes(columns):
+    changes = []
+    for i, category in enumerate(calculate_player_categories(columns['points'])):
+        name = CATEGORY_NAMES[category]
+        if columns['categories'][i] != name:
+            changes.append({'player_id': columns['player_ids'][i], 'category': name})
+    return changes
+
+
+def run_case(case):
+    columns = to_player_salary_columns(case['players'])
+    resolved, skipped = resolve_salary_charges(case['charges'], columns)
+    plan = plan_salary_deductions(resolved, case['balances'])
+    return {
+        'charges': plan['charges'],
+        'teams': plan['teams'],
+        'skipped': skipped + plan['skipped'],
+        'category_changes': plan_category_changes(columns),
+        'salaries': [calculate_real_player_salary(a, s) for a, s in case.get('contracts', [])],
+        'star_ratings': [calculate_star_rating(p) for p in case.get('star_points', [])],
+    }
+
+
+def check(fixtures_path):
+    with open(fixtures_path) as f:
+        cases = json.load(f)['cases']
+
+    failed = 0
+    for case in cases:
+        actual = run_case(case)
+        mismatches = [key for key, expected in case['expected'].items() if actual[key] != expected]
+        for key in mismatches:
+            print(f"❌ {case['name']}: {key}")
+            print(f"   expected {json.dumps(case['expected'][key])}")
+            print(f"   actual   {json.dumps(actual[key])}")
+        failed += bool(mismatches)
+    print(f"{len(cases) - failed}/{len(cases)} cases match")
+    return failed == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--check', action='store_true', help='check against the shared fixtures')
+    parser.add_argument('--fixtures', default=FIXTURES_PATH)
+    args = parser.parse_args()
+
+    if args.check:
+        sys.exit(0 if check(args.fixtures) else 1)
+    parser.print_help()
+
+
+if __name__ == '__main__':
+    main()
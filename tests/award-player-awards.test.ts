@@ -0,0 +1,75 @@
+/**
+ * Tests for season player awards
+ */
+
+import { describe, test, expect, vi } from 'vitest';
+
+const { transaction, query, addFantasyPointsForAward } = vi.hoisted(() => ({
+  transaction: vi.fn(),
+  query: vi.fn((text: string, params: any[]) => ({ text, params })),
+  addFantasyPointsForAward: vi.fn(async () => ({ success: true, points: 0, message: '' }))
+}));
+
+vi.mock('../lib/neon/tournament-config', () => ({
+  getTournamentDb: vi.fn(() => ({ transaction, query }))
+}));
+
+vi.mock('../lib/fantasy-award-points', () => ({
+  addFantasyPointsForAward
+}));
+
+const { autoAwardPlayerAwards, sortSeasonAwards } = await import('../lib/award-player-awards');
+
+const award = (player_id: string, award_type: string, award_position: string) => ({
+  player_id,
+  player_name: player_id,
+  award_category: award_type.startsWith('Best') ? 'category' : 'individual',
+  award_type,
+  award_position,
+  player_category: null
+});
+
+describe('sortSeasonAwards', () => {
+  test('orders by award type, then position', () => {
+    const sorted = sortSeasonAwards([
+      award('P3', 'Best Defender', 'Winner'),
+      award('P2', 'Golden Boot', 'Runner Up'),
+      award('P1', 'Golden Boot', 'Winner'),
+      award('P4', 'Most Assists', 'Third Place')
+    ]);
+
+    expect(sorted.map(a => a.player_id)).toEqual(['P1', 'P2', 'P4', 'P3']);
+  });
+});
+
+describe('autoAwardPlayerAwards', () => {
+  test('inserts awards and refreshes awards_count in one transaction', async () => {
+    transaction.mockResolvedValueOnce([
+      [award('P2', 'Most Assists', 'Winner'), award('P1', 'Golden Boot', 'Winner')],
+      []
+    ]);
+
+    const result = await autoAwardPlayerAwards('SSPSLS16', 3);
+
+    expect(transaction).toHaveBeenCalledTimes(1);
+    const [statements] = transaction.mock.calls[0];
+    expect(statements).toHaveLength(2);
+    expect(statements[0].params).toEqual(['SSPSLS16', 3]);
+    expect(statements[1].text).toContain('awards_count');
+
+    expect(result.success).toBe(true);
+    expect(result.awardsGiven).toBe(2);
+    expect(result.awards.map(a => a.award_type)).toEqual(['Golden Boot', 'Most Assists']);
+    expect(addFantasyPointsForAward).toHaveBeenCalledTimes(2);
+  });
+
+  test('reports a failed transaction without awarding fantasy points', async () => {
+    transaction.mockRejectedValueOnce(new Error('connection lost'));
+    addFantasyPointsForAward.mockClear();
+
+    const result = await autoAwardPlayerAwards('SSPSLS16');
+
+    expect(result).toMatchObject({ success: false, awardsGiven: 0, error: 'connection lost' });
+    expect(addFantasyPointsForAward).not.toHaveBeenCalled();
+  });
+});
@@ -0,0 +1,134 @@
+/**
+ * Tests for the season trophy evaluator
+ *
+ * Covers the pure evaluation step for each tournament format.
+ */
+
+import { describe, test, expect, vi } from 'vitest';
+import {
+  evaluateSeasonTrophies,
+  TrophyFixture,
+  TrophyTournament
+} from '../lib/award-season-trophies';
+
+vi.mock('../lib/neon/tournament-config', () => ({
+  getTournamentDb: vi.fn(() => vi.fn())
+}));
+
+let fixtureSeq = 0;
+
+function fixture(
+  tournamentId: string,
+  home: string,
+  away: string,
+  homeScore: number,
+  awayScore: number,
+  extra: Partial<TrophyFixture> = {}
+): TrophyFixture {
+  fixtureSeq++;
+  return {
+    id: `${tournamentId}_${extra.knockout_round ? 'ko_' : ''}${fixtureSeq}`,
+    tournament_id: tournamentId,
+    home_team_id: home,
+    home_team_name: `Team ${home}`,
+    away_team_id: away,
+    away_team_name: `Team ${away}`,
+    home_score: homeScore,
+    away_score: awayScore,
+    knockout_round: null,
+    group_name: null,
+    ...extra
+  };
+}
+
+function tournament(id: string, format: Partial<TrophyTournament> = {}): TrophyTournament {
+  return {
+    id,
+    tournament_name: id,
+    has_knockout_stage: false,
+    is_pure_knockout: false,
+    has_group_stage: false,
+    ...format
+  };
+}
+
+describe('evaluateSeasonTrophies', () => {
+  test('awards the league winner on points, then goal difference', () => {
+    const trophies = evaluateSeasonTrophies(
+      [tournament('LEAGUE')],
+      [
+        fixture('LEAGUE', 'A', 'B', 2, 0),
+        fixture('LEAGUE', 'C', 'B', 5, 0),
+        fixture('LEAGUE', 'A', 'C', 1, 1)
+      ]
+    );
+
+    expect(trophies).toHaveLength(1);
+    expect(trophies[0]).toMatchObject({
+      team_id: 'C',
+      trophy_type: 'cup',
+      trophy_name: 'LEAGUE',
+      trophy_position: 'Winner',
+      label: 'LEAGUE Winner'
+    });
+  });
+
+  test('awards knockout winner and runner-up from the final', () => {
+    const trophies = evaluateSeasonTrophies(
+      [tournament('CUP', { is_pure_knockout: true, has_knockout_stage: true })],
+      [
+        fixture('CUP', 'A', 'B', 3, 1, { knockout_round: 'Semi Final' }),
+        fixture('CUP', 'C', 'D', 2, 0, { knockout_round: 'Semi Final' }),
+        fixture('CUP', 'A', 'C', 0, 1, { knockout_round: 'Final' })
+      ]
+    );
+
+    expect(trophies.map(t => [t.team_id, t.trophy_position])).toEqual([['C', 'Winner'], ['A', 'Runner Up']]);
+  });
+
+  test('awards shield winner plus knockout trophies for league + knockout', () => {
+    const trophies = evaluateSeasonTrophies(
+      [tournament('MIX', { has_knockout_stage: true })],
+      [
+        fixture('MIX', 'A', 'B', 4, 0),
+        fixture('MIX', 'B', 'A', 1, 0, { knockout_round: 'Final' })
+      ]
+    );
+
+    expect(trophies.map(t => t.label)).toEqual(['MIX Shield Winner', 'MIX Knockout Winner', 'MIX Knockout Runner Up']);
+    // Knockout fixtures are excluded from the shield standings
+    expect(trophies[0].team_id).toBe('A');
+    expect(trophies[1].team_id).toBe('B');
+  });
+
+  test('awards each group winner for group stage tournaments', () => {
+    const trophies = evaluateSeasonTrophies(
+      [tournament('GRP', { has_group_stage: true })],
+      [
+        fixture('GRP', 'A', 'B', 1, 0, { group_name: 'Group A' }),
+        fixture('GRP', 'C', 'D', 0, 2, { group_name: 'Group B' })
+      ]
+    );
+
+    expect(trophies.map(t => [t.team_id, t.trophy_position])).toEqual([
+      ['A', 'Group A Winner'],
+      ['D', 'Group B Winner']
+    ]);
+  });
+
+  test('skips tournaments without completed fixtures and adds the fantasy winner', () => {
+    const trophies = evaluateSeasonTrophies(
+      [tournament('EMPTY')],
+      [],
+      { league_name: 'Fantasy League', team_id: 'F1', team_name: 'Dream XI', total_points: 900 }
+    );
+
+    expect(trophies).toEqual([expect.objectContaining({
+      team_id: 'F1',
+      trophy_type: 'special',
+      trophy_name: 'Fantasy League',
+      trophy_position: 'Winner',
+      label: 'Fantasy League Winner'
+    })]);
+  });
+});
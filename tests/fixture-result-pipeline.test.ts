@@ -0,0 +1,158 @@
+/**
+ * Tests for the fixture result pipeline
+ *
+ * Covers the pure delta steps: fixture score, player stat deltas, salary
+ * charges and teamstats entries.
+ */
+
+import { describe, test, expect, vi } from 'vitest';
+
+vi.mock('../lib/neon/tournament-config', () => ({ getTournamentDb: vi.fn() }));
+vi.mock('../lib/neon/fantasy-config', () => ({ getFantasyDb: vi.fn() }));
+vi.mock('../lib/neon/teamstats', () => ({ recalculatePositions: vi.fn() }));
+vi.mock('../lib/neon/season-aggregates', () => ({ refreshSeasonAggregatesAfterChange: vi.fn() }));
+vi.mock('../lib/firebase/admin', () => ({ adminDb: {} }));
+vi.mock('../lib/transaction-logger', () => ({ logTransactions: vi.fn() }));
+vi.mock('../lib/player-transfers-v2', () => ({ toIncrementUpdate: vi.fn() }));
+
+const {
+  applyTeamFixtureEntry,
+  computeFixtureScore,
+  diffPlayerContributions,
+  playerContributions,
+  salaryCharges,
+  teamFixtureEntries
+} = await import('../lib/fixture-result-pipeline');
+
+type Matchup = Parameters<typeof computeFixtureScore>[0][number];
+
+function matchup(position: number, home: string, away: string, homeGoals: number | null, awayGoals: number | null, extra: Partial<Matchup> = {}): Matchup {
+  return {
+    position,
+    home_player_id: home,
+    home_player_name: `Player ${home}`,
+    away_player_id: away,
+    away_player_name: `Player ${away}`,
+    home_goals: homeGoals,
+    away_goals: awayGoals,
+    ...extra
+  };
+}
+
+describe('computeFixtureScore', () => {
+  test('adds opponent substitution penalties and fine goals to goal totals', () => {
+    const score = computeFixtureScore(
+      [matchup(1, 'H1', 'A1', 2, 1, { home_sub_penalty: 2 }), matchup(2, 'H2', 'A2', 0, 0)],
+      'goals',
+      1,
+      0
+    );
+
+    expect(score).toEqual({ home_score: 3, away_score: 3, result: 'draw' });
+  });
+
+  test('scores each matchup 3 / 1 / 0 with win-based scoring', () => {
+    const score = computeFixtureScore(
+      [matchup(1, 'H1', 'A1', 2, 1), matchup(2, 'H2', 'A2', 1, 1), matchup(3, 'H3', 'A3', 0, 4)],
+      'wins',
+      0,
+      0
+    );
+
+    expect(score).toEqual({ home_score: 4, away_score: 4, result: 'draw' });
+  });
+});
+
+describe('player deltas', () => {
+  test('a first submission adds every counted player and skips NULL matchups', () => {
+    const deltas = diffPlayerContributions(
+      playerContributions(null, null),
+      playerContributions([matchup(1, 'H1', 'A1', 3, 0), matchup(2, 'H2', 'A2', 1, 1, { is_null: true })], 'H1')
+    );
+
+    expect(deltas.map(d => d.player_id)).toEqual(['H1', 'A1']);
+    expect(deltas[0]).toMatchObject({
+      matches_played: 1, goals_scored: 3, wins: 1, clean_sheets: 1, motm_awards: 1, points: 3,
+      was_counted: false, is_counted: true
+    });
+    expect(deltas[1]).toMatchObject({ goals_conceded: 3, losses: 1, points: -3 });
+  });
+
+  test('an edit only carries the difference, including conceded goals and MOTM', () => {
+    const before = [matchup(1, 'H1', 'A1', 2, 0), matchup(2, 'H2', 'A2', 1, 1)];
+    const after = [matchup(1, 'H1', 'A1', 1, 2), matchup(2, 'H2', 'A2', 1, 1)];
+
+    const deltas = diffPlayerContributions(
+      playerContributions(before, 'H1'),
+      playerContributions(after, 'A1')
+    );
+
+    // Matchup 2 is unchanged, so its players are not touched
+    expect(deltas.map(d => d.player_id)).toEqual(['H1', 'A1']);
+    expect(deltas[0]).toMatchObject({
+      matches_played: 0, goals_scored: -1, goals_conceded: 2, wins: -1, losses: 1,
+      clean_sheets: -1, motm_awards: -1, points: -3, was_counted: true, is_counted: true
+    });
+    expect(deltas[1]).toMatchObject({ goals_scored: 2, goals_conceded: -1, wins: 1, losses: -1, motm_awards: 1, points: 3 });
+  });
+
+  test('resubmitting the stored result produces no deltas', () => {
+    const stored = [matchup(1, 'H1', 'A1', 4, 2)];
+    expect(diffPlayerContributions(playerContributions(stored, 'H1'), playerContributions(stored, 'H1'))).toEqual([]);
+  });
+});
+
+describe('salaryCharges', () => {
+  test('charges every player on a first submission, NULL matchups included', () => {
+    const charges = salaryCharges(null, [matchup(1, 'H1', 'A1', 1, 0), matchup(2, 'H2', 'A2', 0, 0, { is_null: true })]);
+    expect(charges.map(c => [c.player_id, c.reason])).toEqual([
+      ['H1', 'match'], ['A1', 'match'], ['H2', 'match'], ['A2', 'match']
+    ]);
+  });
+
+  test('refunds swapped-out players and charges their replacements on edit', () => {
+    const charges = salaryCharges(
+      [matchup(1, 'H1', 'A1', 1, 0)],
+      [matchup(1, 'H1', 'A9', 1, 0)]
+    );
+    expect(charges.map(c => [c.player_id, c.reason])).toEqual([
+      ['A1', 'result_edit_player_removed'],
+      ['A9', 'result_edit_player_added']
+    ]);
+  });
+});
+
+describe('team stats', () => {
+  const score = { home_score: 2, away_score: 1, result: 'home_win' as const };
+
+  test('team goals exclude substitution penalties but include fine goals', () => {
+    const { home, away } = teamFixtureEntries('F1', [matchup(1, 'H1', 'A1', 1, 1, { away_sub_penalty: 1 })], score, 0, 0, 'goals');
+    expect(home).toMatchObject({ goals_for: 1, goals_against: 1, draw: true });
+    expect(away).toMatchObject({ goals_for: 1, goals_against: 1, draw: true });
+
+    const winBased = teamFixtureEntries('F1', [matchup(1, 'H1', 'A1', 1, 1)], score, 0, 0, 'wins');
+    expect(winBased.home.won).toBe(true);
+  });
+
+  test('replaces an already processed fixture instead of adding it again', () => {
+    const current = {
+      id: 'T1_S1_L',
+      matches_played: 2, wins: 2, draws: 0, losses: 0, goals_for: 5, goals_against: 1,
+      current_form: 'WW', win_streak: 2, unbeaten_streak: 2,
+      processed_fixtures: [
+        { fixture_id: 'F0', goals_for: 2, goals_against: 0, won: true, draw: false, lost: false },
+        { fixture_id: 'F1', goals_for: 3, goals_against: 1, won: true, draw: false, lost: false }
+      ]
+    };
+
+    const updated = applyTeamFixtureEntry(current, {
+      fixture_id: 'F1', goals_for: 1, goals_against: 2, won: false, draw: false, lost: true
+    });
+
+    expect(updated).toMatchObject({
+      matches_played: 2, wins: 1, losses: 1, goals_for: 3, goals_against: 2,
+      goal_difference: 1, points: 3, current_form: 'WL', win_streak: 0, unbeaten_streak: 0
+    });
+    expect(updated.processed_fixtures.map(f => f.fixture_id)).toEqual(['F0', 'F1']);
+  });
+});
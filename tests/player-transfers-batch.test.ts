@@ -0,0 +1,184 @@
+/**
+ * Tests for transfer window batches
+ *
+ * Covers the pure planning step: deterministic ordering, player conflicts,
+ * running budgets and running transfer limit counts.
+ */
+
+import { describe, test, expect, vi } from 'vitest';
+import {
+  orderMoves,
+  planTransferWindow,
+  mergeBudgetDeltas,
+  toContractUpdates,
+  playerKey,
+  TransferWindowMove,
+  TransferWindowSnapshot
+} from '../lib/player-transfers-batch';
+import { PlayerData } from '../lib/player-transfers-v2';
+
+vi.mock('../lib/neon/tournament-config', () => ({
+  getTournamentDb: vi.fn(() => vi.fn())
+}));
+
+vi.mock('../lib/neon/auction-config', () => ({
+  getAuctionDb: vi.fn(() => vi.fn())
+}));
+
+vi.mock('../lib/firebase/admin', () => ({
+  adminDb: {
+    collection: vi.fn(),
+    batch: vi.fn()
+  }
+}));
+
+const SEASON = 'SSPSLS16';
+
+function player(playerId: string, teamId: string, overrides: Partial<PlayerData> = {}): PlayerData {
+  return {
+    id: `${playerId}_${SEASON}`,
+    player_id: playerId,
+    player_name: `Player ${playerId}`,
+    team_id: teamId,
+    team_name: teamId,
+    auction_value: 225,
+    star_rating: 5,
+    points: 192,
+    salary_per_match: 1.13,
+    season_id: SEASON,
+    type: 'real',
+    ...overrides
+  };
+}
+
+function snapshot(
+  players: PlayerData[],
+  budgets: Record<string, number>,
+  used: Record<string, number> = {}
+): TransferWindowSnapshot {
+  return {
+    players: new Map(players.map(p => [playerKey(p.type, p.player_id), { current: p, futureSeasonIds: [] }])),
+    teamSeasons: new Map(Object.entries(budgets).map(([teamId, budget]) => [
+      teamId, { real_player_budget: budget, real_player_spent: 0, football_budget: budget, football_spent: 0 }
+    ])),
+    transfersUsed: new Map(Object.entries(used))
+  };
+}
+
+const transfer = (playerId: string, newTeamId: string, extra: Partial<TransferWindowMove> = {}): TransferWindowMove => ({
+  kind: 'transfer', playerId, playerType: 'real', newTeamId, ...extra
+} as TransferWindowMove);
+
+describe('orderMoves', () => {
+  test('orders by priority, then requested time, then move key', () => {
+    const moves = [
+      transfer('P3', 'T9'),
+      transfer('P2', 'T9', { requestedAt: '2026-01-02T00:00:00Z' }),
+      transfer('P1', 'T9', { requestedAt: '2026-01-01T00:00:00Z' }),
+      transfer('P4', 'T9', { priority: 1 })
+    ];
+
+    expect(orderMoves(moves).map(m => (m as any).playerId)).toEqual(['P4', 'P1', 'P2', 'P3']);
+  });
+
+  test('is independent of input order', () => {
+    const moves = [transfer('B', 'T1'), transfer('A', 'T2'), transfer('C', 'T3')];
+    const reversed = [...moves].reverse();
+
+    expect(orderMoves(moves)).toEqual(orderMoves(reversed));
+  });
+});
+
+describe('planTransferWindow', () => {
+  test('accepts a valid transfer and computes budget deltas', () => {
+    const { planned, rejections } = planTransferWindow(
+      SEASON,
+      [transfer('P1', 'T2')],
+      snapshot([player('P1', 'T1')], { T1: 1000, T2: 1000 })
+    );
+
+    expect(rejections).toHaveLength(0);
+    expect(planned).toHaveLength(1);
+    expect(planned[0].deltas.T2.real_player_budget).toBe(-309.38);
+    expect(planned[0].deltas.T1.real_player_budget).toBe(253.12);
+  });
+
+  test('rejects a second move for the same player as PLAYER_CONFLICT', () => {
+    const { planned, rejections } = planTransferWindow(
+      SEASON,
+      [transfer('P1', 'T3', { priority: 2 }), transfer('P1', 'T2', { priority: 1 })],
+      snapshot([player('P1', 'T1')], { T1: 1000, T2: 1000, T3: 1000 })
+    );
+
+    expect(planned).toHaveLength(1);
+    expect((planned[0] as any).newTeamId).toBe('T2');
+    expect(rejections[0].errorCode).toBe('PLAYER_CONFLICT');
+  });
+
+  test('validates later moves against the running budget', () => {
+    // T2 can afford one 309.38 transfer but not two
+    const { planned, rejections } = planTransferWindow(
+      SEASON,
+      [transfer('P1', 'T2', { priority: 1 }), transfer('P2', 'T2', { priority: 2 })],
+      snapshot([player('P1', 'T1'), player('P2', 'T3')], { T1: 1000, T2: 500, T3: 1000 })
+    );
+
+    expect(planned).toHaveLength(1);
+    expect(rejections[0].errorCode).toBe('BUDGET_VALIDATION_FAILED');
+  });
+
+  test('counts accepted moves towards the transfer limit', () => {
+    const { planned, rejections } = planTransferWindow(
+      SEASON,
+      [transfer('P1', 'T2', { priority: 1 }), transfer('P2', 'T2', { priority: 2 })],
+      snapshot([player('P1', 'T1'), player('P2', 'T3')], { T1: 5000, T2: 5000, T3: 5000 }, { T2: 1 })
+    );
+
+    expect(planned).toHaveLength(1);
+    expect(rejections[0].errorCode).toBe('TRANSFER_LIMIT_EXCEEDED');
+  });
+
+  test('reports missing players, same-team moves and missing budget fields', () => {
+    const snap = snapshot([player('P1', 'T1'), player('P2', 'T1')], { T1: 1000 });
+    snap.teamSeasons.set('T4', {});
+
+    const { planned, rejections } = planTransferWindow(
+      SEASON,
+      [transfer('P9', 'T2'), transfer('P1', 'T1'), transfer('P2', 'T4')],
+      snap
+    );
+
+    expect(planned).toHaveLength(0);
+    expect(rejections.map(r => r.errorCode).sort()).toEqual(
+      ['BUDGET_FIELD_MISSING', 'PLAYER_NOT_FOUND', 'SAME_TEAM']
+    );
+  });
+
+  test('plans a swap and moves each player to the other team', () => {
+    const swap: TransferWindowMove = {
+      kind: 'swap', playerAId: 'P1', playerAType: 'real', playerBId: 'P2', playerBType: 'real'
+    };
+    const { planned } = planTransferWindow(
+      SEASON,
+      [swap],
+      snapshot([player('P1', 'T1'), player('P2', 'T2')], { T1: 1000, T2: 1000 })
+    );
+
+    const updates = toContractUpdates(SEASON, planned);
+    expect(updates.map(u => [u.playerId, u.currentSeasonUpdates.team_id])).toEqual([['P1', 'T2'], ['P2', 'T1']]);
+  });
+});
+
+describe('mergeBudgetDeltas', () => {
+  test('sums per-field changes across moves', () => {
+    const merged = mergeBudgetDeltas([
+      { T1: { real_player_budget: -100, real_player_spent: 90 } },
+      { T1: { real_player_budget: 50 }, T2: { football_budget: -10 } }
+    ]);
+
+    expect(merged).toEqual({
+      T1: { real_player_budget: -50, real_player_spent: 90 },
+      T2: { football_budget: -10 }
+    });
+  });
+});
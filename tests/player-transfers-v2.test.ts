@@ -2889,3 +2889,61 @@ describe('Budget Validation Error Messages', () => {
     }
   });
 });
+
+// ============================================================================
+// ATOMIC CONTRACT WRITER
+// ============================================================================
+
+describe('applyContractUpdates / restoreContracts', () => {
+  beforeEach(() => {
+    vi.clearAllMocks();
+  });
+
+  test('should update current and future seasons in one transaction request', async () => {
+    const { applyContractUpdates } = await import('../lib/player-transfers-v2');
+    const { getTournamentDb } = await import('../lib/neon/tournament-config');
+    const mockQuery = vi.fn((text: string, params: any[]) => ({ text, params }));
+    const mockTransaction = vi.fn().mockResolvedValue([[
+      { player_id: 'SSPSPL0001', season_id: 'SSPSLS17', team_id: 'SSPSLT0001', auction_value: '225', star_rating: 5, points: '180', salary_per_match: '5.00' },
+      { player_id: 'SSPSPL0001', season_id: 'SSPSLS16', team_id: 'SSPSLT0001', auction_value: '225', star_rating: 5, points: '180', salary_per_match: '5.00' }
+    ]]);
+
+    (getTournamentDb as any).mockReturnValue({ query: mockQuery, transaction: mockTransaction });
+
+    const { updatedSeasonIds, beforeImages } = await applyContractUpdates([{
+      playerId: 'SSPSPL0001',
+      playerType: 'real',
+      currentSeasonId: 'SSPSLS16',
+      currentSeasonUpdates: { team_id: 'SSPSLT0002', auction_value: 281.25, star_rating: 6, points: 200, salary_per_match: 2.567 },
+      futureSeasonIds: ['SSPSLS17']
+    }]);
+
+    expect(mockTransaction).toHaveBeenCalledTimes(1);
+    expect(mockQuery).toHaveBeenCalledTimes(1);
+    const [text, params] = mockQuery.mock.calls[0];
+    expect(text).toContain('season_id = ANY($2::text[])');
+    expect(text).toContain('FOR UPDATE');
+    expect(params).toEqual(['SSPSPL0001', ['SSPSLS16', 'SSPSLS17'], 'SSPSLT0002', 'SSPSLS16', 281, 6, 200, 2.57]);
+
+    expect(updatedSeasonIds.get('SSPSPL0001')).toEqual(['SSPSLS16', 'SSPSLS17']);
+    expect(beforeImages).toHaveLength(2);
+    expect(beforeImages[0]).toMatchObject({ season_id: 'SSPSLS16', team_id: 'SSPSLT0001', auction_value: 225, type: 'real' });
+  });
+
+  test('should restore all before-images of a database with one statement', async () => {
+    const { restoreContracts } = await import('../lib/player-transfers-v2');
+    const { getTournamentDb } = await import('../lib/neon/tournament-config');
+    const mockQuery = vi.fn().mockResolvedValue([]);
+
+    (getTournamentDb as any).mockReturnValue({ query: mockQuery });
+
+    await restoreContracts([
+      { player_id: 'SSPSPL0001', season_id: 'SSPSLS16', team_id: 'SSPSLT0001', auction_value: 225, star_rating: 5, points: 180, salary_per_match: 5, type: 'real' },
+      { player_id: 'SSPSPL0001', season_id: 'SSPSLS17', team_id: 'SSPSLT0001', auction_value: 225, star_rating: 5, points: 180, salary_per_match: 5, type: 'real' }
+    ]);
+
+    expect(mockQuery).toHaveBeenCalledTimes(1);
+    expect(mockQuery.mock.calls[0][0]).toContain('jsonb_to_recordset');
+    expect(JSON.parse(mockQuery.mock.calls[0][1][0])).toHaveLength(2);
+  });
+});